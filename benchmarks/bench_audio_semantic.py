@@ -0,0 +1,281 @@
+#!/usr/bin/env python
+"""Benchmark the audio semantic pipeline with instant fake transcribers.
+
+Usage:
+  python benchmarks/bench_audio_semantic.py [--tracks 1000 --tracks 4000] [--words 300] \
+    [--only process_records,export_outputs] [--output benchmarks/results/audio.json]
+
+Behavior:
+  - Builds a synthetic recovery set per `--tracks` size: fake audio files, `audio_metadata.csv`,
+    and deterministic transcripts and SRTs from `FakeTranscriber`, so model time is zero and
+    only the pipeline's own overhead is measured.
+  - Times `build_semantic_entry`, `semantic_audio.catalogue_audio` (fake transcriber and
+    embedder), `process_records` end to end (state writes, sidecars, checkpoint exports),
+    `export_outputs`, one state-file write, `find_duplicate_groups`, and
+    `verify_catalogue_outputs`.
+  - Reports microseconds per track and, across sizes, a scaling exponent k (time ~ tracks**k):
+    about 1 is linear, about 2 means a quadratic path that will dominate at 10k-100k tracks.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import io
+import shutil
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# harness puts src/ and scripts/ on sys.path, so it must be imported before the script modules.
+from harness import (
+    REPO_ROOT,
+    measure,
+    print_timings,
+    report_header,
+    scaling_exponent,
+    write_report,
+)
+from synthetic_audio import (
+    FakeTranscriber,
+    fake_embedder,
+    plan_tracks,
+    synthetic_srt,
+    write_metadata_csv,
+)
+
+from disk_catalogue.audio_semantic import (
+    AudioCatalogueRecord,
+    build_semantic_entry,
+    find_duplicate_groups,
+    read_srt_segments,
+    segments_end_seconds,
+    verify_catalogue_outputs,
+)
+from disk_catalogue.entry_store import EntryStore
+from disk_catalogue.progress import write_json_atomic
+from disk_catalogue.semantic_audio import catalogue_audio
+
+# The CLI module lives in scripts/, which is only importable once harness has run.
+semantic_script = importlib.import_module("catalogue_following_jesus_semantic")
+
+DEFAULT_GOLD = REPO_ROOT / "eval" / "following_jesus_gold_questions.json"
+WORKLOADS = (
+    "build_semantic_entry",
+    "catalogue_audio",
+    "process_records",
+    "export_outputs",
+    "state_write",
+    "find_duplicate_groups",
+    "verify_catalogue_outputs",
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument(
+        "--tracks",
+        type=int,
+        action="append",
+        help="Synthetic track count; repeat for a scaling comparison (default: 500 and 2000)",
+    )
+    ap.add_argument("--words", type=int, default=300, help="Words per synthetic transcript")
+    ap.add_argument("--tracks-per-album", type=int, default=12)
+    ap.add_argument("--duplicate-album-ratio", type=float, default=0.05)
+    ap.add_argument("--checkpoint-interval", type=int, default=25)
+    ap.add_argument("--gold-questions", type=Path, default=DEFAULT_GOLD)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--only", help=f"Comma-separated subset of: {', '.join(WORKLOADS)}")
+    ap.add_argument("--workdir", type=Path, help="Where to build the sets (default: a temp dir)")
+    ap.add_argument("--keep", action="store_true", help="Keep the work directory afterwards")
+    ap.add_argument("--output", type=Path, help="Results JSON path")
+    return ap
+
+
+def run_size(
+    args: argparse.Namespace, workdir: Path, tracks: int, selected: set[str]
+) -> list[dict[str, Any]]:
+    audio_root = workdir / "audio"
+    records = plan_tracks(
+        audio_root,
+        tracks,
+        tracks_per_album=args.tracks_per_album,
+        duplicate_album_ratio=args.duplicate_album_ratio,
+        seed=args.seed,
+    )
+    n = len(records)
+    metadata_csv = workdir / "audio_metadata.csv"
+    write_metadata_csv(metadata_csv, records)
+    transcriber = FakeTranscriber(words=args.words, seed=args.seed)
+    output_dir = workdir / "semantic_catalogue"
+    db_path = workdir / "catalogue.duckdb"
+    results: list[dict[str, Any]] = []
+
+    def add(name: str, fn: Callable[[], Any], setup: Callable[[], Any] | None = None) -> None:
+        if name in selected:
+            results.append(measure(name, fn, args.repeat, items=n, setup=setup))
+
+    texts = {record.file_key: transcriber.text_for(record.file_key) for record in records}
+    entry_dir = workdir / "entries"
+    entry_dir.mkdir(parents=True, exist_ok=True)
+
+    def build_entries() -> None:
+        for record in records:
+            build_semantic_entry(
+                record,
+                texts[record.file_key],
+                entry_dir / f"{record.file_key}.txt",
+                entry_dir / f"{record.file_key}.srt",
+            )
+
+    add("build_semantic_entry", build_entries)
+
+    state_path = workdir / "semantic_audio_state.json"
+    add(
+        "catalogue_audio",
+        lambda: catalogue_audio(
+            audio_root, state_path, transcriber=transcriber, embedder=fake_embedder
+        ),
+        setup=lambda: state_path.unlink(missing_ok=True),
+    )
+
+    script_args = semantic_script.build_parser().parse_args(
+        [
+            "--metadata-csv",
+            str(metadata_csv),
+            "--output-dir",
+            str(output_dir),
+            "--db",
+            str(db_path),
+            "--gold-questions",
+            str(args.gold_questions),
+            "--checkpoint-interval",
+            str(args.checkpoint_interval),
+        ]
+    )
+
+    def reset_outputs() -> None:
+        shutil.rmtree(output_dir, ignore_errors=True)
+        db_path.unlink(missing_ok=True)
+
+    def run_process_records() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            status = semantic_script.process_records(script_args, transcriber.transcribe_record)
+        if status:
+            raise RuntimeError("process_records reported failures on the synthetic set")
+
+    needs_outputs = selected & {"export_outputs", "state_write"}
+    if "process_records" in selected:
+        add("process_records", run_process_records, setup=reset_outputs)
+    elif needs_outputs:
+        reset_outputs()
+        run_process_records()
+
+    loaded_records = semantic_script.load_records(metadata_csv)
+    state_file = output_dir / "semantic_catalogue_state.json"
+    if needs_outputs:
+        state = semantic_script.load_state(state_file)
+        with EntryStore(output_dir / "semantic_entries.duckdb") as store:
+            add(
+                "export_outputs",
+                lambda: semantic_script.export_outputs(
+                    db_path,
+                    output_dir,
+                    loaded_records,
+                    state,
+                    [args.gold_questions],
+                    metadata_csv,
+                    store,
+                ),
+            )
+        add("state_write", lambda: write_json_atomic(state_file, state))
+
+    if selected & {"find_duplicate_groups", "verify_catalogue_outputs"}:
+        add("find_duplicate_groups", lambda: find_duplicate_groups(records))
+        verify_inputs = verification_inputs(records, transcriber, workdir / "verify")
+        add("verify_catalogue_outputs", lambda: verify_catalogue_outputs(*verify_inputs))
+
+    for result in results:
+        result["tracks"] = n
+    return results
+
+
+def verification_inputs(
+    records: list[AudioCatalogueRecord], transcriber: FakeTranscriber, directory: Path
+) -> tuple[Any, ...]:
+    """Entries, transcript paths, a duplicate audit, and SRT end times for the verify step."""
+    directory.mkdir(parents=True, exist_ok=True)
+    entries = {}
+    transcript_map = {}
+    srt_end = {}
+    for record in records:
+        text = transcriber.text_for(record.file_key)
+        transcript = directory / f"{record.file_key}.txt"
+        srt = directory / f"{record.file_key}.srt"
+        transcript.write_text(text, encoding="utf-8")
+        srt.write_text(synthetic_srt(text), encoding="utf-8")
+        entries[record.file_key] = build_semantic_entry(record, text, transcript, srt)
+        transcript_map[record.file_key] = transcript
+        srt_end[record.file_key] = segments_end_seconds(read_srt_segments(srt))
+    audit = find_duplicate_groups(records)
+    return records, entries, transcript_map, None, 20.0, audit, srt_end
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    sizes = sorted(set(args.tracks or [500, 2000]))
+    selected = set(args.only.split(",")) if args.only else set(WORKLOADS)
+    unknown = selected - set(WORKLOADS)
+    if unknown:
+        raise SystemExit(f"Unknown workloads: {', '.join(sorted(unknown))}")
+
+    base_workdir = args.workdir or Path(tempfile.mkdtemp(prefix="disk-catalogue-audio-bench-"))
+    by_size: dict[int, list[dict[str, Any]]] = {}
+    try:
+        for tracks in sizes:
+            workdir = base_workdir / f"tracks-{tracks}"
+            shutil.rmtree(workdir, ignore_errors=True)
+            workdir.mkdir(parents=True)
+            by_size[tracks] = run_size(args, workdir, tracks, selected)
+    finally:
+        if not args.keep:
+            shutil.rmtree(base_workdir, ignore_errors=True)
+
+    results = [
+        {**result, "name": f"{result['name']} [{tracks} tracks]", "workload": result["name"]}
+        for tracks, size_results in by_size.items()
+        for result in size_results
+    ]
+    scaling: dict[str, float | None] = {}
+    if len(sizes) > 1:
+        smallest = {item["name"]: item for item in by_size[sizes[0]]}
+        for item in by_size[sizes[-1]]:
+            scaling[item["name"]] = scaling_exponent(smallest[item["name"]], item)
+
+    report = {
+        **report_header("audio_semantic"),
+        "params": {
+            "tracks": sizes,
+            "words": args.words,
+            "tracks_per_album": args.tracks_per_album,
+            "duplicate_album_ratio": args.duplicate_album_ratio,
+            "checkpoint_interval": args.checkpoint_interval,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+    output = write_report(report, args.output)
+    print_timings(results)
+    for name, exponent in scaling.items():
+        shape = "" if exponent is None else (" (superlinear)" if exponent > 1.3 else "")
+        print(f"scaling {name:<40} k={exponent}{shape}")
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python
+"""Benchmark the scan -> ingest -> query pipeline on synthetic drives.
+
+Usage:
+  python benchmarks/bench_pipeline.py [--files 20000] [--drives 2] [--repeat 3] \
+    [--output benchmarks/results/pipeline.json]
+
+Behavior:
+  - Generates synthetic drive trees (sparse files) with a configurable file count, depth,
+    fan-out, size range, and media mix, plus stand-in ExifTool CSVs for each drive.
+  - Times `scanner.scan_path`, `derive_lists_from_files_csv`, `load_csvs.ingest_file` (with
+    `ensure_derived_views`), and every query in `sample_queries.sql`. Queries against tables a
+    synthetic catalogue does not have are recorded as skipped.
+  - Writes one JSON document with the commit, environment, parameters, and best/mean timings,
+    so runs can be compared across commits with `benchmarks/compare.py`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import shutil
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+# harness puts src/ and scripts/ on sys.path, so it must be imported before load_csvs and
+# scan_and_ingest.
+from harness import REPO_ROOT, measure, print_timings, report_header, write_report
+from load_csvs import (
+    FILE_TABLE,
+    PHOTO_TABLE,
+    VIDEO_TABLE,
+    ensure_derived_views,
+    ensure_schema,
+    ingest_file,
+)
+from scan_and_ingest import derive_lists_from_files_csv
+from synthetic_drive import (
+    SyntheticFile,
+    TreeSpec,
+    generate_drive,
+    plan_drives,
+    write_files_csv,
+    write_media_csv,
+)
+
+from disk_catalogue.scanner import scan_path
+
+DEFAULT_QUERIES = REPO_ROOT / "sample_queries.sql"
+
+
+def load_sample_queries(path: Path) -> list[tuple[str, str]]:
+    """(name, sql) pairs; each query is named by the last comment line above it.
+
+    A comment line inside an open parenthesis continues the previous one rather than naming
+    the query.
+    """
+    queries: list[tuple[str, str]] = []
+    name = ""
+    depth = 0
+    lines: list[str] = []
+    for line in path.read_text(encoding="utf-8").splitlines():
+        stripped = line.strip()
+        if not lines and stripped.startswith("--"):
+            label = stripped.lstrip("-").strip()
+            if label and depth == 0:
+                name = label
+            depth = max(0, depth + label.count("(") - label.count(")"))
+            continue
+        if not stripped and not lines:
+            continue
+        lines.append(line)
+        if stripped.endswith(";"):
+            queries.append((name or f"query {len(queries) + 1}", "\n".join(lines)))
+            lines = []
+    return queries
+
+
+def build_parser() -> argparse.ArgumentParser:
+    defaults = TreeSpec()
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--files", type=int, default=defaults.files, help="Files per drive")
+    ap.add_argument("--drives", type=int, default=2)
+    ap.add_argument("--depth", type=int, default=defaults.depth)
+    ap.add_argument("--fanout", type=int, default=defaults.fanout)
+    ap.add_argument("--min-size", type=int, default=defaults.min_size)
+    ap.add_argument("--max-size", type=int, default=defaults.max_size)
+    ap.add_argument("--photo-ratio", type=float, default=defaults.photo_ratio)
+    ap.add_argument("--video-ratio", type=float, default=defaults.video_ratio)
+    ap.add_argument("--duplicate-ratio", type=float, default=defaults.duplicate_ratio)
+    ap.add_argument("--seed", type=int, default=defaults.seed)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--queries", type=Path, default=DEFAULT_QUERIES)
+    ap.add_argument("--workdir", type=Path, help="Where to build drives (default: a temp dir)")
+    ap.add_argument("--keep", action="store_true", help="Keep the work directory afterwards")
+    ap.add_argument("--output", type=Path, help="Results JSON path")
+    return ap
+
+
+def run_benchmarks(args: argparse.Namespace, workdir: Path) -> dict[str, Any]:
+    spec = TreeSpec(
+        files=args.files,
+        depth=args.depth,
+        fanout=args.fanout,
+        min_size=args.min_size,
+        max_size=args.max_size,
+        photo_ratio=args.photo_ratio,
+        video_ratio=args.video_ratio,
+        duplicate_ratio=args.duplicate_ratio,
+        seed=args.seed,
+    )
+    labels = [f"Bench-{index + 1}" for index in range(args.drives)]
+    plans: dict[str, list[SyntheticFile]] = dict(
+        zip(labels, plan_drives(spec, args.drives), strict=True)
+    )
+    total_files = sum(len(files) for files in plans.values())
+
+    setup: list[dict[str, Any]] = []
+    started = time.perf_counter()
+    for label, files in plans.items():
+        generate_drive(workdir / "drives" / label, files)
+    setup.append({"name": "generate_tree", "seconds": round(time.perf_counter() - started, 6)})
+
+    csv_dir = workdir / "csv"
+    csv_dir.mkdir(parents=True, exist_ok=True)
+    csv_paths: list[tuple[Path, str]] = []
+    csv_rows = 0
+    started = time.perf_counter()
+    for label, files in plans.items():
+        files_csv = csv_dir / f"files_{label}.csv"
+        csv_rows += write_files_csv(files_csv, label, files)
+        csv_paths.append((files_csv, FILE_TABLE))
+        for kind, table in (("photo", PHOTO_TABLE), ("video", VIDEO_TABLE)):
+            media_csv = csv_dir / f"{kind}s_{label}.csv"
+            csv_rows += write_media_csv(media_csv, label, files, kind, seed=args.seed)
+            csv_paths.append((media_csv, table))
+    setup.append({"name": "fake_exiftool_csv", "seconds": round(time.perf_counter() - started, 6)})
+
+    results: list[dict[str, Any]] = []
+
+    def scan_all() -> None:
+        for label in plans:
+            for _record in scan_path(workdir / "drives" / label):
+                pass
+
+    results.append(measure("scanner.scan_path", scan_all, args.repeat, items=total_files))
+
+    def derive_all() -> None:
+        for label in plans:
+            lists_dir = workdir / "lists" / label
+            lists_dir.mkdir(parents=True, exist_ok=True)
+            derive_lists_from_files_csv(csv_dir / f"files_{label}.csv", lists_dir)
+
+    results.append(
+        measure("derive_lists_from_files_csv", derive_all, args.repeat, items=total_files)
+    )
+
+    db_path = workdir / "bench.duckdb"
+
+    def fresh_db() -> None:
+        db_path.unlink(missing_ok=True)
+
+    def ingest_all() -> None:
+        con = duckdb.connect(str(db_path))
+        try:
+            ensure_schema(con)
+            for path, table in csv_paths:
+                ingest_file(con, path, table)
+            ensure_derived_views(con)
+        finally:
+            con.close()
+
+    results.append(
+        measure("load_csvs.ingest_file", ingest_all, args.repeat, items=csv_rows, setup=fresh_db)
+    )
+
+    queries: list[dict[str, Any]] = []
+    con = duckdb.connect(str(db_path), read_only=True)
+    try:
+        for name, sql in load_sample_queries(args.queries):
+            try:
+                rows = len(con.execute(sql).fetchall())
+            except duckdb.Error as exc:
+                queries.append({"name": name, "skipped": f"{type(exc).__name__}: {exc}"[:200]})
+                continue
+            result = measure(name, lambda sql=sql: con.execute(sql).fetchall(), args.repeat)
+            result["rows"] = rows
+            queries.append(result)
+    finally:
+        con.close()
+
+    return {
+        **report_header("pipeline"),
+        "params": {**asdict(spec), "drives": args.drives, "repeat": args.repeat},
+        "totals": {"files": total_files, "csv_rows": csv_rows},
+        "setup": setup,
+        "results": results,
+        "queries": queries,
+    }
+
+
+def main() -> None:
+    args = build_parser().parse_args()
+    workdir = args.workdir or Path(tempfile.mkdtemp(prefix="disk-catalogue-bench-"))
+    workdir.mkdir(parents=True, exist_ok=True)
+    try:
+        report = run_benchmarks(args, workdir)
+    finally:
+        if not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    output = write_report(report, args.output)
+    print_timings(report["results"] + report["queries"])
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
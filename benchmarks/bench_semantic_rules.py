@@ -0,0 +1,234 @@
+#!/usr/bin/env python
+"""Compare rule-driven semantic entries with the inline heuristics they replaced.
+
+Usage:
+  python benchmarks/bench_semantic_rules.py [--transcripts 200] [--minutes 60] \
+    [--baseline-rev e592f5b] [--output benchmarks/results/semantic_rules.json]
+
+Behavior:
+  - Loads `disk_catalogue.audio_semantic` as it was at `--baseline-rev` (before the heuristics
+    moved into `semantic_rules`) from git, next to the current package. Its Bible reference
+    extraction is replaced with the current one, which later resolves spoken ordinals such as
+    "first John" on purpose, so only the rule-driven heuristics are compared.
+  - Builds a corpus of transcripts about `--minutes` long at 150 words a minute. Each one mixes
+    filler narration with a random selection of the phrases the rules look for (roundtable,
+    module, memory verse, known stories, speaker introductions), in varied case and spacing,
+    under album folders and titles that reach every classification branch.
+  - Runs `build_semantic_entry` from both versions on every transcript and compares the
+    entries field by field (all but `created_at`), printing the first differences.
+  - Times both versions over the corpus.
+  - Exits with status 1 if any entry differs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import subprocess
+import sys
+import types
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+# harness puts src/ and scripts/ on sys.path, so it must be imported before the package.
+from harness import REPO_ROOT, measure, print_timings, report_header, write_report
+from synthetic_audio import WORDS
+
+from disk_catalogue.audio_semantic import (
+    AudioCatalogueRecord,
+    build_semantic_entry,
+    extract_bible_references,
+    semantic_entry_row,
+)
+
+DEFAULT_BASELINE_REV = "e592f5b"
+WORDS_PER_MINUTE = 150
+# Filler without the story words, so some tracks fall through to the album and unknown rules.
+NEUTRAL_WORDS = tuple(word for word in WORDS if word not in {"jesus", "father", "son"})
+RULE_PHRASES = (
+    "Welcome to this roundtable on orality.",
+    "This is module three of Following Jesus.",
+    "Welcome to module one.",
+    "Our mission with God is to follow the spiritual markers.",
+    "Today we ask the right kinds of questions.",
+    "Questions about the story reveal a worldview.",
+    "Let us learn the memory verse together.",
+    "The serpent tempted Eve in the garden and she ate the fruit.",
+    "They ate the forbidden fruit.",
+    "Jesus said to Peter, feed my sheep.",
+    "Moses set up the tabernacle.",
+    "The glory of the Lord filled the tabernacle.",
+    "Lazarus was raised, and a grain of wheat must die.",
+    "A kernel of wheat, a single seed, and Lazarus.",
+    "In the region of the Gerasenes a gadarene man met Jesus.",
+    "Jacob slept at Bethel.",
+    "Orality and literacy are not the same.",
+    "Primary oral learners need storying for discipleship and evangelism.",
+    "Read Genesis 3:1-24 and John 21:15-17.",
+    "Turn to Exodus 40 and first John 1:9.",
+    "My name is Avery Willis.",
+    "I am Jim Slack, with Grant Lovejoy and MARCUS VEGH.",
+    "God spoke to the people.",
+)
+ALBUMS = (
+    "Following Jesus 1--Making Disciples",
+    "Following Jesus 4--Mission With God",
+    "Storying Training Roundtable",
+    "Misc Recordings",
+)
+TITLES = (
+    "Track 01",
+    "track 7",
+    "Wake Up to Orality",
+    "Module 2 Welcome",
+    "The Prodigal Son",
+    "",
+)
+
+
+def load_baseline(rev: str) -> types.ModuleType:
+    """`disk_catalogue.audio_semantic` at `rev`, as a separate module."""
+    source = subprocess.run(
+        ["git", "show", f"{rev}:src/disk_catalogue/audio_semantic.py"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    module = types.ModuleType("baseline_audio_semantic")
+    # dataclasses resolve the module's annotations through sys.modules.
+    sys.modules[module.__name__] = module
+    exec(compile(source, f"{rev}:audio_semantic.py", "exec"), module.__dict__)
+    module.extract_bible_references = extract_bible_references
+    return module
+
+
+def synthetic_corpus(
+    count: int, minutes: float, seed: int
+) -> list[tuple[AudioCatalogueRecord, str]]:
+    rng = random.Random(seed)
+    words = int(minutes * WORDS_PER_MINUTE)
+    corpus: list[tuple[AudioCatalogueRecord, str]] = []
+    for index in range(count):
+        parts: list[str] = []
+        phrases = rng.sample(RULE_PHRASES, rng.randint(0, 5))
+        filler = NEUTRAL_WORDS if index % 3 == 0 else WORDS
+        count_words = 0
+        while count_words < words:
+            length = rng.randint(6, 16)
+            parts.append(" ".join(rng.choice(filler) for _ in range(length)).capitalize() + ".")
+            count_words += length
+            if phrases and rng.random() < 0.01:
+                phrase = phrases.pop()
+                parts.append(phrase.upper() if rng.random() < 0.2 else phrase)
+        parts.extend(phrases)
+        # Whisper output wraps lines and doubles spaces; the rules must see through both.
+        text = "".join(part + rng.choice((" ", "  ", "\n", " \n ")) for part in parts).strip()
+        title = rng.choice(TITLES)
+        corpus.append(
+            (
+                AudioCatalogueRecord(
+                    recovery_set="bench",
+                    file_key=f"t{index}",
+                    album_folder=rng.choice(ALBUMS),
+                    file_name=f"{index:04d} {title or 'untitled'}.m4a",
+                    title=title,
+                    destination_path=f"/audio/{index:04d}.m4a",
+                    disc_index=1,
+                    track_index=index,
+                    duration_seconds=minutes * 60,
+                ),
+                text,
+            )
+        )
+    # The empty transcript takes the no-text paths.
+    corpus.append((corpus[0][0], ""))
+    return corpus
+
+
+def entry_rows(build: Any, row: Any, corpus: list[tuple[AudioCatalogueRecord, str]]) -> list[Any]:
+    transcript = Path("/audio/transcript.txt")
+    rows = []
+    for record, text in corpus:
+        entry = row(build(record, text, transcript, None))
+        entry.pop("created_at")
+        rows.append(entry)
+    return rows
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--transcripts", type=int, default=200)
+    ap.add_argument("--minutes", type=float, default=60.0, help="Length of each transcript")
+    ap.add_argument("--baseline-rev", default=DEFAULT_BASELINE_REV)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--output", type=Path, help="Results JSON path")
+    args = ap.parse_args()
+
+    baseline = load_baseline(args.baseline_rev)
+    corpus = synthetic_corpus(args.transcripts, args.minutes, args.seed)
+    # Baseline records are its own dataclass; the fields are the same.
+    baseline_corpus = [
+        (baseline.AudioCatalogueRecord(**vars(record)), text) for record, text in corpus
+    ]
+    expected = entry_rows(
+        baseline.build_semantic_entry, baseline.semantic_entry_row, baseline_corpus
+    )
+    actual = entry_rows(build_semantic_entry, semantic_entry_row, corpus)
+    differing: Counter[str] = Counter()
+    examples: list[str] = []
+    for (record, _text), old, new in zip(corpus, expected, actual, strict=True):
+        for field in sorted(old.keys() | new.keys()):
+            if old.get(field) != new.get(field):
+                differing[field] += 1
+                if len(examples) < 10:
+                    examples.append(
+                        f"{record.file_key} {field}: {old.get(field)!r} != {new.get(field)!r}"
+                    )
+    track_types = Counter(row["track_type"] for row in actual)
+
+    results = [
+        measure(
+            f"baseline {args.baseline_rev} build_semantic_entry",
+            lambda: entry_rows(
+                baseline.build_semantic_entry, baseline.semantic_entry_row, baseline_corpus
+            ),
+            args.repeat,
+            items=len(corpus),
+        ),
+        measure(
+            "semantic_rules build_semantic_entry",
+            lambda: entry_rows(build_semantic_entry, semantic_entry_row, corpus),
+            args.repeat,
+            items=len(corpus),
+        ),
+    ]
+    report = {
+        **report_header("semantic_rules"),
+        "params": {
+            "transcripts": len(corpus),
+            "minutes": args.minutes,
+            "baseline_rev": args.baseline_rev,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+        "track_types": dict(track_types),
+        "differing_entries": sum(old != new for old, new in zip(expected, actual, strict=True)),
+        "differing_fields": dict(differing),
+    }
+    output = write_report(report, args.output)
+    print_timings(results)
+    print(f"track types: {dict(sorted(track_types.items()))}")
+    for example in examples:
+        print(f"differs: {example}")
+    print(f"{report['differing_entries']} of {len(corpus)} entries differ")
+    print(f"Results written to {output}")
+    if report["differing_entries"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+"""Compare two benchmark result files.
+
+Usage:
+  python benchmarks/compare.py BASE.json NEW.json [--threshold 0.10] [--fail-on-regression]
+
+Matches timings by name across the `results` and `queries` sections and prints the best time
+for each side with the new/base ratio. Ratios above 1 + threshold are flagged as regressions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Any
+
+
+def best_times(report: dict[str, Any]) -> dict[str, float]:
+    times: dict[str, float] = {}
+    for section in ("results", "queries"):
+        for item in report.get(section, []):
+            if "best_seconds" in item:
+                times[f"{section}: {item['name']}"] = float(item["best_seconds"])
+    return times
+
+
+def compare(
+    base: dict[str, Any], new: dict[str, Any], threshold: float
+) -> list[tuple[str, float | None, float | None, float | None, bool]]:
+    """(name, base seconds, new seconds, ratio, regressed) for every timing in either run."""
+    base_times = best_times(base)
+    new_times = best_times(new)
+    rows = []
+    for name in list(base_times) + [name for name in new_times if name not in base_times]:
+        before = base_times.get(name)
+        after = new_times.get(name)
+        ratio = after / before if before and after is not None else None
+        rows.append((name, before, after, ratio, ratio is not None and ratio > 1 + threshold))
+    return rows
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("base", type=Path)
+    ap.add_argument("new", type=Path)
+    ap.add_argument("--threshold", type=float, default=0.10)
+    ap.add_argument("--fail-on-regression", action="store_true")
+    args = ap.parse_args()
+
+    base = json.loads(args.base.read_text(encoding="utf-8"))
+    new = json.loads(args.new.read_text(encoding="utf-8"))
+    print(f"base: {base['commit'].get('sha')}  new: {new['commit'].get('sha')}")
+    if base.get("params") != new.get("params"):
+        print("warning: benchmark parameters differ between runs")
+
+    def fmt(value: float | None) -> str:
+        return f"{value:.4f}" if value is not None else "-"
+
+    rows = compare(base, new, args.threshold)
+    for name, before, after, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        ratio_text = f"{ratio:.2f}x" if ratio is not None else "-"
+        print(f"{name[:64]:<64} {fmt(before):>10} {fmt(after):>10} {ratio_text:>8}{flag}")
+    regressions = sum(1 for row in rows if row[4])
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,120 @@
+"""Shared timing, metadata, and reporting helpers for the benchmark scripts."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# Benchmarks import the package from src/ and the CLI modules from scripts/ without installing.
+for _path in (REPO_ROOT / "scripts", REPO_ROOT / "src"):
+    if str(_path) not in sys.path:
+        sys.path.insert(0, str(_path))
+
+
+def measure(
+    name: str,
+    fn: Callable[[], Any],
+    repeat: int,
+    items: int | None = None,
+    setup: Callable[[], Any] | None = None,
+) -> dict[str, Any]:
+    """Best and mean wall time of `fn` over `repeat` runs; `setup` runs untimed before each."""
+    runs: list[float] = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        runs.append(time.perf_counter() - started)
+    best = min(runs)
+    result: dict[str, Any] = {
+        "name": name,
+        "best_seconds": round(best, 6),
+        "mean_seconds": round(statistics.fmean(runs), 6),
+        "runs": [round(run, 6) for run in runs],
+        "items": items,
+    }
+    if items:
+        result["us_per_item"] = round(best / items * 1e6, 2)
+        if best > 0:
+            result["items_per_sec"] = round(items / best, 1)
+    return result
+
+
+def scaling_exponent(small: dict[str, Any], large: dict[str, Any]) -> float | None:
+    """k in time ~ items**k between two runs: about 1 is linear, about 2 is quadratic."""
+    if not small.get("items") or not large.get("items") or large["items"] == small["items"]:
+        return None
+    if small["best_seconds"] <= 0 or large["best_seconds"] <= 0:
+        return None
+    return round(
+        math.log(large["best_seconds"] / small["best_seconds"])
+        / math.log(large["items"] / small["items"]),
+        2,
+    )
+
+
+def git_commit() -> dict[str, Any]:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {"sha": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"sha": None, "dirty": None}
+
+
+def environment() -> dict[str, Any]:
+    import duckdb
+
+    return {
+        "python": platform.python_version(),
+        "duckdb": duckdb.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def report_header(benchmark: str) -> dict[str, Any]:
+    return {
+        "benchmark": benchmark,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "environment": environment(),
+    }
+
+
+def write_report(report: dict[str, Any], output: Path | None) -> Path:
+    """Write `report` to `output`, or to results/<benchmark>-<sha>-<timestamp>.json."""
+    if output is None:
+        sha = (report["commit"]["sha"] or "nogit")[:10]
+        stamp = datetime.now().strftime("%Y%m%dT%H%M%S")
+        output = DEFAULT_RESULTS_DIR / f"{report['benchmark']}-{sha}-{stamp}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return output
+
+
+def print_timings(items: list[dict[str, Any]]) -> None:
+    for item in items:
+        if "skipped" in item:
+            print(f"{item['name'][:60]:<60} skipped")
+            continue
+        rate = f"  {item['items_per_sec']:>12,.0f}/s" if "items_per_sec" in item else ""
+        print(f"{item['name'][:60]:<60} {item['best_seconds']:>10.4f}s{rate}")
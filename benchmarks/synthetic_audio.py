@@ -0,0 +1,183 @@
+"""Synthetic audio recovery sets, transcripts, and SRTs for the semantic pipeline benchmarks.
+
+`plan_tracks` lays out albums of fake tracks (small files of varied sizes; a share of albums
+is copied under a second folder name so both duplicate audits find work) and writes the
+`audio_metadata.csv` the semantic catalogue script reads. `synthetic_transcript` and
+`synthetic_srt` produce deterministic text with Bible references, story names, and speaker
+introductions, so the heuristics run their real paths. `FakeTranscriber` and `fake_embedder`
+stand in for whisper and an embedding model and return instantly.
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import random
+import shutil
+from pathlib import Path
+
+from disk_catalogue.audio_semantic import AudioCatalogueRecord, transcript_output_stem
+
+METADATA_COLUMNS = (
+    "recovery_set",
+    "file_key",
+    "album_folder",
+    "file_name",
+    "title",
+    "destination_path",
+    "disc_index",
+    "track_index",
+    "duration_seconds",
+)
+
+WORDS = (
+    "jesus disciples crowd village road bread fish boat storm faith prayer kingdom father son "
+    "spirit light water wine healing blind leper servant shepherd sheep seed harvest story "
+    "listen remember question answer people house friend neighbour journey temple"
+).split()
+PHRASES = (
+    "Today's story comes from John 3:16.",
+    "Read with me from Luke 15:11-32.",
+    "This is the story of the prodigal son.",
+    "Turn to first Corinthians 13 verse 4.",
+    "We remember the good Samaritan from Luke 10.",
+    "My name is Sarah and I will tell the story.",
+    "Let us learn the memory verse, Mark 4:39.",
+    "Jesus feeds the five thousand in Matthew 14:13-21.",
+)
+
+
+def synthetic_transcript(rng: random.Random, words: int) -> str:
+    parts: list[str] = [rng.choice(PHRASES)]
+    count = 0
+    while count < words:
+        length = rng.randint(6, 16)
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        parts.append(sentence.capitalize() + ".")
+        count += length
+        if rng.random() < 0.05:
+            parts.append(rng.choice(PHRASES))
+    return " ".join(parts)
+
+
+def srt_timestamp(seconds: float) -> str:
+    millis = round(seconds * 1000)
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def synthetic_srt(text: str, words_per_segment: int = 12, seconds_per_word: float = 0.4) -> str:
+    words = text.split()
+    blocks: list[str] = []
+    for index, start in enumerate(range(0, len(words), words_per_segment), start=1):
+        chunk = words[start : start + words_per_segment]
+        begin = start * seconds_per_word
+        end = (start + len(chunk)) * seconds_per_word
+        blocks.append(
+            f"{index}\n{srt_timestamp(begin)} --> {srt_timestamp(end)}\n{' '.join(chunk)}\n"
+        )
+    return "\n".join(blocks)
+
+
+def plan_tracks(
+    root: Path,
+    tracks: int,
+    tracks_per_album: int = 12,
+    duplicate_album_ratio: float = 0.05,
+    seed: int = 0,
+) -> list[AudioCatalogueRecord]:
+    """Write fake audio files under `root` and return their catalogue records."""
+    rng = random.Random(seed)
+    records: list[AudioCatalogueRecord] = []
+    albums = max(1, tracks // tracks_per_album)
+    duplicates = int(albums * duplicate_album_ratio)
+    originals = albums - duplicates
+    file_key = 0
+    for album in range(originals):
+        folder = f"Album {album:05d}"
+        for track in range(1, tracks_per_album + 1):
+            file_key += 1
+            path = root / folder / f"{track:02d} Track {track}.m4a"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Varied sizes, so the exact-duplicate audit only hashes same-size candidates.
+            padding = bytes(file_key % 4096)
+            path.write_bytes(hashlib.sha256(str(file_key).encode()).digest() * 4 + padding)
+            records.append(
+                AudioCatalogueRecord(
+                    recovery_set="bench",
+                    file_key=str(file_key),
+                    album_folder=folder,
+                    file_name=path.name,
+                    title=f"Track {track}",
+                    destination_path=str(path),
+                    disc_index=1,
+                    track_index=track,
+                    duration_seconds=round(rng.uniform(60, 900), 1),
+                )
+            )
+    by_folder: dict[str, list[AudioCatalogueRecord]] = {}
+    for record in records:
+        by_folder.setdefault(record.album_folder, []).append(record)
+    for album in range(duplicates):
+        source_folder = f"Album {rng.randrange(originals):05d}"
+        folder = f"Album {originals + album:05d} (copy)"
+        shutil.copytree(root / source_folder, root / folder)
+        for record in by_folder[source_folder]:
+            file_key += 1
+            records.append(
+                AudioCatalogueRecord(
+                    recovery_set="bench",
+                    file_key=str(file_key),
+                    album_folder=folder,
+                    file_name=record.file_name,
+                    title=record.title,
+                    destination_path=str(root / folder / record.file_name),
+                    disc_index=record.disc_index,
+                    track_index=record.track_index,
+                    duration_seconds=record.duration_seconds,
+                )
+            )
+    return records
+
+
+def write_metadata_csv(path: Path, records: list[AudioCatalogueRecord]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=METADATA_COLUMNS)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({name: getattr(record, name) for name in METADATA_COLUMNS})
+
+
+class FakeTranscriber:
+    """Instant stand-in for ffmpeg + whisper: deterministic transcript and SRT per track."""
+
+    def __init__(self, words: int = 300, seed: int = 0) -> None:
+        self.words = words
+        self.seed = seed
+
+    def text_for(self, key: str) -> str:
+        return synthetic_transcript(random.Random(f"{self.seed}:{key}"), self.words)
+
+    def __call__(self, path: Path) -> str:
+        """`semantic_audio.AudioTranscriber` signature."""
+        return self.text_for(path.name)
+
+    def transcribe_record(
+        self, record: AudioCatalogueRecord, output_dir: Path, _model: Path, _threads: int
+    ) -> tuple[str, Path, Path | None]:
+        """`transcribe_record` signature from the semantic catalogue script."""
+        stem = transcript_output_stem(record, output_dir)
+        stem.parent.mkdir(parents=True, exist_ok=True)
+        text = self.text_for(record.file_key)
+        transcript_path = stem.with_suffix(".txt")
+        srt_path = stem.with_suffix(".srt")
+        transcript_path.write_text(text, encoding="utf-8")
+        srt_path.write_text(synthetic_srt(text), encoding="utf-8")
+        return text, transcript_path, srt_path
+
+
+def fake_embedder(text: str, dimensions: int = 8) -> list[float]:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return [byte / 255 for byte in digest[:dimensions]]
@@ -0,0 +1,260 @@
+"""Synthetic drive trees and local stand-ins for ExifTool CSV output.
+
+`generate_drive` writes a directory tree of sparse files with a configurable file count, depth,
+fan-out, size range, and photo/video/other mix. `write_files_csv` and `write_media_csv` write
+the CSVs the container ExifTool scripts would produce for that tree, with `SourceFile` paths
+under `/host/Volumes/<drive>/` so the derived `files`/`photos`/`videos` views parse them as real
+scans. Nothing here needs ExifTool or a mounted drive.
+"""
+
+from __future__ import annotations
+
+import csv
+import random
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+PHOTO_EXTS = ("jpg", "jpeg", "heic", "cr2", "nef", "arw", "dng", "png")
+VIDEO_EXTS = ("mp4", "mov", "mts", "mkv")
+OTHER_EXTS = ("txt", "pdf", "docx", "zip", "wav", "m4a", "psd")
+
+MIME_TYPES = {
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "heic": "image/heic",
+    "png": "image/png",
+    "mp4": "video/mp4",
+    "mov": "video/quicktime",
+    "pdf": "application/pdf",
+}
+
+CAMERAS = (
+    ("Canon", "Canon EOS 5D Mark IV", "EF24-70mm f/2.8L II USM"),
+    ("Sony", "ILCE-7M3", "FE 24-105mm F4 G OSS"),
+    ("Nikon", "NIKON D850", "AF-S NIKKOR 24-70mm f/2.8E ED VR"),
+    ("Apple", "iPhone 13 Pro", "iPhone 13 Pro back triple camera"),
+)
+
+FILES_COLUMNS = (
+    "SourceFile",
+    "FileName",
+    "Directory",
+    "FilePath",
+    "FileSize#",
+    "MIMEType",
+    "FileType",
+    "FileInode",
+    "FileModifyDate",
+    "FileCreateDate",
+    "CreateDate",
+    "ModifyDate",
+)
+PHOTO_COLUMNS = (
+    "SourceFile",
+    "FileName",
+    "Directory",
+    "FilePath",
+    "FileSize#",
+    "MIMEType",
+    "CreateDate",
+    "DateTimeOriginal",
+    "ModifyDate",
+    "Model",
+    "Make",
+    "LensModel",
+    "ISO",
+    "ImageWidth",
+    "ImageHeight",
+    "GPSLatitude",
+    "GPSLongitude",
+)
+VIDEO_COLUMNS = (
+    "SourceFile",
+    "FileName",
+    "Directory",
+    "FilePath",
+    "FileSize#",
+    "MIMEType",
+    "CreateDate",
+    "MediaCreateDate",
+    "ModifyDate",
+    "Duration",
+    "ImageWidth",
+    "ImageHeight",
+)
+
+EXIF_DATE = "%Y:%m:%d %H:%M:%S"
+
+
+@dataclass(frozen=True)
+class TreeSpec:
+    files: int = 2_000
+    depth: int = 4
+    fanout: int = 6
+    min_size: int = 1_024
+    max_size: int = 8 * 1_024 * 1_024
+    photo_ratio: float = 0.4
+    video_ratio: float = 0.1
+    duplicate_ratio: float = 0.05
+    seed: int = 0
+
+
+@dataclass(frozen=True)
+class SyntheticFile:
+    relative_path: str
+    size: int
+    kind: str  # "photo", "video", or "other"
+    modified: datetime
+
+
+def plan_tree(spec: TreeSpec) -> list[SyntheticFile]:
+    """Deterministic file list for `spec`; duplicates reuse an earlier name and size."""
+    rng = random.Random(spec.seed)
+    base_time = datetime(2015, 1, 1)
+    directories = [""]
+    frontier = [""]
+    for level in range(spec.depth):
+        next_frontier = []
+        for parent in frontier:
+            for index in range(spec.fanout):
+                child = f"{parent}/d{level}_{index}" if parent else f"d{level}_{index}"
+                next_frontier.append(child)
+        directories.extend(next_frontier)
+        frontier = next_frontier
+
+    planned: list[SyntheticFile] = []
+    for index in range(spec.files):
+        directory = rng.choice(directories)
+        if planned and rng.random() < spec.duplicate_ratio:
+            source = rng.choice(planned)
+            name = source.relative_path.rsplit("/", 1)[-1]
+            size, kind = source.size, source.kind
+        else:
+            roll = rng.random()
+            if roll < spec.photo_ratio:
+                kind, ext = "photo", rng.choice(PHOTO_EXTS)
+            elif roll < spec.photo_ratio + spec.video_ratio:
+                kind, ext = "video", rng.choice(VIDEO_EXTS)
+            else:
+                kind, ext = "other", rng.choice(OTHER_EXTS)
+            name = f"f{index:07d}.{ext}"
+            # Log-uniform sizes: many small files, a long tail of large ones.
+            size = int(
+                spec.min_size * (spec.max_size / spec.min_size) ** rng.random()
+                if spec.max_size > spec.min_size
+                else spec.min_size
+            )
+        relative = f"{directory}/{name}" if directory else name
+        modified = base_time + timedelta(seconds=rng.randrange(0, 10 * 365 * 86_400))
+        planned.append(SyntheticFile(relative, size, kind, modified))
+    # Keep one file per path: a duplicate that lands in its source's directory would collide.
+    unique: dict[str, SyntheticFile] = {}
+    for item in planned:
+        unique.setdefault(item.relative_path, item)
+    return list(unique.values())
+
+
+def plan_drives(spec: TreeSpec, drives: int) -> list[list[SyntheticFile]]:
+    """One plan per drive; later drives carry a `backup/` copy of part of the first drive."""
+    first = plan_tree(spec)
+    plans = [first]
+    rng = random.Random(spec.seed)
+    copies = int(len(first) * spec.duplicate_ratio)
+    for index in range(1, drives):
+        own = plan_tree(replace(spec, files=spec.files - copies, seed=spec.seed + index))
+        backup = [
+            SyntheticFile(f"backup/{item.relative_path}", item.size, item.kind, item.modified)
+            for item in rng.sample(first, copies)
+        ]
+        plans.append(own + backup)
+    return plans
+
+
+def generate_drive(root: Path, files: list[SyntheticFile]) -> None:
+    """Create the tree as sparse files so large sizes cost no disk space."""
+    for item in files:
+        path = root / item.relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with path.open("wb") as handle:
+            handle.truncate(item.size)
+
+
+def _base_row(drive_label: str, item: SyntheticFile) -> dict[str, object]:
+    source = f"/host/Volumes/{drive_label}/{item.relative_path}"
+    directory, _, name = source.rpartition("/")
+    ext = name.rsplit(".", 1)[-1]
+    return {
+        "SourceFile": source,
+        "FileName": name,
+        "Directory": directory,
+        "FilePath": source,
+        "FileSize#": item.size,
+        "MIMEType": MIME_TYPES.get(ext, "application/octet-stream"),
+        "FileType": ext.upper(),
+    }
+
+
+def write_files_csv(path: Path, drive_label: str, files: list[SyntheticFile]) -> int:
+    """Stand-in for `container_scan_files.sh`: one row per file."""
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=FILES_COLUMNS)
+        writer.writeheader()
+        for inode, item in enumerate(files, start=1):
+            stamp = item.modified.strftime(EXIF_DATE)
+            writer.writerow(
+                {
+                    **_base_row(drive_label, item),
+                    "FileInode": inode,
+                    "FileModifyDate": f"{stamp}+00:00",
+                    "FileCreateDate": f"{stamp}+00:00",
+                    "CreateDate": stamp if item.kind != "other" else "",
+                    "ModifyDate": stamp,
+                }
+            )
+    return len(files)
+
+
+def write_media_csv(
+    path: Path, drive_label: str, files: list[SyntheticFile], kind: str, seed: int = 0
+) -> int:
+    """Stand-in for the photo or video extraction scripts, with plausible EXIF fields."""
+    rng = random.Random(seed)
+    columns = PHOTO_COLUMNS if kind == "photo" else VIDEO_COLUMNS
+    rows = 0
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for item in files:
+            if item.kind != kind:
+                continue
+            stamp = item.modified.strftime(EXIF_DATE)
+            row: dict[str, object] = {
+                **_base_row(drive_label, item),
+                "CreateDate": stamp,
+                "ModifyDate": stamp,
+            }
+            if kind == "photo":
+                make, model, lens = rng.choice(CAMERAS)
+                has_gps = rng.random() < 0.3
+                row.update(
+                    DateTimeOriginal=stamp,
+                    Make=make,
+                    Model=model,
+                    LensModel=lens,
+                    ISO=rng.choice((100, 200, 400, 800, 3200)),
+                    ImageWidth=6000,
+                    ImageHeight=4000,
+                    GPSLatitude=round(rng.uniform(50, 56), 6) if has_gps else "",
+                    GPSLongitude=round(rng.uniform(-5, 1), 6) if has_gps else "",
+                )
+            else:
+                row.update(
+                    MediaCreateDate=stamp,
+                    Duration=f"{rng.randint(5, 3600)} s",
+                    ImageWidth=1920,
+                    ImageHeight=1080,
+                )
+            writer.writerow(row)
+            rows += 1
+    return rows
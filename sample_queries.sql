@@ -16,32 +16,48 @@ GROUP BY 1 HAVING COUNT(*) > 1
 ORDER BY dup_count DESC, bytes DESC;
 
 -- ---
--- Duplicates (current views)
+-- Duplicates (file_identity_groups: one row per size + normalised name, kept up to date by
+-- load_csvs, so these read pre-grouped rows instead of self-joining the files view)
 -- Candidates by size only
-SELECT "FileSize#" AS bytes, COUNT(*) AS n, COUNT(DISTINCT Drive) AS drives
-FROM files
-GROUP BY 1 HAVING COUNT(*) > 1
+SELECT size AS bytes, SUM(n_files) AS n, len(list_distinct(flatten(list(drives)))) AS drives
+FROM file_identity_groups
+GROUP BY 1 HAVING SUM(n_files) > 1
 ORDER BY n DESC, bytes DESC
 LIMIT 50;
 
 -- Candidates by name + size
-SELECT LOWER(FileName) AS name, "FileSize#" AS bytes, COUNT(*) AS n, LIST(DISTINCT Drive) AS drives
-FROM files
-GROUP BY 1,2 HAVING COUNT(*) > 1
+SELECT name_key AS name, size AS bytes, n_files AS n, drives
+FROM file_identity_groups
+WHERE n_files > 1
 ORDER BY n DESC, bytes DESC
 LIMIT 50;
 
 -- Cross-drive pairs (same name + size)
-SELECT a.Drive AS a_drive, b.Drive AS b_drive,
-       a.RelativePath AS a_path, b.RelativePath AS b_path,
-       a."FileSize#" AS bytes
-FROM files a
-JOIN files b
-  ON a."FileSize#" = b."FileSize#"
- AND LOWER(a.FileName) = LOWER(b.FileName)
- AND a.Drive < b.Drive
+WITH m AS (
+  SELECT size, name_key, member.drive AS drive, member.path AS path
+  FROM (
+    SELECT size, name_key, UNNEST(members) AS member
+    FROM file_identity_groups
+    WHERE n_drives > 1
+  )
+)
+SELECT a.drive AS a_drive, b.drive AS b_drive,
+       a.path AS a_path, b.path AS b_path,
+       a.size AS bytes
+FROM m a
+JOIN m b
+  ON a.size = b.size
+ AND a.name_key = b.name_key
+ AND a.drive < b.drive
 LIMIT 50;
 
+-- Reclaimable space if every name + size group kept one copy
+SELECT COUNT(*) AS groups,
+       SUM(n_files - 1) AS redundant_files,
+       ROUND(SUM(size * (n_files - 1)) / 1e9, 2) AS reclaimable_gb
+FROM file_identity_groups
+WHERE n_files > 1;
+
 -- ---
 -- Scan summaries (drive_scans)
 
@@ -91,6 +107,37 @@ SELECT drive_label,
 FROM last
 ORDER BY rows_per_sec DESC NULLS LAST;
 
+-- Per-phase timings for the last scan per drive (scan_started_at joins back to drive_scans)
+WITH last AS (
+  SELECT drive_label, max(scan_started_at) AS scan_started_at
+  FROM drive_scan_phases
+  GROUP BY drive_label
+)
+SELECT p.drive_label,
+       p.phase,
+       p.status,
+       p.wall_seconds,
+       p.cpu_seconds,
+       ROUND(p.cpu_seconds / NULLIF(p.wall_seconds, 0), 2) AS cpu_per_wall,
+       p.files,
+       ROUND(p.bytes / 1e6, 1) AS mb,
+       ROUND(p.bytes / 1e6 / NULLIF(p.wall_seconds, 0), 1) AS mb_per_sec,
+       p.errors
+FROM drive_scan_phases p
+JOIN last USING (drive_label, scan_started_at)
+ORDER BY p.drive_label, p.phase_index;
+
+-- Files-phase throughput trend per drive (regressions show up as falling MB/s)
+SELECT drive_label,
+       scan_started_at,
+       wall_seconds,
+       ROUND(bytes / 1e6 / NULLIF(wall_seconds, 0), 1) AS mb_per_sec,
+       ROUND(files / NULLIF(wall_seconds, 0), 1) AS files_per_sec,
+       errors
+FROM drive_scan_phases
+WHERE phase = 'files_exiftool'
+ORDER BY drive_label, scan_started_at DESC;
+
 -- Bethel Church videos by year (matches folder/title pattern)
 SELECT *
 FROM videos
@@ -230,10 +277,49 @@ ORDER BY album_folder, file_name
 LIMIT 50;
 
 -- Evaluation scores from optional gold questions
-SELECT question_id,
+SELECT eval_set,
+       analysis_backend,
+       question_id,
        score,
        max_score,
        passed,
        details_json
 FROM audio_semantic_catalogue_eval
-ORDER BY passed, question_id;
+ORDER BY eval_set, analysis_backend, passed, question_id;
+
+-- Per-field accuracy by gold set and analysis backend
+SELECT field_name,
+       eval_set,
+       analysis_backend,
+       matched,
+       questions,
+       accuracy
+FROM audio_semantic_catalogue_field_accuracy
+ORDER BY field_name, eval_set, accuracy DESC;
+
+-- What is said at 12:30 in a track (interval lookup on transcript segments)
+SELECT s.file_key,
+       c.album_folder,
+       c.file_name,
+       s.start_seconds,
+       s.end_seconds,
+       s.text
+FROM audio_transcript_segments s
+JOIN audio_semantic_catalogue c USING (file_key)
+WHERE s.file_key = '1234'
+  AND s.start_seconds <= 750
+  AND s.end_seconds >= 750
+ORDER BY s.start_seconds;
+
+-- Which tracks cover John 12:24 (verse ordinals are book * 1000000 + chapter * 1000 + verse;
+-- John is book 43)
+SELECT r.file_key,
+       c.album_folder,
+       c.file_name,
+       r.reference,
+       r.reference_role
+FROM audio_bible_references r
+JOIN audio_semantic_catalogue c USING (file_key)
+WHERE r.start_ordinal <= 43012024
+  AND r.end_ordinal >= 43012024
+ORDER BY r.end_ordinal - r.start_ordinal, c.album_folder, c.file_name;
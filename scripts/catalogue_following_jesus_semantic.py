@@ -10,43 +10,108 @@ Outputs:
   output/recovery_plans/following_jesus_team_ext10/semantic_catalogue/
   catalogue.duckdb tables: audio_semantic_catalogue, audio_semantic_catalogue_status,
   audio_semantic_source_metadata, audio_semantic_catalogue_duplicates,
-  audio_semantic_catalogue_verification, audio_semantic_catalogue_eval
+  audio_semantic_catalogue_verification, audio_semantic_catalogue_eval,
+  audio_semantic_catalogue_field_accuracy,
+  audio_transcript_segments, audio_bible_references
 
 The command is resumable. It writes JSON status after each file, skips completed unchanged
-transcripts, keeps per-file semantic sidecars, and continues after individual failures.
+transcripts, and continues after individual failures. Each entry is committed to the entry store
+(semantic_entries.duckdb) together with its state; per-file .semantic.json sidecars are an
+optional mirror (--semantic-sidecars).
+Transcripts are also cached by audio content hash (--memo-cache), so duplicate and moved
+tracks are not transcribed twice.
 """
 
 from __future__ import annotations
 
 import argparse
+import copy
 import csv
 import json
 import os
+import socket
 import subprocess
 import sys
 import tempfile
 import time
-from dataclasses import asdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from itertools import accumulate
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import duckdb
-import pandas as pd
 
 from disk_catalogue.audio_semantic import (
     AudioCatalogueRecord,
-    SemanticEntry,
+    TranscriptSegment,
     build_semantic_entry,
     duplicate_group_row,
+    entry_bible_reference_rows,
+    evaluate_gold_question_sets,
+    field_accuracy_rows,
     find_duplicate_groups,
-    load_gold_questions,
-    score_gold_questions,
+    gold_question_set_names,
+    gold_score_rows,
+    load_gold_question_sets,
+    read_srt_segments,
+    segments_end_seconds,
     semantic_entry_from_mapping,
     semantic_entry_row,
     transcript_output_stem,
+    transcript_segment_rows,
     utc_now_iso,
     verify_catalogue_outputs,
 )
+from disk_catalogue.catalogue_service import CatalogueClient, write_catalogue
+from disk_catalogue.coalescing import CoalescingWorker
+from disk_catalogue.entry_store import EntryStore
+from disk_catalogue.job_queue import DEFAULT_LEASE_SECONDS, JobQueue, Lease
+from disk_catalogue.memo_cache import TRANSCRIPTS, MemoCache, audio_key
+from disk_catalogue.progress import ProgressTracker, write_json_atomic
+from disk_catalogue.semantic_rules import default_rule_set, load_rule_set
+from disk_catalogue.semantic_tables import (
+    BIBLE_REFERENCES,
+    CATALOGUE_DUPLICATES,
+    CATALOGUE_EVAL,
+    CATALOGUE_FIELD_ACCURACY,
+    CATALOGUE_STATUS,
+    CATALOGUE_VERIFICATION,
+    SEMANTIC_CATALOGUE,
+    TRANSCRIPT_SEGMENTS,
+    Statement,
+    add_columns_statements,
+    patch_csv,
+    replace_file_rows_statements,
+    text_schema,
+    with_row_columns,
+    write_csv,
+    write_table_statements,
+)
+from disk_catalogue.transcript_chunks import (
+    ChunkOptions,
+    format_srt,
+    format_transcript,
+    parallel_chunks,
+    plan_chunks,
+    split_wav,
+    stitch_segments,
+    wav_duration,
+)
+from disk_catalogue.transcription_cost import (
+    CostModel,
+    cost_samples,
+    fill_missing_durations,
+    fit_cost_model,
+    longest_first,
+)
+
+if TYPE_CHECKING:
+    from disk_catalogue.vad import VadOptions
 
 PLAN_DIR = Path("output/recovery_plans/following_jesus_team_ext10")
 DEFAULT_METADATA_CSV = PLAN_DIR / "audio_metadata.csv"
@@ -54,18 +119,12 @@ DEFAULT_OUTPUT_DIR = PLAN_DIR / "semantic_catalogue"
 DEFAULT_DB = Path("catalogue.duckdb")
 DEFAULT_MODEL = Path("output/models/ggml-base.en.bin")
 DEFAULT_GOLD = Path("eval/following_jesus_gold_questions.json")
+
+# (record, output_dir, model_path, threads) -> (transcript text, transcript path, SRT path)
+RecordTranscriber = Callable[[AudioCatalogueRecord, Path, Path, int], tuple[str, Path, Path | None]]
+# (wav_path, output_stem, model_path, threads): writes <output_stem>.txt and .srt.
+WhisperRunner = Callable[[Path, Path, Path, int], None]
 STATE_VERSION = 1
-DUPLICATE_FIELDNAMES = [
-    "duplicate_kind",
-    "duplicate_key",
-    "group_count",
-    "file_count",
-    "file_keys",
-    "album_folders",
-    "file_names",
-    "destination_paths",
-    "evidence_json",
-]
 
 
 def int_or_none(value: str | None) -> int | None:
@@ -129,13 +188,6 @@ def load_state(path: Path) -> dict[str, Any]:
     return state
 
 
-def write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    tmp = path.with_suffix(f"{path.suffix}.tmp")
-    tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
-    os.replace(tmp, path)
-
-
 def source_fingerprint(path: Path) -> dict[str, Any]:
     stat = path.stat()
     return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
@@ -153,8 +205,7 @@ def state_is_complete(record_state: dict[str, Any], source_fp: dict[str, Any]) -
         and record_state.get("source_mtime_ns") == source_fp["mtime_ns"]
         and record_state.get("transcript_path")
         and Path(record_state["transcript_path"]).exists()
-        and record_state.get("semantic_path")
-        and Path(record_state["semantic_path"]).exists()
+        and record_state.get("entry_stored")
     )
 
 
@@ -206,11 +257,82 @@ def run_whisper(wav_path: Path, output_stem: Path, model_path: Path, threads: in
         raise RuntimeError(f"whisper-cli failed for {wav_path}: {details[-4000:]}")
 
 
+def run_whisper_chunked(
+    wav_path: Path, output_stem: Path, model_path: Path, threads: int, options: ChunkOptions
+) -> None:
+    """Transcribe a long WAV as overlapping chunks in parallel, stitching .txt and .srt.
+
+    Tracks too short to split go straight to `run_whisper`.
+    """
+    duration = wav_duration(wav_path)
+    chunks = plan_chunks(duration, options.chunk_seconds, options.overlap_seconds)
+    if len(chunks) == 1:
+        run_whisper(wav_path, output_stem, model_path, threads)
+        return
+    workers = parallel_chunks(duration, options)
+    chunk_threads = max(1, threads // workers)
+    with tempfile.TemporaryDirectory(prefix="following-jesus-chunks-") as tmp_dir:
+        chunk_paths = split_wav(wav_path, chunks, Path(tmp_dir))
+
+        def transcribe_chunk(chunk_path: Path) -> list[TranscriptSegment]:
+            chunk_stem = chunk_path.with_suffix("")
+            run_whisper(chunk_path, chunk_stem, model_path, chunk_threads)
+            return read_srt_segments(chunk_stem.with_suffix(".srt"))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            chunk_segments = list(pool.map(transcribe_chunk, chunk_paths))
+    segments = stitch_segments(list(zip(chunks, chunk_segments, strict=True)))
+    output_stem.parent.mkdir(parents=True, exist_ok=True)
+    output_stem.with_suffix(".srt").write_text(format_srt(segments), encoding="utf-8")
+    output_stem.with_suffix(".txt").write_text(format_transcript(segments), encoding="utf-8")
+
+
+def transcribe_speech(
+    wav_path: Path,
+    output_stem: Path,
+    model_path: Path,
+    threads: int,
+    options: VadOptions,
+    whisper: WhisperRunner = run_whisper,
+) -> None:
+    """Run whisper on the speech regions of `wav_path` only, with SRT cues on the original timeline.
+
+    Writes a `.vad.json` sidecar with the regions kept and the fraction of audio skipped.
+    """
+    # Lazy import: NumPy is only needed when --vad is used
+    from disk_catalogue.vad import remap_srt, trim_to_speech
+
+    speech_wav = wav_path.with_name(f"{wav_path.stem}.speech.wav")
+    timeline = trim_to_speech(wav_path, speech_wav, options)
+    srt_path = output_stem.with_suffix(".srt")
+    if timeline.regions:
+        whisper(speech_wav, output_stem, model_path, threads)
+        if srt_path.exists():
+            srt_text = srt_path.read_text(encoding="utf-8")
+            srt_path.write_text(remap_srt(srt_text, timeline), encoding="utf-8")
+    else:
+        output_stem.parent.mkdir(parents=True, exist_ok=True)
+        output_stem.with_suffix(".txt").write_text("", encoding="utf-8")
+        srt_path.write_text("", encoding="utf-8")
+    write_json_atomic(
+        output_stem.with_suffix(".vad.json"),
+        {
+            "duration_seconds": round(timeline.duration_seconds, 3),
+            "speech_seconds": round(timeline.speech_seconds, 3),
+            "skipped_fraction": round(timeline.skipped_fraction, 4),
+            "regions": [[region.start_seconds, region.end_seconds] for region in timeline.regions],
+            "options": asdict(options),
+        },
+    )
+
+
 def transcribe_record(
     record: AudioCatalogueRecord,
     output_dir: Path,
     model_path: Path,
     threads: int,
+    vad: VadOptions | None = None,
+    chunking: ChunkOptions | None = None,
 ) -> tuple[str, Path, Path | None]:
     transcript_path, srt_path, _semantic_path = transcript_paths(record, output_dir)
     if transcript_path.exists() and transcript_path.stat().st_size > 0:
@@ -222,34 +344,106 @@ def transcribe_record(
     with tempfile.TemporaryDirectory(prefix="following-jesus-audio-") as tmp_dir:
         wav_path = Path(tmp_dir) / f"{record.file_key}.wav"
         convert_to_wav(source, wav_path)
-        run_whisper(wav_path, output_stem, model_path, threads)
+        whisper: WhisperRunner = run_whisper
+        if chunking is not None:
+            whisper = partial(run_whisper_chunked, options=chunking)
+        if vad is None:
+            whisper(wav_path, output_stem, model_path, threads)
+        else:
+            transcribe_speech(wav_path, output_stem, model_path, threads, vad, whisper)
 
     transcript_text = transcript_path.read_text(encoding="utf-8")
     return transcript_text, transcript_path, srt_path if srt_path.exists() else None
 
 
-def load_entries(
-    output_dir: Path, allowed_file_keys: set[str] | None = None
-) -> dict[str, SemanticEntry]:
-    entries: dict[str, SemanticEntry] = {}
-    for path in sorted(output_dir.glob("transcripts/**/*.semantic.json")):
-        row = json.loads(path.read_text(encoding="utf-8"))
-        entry = semantic_entry_from_mapping(row)
-        if allowed_file_keys is None or entry.file_key in allowed_file_keys:
-            entries[entry.file_key] = entry
-    return entries
+class CachedTranscriber:
+    """Wrap `transcribe` so identical audio is transcribed once per model.
+
+    Results are keyed by the source's SHA-256, so duplicate tracks and files that moved
+    (new file_key, path or drive) get their .txt/.srt, and the .vad.json sidecar under --vad,
+    written from the cache instead of running ffmpeg and whisper again. `refresh` recomputes and
+    overwrites cached entries without looking them up. `served_from_cache` tells whether the last
+    call was a cache hit, so its elapsed time can be kept out of the cost model.
+    """
+
+    def __init__(
+        self, transcribe: RecordTranscriber, cache: MemoCache, model_id: str, refresh: bool = False
+    ) -> None:
+        self.transcribe = transcribe
+        self.cache = cache
+        self.model_id = model_id
+        self.refresh = refresh
+        self.served_from_cache = False
+
+    def __call__(
+        self, record: AudioCatalogueRecord, output_dir: Path, model_path: Path, threads: int
+    ) -> tuple[str, Path, Path | None]:
+        self.served_from_cache = False
+        key = audio_key(Path(record.destination_path), self.model_id)
+        if not self.refresh:
+            found, cached = self.cache.lookup(TRANSCRIPTS, key)
+            if found:
+                self.served_from_cache = True
+                transcript_path, srt_path, _semantic_path = transcript_paths(record, output_dir)
+                transcript_path.parent.mkdir(parents=True, exist_ok=True)
+                transcript_path.write_text(cached["transcript"], encoding="utf-8")
+                # Entries cached before the sidecar was kept have no "vad"; drop any stale one.
+                vad_path = transcript_path.with_suffix(".vad.json")
+                if cached.get("vad") is None:
+                    vad_path.unlink(missing_ok=True)
+                else:
+                    write_json_atomic(vad_path, cached["vad"])
+                if cached["srt"] is None:
+                    return cached["transcript"], transcript_path, None
+                srt_path.write_text(cached["srt"], encoding="utf-8")
+                return cached["transcript"], transcript_path, srt_path
+
+        transcript_text, transcript_path, srt = self.transcribe(
+            record, output_dir, model_path, threads
+        )
+        srt_text = srt.read_text(encoding="utf-8") if srt else None
+        vad_path = transcript_path.with_suffix(".vad.json")
+        vad = json.loads(vad_path.read_text(encoding="utf-8")) if vad_path.exists() else None
+        self.cache.put(
+            TRANSCRIPTS, key, {"transcript": transcript_text, "srt": srt_text, "vad": vad}
+        )
+        return transcript_text, transcript_path, srt
 
 
-def write_csv(path: Path, rows: list[dict[str, Any]], fieldnames: list[str] | None = None) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if not rows and fieldnames is None:
-        path.write_text("", encoding="utf-8")
-        return
-    fieldnames = fieldnames or list(rows[0].keys())
-    with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+def open_entry_store(args: argparse.Namespace) -> EntryStore:
+    """Open the semantic entry store, filling a new one from any `.semantic.json` sidecars."""
+    output_dir: Path = args.output_dir
+    store = EntryStore(args.entry_store or output_dir / "semantic_entries.duckdb")
+    if not len(store):
+        imported = store.import_sidecars(sorted(output_dir.glob("transcripts/**/*.semantic.json")))
+        if imported:
+            print(f"imported {imported} semantic sidecars into {store.path}", flush=True)
+    return store
+
+
+def reconcile_with_store(state: dict[str, Any], store: EntryStore) -> bool:
+    """Bring the JSON state in line with the entry store; True if anything changed.
+
+    The entry and its state are committed to the store before the state file is rewritten, so a
+    crash in between leaves the store ahead: its newer completed states are adopted, while later
+    JSON states (a failed re-run) are kept. `entry_stored` then follows the store, so entries
+    imported from sidecars count as done and entries missing from a replaced store are redone.
+    """
+    changed = False
+    for file_key, stored in store.record_states().items():
+        current = state["records"].get(file_key, {})
+        stamps = ("started_at", "completed_at", "failed_at", "updated_at")
+        latest = max((str(current[key]) for key in stamps if current.get(key)), default="")
+        if str(stored.get("completed_at") or "") > latest:
+            state["records"][file_key] = stored
+            changed = True
+    stored_keys = store.file_keys()
+    for file_key, record_state in state["records"].items():
+        stored = file_key in stored_keys
+        if record_state.get("status") == "completed" and record_state.get("entry_stored") != stored:
+            record_state["entry_stored"] = stored
+            changed = True
+    return changed
 
 
 def export_outputs(
@@ -257,13 +451,18 @@ def export_outputs(
     output_dir: Path,
     records: list[AudioCatalogueRecord],
     state: dict[str, Any],
-    gold_path: Path | None,
+    gold_paths: list[Path],
     metadata_csv: Path,
+    store: EntryStore,
     run_duplicate_audit: bool = True,
+    service_socket: Path | None = None,
 ) -> None:
     expected_file_keys = {record.file_key for record in records}
-    entries = load_entries(output_dir, expected_file_keys)
+    entries = store.load(expected_file_keys)
     entry_rows = [semantic_entry_row(entries[key]) for key in sorted(entries)]
+    bible_reference_rows = [
+        row for key in sorted(entries) for row in entry_bible_reference_rows(entries[key])
+    ]
     source_metadata_rows = load_source_metadata_rows(metadata_csv, expected_file_keys)
     state_rows = [
         {"file_key": file_key, **record_state}
@@ -272,7 +471,12 @@ def export_outputs(
     transcript_map = {
         record.file_key: transcript_paths(record, output_dir)[0] for record in records
     }
-    srt_map = {record.file_key: transcript_paths(record, output_dir)[1] for record in records}
+    segment_rows: list[dict[str, Any]] = []
+    srt_end_map: dict[str, float | None] = {}
+    for record in records:
+        segments = read_srt_segments(transcript_paths(record, output_dir)[1])
+        segment_rows.extend(transcript_segment_rows(record.file_key, segments))
+        srt_end_map[record.file_key] = segments_end_seconds(segments)
     duplicate_audit = find_duplicate_groups(records) if run_duplicate_audit else None
     duplicate_rows = (
         [duplicate_group_row(group) for group in duplicate_audit.groups] if duplicate_audit else []
@@ -281,8 +485,8 @@ def export_outputs(
         records,
         entries,
         transcript_map,
-        srt_map,
         duplicate_audit=duplicate_audit,
+        srt_end_seconds=srt_end_map,
     )
     verification_row = asdict(verification)
 
@@ -292,70 +496,174 @@ def export_outputs(
     write_csv(
         output_dir / "semantic_catalogue_duplicates.csv",
         duplicate_rows,
-        DUPLICATE_FIELDNAMES,
+        CATALOGUE_DUPLICATES.column_names,
     )
     write_json_atomic(output_dir / "semantic_catalogue_verification.json", verification_row)
 
+    question_sets = load_gold_question_sets(gold_paths)
     eval_rows: list[dict[str, Any]] = []
-    if gold_path is not None and gold_path.exists():
-        scores = score_gold_questions(load_gold_questions(gold_path), list(entries.values()))
-        eval_rows = [
-            {
-                "question_id": score.question_id,
-                "score": score.score,
-                "max_score": score.max_score,
-                "passed": score.passed,
-                "details_json": json.dumps(score.details, sort_keys=True),
-            }
-            for score in scores
-        ]
-        write_csv(output_dir / "semantic_catalogue_evaluation.csv", eval_rows)
+    accuracy_rows: list[dict[str, Any]] = []
+    if question_sets:
+        evaluations = evaluate_gold_question_sets(question_sets, entries.values())
+        eval_rows = [row for evaluation in evaluations for row in gold_score_rows(evaluation)]
+        accuracy_rows = field_accuracy_rows(evaluations)
+        write_csv(
+            output_dir / "semantic_catalogue_evaluation.csv", eval_rows, CATALOGUE_EVAL.column_names
+        )
+        write_csv(
+            output_dir / "semantic_catalogue_field_accuracy.csv",
+            accuracy_rows,
+            CATALOGUE_FIELD_ACCURACY.column_names,
+        )
 
-    con = duckdb.connect(str(db_path))
-    try:
-        for table_name, rows in {
-            "audio_semantic_catalogue": entry_rows,
-            "audio_semantic_source_metadata": source_metadata_rows,
-            "audio_semantic_catalogue_status": state_rows,
-            "audio_semantic_catalogue_duplicates": duplicate_rows,
-            "audio_semantic_catalogue_verification": [verification_row],
-            "audio_semantic_catalogue_eval": eval_rows,
-        }.items():
-            columns = (
-                DUPLICATE_FIELDNAMES
-                if table_name == "audio_semantic_catalogue_duplicates"
-                else None
-            )
-            df = pd.DataFrame(rows, columns=columns)
-            con.register("incoming_df", df)
-            con.execute(f"CREATE OR REPLACE TABLE {table_name} AS SELECT * FROM incoming_df")
-            con.unregister("incoming_df")
-    finally:
-        con.close()
+    source_metadata = text_schema(
+        "audio_semantic_source_metadata",
+        dict.fromkeys(name for row in source_metadata_rows for name in row) or ["file_key"],
+    )
+    statements: list[Statement] = []
+    for schema, rows in (
+        (SEMANTIC_CATALOGUE, entry_rows),
+        (source_metadata, source_metadata_rows),
+        (with_row_columns(CATALOGUE_STATUS, state_rows), state_rows),
+        (CATALOGUE_DUPLICATES, duplicate_rows),
+        (CATALOGUE_VERIFICATION, [verification_row]),
+        (CATALOGUE_EVAL, eval_rows),
+        (CATALOGUE_FIELD_ACCURACY, accuracy_rows),
+        (TRANSCRIPT_SEGMENTS, segment_rows),
+        (BIBLE_REFERENCES, bible_reference_rows),
+    ):
+        statements.extend(write_table_statements(schema, rows))
+    write_catalogue(db_path, statements, service_socket)
+
+
+def export_changed_outputs(
+    db_path: Path,
+    output_dir: Path,
+    records: list[AudioCatalogueRecord],
+    state: dict[str, Any],
+    changed_file_keys: set[str],
+    store: EntryStore,
+    service_socket: Path | None = None,
+) -> None:
+    """Checkpoint export: upsert rows for changed file_keys only.
+
+    Catalogue, status, segment, and Bible-reference rows are replaced per file_key in DuckDB and
+    patched in the CSVs. Verification, duplicates, and evaluation are left as of the last full
+    `export_outputs`, which still runs for `--verify`, `--evaluate`, and at the end of a run.
+    """
+    changed = [record for record in records if record.file_key in changed_file_keys]
+    file_keys = {record.file_key for record in changed}
+    entry_rows: list[dict[str, Any]] = []
+    bible_reference_rows: list[dict[str, Any]] = []
+    segment_rows: list[dict[str, Any]] = []
+    entries = store.load(file_keys)
+    for record in changed:
+        _txt, srt_path, _semantic_path = transcript_paths(record, output_dir)
+        entry = entries.get(record.file_key)
+        if entry is not None:
+            entry_rows.append(semantic_entry_row(entry))
+            bible_reference_rows.extend(entry_bible_reference_rows(entry))
+        segment_rows.extend(transcript_segment_rows(record.file_key, read_srt_segments(srt_path)))
+    state_rows = [
+        {"file_key": file_key, **state["records"][file_key]}
+        for file_key in sorted(file_keys)
+        if file_key in state["records"]
+    ]
 
+    patch_csv(output_dir / "semantic_catalogue.csv", entry_rows, file_keys)
+    patch_csv(output_dir / "semantic_catalogue_status.csv", state_rows, file_keys)
+
+    status = with_row_columns(CATALOGUE_STATUS, state_rows)
+    statements = [
+        *replace_file_rows_statements(SEMANTIC_CATALOGUE, entry_rows, file_keys),
+        *add_columns_statements(status),
+        *replace_file_rows_statements(status, state_rows, file_keys),
+        *replace_file_rows_statements(TRANSCRIPT_SEGMENTS, segment_rows, file_keys),
+        *replace_file_rows_statements(BIBLE_REFERENCES, bible_reference_rows, file_keys),
+    ]
+    write_catalogue(db_path, statements, service_socket)
 
-def load_speaker_names(db_path: Path) -> dict[str, list[str]]:
-    if not db_path.exists():
-        return {}
-    con = duckdb.connect(str(db_path), read_only=True)
-    try:
-        table_exists = con.execute("""
-            select count(*)
-            from information_schema.tables
-            where table_name = 'audio_speaker_assignments'
-            """).fetchone()[0]
-        if not table_exists:
-            return {}
-        rows = con.execute("""
-            select cast(file_key as varchar) as file_key, assigned_speaker_name
-            from audio_speaker_assignments
-            where assignment_confidence in ('high', 'medium')
-              and assigned_speaker_name is not null
-              and assigned_speaker_name <> 'Unknown'
-            order by file_key, assigned_speaker_name
-            """).fetchall()
-    finally:
-        con.close()
+
+@dataclass(frozen=True)
+class CheckpointExport:
+    """A checkpoint export of one state snapshot; `full` rebuilds every table."""
+
+    state: dict[str, Any]
+    changed_file_keys: frozenset[str]
+    full: bool
+
+
+def merge_checkpoint_exports(older: CheckpointExport, newer: CheckpointExport) -> CheckpointExport:
+    """Coalesce a queued checkpoint into the next: newest state, every changed file_key."""
+    return CheckpointExport(
+        newer.state,
+        older.changed_file_keys | newer.changed_file_keys,
+        full=older.full or newer.full,
+    )
+
+
+def run_checkpoint_export(
+    args: argparse.Namespace,
+    records: list[AudioCatalogueRecord],
+    store: EntryStore,
+    job: CheckpointExport,
+) -> None:
+    if job.full:
+        export_outputs(
+            args.db,
+            args.output_dir,
+            records,
+            job.state,
+            args.gold_questions,
+            args.metadata_csv,
+            store,
+            run_duplicate_audit=False,
+            service_socket=args.service_socket,
+        )
+    else:
+        export_changed_outputs(
+            args.db,
+            args.output_dir,
+            records,
+            job.state,
+            set(job.changed_file_keys),
+            store,
+            service_socket=args.service_socket,
+        )
+
+
+def report_checkpoint_error(exc: Exception) -> None:
+    print(f"checkpoint export failed, retrying at the next checkpoint: {exc!r}", file=sys.stderr)
+
+
+SPEAKER_TABLE_SQL = """
+    select count(*)
+    from information_schema.tables
+    where table_name = 'audio_speaker_assignments'
+"""
+SPEAKER_NAMES_SQL = """
+    select cast(file_key as varchar) as file_key, assigned_speaker_name
+    from audio_speaker_assignments
+    where assignment_confidence in ('high', 'medium')
+      and assigned_speaker_name is not null
+      and assigned_speaker_name <> 'Unknown'
+    order by file_key, assigned_speaker_name
+"""
+
+
+def load_speaker_names(db_path: Path, service_socket: Path | None = None) -> dict[str, list[str]]:
+    rows: list[tuple[Any, ...]] = []
+    if service_socket is not None:
+        with CatalogueClient(service_socket) as client:
+            if client.query(SPEAKER_TABLE_SQL)[0][0]:
+                rows = client.query(SPEAKER_NAMES_SQL)
+    elif db_path.exists():
+        con = duckdb.connect(str(db_path), read_only=True)
+        try:
+            if con.execute(SPEAKER_TABLE_SQL).fetchall()[0][0]:
+                rows = con.execute(SPEAKER_NAMES_SQL).fetchall()
+        finally:
+            con.close()
 
     speakers: dict[str, list[str]] = {}
     for file_key, speaker_name in rows:
@@ -365,7 +673,107 @@ def load_speaker_names(db_path: Path) -> dict[str, list[str]]:
     return speakers
 
 
-def status_summary(records: list[AudioCatalogueRecord], state: dict[str, Any]) -> dict[str, Any]:
+def vad_state(transcript_path: Path) -> dict[str, Any]:
+    """Speech/duration seconds from the `.vad.json` sidecar, when --vad produced one."""
+    vad_path = transcript_path.with_suffix(".vad.json")
+    if not vad_path.exists():
+        return {}
+    vad = json.loads(vad_path.read_text(encoding="utf-8"))
+    return {
+        "vad_duration_seconds": vad["duration_seconds"],
+        "vad_speech_seconds": vad["speech_seconds"],
+        "vad_skipped_fraction": vad["skipped_fraction"],
+    }
+
+
+def vad_skipped_fraction(states: list[dict[str, Any]]) -> float | None:
+    trimmed = [item for item in states if item.get("vad_duration_seconds")]
+    if not trimmed:
+        return None
+    duration = sum(float(item["vad_duration_seconds"]) for item in trimmed)
+    speech = sum(float(item["vad_speech_seconds"]) for item in trimmed)
+    return round(1.0 - speech / duration, 4)
+
+
+def transcription_model_id(args: argparse.Namespace) -> str:
+    """Identifies what produced a transcript, for the memo cache and the cost model."""
+    model_id = f"whisper-cli:{args.model.name}"
+    if args.vad:
+        model_id += f":vad:{args.vad_margin_db}:{args.vad_min_silence_ms}"
+    return model_id
+
+
+def chunk_options(args: argparse.Namespace) -> ChunkOptions | None:
+    if args.chunk_seconds <= 0:
+        return None
+    return ChunkOptions(args.chunk_seconds, args.chunk_overlap_seconds, args.chunk_workers)
+
+
+def chunking_id(chunking: ChunkOptions | None) -> str | None:
+    """Identifies the chunk settings for the cost model; None when tracks are not split."""
+    if chunking is None:
+        return None
+    return f"chunk:{chunking.chunk_seconds}:{chunking.overlap_seconds}:{chunking.workers}"
+
+
+def track_parallelism(duration_seconds: float | None, chunking: ChunkOptions | None) -> int:
+    if chunking is None or duration_seconds is None:
+        return 1
+    return parallel_chunks(duration_seconds, chunking)
+
+
+def predicted_costs(
+    records: list[AudioCatalogueRecord],
+    state: dict[str, Any],
+    model: CostModel,
+    model_id: str,
+    threads: int,
+    chunking: ChunkOptions | None = None,
+) -> dict[str, float]:
+    """Predicted transcription seconds per file_key for records not yet completed."""
+    durations = fill_missing_durations([record.duration_seconds for record in records])
+    states = state.get("records", {})
+    chunk_id = chunking_id(chunking)
+    return {
+        record.file_key: model.predict(
+            duration, model_id, threads, chunk_id, track_parallelism(duration, chunking)
+        )
+        for record, duration in zip(records, durations, strict=True)
+        if states.get(record.file_key, {}).get("status") != "completed"
+    }
+
+
+def transcription_estimate(
+    records: list[AudioCatalogueRecord],
+    state: dict[str, Any],
+    model_id: str,
+    threads: int,
+    chunking: ChunkOptions | None = None,
+) -> dict[str, Any]:
+    """ETA for the records not yet completed, from a cost model fitted on this state's history."""
+    durations = {record.file_key: record.duration_seconds for record in records}
+    model = fit_cost_model(cost_samples(state.get("records", {}), durations))
+    costs = predicted_costs(records, state, model, model_id, threads, chunking)
+    fit = model.fit_for(model_id, threads, chunking_id(chunking))
+    eta_seconds = sum(costs.values())
+    return {
+        "model_id": model_id,
+        "threads": threads,
+        "chunking": chunking_id(chunking),
+        "rtf": round(fit.rtf, 4),
+        "overhead_seconds": round(fit.overhead_seconds, 2),
+        "fit_samples": fit.samples,
+        "pending_files": len(costs),
+        "eta_seconds": round(eta_seconds),
+        "finish_at": (datetime.now(UTC) + timedelta(seconds=eta_seconds)).isoformat(),
+    }
+
+
+def status_summary(
+    records: list[AudioCatalogueRecord],
+    state: dict[str, Any],
+    estimate: dict[str, Any] | None = None,
+) -> dict[str, Any]:
     states = state.get("records", {})
     expected_file_keys = {record.file_key for record in records}
     expected_states = [item for file_key, item in states.items() if file_key in expected_file_keys]
@@ -380,15 +788,77 @@ def status_summary(records: list[AudioCatalogueRecord], state: dict[str, Any]) -
         "remaining": max(0, len(records) - completed - failed),
         "updated_at": state.get("updated_at"),
         "last_file": state.get("last_file"),
+        "progress": state.get("progress"),
+        "vad_skipped_fraction": vad_skipped_fraction(expected_states),
+        "estimate": estimate if estimate is not None else state.get("estimate"),
     }
 
 
-def print_status(records: list[AudioCatalogueRecord], state: dict[str, Any]) -> None:
-    summary = status_summary(records, state)
+def print_status(
+    records: list[AudioCatalogueRecord],
+    state: dict[str, Any],
+    estimate: dict[str, Any] | None = None,
+) -> None:
+    summary = status_summary(records, state, estimate)
     print(json.dumps(summary, indent=2, sort_keys=True))
 
 
-def process_records(args: argparse.Namespace) -> int:
+def leased_records(
+    job_queue: JobQueue, worker_id: str, records: list[AudioCatalogueRecord]
+) -> Iterator[tuple[AudioCatalogueRecord, Lease | None]]:
+    """Records this worker claims from the shared queue, until every job is settled."""
+    by_key = {record.file_key: record for record in records}
+    for lease in job_queue.claimed(worker_id):
+        record = by_key.get(lease.file_key)
+        if record is None:
+            job_queue.fail(lease, f"{lease.file_key} is not in this worker's metadata CSV")
+            continue
+        yield record, lease
+
+
+def keep_lease(job_queue: JobQueue | None, lease: Lease | None) -> AbstractContextManager[object]:
+    return job_queue.keep_alive(lease) if job_queue and lease else nullcontext()
+
+
+def settle_job(
+    job_queue: JobQueue | None,
+    lease: Lease | None,
+    record_state: dict[str, Any],
+    entry_row: dict[str, Any] | None = None,
+) -> None:
+    """Commit a record's final state, and its entry row, to the shared queue.
+
+    Queue workers cannot share the DuckDB entry store, so entries travel with the queue results
+    and the worker running the final export stores them.
+    """
+    if job_queue is None or lease is None:
+        return
+    result = {"state": record_state, "entry": entry_row}
+    if record_state.get("status") == "completed":
+        committed = job_queue.complete(lease, result)
+    else:
+        committed = job_queue.fail(lease, str(record_state.get("error")), result)
+    if not committed:
+        print(
+            f"lease on {lease.file_key} passed to another worker; result not committed",
+            file=sys.stderr,
+            flush=True,
+        )
+
+
+def merge_queue_results(state: dict[str, Any], job_queue: JobQueue) -> dict[str, dict[str, Any]]:
+    """Copy every worker's committed record states into `state`; returns their entry rows."""
+    entry_rows: dict[str, dict[str, Any]] = {}
+    for file_key, result in job_queue.results().items():
+        state["records"][file_key] = result["state"]
+        if result.get("entry"):
+            entry_rows[file_key] = result["entry"]
+    return entry_rows
+
+
+def process_records(
+    args: argparse.Namespace, transcribe: RecordTranscriber = transcribe_record
+) -> int:
     records = load_records(args.metadata_csv)
     if args.file_key:
         wanted = {str(file_key) for file_key in args.file_key}
@@ -403,40 +873,121 @@ def process_records(args: argparse.Namespace) -> int:
     state["updated_at"] = utc_now_iso()
     write_json_atomic(state_path, state)
 
+    model_id = transcription_model_id(args)
+    chunking = chunk_options(args)
     if args.status:
-        print_status(records, state)
+        estimate = transcription_estimate(records, state, model_id, args.threads, chunking)
+        print_status(records, state, estimate)
         return 0
 
     if args.verify or args.evaluate:
-        export_outputs(args.db, output_dir, records, state, args.gold_questions, args.metadata_csv)
+        with open_entry_store(args) as store:
+            export_outputs(
+                args.db,
+                output_dir,
+                records,
+                state,
+                args.gold_questions,
+                args.metadata_csv,
+                store,
+                service_socket=args.service_socket,
+            )
         print_status(records, state)
         return 0
 
-    speaker_names_by_file = load_speaker_names(args.db)
+    speaker_names_by_file = load_speaker_names(args.db, args.service_socket)
+    if transcribe is transcribe_record:
+        vad_options = None
+        if args.vad:
+            # Lazy import: NumPy is only needed when --vad is used
+            from disk_catalogue.vad import VadOptions
+
+            vad_options = VadOptions(
+                margin_db=args.vad_margin_db, min_silence_ms=args.vad_min_silence_ms
+            )
+        transcribe = partial(transcribe_record, vad=vad_options, chunking=chunking)
+    cache: MemoCache | None = None
+    cached: CachedTranscriber | None = None
+    if not args.no_memo_cache:
+        cache = MemoCache(
+            args.memo_cache or output_dir / "memo_cache.sqlite",
+            max_bytes=args.memo_cache_max_mb * 1024 * 1024,
+        )
+        transcribe = cached = CachedTranscriber(transcribe, cache, model_id, refresh=args.force)
+    rules = load_rule_set(args.rules) if args.rules else default_rule_set()
     failures = 0
     processed_since_export = 0
-    for index, record in enumerate(records, start=1):
+    # File keys whose rows changed since the last export. Checkpoints before the first full
+    # export of this run rebuild everything, so stale tables from an earlier run are replaced.
+    changed_file_keys: set[str] = set()
+    exported_this_run = False
+    # Queue workers on other hosts cannot share one DuckDB file; their entries travel with the
+    # queue results and the worker running the final export stores them.
+    store = None if args.job_queue else open_entry_store(args)
+    if store is not None and reconcile_with_store(state, store):
+        write_json_atomic(state_path, state)
+    exporter = CoalescingWorker(
+        partial(run_checkpoint_export, args, records, store),
+        merge_checkpoint_exports,
+        name="checkpoint-export",
+        on_error=report_checkpoint_error,
+    )
+    # Same snapshot shape as the drive-scan status file: files/s, bytes/s, and ETA for this run.
+    progress = ProgressTracker("transcribe", total_files=len(records))
+    durations = {record.file_key: record.duration_seconds for record in records}
+    cost_model = fit_cost_model(cost_samples(state["records"], durations))
+    costs = predicted_costs(records, state, cost_model, model_id, args.threads, chunking)
+    queue = records
+    if args.order == "longest-first":
+        # Long tracks start first, so the batch does not end on one straggler.
+        queue = longest_first(records, lambda record: costs.get(record.file_key, 0.0))
+    # remaining_costs[i]: predicted seconds for queue[i:]. Files transcribed this run rescale it
+    # by how far actual times have run from the predictions.
+    remaining_costs = [
+        *accumulate((costs.get(record.file_key, 0.0) for record in reversed(queue)), initial=0.0)
+    ][::-1]
+    predicted_done = actual_done = 0.0
+    # With --job-queue, workers on several machines claim file_keys from one SQLite queue.
+    job_queue: JobQueue | None = None
+    worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    work: Iterator[tuple[AudioCatalogueRecord, Lease | None]] = ((record, None) for record in queue)
+    if args.job_queue:
+        job_queue = JobQueue(args.job_queue, lease_seconds=args.lease_seconds)
+        job_queue.enqueue((record.file_key, costs.get(record.file_key, 0.0)) for record in queue)
+        if args.retry_failed:
+            job_queue.retry_failed()
+        work = leased_records(job_queue, worker_id, records)
+    for index, (record, lease) in enumerate(work, start=1):
         source = Path(record.destination_path)
         record_state = state["records"].get(record.file_key, {})
 
         if not source.exists():
+            progress.skip()
+            progress.errors += 1
+            changed_file_keys.add(record.file_key)
             state["records"][record.file_key] = {
                 **record_state,
                 "status": "failed",
                 "error": f"missing source: {source}",
                 "updated_at": utc_now_iso(),
             }
+            settle_job(job_queue, lease, state["records"][record.file_key])
             failures += 1
             write_json_atomic(state_path, state)
             continue
 
         source_fp = source_fingerprint(source)
         if not args.force and state_is_complete(record_state, source_fp):
+            settle_job(job_queue, lease, record_state)
+            progress.skip()
             continue
         if record_state.get("status") == "failed" and not args.retry_failed and not args.force:
+            settle_job(job_queue, lease, record_state)
+            progress.skip()
             continue
 
         started = time.perf_counter()
+        changed_file_keys.add(record.file_key)
         state["records"][record.file_key] = {
             **record_state,
             "status": "running",
@@ -451,22 +1002,25 @@ def process_records(args: argparse.Namespace) -> int:
         state["updated_at"] = utc_now_iso()
         write_json_atomic(state_path, state)
 
+        entry_row: dict[str, Any] | None = None
         try:
-            transcript_text, transcript_path, srt_path = transcribe_record(
-                record, output_dir, args.model, args.threads
-            )
-            _txt, _srt, semantic_path = transcript_paths(record, output_dir)
+            with keep_lease(job_queue, lease):
+                transcript_text, transcript_path, srt_path = transcribe(
+                    record, output_dir, args.model, args.threads
+                )
+            memo_cache_hit = cached is not None and cached.served_from_cache
             entry = build_semantic_entry(
                 record,
                 transcript_text,
                 transcript_path,
                 srt_path,
                 speaker_names=speaker_names_by_file.get(record.file_key),
+                rules=rules,
             )
-            semantic_path.write_text(
-                json.dumps(semantic_entry_row(entry), indent=2, sort_keys=True),
-                encoding="utf-8",
-            )
+            semantic_path = None
+            if args.semantic_sidecars:
+                _txt, _srt, semantic_path = transcript_paths(record, output_dir)
+                write_json_atomic(semantic_path, semantic_entry_row(entry))
             elapsed = round(time.perf_counter() - started, 3)
             state["records"][record.file_key] = {
                 **state["records"][record.file_key],
@@ -474,15 +1028,30 @@ def process_records(args: argparse.Namespace) -> int:
                 "error": None,
                 "completed_at": utc_now_iso(),
                 "elapsed_seconds": elapsed,
+                "model_id": model_id,
+                "threads": args.threads,
+                "chunking": chunking_id(chunking),
+                "parallel_chunks": track_parallelism(record.duration_seconds, chunking),
+                "memo_cache_hit": memo_cache_hit,
                 "transcript_path": str(transcript_path),
                 "srt_path": str(srt_path) if srt_path else None,
-                "semantic_path": str(semantic_path),
+                "semantic_path": str(semantic_path) if semantic_path else None,
+                "entry_stored": True,
                 "semantic_title": entry.semantic_title,
                 "track_type": entry.track_type,
                 "bible_reference": entry.bible_reference,
                 "metadata_confidence": entry.metadata_confidence,
+                **vad_state(transcript_path),
             }
+            # The entry and its completed state commit together; the JSON state file follows.
+            if store is not None:
+                store.put(entry, state["records"][record.file_key])
+            else:
+                entry_row = semantic_entry_row(entry)
             processed_since_export += 1
+            if not memo_cache_hit:
+                predicted_done += costs.get(record.file_key, 0.0)
+                actual_done += elapsed
             print(
                 f"[{index}/{len(records)}] completed {record.album_folder} / "
                 f"{record.file_name} -> {entry.semantic_title}",
@@ -490,6 +1059,7 @@ def process_records(args: argparse.Namespace) -> int:
             )
         except Exception as exc:
             failures += 1
+            progress.errors += 1
             state["records"][record.file_key] = {
                 **state["records"][record.file_key],
                 "status": "failed",
@@ -503,22 +1073,78 @@ def process_records(args: argparse.Namespace) -> int:
                 flush=True,
             )
 
+        progress.advance(bytes_=source_fp["size"], path=record.file_key)
+        state["progress"] = progress.snapshot()
+        correction = actual_done / predicted_done if predicted_done else 1.0
+        if job_queue is None:
+            eta_seconds = remaining_costs[index] * correction
+        else:
+            settle_job(job_queue, lease, state["records"][record.file_key], entry_row)
+            # Every worker's results, so whichever writes the state file last leaves it whole.
+            merge_queue_results(state, job_queue)
+            # Queue priorities are predicted costs, shared among the workers holding leases.
+            outstanding, active_workers = job_queue.outstanding()
+            eta_seconds = outstanding * correction / max(active_workers, 1)
+        state["estimate"] = {
+            "model_id": model_id,
+            "eta_seconds": round(eta_seconds),
+            "finish_at": (datetime.now(UTC) + timedelta(seconds=eta_seconds)).isoformat(),
+            "correction": round(correction, 3),
+        }
         state["updated_at"] = utc_now_iso()
         write_json_atomic(state_path, state)
 
-        if processed_since_export >= args.checkpoint_interval:
-            export_outputs(
-                args.db,
-                output_dir,
-                records,
-                state,
-                args.gold_questions,
-                args.metadata_csv,
-                run_duplicate_audit=False,
+        # Queue workers leave exports to the last one to finish: DuckDB takes one writer.
+        if job_queue is None and processed_since_export >= args.checkpoint_interval:
+            # The export runs on the worker thread from a snapshot, so transcription carries on.
+            exporter.submit(
+                CheckpointExport(
+                    copy.deepcopy(state), frozenset(changed_file_keys), full=not exported_this_run
+                )
             )
+            exported_this_run = True
+            changed_file_keys.clear()
             processed_since_export = 0
 
-    export_outputs(args.db, output_dir, records, state, args.gold_questions, args.metadata_csv)
+    # The final export supersedes any checkpoint, but must not race one still writing.
+    exporter.close()
+    state["checkpoint_exports"] = {
+        "completed": exporter.completed,
+        "coalesced": exporter.coalesced,
+        "failed": len(exporter.errors),
+    }
+    queued_entries: dict[str, dict[str, Any]] = {}
+    if job_queue is not None:
+        queued_entries = merge_queue_results(state, job_queue)
+        state["job_queue"] = {"worker_id": worker_id, **job_queue.counts()}
+    write_json_atomic(state_path, state)
+    if job_queue is None or job_queue.claim_final_export(worker_id):
+        if store is None:
+            store = open_entry_store(args)
+            store.put_many(
+                (semantic_entry_from_mapping(row), state["records"].get(file_key))
+                for file_key, row in queued_entries.items()
+            )
+        export_outputs(
+            args.db,
+            output_dir,
+            records,
+            state,
+            args.gold_questions,
+            args.metadata_csv,
+            store,
+            service_socket=args.service_socket,
+        )
+    else:
+        print("final export left to the worker that finished last", flush=True)
+    if store is not None:
+        store.close()
+    if job_queue is not None:
+        job_queue.close()
+    if cache is not None:
+        state["memo_cache"] = cache.stats()
+        write_json_atomic(state_path, state)
+        cache.close()
     print_status(records, state)
     return 1 if failures else 0
 
@@ -529,7 +1155,23 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
     parser.add_argument("--db", type=Path, default=DEFAULT_DB)
     parser.add_argument("--model", type=Path, default=DEFAULT_MODEL)
-    parser.add_argument("--gold-questions", type=Path, default=DEFAULT_GOLD)
+    parser.add_argument(
+        "--gold-questions",
+        type=Path,
+        action="append",
+        help=f"Gold-question JSON to evaluate. Repeat for multiple sets. Default: {DEFAULT_GOLD}.",
+    )
+    parser.add_argument(
+        "--rules",
+        type=Path,
+        help="Versioned JSON semantic rule set. Defaults to the built-in heuristic rules.",
+    )
+    parser.add_argument(
+        "--service-socket",
+        type=Path,
+        help="Read and write the catalogue through a running catalogue service socket "
+        "(scripts/catalogue_service.py) instead of opening --db directly.",
+    )
     parser.add_argument("--threads", type=int, default=8)
     parser.add_argument("--limit", type=int)
     parser.add_argument(
@@ -538,7 +1180,67 @@ def build_parser() -> argparse.ArgumentParser:
         help="Process only a specific file_key. Repeat for multiple keys.",
     )
     parser.add_argument("--checkpoint-interval", type=int, default=25)
+    parser.add_argument(
+        "--order",
+        choices=["longest-first", "catalogue"],
+        default="longest-first",
+        help="Transcribe the longest predicted jobs first (default), or in catalogue order.",
+    )
+    parser.add_argument(
+        "--vad",
+        action="store_true",
+        help="Trim silence and music with energy-based voice activity detection before whisper "
+        "(requires NumPy); SRT timings stay on the original track.",
+    )
+    parser.add_argument(
+        "--chunk-seconds",
+        type=float,
+        default=600.0,
+        help="Split tracks longer than 1.25x this into overlapping chunks transcribed in "
+        "parallel (0 disables).",
+    )
+    parser.add_argument("--chunk-overlap-seconds", type=float, default=8.0)
+    parser.add_argument(
+        "--chunk-workers",
+        type=int,
+        default=4,
+        help="Chunks transcribed at once; --threads is shared between them.",
+    )
+    parser.add_argument("--vad-margin-db", type=float, default=12.0)
+    parser.add_argument("--vad-min-silence-ms", type=int, default=600)
+    parser.add_argument(
+        "--memo-cache",
+        type=Path,
+        help="Transcript cache keyed by audio content hash and model, shared across runs and "
+        "output directories. Default: <output-dir>/memo_cache.sqlite.",
+    )
+    parser.add_argument("--memo-cache-max-mb", type=int, default=512)
+    parser.add_argument("--no-memo-cache", action="store_true")
     parser.add_argument("--force", action="store_true")
+    parser.add_argument(
+        "--entry-store",
+        type=Path,
+        help="DuckDB file of semantic entries (default: <output-dir>/semantic_entries.duckdb).",
+    )
+    parser.add_argument(
+        "--semantic-sidecars",
+        action="store_true",
+        help="Also write each entry as a .semantic.json sidecar next to its transcript.",
+    )
+    parser.add_argument(
+        "--job-queue",
+        type=Path,
+        help="SQLite job queue shared by workers on several machines; leases file_keys to each.",
+    )
+    parser.add_argument(
+        "--worker-id", help="Name of this worker in the job queue (default: host-pid)."
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="How long a claimed file stays leased without a heartbeat.",
+    )
     parser.add_argument("--retry-failed", action="store_true", default=True)
     parser.add_argument("--no-retry-failed", action="store_false", dest="retry_failed")
     parser.add_argument("--status", action="store_true")
@@ -550,6 +1252,12 @@ def build_parser() -> argparse.ArgumentParser:
 def main() -> int:
     parser = build_parser()
     args = parser.parse_args()
+    if not args.gold_questions:
+        args.gold_questions = [DEFAULT_GOLD]
+    try:
+        gold_question_set_names(args.gold_questions)
+    except ValueError as exc:
+        parser.error(str(exc))
     return process_records(args)
 
 
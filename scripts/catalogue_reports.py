@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Run named catalogue reports, served from cached summary tables when nothing has changed.
+
+Usage:
+  python scripts/catalogue_reports.py [--db catalogue.duckdb] [--list] [--refresh] [--csv] \
+    [REPORT ...]
+
+Behavior:
+  - With no REPORT names, runs every report whose source tables exist in the catalogue.
+  - A report is recomputed only when `ingested_files` (or `drive_scans` for scan history) has
+    new rows since it was cached, or its SQL has changed; `--refresh` forces a recompute.
+  - `--list` shows each report with its cached row count and refresh time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from scan_summary import print_rows
+
+from disk_catalogue.reports import (
+    CACHE_DDL,
+    CACHE_TABLE,
+    REPORTS,
+    ReportError,
+    available_reports,
+    refresh_reports,
+)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("reports", nargs="*", metavar="REPORT", help=f"One of: {', '.join(REPORTS)}")
+    ap.add_argument("--db", default="catalogue.duckdb", help="DuckDB database path")
+    ap.add_argument("--csv", action="store_true", help="Output as CSV instead of a table")
+    ap.add_argument("--refresh", action="store_true", help="Recompute even if the cache is fresh")
+    ap.add_argument("--list", action="store_true", help="List reports and their cache state")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {args.db}")
+
+    # Lazy import to keep third-party deps out of the top-level import block for isort
+    import duckdb
+
+    con = duckdb.connect(args.db)
+    if args.list:
+        con.execute(CACHE_DDL)
+        cached = {
+            row[0]: row[1:]
+            for row in con.execute(
+                f"SELECT report_name, row_count, refreshed_at FROM {CACHE_TABLE}"
+            ).fetchall()
+        }
+        available = {report.name for report in available_reports(con)}
+        rows = [
+            (
+                report.name,
+                report.title,
+                "yes" if report.name in available else "no",
+                *cached.get(report.name, (None, None)),
+            )
+            for report in REPORTS.values()
+        ]
+        print_rows(["report", "title", "available", "rows", "refreshed_at"], rows, args.csv)
+        return
+
+    try:
+        results = refresh_reports(con, args.reports, force=args.refresh)
+    except ReportError as err:
+        raise SystemExit(str(err)) from err
+    for index, result in enumerate(results):
+        if not args.csv:
+            if index:
+                print()
+            source = "cached" if result.cached else "refreshed"
+            stamp = f"{result.refreshed_at:%Y-%m-%d %H:%M}"
+            print(f"## {REPORTS[result.name].title} ({source} {stamp})")
+        print_rows(result.columns, result.rows, args.csv)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
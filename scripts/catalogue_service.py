@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Run the single-writer catalogue service for a DuckDB database.
+
+Usage:
+  python scripts/catalogue_service.py [--db catalogue.duckdb] [--socket catalogue.duckdb.sock]
+
+The service owns the only read-write connection to the database. Scripts started with
+`--service-socket` (`catalogue_following_jesus_semantic.py`, `scan_and_ingest.py`,
+`load_csvs.py`, `plan_following_jesus_rename.py`) queue their writes and run their reads through
+it, so a long transcription run and an ingest can share the catalogue without DuckDB file-lock
+failures. Stop it with Ctrl-C or
+SIGTERM.
+"""
+
+from __future__ import annotations
+
+import argparse
+import signal
+import sys
+from pathlib import Path
+
+from disk_catalogue.catalogue_service import CatalogueService
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--db", type=Path, default=Path("catalogue.duckdb"))
+    parser.add_argument(
+        "--socket",
+        type=Path,
+        help="Unix socket path. Defaults to the database path with a .sock suffix.",
+    )
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    socket_path = args.socket or args.db.with_name(f"{args.db.name}.sock")
+    service = CatalogueService(args.db, socket_path)
+    signal.signal(signal.SIGTERM, lambda _signum, _frame: sys.exit(0))
+    print(f"catalogue service for {args.db} listening on {socket_path}", flush=True)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    raise SystemExit(main())
@@ -12,11 +12,15 @@ fi
 LIST_FILE="$1"
 DRIVE_ID="$2"
 OUT_DIR="${3:-output}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 DATE_STR="$(date +%Y%m%d)"
 mkdir -p "$OUT_DIR"
 
 set +e
-exiftool -csv -fast3 -m \
+# -progress prints "======== FILE [n/total]" for each file; split_exiftool_progress.awk moves
+# those lines to stderr for scan_and_ingest.py, keeping the CSV clean. -q is not passed: ExifTool
+# documents that -progress implies -v0 unless -q is also used.
+exiftool -csv -fast3 -m -progress \
   -ext arw -ext arq -ext srx -ext sr2 -ext cr2 -ext raf -ext nef -ext dng \
   -ext jpg -ext jpeg -ext tiff -ext tif -ext png -ext heic -ext heif \
   -FileName -Directory -FilePath -FileSize# -MIMEType \
@@ -26,8 +30,9 @@ exiftool -csv -fast3 -m \
   -GPSLatitude -GPSLongitude \
   -Rating -Label -XMP-dc:Title -Keywords -HierarchicalSubject \
   -SourceFile \
-  -@ "$LIST_FILE" > "$OUT_DIR/photos_${DRIVE_ID}_${DATE_STR}.csv"
-code=$?
+  -@ "$LIST_FILE" \
+  | awk -f "$SCRIPT_DIR/split_exiftool_progress.awk" > "$OUT_DIR/photos_${DRIVE_ID}_${DATE_STR}.csv"
+code=${PIPESTATUS[0]}
 set -e
 if [ "$code" -gt 1 ]; then
   echo "[photos-from-list] ExifTool failed with exit code $code" >&2
@@ -12,19 +12,24 @@ fi
 LIST_FILE="$1"
 DRIVE_ID="$2"
 OUT_DIR="${3:-output}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 DATE_STR="$(date +%Y%m%d)"
 mkdir -p "$OUT_DIR"
 
 set +e
-exiftool -csv -fast3 -m \
+# -progress prints "======== FILE [n/total]" for each file; split_exiftool_progress.awk moves
+# those lines to stderr for scan_and_ingest.py, keeping the CSV clean. -q is not passed: ExifTool
+# documents that -progress implies -v0 unless -q is also used.
+exiftool -csv -fast3 -m -progress \
   -ext mp4 -ext mov -ext mxf -ext avi -ext mpg -ext mpeg -ext mts -ext mkv \
   -FileName -Directory -FilePath -FileSize# -MIMEType \
   -Duration -TrackCreateDate -MediaCreateDate -CreateDate \
   -HandlerDescription -CompressorName -VideoCodec -VideoFrameRate -VideoFrameCount \
   -ImageWidth -ImageHeight -AudioFormat -AudioChannels -AudioSampleRate -BitRate \
   -SourceFile \
-  -@ "$LIST_FILE" > "$OUT_DIR/videos_${DRIVE_ID}_${DATE_STR}.csv"
-code=$?
+  -@ "$LIST_FILE" \
+  | awk -f "$SCRIPT_DIR/split_exiftool_progress.awk" > "$OUT_DIR/videos_${DRIVE_ID}_${DATE_STR}.csv"
+code=${PIPESTATUS[0]}
 set -e
 if [ "$code" -gt 1 ]; then
   echo "[videos-from-list] ExifTool failed with exit code $code" >&2
@@ -12,6 +12,7 @@ fi
 DRIVE_PATH="$1"
 DRIVE_ID="$2"
 OUT_DIR="${3:-output}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 DATE_STR="$(date +%Y%m%d)"
 mkdir -p "$OUT_DIR"
 
@@ -21,12 +22,16 @@ set +e
 # Exclude AppleDouble and common system/hidden files and dirs (NTFS/macOS noise)
 # - Skip files starting with ._ (AppleDouble), .DS_Store, Thumbs.db, desktop.ini
 # - Skip well-known system directories on external volumes
-exiftool -r -csv -fast3 -m -q -q \
+# -progress prints "======== FILE [n/total]" for each file; split_exiftool_progress.awk moves
+# those lines to stderr for scan_and_ingest.py, keeping the CSV clean. -q is not passed: ExifTool
+# documents that -progress implies -v0 unless -q is also used.
+exiftool -r -csv -fast3 -m -progress \
   -FileName -Directory -FilePath -FileSize# -MIMEType -FileType \
   -FileInode -FileModifyDate -FileCreateDate \
   -CreateDate -ModifyDate -SourceFile \
-  "$DRIVE_PATH" > "$OUT_DIR/files_${DRIVE_ID}_${DATE_STR}.csv"
-code=$?
+  "$DRIVE_PATH" \
+  | awk -f "$SCRIPT_DIR/split_exiftool_progress.awk" > "$OUT_DIR/files_${DRIVE_ID}_${DATE_STR}.csv"
+code=${PIPESTATUS[0]}
 set -e
 if [ "$code" -gt 1 ]; then
   echo "[files] ExifTool failed with exit code $code" >&2
@@ -12,12 +12,16 @@ fi
 DRIVE_PATH="$1"
 DRIVE_ID="$2"
 OUT_DIR="${3:-output}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 DATE_STR="$(date +%Y%m%d)"
 mkdir -p "$OUT_DIR"
 
 # ExifTool fast recursive photo metadata export
 set +e
-exiftool -r -csv -fast3 -m -q -q \
+# -progress prints "======== FILE [n/total]" for each file; split_exiftool_progress.awk moves
+# those lines to stderr for scan_and_ingest.py, keeping the CSV clean. -q is not passed: ExifTool
+# documents that -progress implies -v0 unless -q is also used.
+exiftool -r -csv -fast3 -m -progress \
   -ext arw -ext arq -ext srx -ext sr2 -ext cr2 -ext raf -ext nef -ext dng \
   -ext jpg -ext jpeg -ext tiff -ext tif -ext png -ext heic -ext heif \
   -FileName -Directory -FilePath -FileSize# -MIMEType \
@@ -28,8 +32,9 @@ exiftool -r -csv -fast3 -m -q -q \
   -GPSLatitude -GPSLongitude \
   -Rating -Label -XMP-dc:Title -Keywords -HierarchicalSubject \
   -SourceFile \
-  "$DRIVE_PATH" > "$OUT_DIR/photos_${DRIVE_ID}_${DATE_STR}.csv"
-code=$?
+  "$DRIVE_PATH" \
+  | awk -f "$SCRIPT_DIR/split_exiftool_progress.awk" > "$OUT_DIR/photos_${DRIVE_ID}_${DATE_STR}.csv"
+code=${PIPESTATUS[0]}
 set -e
 if [ "$code" -gt 1 ]; then
   echo "[photos] ExifTool failed with exit code $code" >&2
@@ -12,12 +12,16 @@ fi
 DRIVE_PATH="$1"
 DRIVE_ID="$2"
 OUT_DIR="${3:-output}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
 DATE_STR="$(date +%Y%m%d)"
 mkdir -p "$OUT_DIR"
 
 # Video metadata export (core technical + container usage)
 set +e
-exiftool -r -csv -fast3 -m -q -q \
+# -progress prints "======== FILE [n/total]" for each file; split_exiftool_progress.awk moves
+# those lines to stderr for scan_and_ingest.py, keeping the CSV clean. -q is not passed: ExifTool
+# documents that -progress implies -v0 unless -q is also used.
+exiftool -r -csv -fast3 -m -progress \
   -ext mp4 -ext mov -ext mxf -ext avi -ext mpg -ext mpeg -ext mts -ext mkv \
   -FileName -Directory -FilePath -FileSize# -MIMEType \
   -FileInode -FileModifyDate -FileCreateDate \
@@ -25,8 +29,9 @@ exiftool -r -csv -fast3 -m -q -q \
   -HandlerDescription -CompressorName -VideoCodec -VideoFrameRate -VideoFrameCount \
   -ImageWidth -ImageHeight -AudioFormat -AudioChannels -AudioSampleRate -BitRate \
   -SourceFile \
-  "$DRIVE_PATH" > "$OUT_DIR/videos_${DRIVE_ID}_${DATE_STR}.csv"
-code=$?
+  "$DRIVE_PATH" \
+  | awk -f "$SCRIPT_DIR/split_exiftool_progress.awk" > "$OUT_DIR/videos_${DRIVE_ID}_${DATE_STR}.csv"
+code=${PIPESTATUS[0]}
 set -e
 if [ "$code" -gt 1 ]; then
   echo "[videos] ExifTool failed with exit code $code" >&2
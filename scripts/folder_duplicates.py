@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""Find folder trees that were copied between drives, whole or in part.
+
+Usage:
+  python scripts/folder_duplicates.py [--db catalogue.duckdb] [--threshold 0.9] \
+    [--min-files 5] [--sketch-size 128] [--same-drive] [--limit 50] [--csv]
+
+Behavior:
+  - Streams `files` once in (Drive, RelativePath) order and builds a Merkle digest and a
+    MinHash sketch per directory; nothing is stored in the catalogue.
+  - Reports each copied tree once, at the top of the copy, as "X is an exact copy of Y" or
+    "X is a 97% copy of Y" (the share of X's files, by name and size, found in Y).
+  - Matches compare names and sizes only; verify with checksums before deleting anything.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+
+from scan_summary import print_rows
+
+from disk_catalogue.folder_digests import (
+    DEFAULT_SKETCH_SIZE,
+    MATCH_COLUMNS,
+    catalogue_rows,
+    directory_digests,
+    find_folder_matches,
+)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--db", default="catalogue.duckdb", help="DuckDB database path")
+    ap.add_argument(
+        "--threshold",
+        type=float,
+        default=0.9,
+        help="Minimum share of one folder found in the other (0-1)",
+    )
+    ap.add_argument("--min-files", type=int, default=5, help="Ignore folders with fewer files")
+    ap.add_argument(
+        "--sketch-size",
+        type=int,
+        default=DEFAULT_SKETCH_SIZE,
+        help="MinHash values kept per folder; larger is more precise and slower",
+    )
+    ap.add_argument(
+        "--same-drive", action="store_true", help="Also report copies within a single drive"
+    )
+    ap.add_argument("--limit", type=int, default=50, help="Maximum matches to show (0 for all)")
+    ap.add_argument("--csv", action="store_true", help="Output as CSV instead of sentences")
+    args = ap.parse_args()
+
+    if not os.path.exists(args.db):
+        raise SystemExit(f"Database not found: {args.db}")
+
+    # Lazy import to keep third-party deps out of the top-level import block for isort
+    import duckdb
+
+    con = duckdb.connect(args.db, read_only=True)
+    directories = directory_digests(
+        catalogue_rows(con), sketch_size=args.sketch_size, min_files=args.min_files
+    )
+    matches = find_folder_matches(
+        directories,
+        threshold=args.threshold,
+        sketch_size=args.sketch_size,
+        same_drive=args.same_drive,
+    )
+    if args.limit:
+        matches = matches[: args.limit]
+    if args.csv:
+        print_rows(MATCH_COLUMNS, [match.row() for match in matches], True)
+        return
+    if not matches:
+        print("No copied folders found.")
+    for match in matches:
+        copy, source = match.copy_and_source
+        print(f"{match.describe()} ({copy.files} vs {source.files} files)")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -75,6 +75,11 @@ KNOWN_COLUMN_DESCRIPTIONS: dict[str, str] = {
     "AudioChannels": "Audio channel count (videos).",
     "AudioSampleRate": "Audio sample rate (videos).",
     "BitRate": "Overall bit rate (videos).",
+    # file_identity_groups
+    "name_key": "NFC-normalised, lowercased FileName used to group candidate duplicates.",
+    "n_files": "Distinct (drive, path) members in the group.",
+    "n_drives": "Distinct drives the group's members are on.",
+    "members": "List of {drive, path} structs for every file in the group.",
 }
 
 
@@ -91,6 +96,9 @@ OBJECT_PURPOSE: dict[str, str] = {
     "ingested_files": "Ingestion log of CSVs already loaded (idempotency).",
     "drives": "Drive metadata snapshot from manifest (label, mounts, ids, notes).",
     "drive_scans": "History of scan runs per drive (start/end, status, CSVs, row counts).",
+    "file_identity_groups": (
+        "Duplicate index: files grouped by size + normalised name, with drives and members."
+    ),
 }
 
 
@@ -2,13 +2,17 @@
 """Load latest scan CSVs into DuckDB tables.
 
 Usage:
-  python scripts/load_csvs.py [--db catalogue.duckdb] [--dir output]
+  python scripts/load_csvs.py [--db catalogue.duckdb] [--dir output] [--service-socket PATH]
 
 Behavior:
   - Loads all matching CSVs (photos_*.csv, videos_*.csv) incrementally.
   - Creates target tables on first ingest using the CSV schema.
   - If schemas drift, adds missing columns and aligns on insert.
   - Skips files already recorded in an ingestion log table.
+  - Merges each new files CSV into `file_identity_groups` (size + normalised name duplicate
+    index), backfilling it from `files_raw` on first use.
+  - With --service-socket, each CSV is ingested as one write batch through the catalogue
+    service (scripts/catalogue_service.py) instead of opening the database file.
 """
 
 from __future__ import annotations
@@ -18,6 +22,15 @@ from pathlib import Path
 
 import duckdb
 
+from disk_catalogue.catalogue_service import CatalogueClient, Statement
+from disk_catalogue.identity_groups import (
+    IDENTITY_TABLE,
+    ensure_identity_groups,
+    ensure_identity_sql,
+    update_identity_groups,
+    update_identity_sql,
+)
+
 PHOTO_PREFIX = "photos_"
 VIDEO_PREFIX = "videos_"
 FILE_PREFIX = "files_"
@@ -79,50 +92,63 @@ def qident(name: str) -> str:
     return '"' + name.replace('"', '""') + '"'
 
 
-def ingest_file(con: duckdb.DuckDBPyConnection, path: Path, table: str) -> None:
+def staging_view_sql(path: Path) -> str:
     # Read CSV (auto-detected) with explicit quoting to handle commas in paths
-    rel = con.from_csv_auto(
-        str(path),
-        header=True,
-        quotechar='"',
+    literal = str(path).replace("'", "''")
+    return (
+        "CREATE OR REPLACE TEMP VIEW _staging_ingest AS "
+        f"SELECT * FROM read_csv_auto('{literal}', header = true, quote = '\"')"
     )
-    rel.create_view("_staging_ingest", replace=True)
 
+
+def csv_columns(path: Path) -> list[tuple[str, str]]:
+    """Column names and types DuckDB detects for a scan CSV, without opening the catalogue."""
+    con = duckdb.connect()
     try:
-        if not table_exists(con, table):
-            # Create target table with the same schema as the CSV (empty table)
-            con.execute(f"CREATE TABLE {table} AS SELECT * FROM _staging_ingest WHERE FALSE")
-        else:
-            # Align schemas if needed
-            tgt_cols = get_table_columns(con, table)
-            stg_cols = get_view_columns(con, "_staging_ingest")
-            tgt_names = [n for n, _ in tgt_cols]
-            stg_dict = dict(stg_cols)
-
-            # Add any missing columns from staging to target (using staging type)
-            for name, typ in stg_cols:
-                if name not in tgt_names:
-                    con.execute(f"ALTER TABLE {table} ADD COLUMN {qident(name)} {typ}")
-            # Refresh target columns after ALTERs
-            tgt_cols = get_table_columns(con, table)
-            tgt_names = [n for n, _ in tgt_cols]
-
-            # Build aligned select list over staging
-            select_exprs: list[str] = []
-            for name, typ in tgt_cols:
-                if name in stg_dict:
-                    select_exprs.append(qident(name))
-                else:
-                    select_exprs.append(f"NULL::{typ} AS {qident(name)}")
-
-            select_sql = ", ".join(select_exprs)
-            con.execute(f"INSERT INTO {table} SELECT {select_sql} FROM _staging_ingest")
-            con.execute("DROP VIEW _staging_ingest")
-            con.execute("INSERT INTO ingested_files(file_path) VALUES (?)", [str(path)])
-            return
+        con.execute(staging_view_sql(path))
+        return get_view_columns(con, "_staging_ingest")
+    finally:
+        con.close()
+
+
+def load_sql(
+    table: str, tgt_cols: list[tuple[str, str]] | None, stg_cols: list[tuple[str, str]]
+) -> list[str]:
+    """Statements copying `_staging_ingest` into `table`, whose columns are `tgt_cols`."""
+    if tgt_cols is None:
+        # Create target table with the same schema as the CSV, then insert all columns
+        return [
+            f"CREATE TABLE {table} AS SELECT * FROM _staging_ingest WHERE FALSE",
+            f"INSERT INTO {table} SELECT * FROM _staging_ingest",
+        ]
+    # Align schemas if needed: add any missing columns from staging to target (using staging
+    # type), then select the target's columns from staging, NULL where staging lacks one.
+    tgt_names = {n for n, _ in tgt_cols}
+    added = [(name, typ) for name, typ in stg_cols if name not in tgt_names]
+    stg_names = {n for n, _ in stg_cols}
+    select_exprs = [
+        qident(name) if name in stg_names else f"NULL::{typ} AS {qident(name)}"
+        for name, typ in [*tgt_cols, *added]
+    ]
+    return [
+        *(f"ALTER TABLE {table} ADD COLUMN {qident(name)} {typ}" for name, typ in added),
+        f"INSERT INTO {table} SELECT {', '.join(select_exprs)} FROM _staging_ingest",
+    ]
+
 
-        # Fresh table path: insert all columns directly
-        con.execute(f"INSERT INTO {table} SELECT * FROM _staging_ingest")
+def ingest_file(con: duckdb.DuckDBPyConnection, path: Path, table: str) -> None:
+    con.execute(staging_view_sql(path))
+
+    try:
+        if table == FILE_TABLE:
+            # Backfill the duplicate index from rows ingested before it existed
+            ensure_identity_groups(con, FILE_TABLE)
+        tgt_cols = get_table_columns(con, table) if table_exists(con, table) else None
+        for sql in load_sql(table, tgt_cols, get_view_columns(con, "_staging_ingest")):
+            con.execute(sql)
+
+        if table == FILE_TABLE:
+            update_identity_groups(con, "_staging_ingest")
         con.execute("DROP VIEW _staging_ingest")
         con.execute("INSERT INTO ingested_files(file_path) VALUES (?)", [str(path)])
     except Exception:
@@ -134,88 +160,111 @@ def ingest_file(con: duckdb.DuckDBPyConnection, path: Path, table: str) -> None:
         raise
 
 
+def ingest_statements(client: CatalogueClient, path: Path, table: str) -> list[Statement]:
+    """`ingest_file` as one write batch for the catalogue service.
+
+    The CSV is read by the service process, so its path is made absolute. A failed batch is
+    rolled back whole, staging view included.
+    """
+    tgt_cols = None
+    if client.relation_exists(table):
+        tgt_cols = [(r[1], r[2]) for r in client.query(f"PRAGMA table_info('{table}')")]
+    sql = [
+        staging_view_sql(path.resolve()),
+        *load_sql(table, tgt_cols, csv_columns(path)),
+        *(update_identity_sql("_staging_ingest") if table == FILE_TABLE else []),
+        "DROP VIEW _staging_ingest",
+    ]
+    return [
+        *((statement, []) for statement in sql),
+        ("INSERT INTO ingested_files(file_path) VALUES (?)", [str(path)]),
+    ]
+
+
+DERIVED_VIEW_SQL = r"""
+    CREATE OR REPLACE VIEW {view} AS
+    SELECT
+      *,
+      regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1) AS Drive,
+      regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', '') AS RelativePath,
+      regexp_extract("Directory", '/host/Volumes/[^/]+/(.*)$', 1) AS RelativeDirectory,
+      lower(regexp_extract("FileName", '\\.([^.]+)$', 1)) AS FileExt,
+      hash(
+        regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1),
+        regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', ''),
+        CAST("FileSize#" AS BIGINT)
+      ) AS FileKey
+    FROM {table};
+    """
+# Convenient views with derived identifiers and drive/path parsing
+DERIVED_VIEWS = [
+    DERIVED_VIEW_SQL.format(view="files", table=FILE_TABLE),
+    DERIVED_VIEW_SQL.format(view="photos", table=PHOTO_TABLE),
+    DERIVED_VIEW_SQL.format(view="videos", table=VIDEO_TABLE),
+]
+
+
 def ensure_derived_views(con: duckdb.DuckDBPyConnection) -> None:
-    # Create convenient views with derived identifiers and drive/path parsing
-    con.execute(r"""
-        CREATE OR REPLACE VIEW files AS
-        SELECT
-          *,
-          regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1) AS Drive,
-          regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', '') AS RelativePath,
-          regexp_extract("Directory", '/host/Volumes/[^/]+/(.*)$', 1) AS RelativeDirectory,
-          lower(regexp_extract("FileName", '\\.([^.]+)$', 1)) AS FileExt,
-          hash(
-            regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1),
-            regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', ''),
-            CAST("FileSize#" AS BIGINT)
-          ) AS FileKey
-        FROM files_raw;
-        """)
-    con.execute(r"""
-        CREATE OR REPLACE VIEW photos AS
-        SELECT
-          *,
-          regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1) AS Drive,
-          regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', '') AS RelativePath,
-          regexp_extract("Directory", '/host/Volumes/[^/]+/(.*)$', 1) AS RelativeDirectory,
-          lower(regexp_extract("FileName", '\\.([^.]+)$', 1)) AS FileExt,
-          hash(
-            regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1),
-            regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', ''),
-            CAST("FileSize#" AS BIGINT)
-          ) AS FileKey
-        FROM photos_raw;
-        """)
-    con.execute(r"""
-        CREATE OR REPLACE VIEW videos AS
-        SELECT
-          *,
-          regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1) AS Drive,
-          regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', '') AS RelativePath,
-          regexp_extract("Directory", '/host/Volumes/[^/]+/(.*)$', 1) AS RelativeDirectory,
-          lower(regexp_extract("FileName", '\\.([^.]+)$', 1)) AS FileExt,
-          hash(
-            regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1),
-            regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', ''),
-            CAST("FileSize#" AS BIGINT)
-          ) AS FileKey
-        FROM videos_raw;
-        """)
+    for sql in DERIVED_VIEWS:
+        con.execute(sql)
+
+
+def pending_targets(directory: Path, ingested: set[str]) -> list[tuple[Path, str]]:
+    """CSVs not yet in the ingestion log, photos first, then videos, then files."""
+    return [
+        (path, table)
+        for prefix, table in (
+            (PHOTO_PREFIX, PHOTO_TABLE),
+            (VIDEO_PREFIX, VIDEO_TABLE),
+            (FILE_PREFIX, FILE_TABLE),
+        )
+        for path in list_targets(directory, prefix)
+        if str(path) not in ingested
+    ]
+
+
+def ingest_via_service(socket_path: Path, out_dir: Path) -> int:
+    with CatalogueClient(socket_path) as client:
+        setup: list[Statement] = [(LOG_SCHEMA, [])]
+        if not client.relation_exists(IDENTITY_TABLE):
+            setup.append((ensure_identity_sql(FILE_TABLE, client.relation_exists(FILE_TABLE)), []))
+        client.execute_batch(setup)
+        ingested = {str(row[0]) for row in client.query(f"SELECT file_path FROM {LOG_TABLE}")}
+        targets = pending_targets(out_dir, ingested)
+        for path, table in targets:
+            client.execute_batch(ingest_statements(client, path, table))
+        client.execute_batch([(sql, []) for sql in DERIVED_VIEWS])
+    return len(targets)
 
 
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--db", default="catalogue.duckdb", help="DuckDB database path")
     ap.add_argument("--dir", default="output", help="Directory containing CSV scan files")
+    ap.add_argument(
+        "--service-socket",
+        type=Path,
+        help="Ingest through the catalogue service on this Unix socket instead of --db",
+    )
     args = ap.parse_args()
 
     out_dir = Path(args.dir)
     if not out_dir.exists():
         raise SystemExit(f"Output directory not found: {out_dir}")
 
+    if args.service_socket:
+        added = ingest_via_service(args.service_socket, out_dir)
+        print(f"Ingestion complete. New files ingested: {added}")
+        return
+
     con = duckdb.connect(args.db)
     ensure_schema(con)
+    ensure_identity_groups(con, FILE_TABLE)
     ingested = already_ingested(con)
 
-    photo_files = list_targets(out_dir, PHOTO_PREFIX)
-    video_files = list_targets(out_dir, VIDEO_PREFIX)
-    file_files = list_targets(out_dir, FILE_PREFIX)
-
     added = 0
-    for path in photo_files:
-        if str(path) in ingested:
-            continue
-        ingest_file(con, path, PHOTO_TABLE)
-        added += 1
-    for path in video_files:
-        if str(path) in ingested:
-            continue
-        ingest_file(con, path, VIDEO_TABLE)
-        added += 1
-    for path in file_files:
-        if str(path) in ingested:
-            continue
-        ingest_file(con, path, FILE_TABLE)
+    for path, table in pending_targets(out_dir, ingested):
+        ingest_file(con, path, table)
         added += 1
 
     # Create/refresh derived views for convenience and stable identifiers
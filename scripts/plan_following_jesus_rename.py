@@ -8,88 +8,105 @@ The command reads `audio_semantic_catalogue` and `audio_semantic_source_metadata
 - album and track catalogue CSVs
 - a readable Markdown catalogue
 
-By default it does not modify the files on the external SSD.
+By default it does not modify the files on the external SSD. With `--service-socket`, the
+catalogue is read and the plan table written through the catalogue service
+(`scripts/catalogue_service.py`) instead of opening `catalogue.duckdb`.
 """
 
 from __future__ import annotations
 
 import argparse
+from contextlib import ExitStack
 from pathlib import Path
-from typing import Any
 
 import duckdb
 
+from disk_catalogue.catalogue_service import CatalogueClient, write_catalogue
 from disk_catalogue.following_jesus_rename import (
     DEFAULT_ALBUM_CATALOGUE_PATH,
     DEFAULT_MARKDOWN_CATALOGUE_PATH,
     DEFAULT_PLAN_PATH,
+    DEFAULT_RENAME_DIR,
     DEFAULT_TARGET_ROOT,
     DEFAULT_TRACK_CATALOGUE_PATH,
-    RenameEntry,
     album_catalogue_rows,
-    build_rename_entry,
-    ensure_unique_targets,
+    following_jesus_rename_rules,
     track_catalogue_rows,
     write_dict_csv,
     write_markdown_catalogue,
+)
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.rename_planner import (
+    RenameEntry,
+    RenameRules,
+    load_rename_rules,
+    plan_from_duckdb,
     write_plan,
 )
-
-
-def load_rows(db_path: Path) -> list[dict[str, Any]]:
-    con = duckdb.connect(str(db_path), read_only=True)
-    try:
-        rows = con.execute("""
-            select
-              m.file_key,
-              m.destination_path as source_path,
-              m.album_folder as source_album_folder,
-              m.file_name as source_file_name,
-              m.title as embedded_title,
-              c.semantic_title,
-              c.track_type,
-              c.bible_reference,
-              cast(m.disc_index as integer) as disc_index,
-              cast(m.track_index as integer) as track_index,
-              try_cast(m.duration_seconds as double) as duration_seconds,
-              try_cast(m.size_bytes_actual as bigint) as size_bytes
-            from audio_semantic_source_metadata m
-            join audio_semantic_catalogue c using (file_key)
-            order by m.album_folder, disc_index, track_index, m.file_name
-            """).fetchall()
-        columns = [item[0] for item in con.description]
-    finally:
-        con.close()
-    return [dict(zip(columns, row, strict=True)) for row in rows]
+from disk_catalogue.semantic_tables import TableSchema, with_row_columns, write_table
+
+SOURCE_SQL = """
+select
+  m.file_key,
+  m.destination_path as source_path,
+  m.album_folder as source_album_folder,
+  m.file_name as source_file_name,
+  m.title as embedded_title,
+  c.semantic_title,
+  c.track_type,
+  c.bible_reference,
+  cast(m.disc_index as integer) as disc_index,
+  cast(m.track_index as integer) as track_index,
+  try_cast(m.duration_seconds as double) as duration_seconds,
+  try_cast(m.size_bytes_actual as bigint) as size_bytes
+from audio_semantic_source_metadata m
+join audio_semantic_catalogue c using (file_key)
+"""
 
 
 def build_entries(
-    rows: list[dict[str, Any]],
+    db_path: Path,
     target_root: Path,
+    rules: RenameRules,
     include_hash: bool,
+    hash_cache: MemoCache | None = None,
+    service_socket: Path | None = None,
 ) -> list[RenameEntry]:
-    entries = [build_rename_entry(row, target_root, include_hash=include_hash) for row in rows]
-    ensure_unique_targets(entries)
-    return sorted(
-        entries,
-        key=lambda item: (item.module_sort, item.disc_index, item.track_index, item.file_key),
-    )
-
-
-def write_rename_table(db_path: Path, plan_path: Path) -> None:
-    con = duckdb.connect(str(db_path))
+    if service_socket is None:
+        con = duckdb.connect(str(db_path), read_only=True)
+        source_sql = SOURCE_SQL
+    else:
+        # The service holds the file lock, so plan from a local copy of the source rows.
+        with CatalogueClient(service_socket) as client:
+            rows = client.query_dicts(SOURCE_SQL)
+        if not rows:
+            return []
+        con = duckdb.connect()
+        write_table(con, with_row_columns(TableSchema("rename_source_rows", ()), rows), rows)
+        source_sql = "SELECT * FROM rename_source_rows"
     try:
-        con.execute(
-            """
-            create or replace table audio_semantic_rename_plan as
-            select * from read_csv_auto(?)
-            """,
-            [str(plan_path)],
-        )
+        return list(plan_from_duckdb(con, source_sql, target_root, rules, include_hash, hash_cache))
     finally:
         con.close()
 
 
+def write_rename_table(db_path: Path, plan_path: Path, service_socket: Path | None = None) -> None:
+    write_catalogue(
+        db_path,
+        [
+            (
+                """
+                create or replace table audio_semantic_rename_plan as
+                select * from read_csv_auto(?)
+                """,
+                # The service may run from another directory.
+                [str(plan_path.resolve())],
+            )
+        ],
+        service_socket,
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--db", type=Path, default=Path("catalogue.duckdb"))
@@ -103,23 +120,46 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Store source SHA-256 hashes in the plan for later validation.",
     )
+    parser.add_argument(
+        "--hash-cache",
+        type=Path,
+        default=DEFAULT_RENAME_DIR / "following_jesus_hash_cache.sqlite",
+        help="Reuse SHA-256 hashes of files whose size and modification time are unchanged.",
+    )
+    parser.add_argument(
+        "--rules",
+        type=Path,
+        default=None,
+        help="Versioned JSON rename rule set. Defaults to the Following Jesus module mapping.",
+    )
     parser.add_argument(
         "--no-db-table",
         action="store_true",
         help="Do not replace the audio_semantic_rename_plan table in catalogue.duckdb.",
     )
+    parser.add_argument(
+        "--service-socket",
+        type=Path,
+        default=None,
+        help="Use the catalogue service on this Unix socket instead of opening --db.",
+    )
     return parser
 
 
 def main() -> int:
     args = build_parser().parse_args()
-    entries = build_entries(load_rows(args.db), args.target_root, include_hash=args.hash)
+    rules = load_rename_rules(args.rules) if args.rules else following_jesus_rename_rules()
+    with ExitStack() as stack:
+        cache = stack.enter_context(MemoCache(args.hash_cache)) if args.hash else None
+        entries = build_entries(
+            args.db, args.target_root, rules, args.hash, cache, args.service_socket
+        )
     write_plan(args.plan, entries)
     write_dict_csv(args.track_catalogue, track_catalogue_rows(entries))
     write_dict_csv(args.album_catalogue, album_catalogue_rows(entries))
     write_markdown_catalogue(args.markdown_catalogue, entries)
     if not args.no_db_table:
-        write_rename_table(args.db, args.plan)
+        write_rename_table(args.db, args.plan, args.service_socket)
     print(
         f"planned {len(entries)} renames under {args.target_root}\n"
         f"plan: {args.plan}\n"
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Generate a rename plan for any audio library from a rule set and a DuckDB query.
+
+The query supplies one row per file with at least `file_key`, `source_path`,
+`source_album_folder`, and `source_file_name`, plus the title fields named by the rules (for
+example `embedded_title`) and, optionally, `disc_index`, `track_index`, `duration_seconds`, and
+`size_bytes`. It can read a table in `--db` or a CSV through `read_csv_auto(...)`.
+
+The plan is streamed to a CSV in the format `scripts/rename_following_jesus_files.py` applies
+and `scripts/validate_following_jesus_rename.py` checks. Nothing is moved.
+"""
+
+from __future__ import annotations
+
+import argparse
+from contextlib import ExitStack
+from pathlib import Path
+
+import duckdb
+
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.rename_planner import (
+    DEFAULT_BATCH_SIZE,
+    load_rename_rules,
+    plan_from_duckdb,
+    write_plan,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rules", type=Path, required=True, help="Versioned JSON rename rules.")
+    parser.add_argument("--query", required=True, help="SELECT returning one row per file.")
+    parser.add_argument("--db", type=Path, default=None, help="DuckDB file the query reads.")
+    parser.add_argument("--target-root", type=Path, required=True)
+    parser.add_argument("--plan", type=Path, required=True)
+    parser.add_argument(
+        "--hash",
+        action="store_true",
+        help="Store source SHA-256 hashes in the plan for later validation.",
+    )
+    parser.add_argument("--hash-cache", type=Path, default=None)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    rules = load_rename_rules(args.rules)
+    con = duckdb.connect(str(args.db) if args.db else ":memory:", read_only=args.db is not None)
+    with ExitStack() as stack:
+        stack.callback(con.close)
+        cache = None
+        if args.hash and args.hash_cache:
+            cache = stack.enter_context(MemoCache(args.hash_cache))
+        entries = plan_from_duckdb(
+            con,
+            args.query,
+            args.target_root,
+            rules,
+            include_hash=args.hash,
+            hash_cache=cache,
+            batch_size=args.batch_size,
+        )
+        count = write_plan(args.plan, entries)
+    print(f"planned {count} renames under {args.target_root}\nplan: {args.plan}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -7,6 +7,8 @@ The command is deliberately conservative:
 - `--apply` is required to move files
 - existing targets are treated as collisions
 - source/target sizes are validated before and after
+- moves to another filesystem are copied, verified, and only then unlinked
+- every move step is journalled, and a rerun resumes an interrupted apply
 """
 
 from __future__ import annotations
@@ -19,9 +21,12 @@ from disk_catalogue.following_jesus_rename import (
     DEFAULT_PLAN_PATH,
     DEFAULT_VALIDATION_REPORT_PATH,
     apply_rename_plan,
-    read_plan,
     write_json_report,
 )
+from disk_catalogue.move_engine import DEFAULT_CHUNK_BYTES
+from disk_catalogue.rename_planner import (
+    read_plan,
+)
 
 
 def write_apply_log(path: Path, rows: list[dict[str, str]]) -> None:
@@ -56,13 +61,30 @@ def build_parser() -> argparse.ArgumentParser:
         type=Path,
         default=DEFAULT_PLAN_PATH.with_name("following_jesus_rename_applied_log.csv"),
     )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        default=DEFAULT_PLAN_PATH.with_name("following_jesus_rename_journal.jsonl"),
+        help="Append-only log of move steps, used to resume an interrupted --apply.",
+    )
+    parser.add_argument(
+        "--chunk-mib",
+        type=int,
+        default=DEFAULT_CHUNK_BYTES // (1024 * 1024),
+        help="Copy chunk size for moves to another filesystem.",
+    )
     return parser
 
 
 def main() -> int:
     args = build_parser().parse_args()
     rows = read_plan(args.plan)
-    report = apply_rename_plan(rows, apply=args.apply)
+    report = apply_rename_plan(
+        rows,
+        apply=args.apply,
+        journal_path=args.journal,
+        chunk_bytes=args.chunk_mib * 1024 * 1024,
+    )
     write_json_report(args.report, report)
     if args.apply and report.ok:
         write_apply_log(args.apply_log, rows)
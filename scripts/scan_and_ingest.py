@@ -3,7 +3,8 @@
 
 Usage:
   python scripts/scan_and_ingest.py --drive Ext-10 \
-    [--db catalogue.duckdb] [--manifest drive_manifest.csv] [--outdir output]
+    [--db catalogue.duckdb] [--manifest drive_manifest.csv] [--outdir output] \
+    [--service-socket catalogue.duckdb.sock]
 
 Behavior:
   - Looks up the drive in the manifest (by drive_label).
@@ -11,6 +12,12 @@ Behavior:
   - Skips scan/ingest if the drive already has rows in any target table, unless --force.
   - Runs three scans (files, photos, videos) and then ingests from the drive-specific
     output folder.
+  - Records wall/CPU time, files, bytes and errors for each phase in drive_scan_phases.
+  - Reports files/sec, MB/sec and ETA for each phase to the terminal and to a JSON status
+    file (default <outdir>/<drive>/scan_status.json) while the scan runs.
+  - With --service-socket, every read and write (including the load_csvs ingest) goes through
+    the catalogue service (scripts/catalogue_service.py), so the scan never takes the
+    database file lock.
 """
 
 from __future__ import annotations
@@ -25,6 +32,23 @@ from pathlib import Path
 
 import duckdb
 
+from disk_catalogue.catalogue_service import CatalogueClient, Statement, write_catalogue
+from disk_catalogue.progress import (
+    ProgressReporter,
+    ProgressTracker,
+    count_tree,
+    listed_totals,
+    run_with_progress,
+)
+from disk_catalogue.scan_telemetry import (
+    DRIVE_SCAN_PHASES_DDL,
+    PHASE_COLUMNS,
+    PhaseTiming,
+    csv_file_stats,
+    measure_phase,
+    phase_rows,
+)
+
 
 @dataclass
 class ManifestEntry:
@@ -72,15 +96,36 @@ def table_exists(con: duckdb.DuckDBPyConnection, table: str) -> bool:
     return con.execute(q, [table]).fetchone() is not None
 
 
-def has_rows_for_drive(con: duckdb.DuckDBPyConnection, table: str, drive_label: str) -> bool:
-    if not table_exists(con, table):
-        return False
-    q = (
+def drive_rows_sql(table: str) -> str:
+    return (
         "SELECT 1 FROM "
         + table
         + " WHERE regexp_extract(SourceFile, '/host/Volumes/([^/]+)/', 1) = ? LIMIT 1"
     )
-    return con.execute(q, [drive_label]).fetchone() is not None
+
+
+def has_rows_for_drive(con: duckdb.DuckDBPyConnection, table: str, drive_label: str) -> bool:
+    if not table_exists(con, table):
+        return False
+    return con.execute(drive_rows_sql(table), [drive_label]).fetchone() is not None
+
+
+def indexed_tables(db: str, drive_label: str, service_socket: Path | None) -> dict[str, bool]:
+    """Whether each raw table already has rows for the drive."""
+    tables = ("files_raw", "photos_raw", "videos_raw")
+    if service_socket is not None:
+        with CatalogueClient(service_socket) as client:
+            return {
+                table: client.relation_exists(table)
+                and bool(client.query(drive_rows_sql(table), [drive_label]))
+                for table in tables
+            }
+    con = duckdb.connect(db)
+    try:
+        return {table: has_rows_for_drive(con, table, drive_label) for table in tables}
+    finally:
+        # Close DB before running child processes that will also open it (avoids file lock)
+        con.close()
 
 
 def run(cmd: list[str]) -> None:
@@ -162,25 +207,34 @@ def count_csv_rows(p: Path | None) -> int:
         return 0
 
 
-def ensure_drive_scans_table(con: duckdb.DuckDBPyConnection) -> None:
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS drive_scans (
-          drive_label TEXT,
-          started_at TIMESTAMP,
-          ended_at TIMESTAMP,
-          status TEXT,
-          files_csv TEXT,
-          photos_csv TEXT,
-          videos_csv TEXT,
-          files_rows BIGINT,
-          photos_rows BIGINT,
-          videos_rows BIGINT
-        );
-        """)
-
-
-def insert_drive_scan(
-    con: duckdb.DuckDBPyConnection,
+DRIVE_SCANS_DDL = """
+    CREATE TABLE IF NOT EXISTS drive_scans (
+      drive_label TEXT,
+      started_at TIMESTAMP,
+      ended_at TIMESTAMP,
+      status TEXT,
+      files_csv TEXT,
+      photos_csv TEXT,
+      videos_csv TEXT,
+      files_rows BIGINT,
+      photos_rows BIGINT,
+      videos_rows BIGINT
+    );
+    """
+
+DRIVES_DDL = """
+    CREATE TABLE IF NOT EXISTS drives (
+      drive_label TEXT PRIMARY KEY,
+      mac_mount TEXT,
+      volume_uuid TEXT,
+      serial_number TEXT,
+      notes TEXT,
+      last_scanned TIMESTAMP
+    );
+    """
+
+
+def drive_scan_statements(
     drive_label: str,
     started_at: datetime,
     ended_at: datetime,
@@ -188,29 +242,192 @@ def insert_drive_scan(
     files_csv: Path | None,
     photos_csv: Path | None,
     videos_csv: Path | None,
+) -> list[Statement]:
+    return [
+        (DRIVE_SCANS_DDL, []),
+        (
+            """
+            INSERT INTO drive_scans(
+              drive_label, started_at, ended_at, status,
+              files_csv, photos_csv, videos_csv,
+              files_rows, photos_rows, videos_rows
+            ) VALUES (?,?,?,?,?,?,?,?,?,?)
+            """,
+            [
+                drive_label,
+                started_at,
+                ended_at,
+                status,
+                str(files_csv) if files_csv else None,
+                str(photos_csv) if photos_csv else None,
+                str(videos_csv) if videos_csv else None,
+                count_csv_rows(files_csv),
+                count_csv_rows(photos_csv),
+                count_csv_rows(videos_csv),
+            ],
+        ),
+    ]
+
+
+def drive_snapshot_statements(
+    manifest_path: Path, drive_label: str, mac_mount: str | None
+) -> list[Statement]:
+    """Upsert the drive's manifest row into `drives`, stamped with the current time."""
+    # Reload full manifest row to get all columns
+    with manifest_path.open(newline="", encoding="utf-8") as mf:
+        r = _csv.DictReader(mf)
+        vol_uuid = serial = notes = None
+        plat = None
+        for row in r:
+            if (row.get("drive_label") or "").strip() == drive_label:
+                plat = (row.get("platform_mount") or "").strip() or None
+                vol_uuid = (row.get("volume_uuid") or "").strip() or None
+                serial = (row.get("serial_number") or "").strip() or None
+                notes = (row.get("notes") or "").strip() or None
+                break
+    # Upsert by delete+insert to avoid ON CONFLICT dependency
+    return [
+        (DRIVES_DDL, []),
+        ("DELETE FROM drives WHERE drive_label = ?", [drive_label]),
+        (
+            "INSERT INTO drives("
+            "drive_label, mac_mount, volume_uuid, serial_number, notes, last_scanned"
+            ") VALUES (?,?,?,?,?,?)",
+            [drive_label, plat or mac_mount, vol_uuid, serial, notes, datetime.now()],
+        ),
+    ]
+
+
+def count_lines(path: Path | None) -> int:
+    if not path or not path.exists():
+        return 0
+    with path.open("rb") as f:
+        return sum(1 for _ in f)
+
+
+def scan_phase_statements(
+    drive_label: str,
+    started_at: datetime,
+    phases: list[PhaseTiming],
+) -> list[Statement]:
+    placeholders = ",".join("?" for _ in PHASE_COLUMNS)
+    insert = f"INSERT INTO drive_scan_phases({', '.join(PHASE_COLUMNS)}) VALUES ({placeholders})"
+    return [
+        (DRIVE_SCAN_PHASES_DDL, []),
+        *((insert, row) for row in phase_rows(drive_label, started_at, phases)),
+    ]
+
+
+def list_tracker(label: str, list_path: Path | None, files_csv: Path | None) -> ProgressTracker:
+    """A tracker whose totals come from a derived path list and the files CSV sizes."""
+    if list_path is None or files_csv is None or not list_path.exists():
+        return ProgressTracker(label)
+    total_files, total_bytes = listed_totals(list_path, files_csv)
+    return ProgressTracker(label, total_files=total_files, total_bytes=total_bytes)
+
+
+def run_scan_phases(
+    drive_path: str,
+    drive_label: str,
+    outdir_drive: Path,
+    db: str,
+    need_files: bool,
+    need_photos: bool,
+    need_videos: bool,
+    phases: list[PhaseTiming],
+    reporter: ProgressReporter,
+    prewalk: bool = False,
+    service_socket: Path | None = None,
 ) -> None:
-    ensure_drive_scans_table(con)
-    con.execute(
-        """
-        INSERT INTO drive_scans(
-          drive_label, started_at, ended_at, status,
-          files_csv, photos_csv, videos_csv,
-          files_rows, photos_rows, videos_rows
-        ) VALUES (?,?,?,?,?,?,?,?,?,?)
-        """,
-        [
-            drive_label,
-            started_at,
-            ended_at,
-            status,
-            str(files_csv) if files_csv else None,
-            str(photos_csv) if photos_csv else None,
-            str(videos_csv) if videos_csv else None,
-            count_csv_rows(files_csv),
-            count_csv_rows(photos_csv),
-            count_csv_rows(videos_csv),
-        ],
-    )
+    """Run the needed scans and the ingest, timing each step as a phase."""
+    files_csv: Path | None = None
+    if need_files:
+        # ExifTool walks the drive itself, so the walk is timed as part of this phase.
+        with measure_phase(phases, "files_exiftool") as phase:
+            tracker = ProgressTracker("files_exiftool")
+            if prewalk:
+                tracker.total_files, tracker.total_bytes = count_tree(Path(drive_path))
+            run_with_progress(
+                ["./scripts/container_scan_files.sh", drive_path, drive_label, str(outdir_drive)],
+                tracker,
+                reporter,
+            )
+            files_csv = latest_csv(outdir_drive, "files_")
+            phase.files, phase.bytes = csv_file_stats(files_csv)
+    else:
+        files_csv = latest_csv(outdir_drive, "files_")
+
+    # If we have a files CSV, derive targeted lists for efficient media extraction
+    photo_list_path: Path | None = None
+    video_list_path: Path | None = None
+    if files_csv and (need_photos or need_videos):
+        with measure_phase(phases, "derive_lists") as phase:
+            photo_list_path, video_list_path = derive_lists_from_files_csv(files_csv, outdir_drive)
+            phase.files = count_lines(photo_list_path) + count_lines(video_list_path)
+            phase.bytes = files_csv.stat().st_size
+
+    if need_photos:
+        with measure_phase(phases, "photo_extract") as phase:
+            tracker = list_tracker("photo_extract", photo_list_path, files_csv)
+            if photo_list_path and photo_list_path.exists():
+                run_with_progress(
+                    [
+                        "./scripts/container_extract_photos_from_list.sh",
+                        str(photo_list_path),
+                        drive_label,
+                        str(outdir_drive),
+                    ],
+                    tracker,
+                    reporter,
+                )
+            else:
+                run_with_progress(
+                    [
+                        "./scripts/container_scan_photos.sh",
+                        drive_path,
+                        drive_label,
+                        str(outdir_drive),
+                    ],
+                    tracker,
+                    reporter,
+                )
+            phase.files, phase.bytes = csv_file_stats(latest_csv(outdir_drive, "photos_"))
+    if need_videos:
+        with measure_phase(phases, "video_extract") as phase:
+            tracker = list_tracker("video_extract", video_list_path, files_csv)
+            if video_list_path and video_list_path.exists():
+                run_with_progress(
+                    [
+                        "./scripts/container_extract_videos_from_list.sh",
+                        str(video_list_path),
+                        drive_label,
+                        str(outdir_drive),
+                    ],
+                    tracker,
+                    reporter,
+                )
+            else:
+                run_with_progress(
+                    [
+                        "./scripts/container_scan_videos.sh",
+                        drive_path,
+                        drive_label,
+                        str(outdir_drive),
+                    ],
+                    tracker,
+                    reporter,
+                )
+            phase.files, phase.bytes = csv_file_stats(latest_csv(outdir_drive, "videos_"))
+
+    # Ingest; files and bytes count the CSVs in the drive output folder.
+    with measure_phase(phases, "ingest") as phase:
+        command = ["python", "scripts/load_csvs.py", "--db", db, "--dir", str(outdir_drive)]
+        if service_socket is not None:
+            command += ["--service-socket", str(service_socket)]
+        run_with_progress(command, ProgressTracker("ingest"), reporter)
+        csvs = [p for p in outdir_drive.glob("*.csv") if p.is_file()]
+        phase.files = len(csvs)
+        phase.bytes = sum(p.stat().st_size for p in csvs)
 
 
 def main() -> None:
@@ -240,6 +457,27 @@ def main() -> None:
         action="store_true",
         help="Force re-scan even if indexed",
     )
+    ap.add_argument(
+        "--status-file",
+        type=Path,
+        help="JSON progress file (default: <outdir>/<drive>/scan_status.json)",
+    )
+    ap.add_argument(
+        "--progress-interval",
+        type=float,
+        default=5.0,
+        help="Seconds between progress lines and status-file updates",
+    )
+    ap.add_argument(
+        "--prewalk",
+        action="store_true",
+        help="Count files and bytes on the drive before the files scan, for a byte-based ETA",
+    )
+    ap.add_argument(
+        "--service-socket",
+        type=Path,
+        help="Read and write the catalogue through the catalogue service on this Unix socket",
+    )
     args = ap.parse_args()
 
     manifest_path = Path(args.manifest)
@@ -300,14 +538,13 @@ def main() -> None:
         raise SystemExit(f"Drive path not found or not mounted in container: {drive_path}")
 
     # Decide per-table whether to scan
-    con = duckdb.connect(args.db)
-    need_files = not has_rows_for_drive(con, "files_raw", args.drive)
-    need_photos = not has_rows_for_drive(con, "photos_raw", args.drive)
-    need_videos = not has_rows_for_drive(con, "videos_raw", args.drive)
+    indexed = indexed_tables(args.db, args.drive, args.service_socket)
+    need_files = not indexed["files_raw"]
+    need_photos = not indexed["photos_raw"]
+    need_videos = not indexed["videos_raw"]
     if args.force:
         need_files = need_photos = need_videos = True
-    # Close DB before running child processes that will also open it (avoids file lock)
-    con.close()
+    db_path = Path(args.db)
 
     # Prepare output dir per drive
     outdir_drive = Path(args.outdir) / args.drive
@@ -319,157 +556,85 @@ def main() -> None:
             f"Drive '{args.drive}' already indexed in files/photos/videos. "
             f"Skipping scans; recording drive snapshot."
         )
-        # Record/update drive metadata snapshot in DB even if no scans are needed
-        con = duckdb.connect(args.db)
-        con.execute("""
-            CREATE TABLE IF NOT EXISTS drives (
-              drive_label TEXT PRIMARY KEY,
-              mac_mount TEXT,
-              volume_uuid TEXT,
-              serial_number TEXT,
-              notes TEXT,
-              last_scanned TIMESTAMP
-            );
-            """)
-        # Reload full manifest row
-        with open(args.manifest, newline="", encoding="utf-8") as mf:
-            r = _csv.DictReader(mf)
-            vol_uuid = serial = notes = None
-            plat = None
-            for row in r:
-                if (row.get("drive_label") or "").strip() == args.drive:
-                    plat = (row.get("platform_mount") or "").strip() or None
-                    vol_uuid = (row.get("volume_uuid") or "").strip() or None
-                    serial = (row.get("serial_number") or "").strip() or None
-                    notes = (row.get("notes") or "").strip() or None
-                    break
-        con.execute("DELETE FROM drives WHERE drive_label = ?", [args.drive])
-        con.execute(
-            (
-                "INSERT INTO drives("
-                "drive_label, mac_mount, volume_uuid, serial_number, notes, last_scanned"
-                ") VALUES (?,?,?,?,?,?)"
-            ),
-            [args.drive, plat or entry.mac_mount, vol_uuid, serial, notes, datetime.now()],
+        # Record/update drive metadata snapshot in DB even if no scans are needed, with a
+        # drive_scans history record with status 'skipped'
+        write_catalogue(
+            db_path,
+            [
+                *drive_snapshot_statements(manifest_path, args.drive, entry.mac_mount),
+                *drive_scan_statements(
+                    args.drive,
+                    started_at=start_time,
+                    ended_at=datetime.now(),
+                    status="skipped",
+                    files_csv=None,
+                    photos_csv=None,
+                    videos_csv=None,
+                ),
+            ],
+            args.service_socket,
         )
-        # Also record a drive_scans history record with status 'skipped'
-        try:
-            insert_drive_scan(
-                con,
-                args.drive,
-                started_at=start_time,
-                ended_at=datetime.now(),
-                status="skipped",
-                files_csv=None,
-                photos_csv=None,
-                videos_csv=None,
-            )
-        finally:
-            con.close()
         print(f"Drive '{args.drive}' snapshot recorded.")
         return
-    files_csv: Path | None = None
-    if need_files:
-        run(["./scripts/container_scan_files.sh", drive_path, args.drive, str(outdir_drive)])
-        files_csv = latest_csv(outdir_drive, "files_")
-    else:
-        files_csv = latest_csv(outdir_drive, "files_")
-
-    # If we have a files CSV, derive targeted lists for efficient media extraction
-    photo_list_path: Path | None = None
-    video_list_path: Path | None = None
-    if files_csv and (need_photos or need_videos):
-        photo_list_path, video_list_path = derive_lists_from_files_csv(files_csv, outdir_drive)
-
-    if need_photos:
-        if photo_list_path and photo_list_path.exists():
-            run(
-                [
-                    "./scripts/container_extract_photos_from_list.sh",
-                    str(photo_list_path),
-                    args.drive,
-                    str(outdir_drive),
-                ]
-            )
-        else:
-            run(["./scripts/container_scan_photos.sh", drive_path, args.drive, str(outdir_drive)])
-    if need_videos:
-        if video_list_path and video_list_path.exists():
-            run(
-                [
-                    "./scripts/container_extract_videos_from_list.sh",
-                    str(video_list_path),
+    phases: list[PhaseTiming] = []
+    reporter = ProgressReporter(
+        args.status_file or outdir_drive / "scan_status.json",
+        interval=args.progress_interval,
+        context={"drive_label": args.drive, "scan_started_at": start_time.isoformat()},
+    )
+    try:
+        run_scan_phases(
+            drive_path,
+            args.drive,
+            outdir_drive,
+            args.db,
+            need_files,
+            need_photos,
+            need_videos,
+            phases,
+            reporter,
+            prewalk=args.prewalk,
+            service_socket=args.service_socket,
+        )
+    except (subprocess.CalledProcessError, OSError):
+        # Keep the timings of a failed scan: the failing phase is often the one to look at.
+        write_catalogue(
+            db_path,
+            [
+                *drive_scan_statements(
                     args.drive,
-                    str(outdir_drive),
-                ]
-            )
-        else:
-            run(["./scripts/container_scan_videos.sh", drive_path, args.drive, str(outdir_drive)])
+                    started_at=start_time,
+                    ended_at=datetime.now(),
+                    status="failed",
+                    files_csv=latest_csv(outdir_drive, "files_"),
+                    photos_csv=latest_csv(outdir_drive, "photos_"),
+                    videos_csv=latest_csv(outdir_drive, "videos_"),
+                ),
+                *scan_phase_statements(args.drive, start_time, phases),
+            ],
+            args.service_socket,
+        )
+        raise
 
-    # Ingest
-    run(
+    # Record/update drive metadata snapshot in DB and write drive_scans history, using the
+    # latest CSVs of this run
+    write_catalogue(
+        db_path,
         [
-            "python",
-            "scripts/load_csvs.py",
-            "--db",
-            args.db,
-            "--dir",
-            str(outdir_drive),
-        ]
-    )
-
-    # Record/update drive metadata snapshot in DB and write drive_scans history
-    con = duckdb.connect(args.db)
-    con.execute("""
-        CREATE TABLE IF NOT EXISTS drives (
-          drive_label TEXT PRIMARY KEY,
-          mac_mount TEXT,
-          volume_uuid TEXT,
-          serial_number TEXT,
-          notes TEXT,
-          last_scanned TIMESTAMP
-        );
-        """)
-    mac_mount = entry.mac_mount or None
-    # We also store raw platform_mount string for reference if present
-    # Extract other fields directly from manifest if available
-    # Reload row from manifest to get all columns
-    with open(args.manifest, newline="", encoding="utf-8") as mf:
-        r = _csv.DictReader(mf)
-        vol_uuid = serial = notes = None
-        plat = None
-        for row in r:
-            if (row.get("drive_label") or "").strip() == args.drive:
-                plat = (row.get("platform_mount") or "").strip() or None
-                vol_uuid = (row.get("volume_uuid") or "").strip() or None
-                serial = (row.get("serial_number") or "").strip() or None
-                notes = (row.get("notes") or "").strip() or None
-                break
-    # Upsert by delete+insert to avoid ON CONFLICT dependency
-    con.execute("DELETE FROM drives WHERE drive_label = ?", [args.drive])
-    con.execute(
-        (
-            "INSERT INTO drives("
-            "drive_label, mac_mount, volume_uuid, serial_number, notes, last_scanned"
-            ") VALUES (?,?,?,?,?,?)"
-        ),
-        [args.drive, plat or mac_mount, vol_uuid, serial, notes, datetime.now()],
-    )
-    # Determine latest CSVs used in this run
-    files_csv = latest_csv(outdir_drive, "files_")
-    photos_csv = latest_csv(outdir_drive, "photos_")
-    videos_csv = latest_csv(outdir_drive, "videos_")
-    insert_drive_scan(
-        con,
-        args.drive,
-        started_at=start_time,
-        ended_at=datetime.now(),
-        status="ok",
-        files_csv=files_csv,
-        photos_csv=photos_csv,
-        videos_csv=videos_csv,
+            *drive_snapshot_statements(manifest_path, args.drive, entry.mac_mount or None),
+            *drive_scan_statements(
+                args.drive,
+                started_at=start_time,
+                ended_at=datetime.now(),
+                status="ok",
+                files_csv=latest_csv(outdir_drive, "files_"),
+                photos_csv=latest_csv(outdir_drive, "photos_"),
+                videos_csv=latest_csv(outdir_drive, "videos_"),
+            ),
+            *scan_phase_statements(args.drive, start_time, phases),
+        ],
+        args.service_socket,
     )
-    con.close()
 
     print(f"Drive '{args.drive}' scan + ingest complete.")
 
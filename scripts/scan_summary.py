@@ -28,6 +28,52 @@ WHERE rn = 1
 ORDER BY drive_label;
 """
 
+PHASES_QUERY = """
+WITH last_scan AS (
+  SELECT drive_label, MAX(scan_started_at) AS scan_started_at
+  FROM drive_scan_phases
+  GROUP BY drive_label
+)
+SELECT p.drive_label,
+       p.phase,
+       p.status,
+       ROUND(p.wall_seconds, 2) AS wall_s,
+       ROUND(p.cpu_seconds, 2) AS cpu_s,
+       ROUND(p.cpu_seconds / NULLIF(p.wall_seconds, 0), 2) AS cpu_per_wall,
+       ROUND(100.0 * p.wall_seconds
+             / NULLIF(SUM(p.wall_seconds) OVER (PARTITION BY p.drive_label), 0), 1) AS wall_pct,
+       p.files,
+       ROUND(p.bytes / 1e6, 1) AS mb,
+       ROUND(p.files / NULLIF(p.wall_seconds, 0), 1) AS files_per_sec,
+       ROUND(p.bytes / 1e6 / NULLIF(p.wall_seconds, 0), 2) AS mb_per_sec,
+       p.errors
+FROM drive_scan_phases p
+JOIN last_scan USING (drive_label, scan_started_at)
+ORDER BY p.drive_label, p.phase_index;
+"""
+
+TREND_QUERY = """
+WITH ranked AS (
+  SELECT *,
+         DENSE_RANK() OVER (PARTITION BY drive_label ORDER BY scan_started_at DESC) AS scan_rank
+  FROM drive_scan_phases
+)
+SELECT drive_label,
+       phase,
+       COUNT(*) AS scans,
+       ROUND(ARG_MAX(wall_seconds, scan_started_at), 2) AS last_wall_s,
+       ROUND(AVG(wall_seconds), 2) AS avg_wall_s,
+       ROUND(MIN(wall_seconds), 2) AS best_wall_s,
+       ROUND(ARG_MAX(bytes, scan_started_at) / 1e6
+             / NULLIF(ARG_MAX(wall_seconds, scan_started_at), 0), 2) AS last_mb_per_sec,
+       ROUND(SUM(bytes) / 1e6 / NULLIF(SUM(wall_seconds), 0), 2) AS avg_mb_per_sec,
+       SUM(errors) AS errors
+FROM ranked
+WHERE scan_rank <= ?
+GROUP BY drive_label, phase
+ORDER BY drive_label, MIN(phase_index);
+"""
+
 
 def fmt_table(headers: list[str], rows: list[tuple[object, ...]]) -> str:
     cols = list(
@@ -44,10 +90,34 @@ def fmt_table(headers: list[str], rows: list[tuple[object, ...]]) -> str:
     return "\n".join(lines)
 
 
+def print_rows(headers: list[str], rows: list[tuple[object, ...]], as_csv: bool) -> None:
+    if as_csv:
+        import csv
+        import sys
+
+        w = csv.writer(sys.stdout)
+        w.writerow(headers)
+        for r in rows:
+            w.writerow(r)
+    else:
+        print(fmt_table(headers, rows))
+
+
 def main() -> None:
     ap = argparse.ArgumentParser(description="Show last scan summary per drive from drive_scans")
     ap.add_argument("--db", default="catalogue.duckdb", help="DuckDB database path")
     ap.add_argument("--csv", action="store_true", help="Output as CSV instead of a table")
+    ap.add_argument(
+        "--phases",
+        action="store_true",
+        help="Show the per-phase breakdown of the last scan per drive (drive_scan_phases)",
+    )
+    ap.add_argument(
+        "--trend",
+        type=int,
+        metavar="N",
+        help="Show per-phase timings and throughput across the last N scans per drive",
+    )
     args = ap.parse_args()
 
     if not os.path.exists(args.db):
@@ -57,6 +127,27 @@ def main() -> None:
     import duckdb
 
     con = duckdb.connect(args.db)
+    if args.phases or args.trend:
+        exists = con.execute(
+            "SELECT 1 FROM information_schema.tables "
+            "WHERE table_schema='main' AND table_name='drive_scan_phases'"
+        ).fetchone()
+        if not exists:
+            raise SystemExit(
+                "drive_scan_phases table not found. Run a scan via scripts/scan_and_ingest.py "
+                "first."
+            )
+        if args.phases:
+            rel = con.sql(PHASES_QUERY)
+            print_rows(list(rel.columns), rel.fetchall(), args.csv)
+        if args.trend:
+            if args.phases and not args.csv:
+                print()
+            cur = con.execute(TREND_QUERY, [args.trend])
+            headers = [d[0] for d in cur.description or []]
+            print_rows(headers, cur.fetchall(), args.csv)
+        return
+
     # Ensure table exists
     try:
         con.sql(
@@ -81,16 +172,7 @@ def main() -> None:
         "total_rows",
         "rows_per_sec",
     ]
-    if args.csv:
-        import csv
-        import sys
-
-        w = csv.writer(sys.stdout)
-        w.writerow(headers)
-        for r in res:
-            w.writerow(r)
-    else:
-        print(fmt_table(headers, res))
+    print_rows(headers, res, args.csv)
 
 
 if __name__ == "__main__":  # pragma: no cover
@@ -0,0 +1,13 @@
+# Filter for ExifTool's stdout when it runs with -csv and -progress.
+#
+# -progress adds "[n/total]" to the "======== FILE" line ExifTool prints for each file (it
+# implies -v0, which is why the scan scripts do not pass -q). Those lines, and the summary
+# printed at the end ("    12 image files read"), are moved to stderr, where scan_and_ingest.py
+# parses them. Everything else is CSV and goes to stdout unchanged. If a given ExifTool build
+# already prints these lines on stderr, nothing matches here and the CSV passes straight through.
+/^======== / || /^ *[0-9]+ (directories|image files|files|output files) / {
+    print > "/dev/stderr"
+    fflush("/dev/stderr")
+    next
+}
+{ print }
@@ -1,18 +1,30 @@
 #!/usr/bin/env python3
-"""Validate a Following Jesus rename plan before or after applying it."""
+"""Validate a Following Jesus rename plan before or after applying it.
+
+Paths are statted once on a thread pool. With `--verify-hash`, files are hashed in parallel with
+at most `--hashes-per-device` reads per drive, and hashes are cached by path, size, and
+modification time so a repeat validation only reads files that changed.
+"""
 
 from __future__ import annotations
 
 import argparse
+from contextlib import ExitStack
 from pathlib import Path
 
+from disk_catalogue.file_checks import DEFAULT_HASHES_PER_DEVICE, DEFAULT_WORKERS
 from disk_catalogue.following_jesus_rename import (
     DEFAULT_PLAN_PATH,
+    DEFAULT_RENAME_DIR,
     DEFAULT_VALIDATION_REPORT_PATH,
-    read_plan,
     validate_plan_rows,
     write_json_report,
 )
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.progress import ProgressReporter
+from disk_catalogue.rename_planner import (
+    read_plan,
+)
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -30,12 +42,45 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Verify SHA-256 hashes when the plan contains source_sha256 values.",
     )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument(
+        "--hashes-per-device",
+        type=int,
+        default=DEFAULT_HASHES_PER_DEVICE,
+        help="Files hashed at once on each drive; raise it for SSDs.",
+    )
+    parser.add_argument(
+        "--hash-cache",
+        type=Path,
+        default=DEFAULT_RENAME_DIR / "following_jesus_hash_cache.sqlite",
+    )
+    parser.add_argument("--no-hash-cache", action="store_true")
+    parser.add_argument(
+        "--status",
+        type=Path,
+        default=None,
+        help="Rewrite this JSON file with hashing progress while --verify-hash runs.",
+    )
     return parser
 
 
 def main() -> int:
     args = build_parser().parse_args()
-    report = validate_plan_rows(read_plan(args.plan), mode=args.mode, verify_hash=args.verify_hash)
+    rows = read_plan(args.plan)
+    progress = ProgressReporter(args.status, context={"plan": str(args.plan)})
+    with ExitStack() as stack:
+        cache = None
+        if args.verify_hash and not args.no_hash_cache:
+            cache = stack.enter_context(MemoCache(args.hash_cache))
+        report = validate_plan_rows(
+            rows,
+            mode=args.mode,
+            verify_hash=args.verify_hash,
+            workers=args.workers,
+            hashes_per_device=args.hashes_per_device,
+            hash_cache=cache,
+            progress=progress,
+        )
     write_json_report(args.report, report)
     print(
         f"validation: ok={report.ok} mode={args.mode} rows={report.total_rows} "
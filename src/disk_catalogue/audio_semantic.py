@@ -2,103 +2,37 @@ from __future__ import annotations
 
 import json
 import re
+from bisect import bisect_right
 from collections import defaultdict
-from collections.abc import Iterable, Mapping, Sequence
+from collections.abc import Iterable, Iterator, Mapping, Sequence
 from dataclasses import asdict, dataclass, field
 from datetime import UTC, datetime
 from hashlib import sha256
 from pathlib import Path
 from typing import Any
 
+from disk_catalogue.bible_references import (
+    BibleReference,
+    bible_reference_rows,
+    extract_bible_references,
+    parse_bible_references,
+    reference_ordinal_range,
+)
+from disk_catalogue.semantic_rules import (
+    RuleSet,
+    TranscriptView,
+    condition_matches,
+    default_rule_set,
+    first_matching_value,
+    prepare_transcript,
+)
+
 GENERIC_TITLE_RE = re.compile(r"^Track\s+\d+$", re.IGNORECASE)
 
-BIBLE_BOOKS = [
-    "Genesis",
-    "Exodus",
-    "Leviticus",
-    "Numbers",
-    "Deuteronomy",
-    "Joshua",
-    "Judges",
-    "Ruth",
-    "1 Samuel",
-    "2 Samuel",
-    "Samuel",
-    "1 Kings",
-    "2 Kings",
-    "Kings",
-    "1 Chronicles",
-    "2 Chronicles",
-    "Chronicles",
-    "Ezra",
-    "Nehemiah",
-    "Esther",
-    "Job",
-    "Psalms",
-    "Psalm",
-    "Proverbs",
-    "Ecclesiastes",
-    "Song of Songs",
-    "Isaiah",
-    "Jeremiah",
-    "Lamentations",
-    "Ezekiel",
-    "Daniel",
-    "Hosea",
-    "Joel",
-    "Amos",
-    "Obadiah",
-    "Jonah",
-    "Micah",
-    "Nahum",
-    "Habakkuk",
-    "Zephaniah",
-    "Haggai",
-    "Zechariah",
-    "Malachi",
-    "Matthew",
-    "Mark",
-    "Luke",
-    "John",
-    "Acts",
-    "Romans",
-    "1 Corinthians",
-    "2 Corinthians",
-    "Corinthians",
-    "Galatians",
-    "Ephesians",
-    "Philippians",
-    "Colossians",
-    "1 Thessalonians",
-    "2 Thessalonians",
-    "Thessalonians",
-    "1 Timothy",
-    "2 Timothy",
-    "Timothy",
-    "Titus",
-    "Philemon",
-    "Hebrews",
-    "James",
-    "1 Peter",
-    "2 Peter",
-    "Peter",
-    "1 John",
-    "2 John",
-    "3 John",
-    "Jude",
-    "Revelation",
-]
-
-BIBLE_REFERENCE_RE = re.compile(
-    rf"\b({'|'.join(re.escape(book) for book in BIBLE_BOOKS)})\s+"
-    r"(\d{1,3})(?::(\d{1,3}))?"
-    r"(?:\s*[-]\s*(?:(\d{1,3}):)?(\d{1,3}))?\b",
-    re.IGNORECASE,
-)
+SPEAKER_NAME_RE = default_rule_set().speaker_re
 
-SPEAKER_NAME_RE = re.compile(
-    r"\b(Avery Willis|Jim Slack|Grant Lovejoy|Marcus Vegh)\b", re.IGNORECASE
-)
+# Gold-question lookup key matching entries whose Bible references overlap a passage.
+COVERS_REFERENCE_LOOKUP = "covers_reference"
 
 
 @dataclass(frozen=True)
@@ -144,6 +78,13 @@ class SemanticEntry:
     analysis_backend: str = "heuristic_v1"
 
 
+@dataclass(frozen=True)
+class TranscriptSegment:
+    start_seconds: float
+    end_seconds: float
+    text: str
+
+
 @dataclass(frozen=True)
 class VerificationResult:
     total_files: int
@@ -191,6 +132,13 @@ class GoldQuestionScore:
     details: dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass(frozen=True)
+class GoldEvaluation:
+    eval_set: str
+    analysis_backend: str
+    scores: list[GoldQuestionScore]
+
+
 @dataclass(frozen=True)
 class DuplicateGroup:
     duplicate_kind: str
@@ -229,7 +177,10 @@ def normalise_space(value: str) -> str:
 
 
 def first_sentence(text: str, max_chars: int = 180) -> str:
-    cleaned = normalise_space(text)
+    return _first_sentence_of_normalised(normalise_space(text), max_chars)
+
+
+def _first_sentence_of_normalised(cleaned: str, max_chars: int) -> str:
     if not cleaned:
         return ""
     match = re.search(r"(?<=[.!?])\s+", cleaned)
@@ -378,191 +329,197 @@ def parse_srt_timestamp(value: str) -> float:
     return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
 
 
-def parse_srt_end_seconds(path: Path) -> float | None:
-    if not path.exists():
+def format_srt_timestamp(seconds: float) -> str:
+    millis = max(0, round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d},{millis:03d}"
+
+
+def _srt_block_segment(block: Sequence[str]) -> TranscriptSegment | None:
+    if len(block) < 2 or "-->" not in block[1]:
         return None
-    latest_end: float | None = None
-    for line in path.read_text(encoding="utf-8").splitlines():
-        if "-->" not in line:
-            continue
-        _start, end = line.split("-->", 1)
-        end_timestamp = end.strip().split()[0]
-        try:
-            end_seconds = parse_srt_timestamp(end_timestamp)
-        except (ValueError, IndexError):
+    start, end = block[1].split("-->", 1)
+    try:
+        start_seconds = parse_srt_timestamp(start.strip())
+        end_seconds = parse_srt_timestamp(end.strip().split()[0])
+    except (ValueError, IndexError):
+        return None
+    return TranscriptSegment(
+        start_seconds=start_seconds,
+        end_seconds=end_seconds,
+        text=normalise_space(" ".join(block[2:])),
+    )
+
+
+def iter_srt_segments(lines: Iterable[str]) -> Iterator[TranscriptSegment]:
+    block: list[str] = []
+    for line in lines:
+        stripped = line.strip()
+        if stripped:
+            block.append(stripped)
             continue
-        latest_end = end_seconds if latest_end is None else max(latest_end, end_seconds)
-    return latest_end
+        if block:
+            segment = _srt_block_segment(block)
+            if segment is not None:
+                yield segment
+            block = []
+    if block:
+        segment = _srt_block_segment(block)
+        if segment is not None:
+            yield segment
+
+
+def read_srt_segments(path: Path) -> list[TranscriptSegment]:
+    if not path.exists():
+        return []
+    with path.open(encoding="utf-8") as handle:
+        return list(iter_srt_segments(handle))
+
+
+def segments_end_seconds(segments: Iterable[TranscriptSegment]) -> float | None:
+    return max((segment.end_seconds for segment in segments), default=None)
+
+
+def segments_text(segments: Iterable[TranscriptSegment]) -> str:
+    return normalise_space(" ".join(segment.text for segment in segments if segment.text))
+
+
+def segment_at(segments: Sequence[TranscriptSegment], seconds: float) -> TranscriptSegment | None:
+    """Return the cue spoken at `seconds`; `segments` must be ordered by start time.
+
+    Only the O(log n) cues the binary search visits are read.
+    """
+    index = bisect_right(segments, seconds, key=lambda segment: segment.start_seconds) - 1
+    if index < 0 or segments[index].end_seconds < seconds:
+        return None
+    return segments[index]
+
+
+def transcript_segment_rows(
+    file_key: str, segments: Sequence[TranscriptSegment]
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "file_key": file_key,
+            "segment_index": index,
+            "start_seconds": segment.start_seconds,
+            "end_seconds": segment.end_seconds,
+            "text": segment.text,
+        }
+        for index, segment in enumerate(segments)
+    ]
+
+
+def parse_srt_end_seconds(path: Path) -> float | None:
+    return segments_end_seconds(read_srt_segments(path))
 
 
 def parse_srt_text(path: Path) -> str:
-    if not path.exists():
-        return ""
-    text_parts: list[str] = []
-    blocks = re.split(r"\n\s*\n", path.read_text(encoding="utf-8").strip())
-    for block in blocks:
-        lines = [line.strip() for line in block.splitlines() if line.strip()]
-        if len(lines) >= 3 and "-->" in lines[1]:
-            text_parts.extend(lines[2:])
-    return normalise_space(" ".join(text_parts))
-
-
-def extract_bible_references(text: str) -> list[str]:
-    refs: list[str] = []
-    for match in BIBLE_REFERENCE_RE.finditer(text):
-        book = " ".join(part.capitalize() for part in match.group(1).split())
-        chapter = match.group(2)
-        verse = match.group(3)
-        end_chapter = match.group(4)
-        end_verse = match.group(5)
-        ref = f"{book} {chapter}"
-        if verse:
-            ref += f":{verse}"
-        if end_verse:
-            ref += "-"
-            if end_chapter:
-                ref += f"{end_chapter}:"
-            ref += end_verse
-        if ref not in refs:
-            refs.append(ref)
-    return refs
-
-
-def infer_known_story_reference(text: str) -> str | None:
-    lower = text.lower()
-    if "serpent" in lower and (
-        "forbidden fruit" in lower or ("garden" in lower and "fruit" in lower)
-    ):
-        return "Genesis 3"
-    if "feed my sheep" in lower and "peter" in lower:
-        return "John 21:1-22"
-    if "tabernacle" in lower and ("moses" in lower or "glory of the lord filled" in lower):
-        return "Exodus 40"
-    if "lazarus" in lower and (
-        "grain of wheat" in lower or "kernel of wheat" in lower or "single seed" in lower
-    ):
-        return "John 11:1-12:26"
-    if "gerasene" in lower or "gadarene" in lower:
-        return "Mark 5 / Luke 8"
-    if "jacob" in lower and "bethel" in lower:
-        return "Genesis 28"
-    return None
+    return segments_text(read_srt_segments(path))
+
+
+def analyse_transcript(text: str, rules: RuleSet | None = None) -> TranscriptView:
+    return prepare_transcript(text, rules or default_rule_set(), normalise_space(text))
+
+
+def _infer_known_story_reference(view: TranscriptView, rules: RuleSet) -> str | None:
+    return first_matching_value(rules.story_references, view)
+
+
+def infer_known_story_reference(text: str, rules: RuleSet | None = None) -> str | None:
+    rule_set = rules or default_rule_set()
+    return _infer_known_story_reference(analyse_transcript(text, rule_set), rule_set)
 
 
 def bible_book_from_reference(reference: str | None) -> str | None:
     if not reference:
         return None
-    match = re.match(r"([1-3]?\s?[A-Za-z ]+?)\s+\d", reference)
-    return match.group(1).strip() if match else None
-
-
-def extract_speaker_names(text: str) -> list[str]:
+    refs = parse_bible_references(reference)
+    return refs[0].book if refs else None
+
+
+def entry_bible_references(entry: SemanticEntry) -> list[tuple[BibleReference, str]]:
+    """Structured primary and detected references for an entry, without repeats."""
+    evidence = json.loads(entry.evidence_json) if entry.evidence_json else {}
+    labelled = [(entry.bible_reference or "", "primary")]
+    labelled.extend((label, "detected") for label in evidence.get("detected_references", []))
+    seen: set[BibleReference] = set()
+    references: list[tuple[BibleReference, str]] = []
+    for label, role in labelled:
+        for ref in parse_bible_references(label):
+            if ref not in seen:
+                seen.add(ref)
+                references.append((ref, role))
+    return references
+
+
+def entry_bible_reference_rows(entry: SemanticEntry) -> list[dict[str, Any]]:
+    return bible_reference_rows(entry.file_key, entry_bible_references(entry))
+
+
+def entry_covers_reference(entry: SemanticEntry, reference: str) -> bool:
+    wanted = reference_ordinal_range(reference)
+    if wanted is None:
+        return False
+    for ref, _role in entry_bible_references(entry):
+        start, end = ref.start_ordinal, ref.end_ordinal
+        if start is not None and end is not None and start <= wanted[1] and end >= wanted[0]:
+            return True
+    return False
+
+
+def extract_speaker_names(text: str, rules: RuleSet | None = None) -> list[str]:
+    rule_set = rules or default_rule_set()
+    canonical = {name.lower(): name for name in rule_set.speakers}
     names: list[str] = []
-    canonical = {
-        "avery willis": "Avery Willis",
-        "jim slack": "Jim Slack",
-        "grant lovejoy": "Grant Lovejoy",
-        "marcus vegh": "Marcus Vegh",
-    }
-    for match in SPEAKER_NAME_RE.finditer(text):
+    for match in rule_set.speaker_re.finditer(text):
         name = canonical[match.group(1).lower()]
         if name not in names:
             names.append(name)
     return names
 
 
-def classify_track(
-    record: AudioCatalogueRecord, transcript_text: str
+def _classify_track(
+    record: AudioCatalogueRecord, view: TranscriptView, rules: RuleSet
 ) -> tuple[str, str, str | None]:
-    title = record.title.lower()
-    album = record.album_folder.lower()
-    text = transcript_text.lower()
+    for rule in rules.classifications:
+        if condition_matches(rule.when, view, record.title, record.album_folder):
+            return rule.result()
+    return rules.fallback_classification.result()
 
-    if "wake up to orality" in title or "roundtable" in text:
-        return (
-            "roundtable_training",
-            "Foundational training and rationale for orality-based discipleship.",
-            "foundational_training",
-        )
-    if (
-        "this is module" in text
-        or "welcome to module" in text
-        or ("mission with god" in text and "spiritual markers" in text)
-        or ("module " in title and "welcome" in title)
-    ):
-        return (
-            "module_overview",
-            "Module orientation; explains audience, structure, and intended use.",
-            "module_orientation",
-        )
-    if "ask the right kinds of questions" in text or (
-        "questions" in text and "story" in text and "worldview" in text
-    ):
-        return (
-            "training_guidance",
-            "Facilitator training; explains story dialogue and discussion practice.",
-            "facilitator_training",
-        )
-    if "memory verse" in text:
-        return (
-            "bible_story",
-            "Bible story narration with explicit memory verse.",
-            "memory_verse_story",
-        )
-    if any(word in text for word in ["jesus", "god", "moses", "peter", "serpent", "lazarus"]):
-        return ("bible_story", "Bible story narration.", "story_narration")
-    if "following jesus" in album:
-        return ("training_guidance", "Training or storying resource segment.", "training_segment")
-    return ("unknown", "Unclassified audio segment.", None)
 
+def classify_track(
+    record: AudioCatalogueRecord, transcript_text: str, rules: RuleSet | None = None
+) -> tuple[str, str, str | None]:
+    rule_set = rules or default_rule_set()
+    return _classify_track(record, analyse_transcript(transcript_text, rule_set), rule_set)
 
-def suggest_semantic_title(record: AudioCatalogueRecord, transcript_text: str) -> str:
-    lower = transcript_text.lower()
-    if "serpent" in lower and (
-        "forbidden fruit" in lower or ("garden" in lower and "fruit" in lower)
-    ):
-        return "Adam and Eve: disobedience, shame, judgment, and exile"
-    if "feed my sheep" in lower and "peter" in lower:
-        return "Jesus restores Peter: feed my sheep and follow me"
-    if "ask the right kinds of questions" in lower:
-        return "How to ask story dialogue questions"
-    if "tabernacle" in lower and ("moses" in lower or "glory of the lord filled" in lower):
-        return "Moses sets up the tabernacle and God's glory fills it"
-    if "lazarus" in lower and (
-        "grain of wheat" in lower or "kernel of wheat" in lower or "single seed" in lower
-    ):
-        return "Lazarus, Mary's anointing, triumphal entry, and the grain of wheat"
-    if "our mission with god" in lower or "spiritual markers" in lower:
-        return "Mission with God: God's big story and spiritual markers"
-    if "wake up to orality" in record.title.lower() or "orality and literacy" in lower:
-        return "Wake Up to Orality and Literacy: why literate methods fail oral learners"
+
+def _suggest_semantic_title(
+    record: AudioCatalogueRecord, view: TranscriptView, rules: RuleSet
+) -> str:
+    title = first_matching_value(rules.semantic_titles, view, record.title, record.album_folder)
+    if title is not None:
+        return title
     if not is_generic_title(record.title):
         return record.title
-    sentence = first_sentence(transcript_text, max_chars=100)
+    sentence = _first_sentence_of_normalised(view.normalised, max_chars=100)
     return sentence or record.title or record.file_name
 
 
-def extract_keywords(text: str, track_type: str, bible_reference: str | None) -> list[str]:
-    lower = text.lower()
-    candidates = [
-        "orality",
-        "literacy",
-        "primary oral learners",
-        "worldview",
-        "discipleship",
-        "storying",
-        "evangelism",
-        "memory verse",
-        "mission",
-        "tabernacle",
-        "lazarus",
-        "peter",
-        "moses",
-        "genesis",
-        "john",
-        "exodus",
-    ]
-    keywords = [candidate for candidate in candidates if candidate in lower]
+def suggest_semantic_title(
+    record: AudioCatalogueRecord, transcript_text: str, rules: RuleSet | None = None
+) -> str:
+    rule_set = rules or default_rule_set()
+    return _suggest_semantic_title(record, analyse_transcript(transcript_text, rule_set), rule_set)
+
+
+def _extract_keywords(
+    view: TranscriptView, track_type: str, bible_reference: str | None, rules: RuleSet
+) -> list[str]:
+    keywords = [keyword for keyword in rules.keywords if keyword.lower() in view.phrases]
     if track_type not in keywords:
         keywords.insert(0, track_type)
     if bible_reference:
@@ -570,6 +527,15 @@ def extract_keywords(text: str, track_type: str, bible_reference: str | None) ->
     return list(dict.fromkeys(keywords))
 
 
+def extract_keywords(
+    text: str, track_type: str, bible_reference: str | None, rules: RuleSet | None = None
+) -> list[str]:
+    rule_set = rules or default_rule_set()
+    return _extract_keywords(
+        analyse_transcript(text, rule_set), track_type, bible_reference, rule_set
+    )
+
+
 def metadata_confidence(
     record: AudioCatalogueRecord, transcript_text: str, bible_reference: str | None
 ) -> str:
@@ -589,24 +555,31 @@ def build_semantic_entry(
     srt_path: Path | None,
     speaker_names: Sequence[str] | None = None,
     analysis_backend: str = "heuristic_v1",
+    rules: RuleSet | None = None,
 ) -> SemanticEntry:
+    rule_set = rules or default_rule_set()
+    view = analyse_transcript(transcript_text, rule_set)
     references = extract_bible_references(transcript_text)
-    inferred_reference = infer_known_story_reference(transcript_text)
+    inferred_reference = _infer_known_story_reference(view, rule_set)
     bible_reference = inferred_reference or (references[0] if references else None)
-    track_type, storying_role, module_role = classify_track(record, transcript_text)
-    detected_speakers = list(speaker_names or extract_speaker_names(transcript_text))
-    semantic_title = suggest_semantic_title(record, transcript_text)
-    summary_short = first_sentence(transcript_text, max_chars=180)
-    summary_long = first_sentence(transcript_text, max_chars=600)
+    track_type, storying_role, module_role = _classify_track(record, view, rule_set)
+    detected_speakers = list(speaker_names or extract_speaker_names(transcript_text, rule_set))
+    semantic_title = _suggest_semantic_title(record, view, rule_set)
+    summary_short = _first_sentence_of_normalised(view.normalised, max_chars=180)
+    summary_long = _first_sentence_of_normalised(view.normalised, max_chars=600)
     speaker_confidence = "high" if speaker_names else ("medium" if detected_speakers else "unknown")
-    memory_verse = next(
-        (ref for ref in references if "memory verse" in transcript_text.lower()), None
+    memory_verse = (
+        references[0]
+        if references and condition_matches(rule_set.memory_verse_when, view)
+        else None
+    )
+    worldview_issue = (
+        "worldview discussion" if condition_matches(rule_set.worldview_when, view) else None
     )
-    worldview_issue = "worldview discussion" if "worldview" in transcript_text.lower() else None
     evidence = {
         "detected_references": references,
         "inferred_reference": inferred_reference,
-        "first_300_chars": normalise_space(transcript_text)[:300],
+        "first_300_chars": view.normalised[:300],
     }
     return SemanticEntry(
         recovery_set=record.recovery_set,
@@ -627,7 +600,7 @@ def build_semantic_entry(
         worldview_issue=worldview_issue,
         summary_short=summary_short,
         summary_long=summary_long,
-        keywords=extract_keywords(transcript_text, track_type, bible_reference),
+        keywords=_extract_keywords(view, track_type, bible_reference, rule_set),
         transcript_path=str(transcript_path),
         srt_path=str(srt_path) if srt_path else None,
         transcript_chars=len(transcript_text),
@@ -689,6 +662,7 @@ def verify_catalogue_outputs(
     srt_paths: Mapping[str, Path] | None = None,
     duration_tolerance_seconds: float = 20.0,
     duplicate_audit: DuplicateAudit | None = None,
+    srt_end_seconds: Mapping[str, float | None] | None = None,
 ) -> VerificationResult:
     missing_catalogue: list[str] = []
     missing_transcripts: list[str] = []
@@ -706,12 +680,16 @@ def verify_catalogue_outputs(
         transcript_count += 1
         if transcript_path.stat().st_size == 0:
             empty_transcripts.append(record.file_key)
-        if srt_paths is not None and record.duration_seconds is not None:
-            srt_path = srt_paths.get(record.file_key)
-            srt_end_seconds = parse_srt_end_seconds(srt_path) if srt_path else None
-            if srt_end_seconds is None:
+        has_srt_source = srt_end_seconds is not None or srt_paths is not None
+        if has_srt_source and record.duration_seconds is not None:
+            if srt_end_seconds is not None:
+                end_seconds = srt_end_seconds.get(record.file_key)
+            else:
+                srt_path = srt_paths.get(record.file_key) if srt_paths is not None else None
+                end_seconds = parse_srt_end_seconds(srt_path) if srt_path else None
+            if end_seconds is None:
                 short_transcripts.append(record.file_key)
-            elif srt_end_seconds + duration_tolerance_seconds < record.duration_seconds:
+            elif end_seconds + duration_tolerance_seconds < record.duration_seconds:
                 short_transcripts.append(record.file_key)
 
     exact_groups = (
@@ -759,8 +737,33 @@ def load_gold_questions(path: Path) -> list[GoldQuestion]:
     ]
 
 
+def gold_question_set_names(paths: Iterable[Path]) -> dict[str, Path]:
+    """Name each gold-question file by its stem; two files with one stem raise ValueError."""
+    names: dict[str, Path] = {}
+    for path in paths:
+        if path.stem in names and names[path.stem] != path:
+            raise ValueError(
+                f"gold-question sets {names[path.stem]} and {path} share the name {path.stem!r}"
+            )
+        names[path.stem] = path
+    return names
+
+
+def load_gold_question_sets(paths: Iterable[Path]) -> dict[str, list[GoldQuestion]]:
+    """Question sets by name (`gold_question_set_names`), skipping files that do not exist."""
+    return {
+        name: load_gold_questions(path)
+        for name, path in gold_question_set_names(paths).items()
+        if path.exists()
+    }
+
+
 def entry_matches_lookup(entry: SemanticEntry, lookup: Mapping[str, str]) -> bool:
     for key, expected in lookup.items():
+        if key == COVERS_REFERENCE_LOOKUP:
+            if not entry_covers_reference(entry, str(expected)):
+                return False
+            continue
         actual = getattr(entry, key)
         if str(actual) != str(expected):
             return False
@@ -777,27 +780,52 @@ def value_matches(actual: Any, expected: Any) -> bool:
     return str(actual or "").casefold() == str(expected or "").casefold()
 
 
-def score_gold_question(
-    question: GoldQuestion, entries: Iterable[SemanticEntry], pass_threshold: float = 0.8
+class GoldLookupIndex:
+    """Hash indexes over entries, built once per distinct set of lookup keys.
+
+    Matches keep the order of `entries`, so the first match is the entry a linear scan would pick.
+    """
+
+    def __init__(self, entries: Iterable[SemanticEntry]) -> None:
+        self.entries = list(entries)
+        self._indexes: dict[tuple[str, ...], dict[tuple[str, ...], list[SemanticEntry]]] = {}
+
+    def _index(self, keys: tuple[str, ...]) -> dict[tuple[str, ...], list[SemanticEntry]]:
+        index = self._indexes.get(keys)
+        if index is None:
+            index = {}
+            for entry in self.entries:
+                values = tuple(str(getattr(entry, key)) for key in keys)
+                index.setdefault(values, []).append(entry)
+            self._indexes[keys] = index
+        return index
+
+    def matching(self, lookup: Mapping[str, str]) -> list[SemanticEntry]:
+        keys = tuple(sorted(key for key in lookup if key != COVERS_REFERENCE_LOOKUP))
+        if keys:
+            values = tuple(str(lookup[key]) for key in keys)
+            candidates = self._index(keys).get(values, [])
+        else:
+            candidates = self.entries
+        reference = lookup.get(COVERS_REFERENCE_LOOKUP)
+        if reference is None:
+            return list(candidates)
+        return [entry for entry in candidates if entry_covers_reference(entry, str(reference))]
+
+
+def score_matching_entries(
+    question: GoldQuestion, matching: Sequence[SemanticEntry], pass_threshold: float = 0.8
 ) -> GoldQuestionScore:
-    matching = [entry for entry in entries if entry_matches_lookup(entry, question.lookup)]
     details: dict[str, Any] = {"lookup_matches": len(matching), "fields": {}}
     max_score = sum(question.rubric.values())
-    if not matching:
-        return GoldQuestionScore(
-            question_id=question.question_id,
-            score=0.0,
-            max_score=max_score,
-            passed=False,
-            details=details,
-        )
-
-    entry = matching[0]
+    # A question without a matching entry still reports each rubric field, as unmatched, so the
+    # per-field accuracy counts every question.
+    entry = matching[0] if matching else None
     score = 0.0
     for field_name, weight in question.rubric.items():
-        actual = getattr(entry, field_name)
+        actual = getattr(entry, field_name) if entry is not None else None
         expected = question.expected.get(field_name)
-        matched = value_matches(actual, expected)
+        matched = entry is not None and value_matches(actual, expected)
         if matched:
             score += weight
         details["fields"][field_name] = {
@@ -816,7 +844,83 @@ def score_gold_question(
     )
 
 
+def score_gold_question(
+    question: GoldQuestion, entries: Iterable[SemanticEntry], pass_threshold: float = 0.8
+) -> GoldQuestionScore:
+    matching = [entry for entry in entries if entry_matches_lookup(entry, question.lookup)]
+    return score_matching_entries(question, matching, pass_threshold)
+
+
 def score_gold_questions(
-    questions: Sequence[GoldQuestion], entries: Sequence[SemanticEntry]
+    questions: Sequence[GoldQuestion],
+    entries: Sequence[SemanticEntry] | GoldLookupIndex,
+    pass_threshold: float = 0.8,
 ) -> list[GoldQuestionScore]:
-    return [score_gold_question(question, entries) for question in questions]
+    index = entries if isinstance(entries, GoldLookupIndex) else GoldLookupIndex(entries)
+    return [
+        score_matching_entries(question, index.matching(question.lookup), pass_threshold)
+        for question in questions
+    ]
+
+
+def evaluate_gold_question_sets(
+    question_sets: Mapping[str, Sequence[GoldQuestion]], entries: Iterable[SemanticEntry]
+) -> list[GoldEvaluation]:
+    """Score every question set against the entries of each analysis backend separately."""
+    by_backend: dict[str, list[SemanticEntry]] = {}
+    for entry in entries:
+        by_backend.setdefault(entry.analysis_backend, []).append(entry)
+    if not by_backend:
+        by_backend[SemanticEntry.analysis_backend] = []
+    evaluations: list[GoldEvaluation] = []
+    for backend in sorted(by_backend):
+        index = GoldLookupIndex(by_backend[backend])
+        for eval_set in sorted(question_sets):
+            scores = score_gold_questions(question_sets[eval_set], index)
+            evaluations.append(GoldEvaluation(eval_set, backend, scores))
+    return evaluations
+
+
+def gold_score_rows(evaluation: GoldEvaluation) -> list[dict[str, Any]]:
+    return [
+        {
+            "eval_set": evaluation.eval_set,
+            "analysis_backend": evaluation.analysis_backend,
+            "question_id": score.question_id,
+            "score": score.score,
+            "max_score": score.max_score,
+            "passed": score.passed,
+            "details_json": json.dumps(score.details, sort_keys=True),
+        }
+        for score in evaluation.scores
+    ]
+
+
+def field_accuracy_rows(evaluations: Iterable[GoldEvaluation]) -> list[dict[str, Any]]:
+    """Per eval set, backend, and rubric field: how many questions matched and their weight."""
+    totals: dict[tuple[str, str, str], list[float]] = {}
+    for evaluation in evaluations:
+        for score in evaluation.scores:
+            for field_name, field_detail in score.details["fields"].items():
+                key = (evaluation.eval_set, evaluation.analysis_backend, field_name)
+                counts = totals.setdefault(key, [0, 0, 0.0, 0.0])
+                counts[0] += 1
+                counts[2] += field_detail["weight"]
+                if field_detail["matched"]:
+                    counts[1] += 1
+                    counts[3] += field_detail["weight"]
+    return [
+        {
+            "eval_set": eval_set,
+            "analysis_backend": backend,
+            "field_name": field_name,
+            "questions": int(questions),
+            "matched": int(matched),
+            "accuracy": round(matched / questions, 6),
+            "weighted_score": round(weighted, 6),
+            "max_weighted_score": round(max_weighted, 6),
+        }
+        for (eval_set, backend, field_name), (questions, matched, max_weighted, weighted) in sorted(
+            totals.items()
+        )
+    ]
@@ -0,0 +1,298 @@
+"""Bible reference extraction with a token trie of book names and abbreviations.
+
+Transcripts contain few digits, so extraction scans for chapter/verse numbers and walks a
+reversed token trie over the words immediately before each number. Full book names and spoken
+ordinals ("first Corinthians") match case-insensitively; abbreviations such as "Gen" or "1 Cor"
+must be capitalised so ordinary words like "is" or "am" are not read as books.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+
+# Canonical book names in canonical order, with the abbreviations recognised for each.
+BOOK_ALIASES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("Genesis", ("Gen", "Gn")),
+    ("Exodus", ("Exod", "Ex")),
+    ("Leviticus", ("Lev",)),
+    ("Numbers", ("Num",)),
+    ("Deuteronomy", ("Deut", "Dt")),
+    ("Joshua", ("Josh",)),
+    ("Judges", ("Judg",)),
+    ("Ruth", ()),
+    ("1 Samuel", ("1 Sam",)),
+    ("2 Samuel", ("2 Sam",)),
+    ("1 Kings", ("1 Kgs",)),
+    ("2 Kings", ("2 Kgs",)),
+    ("1 Chronicles", ("1 Chr", "1 Chron")),
+    ("2 Chronicles", ("2 Chr", "2 Chron")),
+    ("Ezra", ()),
+    ("Nehemiah", ("Neh",)),
+    ("Esther", ("Esth",)),
+    ("Job", ()),
+    ("Psalms", ("Ps", "Psa")),
+    ("Proverbs", ("Prov",)),
+    ("Ecclesiastes", ("Eccl", "Eccles")),
+    ("Song of Songs", ()),
+    ("Isaiah", ("Isa",)),
+    ("Jeremiah", ("Jer",)),
+    ("Lamentations", ("Lam",)),
+    ("Ezekiel", ("Ezek",)),
+    ("Daniel", ("Dan",)),
+    ("Hosea", ("Hos",)),
+    ("Joel", ()),
+    ("Amos", ()),
+    ("Obadiah", ("Obad",)),
+    ("Jonah", ()),
+    ("Micah", ("Mic",)),
+    ("Nahum", ("Nah",)),
+    ("Habakkuk", ("Hab",)),
+    ("Zephaniah", ("Zeph",)),
+    ("Haggai", ("Hag",)),
+    ("Zechariah", ("Zech",)),
+    ("Malachi", ("Mal",)),
+    ("Matthew", ("Matt", "Mt")),
+    ("Mark", ("Mk",)),
+    ("Luke", ("Lk",)),
+    ("John", ("Jn",)),
+    ("Acts", ()),
+    ("Romans", ("Rom",)),
+    ("1 Corinthians", ("1 Cor",)),
+    ("2 Corinthians", ("2 Cor",)),
+    ("Galatians", ("Gal",)),
+    ("Ephesians", ("Eph",)),
+    ("Philippians", ("Phil",)),
+    ("Colossians", ("Col",)),
+    ("1 Thessalonians", ("1 Thess",)),
+    ("2 Thessalonians", ("2 Thess",)),
+    ("1 Timothy", ("1 Tim",)),
+    ("2 Timothy", ("2 Tim",)),
+    ("Titus", ()),
+    ("Philemon", ("Philem",)),
+    ("Hebrews", ("Heb",)),
+    ("James", ("Jas",)),
+    ("1 Peter", ("1 Pet",)),
+    ("2 Peter", ("2 Pet",)),
+    ("1 John", ("1 Jn",)),
+    ("2 John", ("2 Jn",)),
+    ("3 John", ("3 Jn",)),
+    ("Jude", ()),
+    ("Revelation", ("Rev",)),
+)
+
+# Other spoken or written full names, matched case-insensitively like canonical names.
+ALTERNATE_NAMES = {
+    "Psalm": "Psalms",
+    "Song of Solomon": "Song of Songs",
+    "Revelations": "Revelation",
+}
+
+# Unnumbered names of numbered books. They are kept as-is because a speaker often omits the
+# number, but they have no canonical ordinal.
+AMBIGUOUS_BOOKS = (
+    "Samuel",
+    "Kings",
+    "Chronicles",
+    "Corinthians",
+    "Thessalonians",
+    "Timothy",
+    "Peter",
+)
+
+BIBLE_BOOKS = [book for book, _aliases in BOOK_ALIASES]
+BOOK_ORDINALS = {book: ordinal for ordinal, book in enumerate(BIBLE_BOOKS, start=1)}
+
+ORDINAL_PREFIXES = {
+    "1": ("1", "1st", "first"),
+    "2": ("2", "2nd", "second"),
+    "3": ("3", "3rd", "third"),
+}
+
+CHAPTER_VERSE_RE = re.compile(
+    r"(?<![\w:])(\d{1,3})(?::(\d{1,3}))?(?:\s*[-\u2013]\s*(?:(\d{1,3}):)?(\d{1,3}))?\b"
+)
+
+# Absolute verse ordinals encode book, chapter, and verse as BBCCCVVV so that every reference is
+# a closed integer interval. Chapter-only references span verses 0-999 of their chapters.
+BOOK_ORDINAL_SCALE = 1_000_000
+CHAPTER_ORDINAL_SCALE = 1_000
+LAST_VERSE = 999
+
+_TERMINAL = ""
+_OPENING_PUNCTUATION = "(\"'["
+_LOOKBACK_CHARS = 64
+
+
+@dataclass(frozen=True)
+class BibleReference:
+    book: str
+    chapter: int
+    verse_start: int | None
+    chapter_end: int
+    verse_end: int | None
+
+    @property
+    def book_ordinal(self) -> int | None:
+        return BOOK_ORDINALS.get(self.book)
+
+    @property
+    def start_ordinal(self) -> int | None:
+        book_ordinal = self.book_ordinal
+        if book_ordinal is None:
+            return None
+        return verse_ordinal(book_ordinal, self.chapter, self.verse_start or 0)
+
+    @property
+    def end_ordinal(self) -> int | None:
+        book_ordinal = self.book_ordinal
+        if book_ordinal is None:
+            return None
+        verse_end = self.verse_end if self.verse_end is not None else LAST_VERSE
+        return verse_ordinal(book_ordinal, self.chapter_end, verse_end)
+
+    def __str__(self) -> str:
+        label = f"{self.book} {self.chapter}"
+        if self.verse_start is None:
+            if self.verse_end is not None:
+                return f"{label}-{self.chapter_end}:{self.verse_end}"
+            return label if self.chapter_end == self.chapter else f"{label}-{self.chapter_end}"
+        label += f":{self.verse_start}"
+        if (self.chapter_end, self.verse_end) == (self.chapter, self.verse_start):
+            return label
+        if self.chapter_end != self.chapter:
+            label += f"-{self.chapter_end}:{self.verse_end}"
+        else:
+            label += f"-{self.verse_end}"
+        return label
+
+
+def verse_ordinal(book_ordinal: int, chapter: int, verse: int) -> int:
+    return book_ordinal * BOOK_ORDINAL_SCALE + chapter * CHAPTER_ORDINAL_SCALE + verse
+
+
+def _book_variants(book: str, aliases: tuple[str, ...]) -> list[tuple[str, bool]]:
+    variants = [(book, False), *((alias, True) for alias in aliases)]
+    expanded: list[tuple[str, bool]] = []
+    for name, is_abbreviation in variants:
+        number, _space, rest = name.partition(" ")
+        if number in ORDINAL_PREFIXES and rest:
+            expanded.extend(
+                (f"{prefix} {rest}", is_abbreviation) for prefix in ORDINAL_PREFIXES[number]
+            )
+        else:
+            expanded.append((name, is_abbreviation))
+    return expanded
+
+
+def _build_reversed_trie() -> dict[str, Any]:
+    root: dict[str, Any] = {}
+    entries = [(book, _book_variants(book, aliases)) for book, aliases in BOOK_ALIASES]
+    entries.extend((book, [(name, False)]) for name, book in ALTERNATE_NAMES.items())
+    entries.extend((book, [(book, False)]) for book in AMBIGUOUS_BOOKS)
+    for book, variants in entries:
+        for name, is_abbreviation in variants:
+            node = root
+            for token in reversed(name.casefold().split()):
+                node = node.setdefault(token, {})
+            node[_TERMINAL] = (book, is_abbreviation)
+    return root
+
+
+BOOK_TRIE = _build_reversed_trie()
+
+
+def _book_before(text: str, number_start: int) -> str | None:
+    prefix = text[max(0, number_start - _LOOKBACK_CHARS) : number_start]
+    if not prefix or not prefix[-1].isspace():
+        return None
+    node = BOOK_TRIE
+    best: str | None = None
+    last_token = ""
+    dotted = False
+    for position, word in enumerate(reversed(prefix.split())):
+        token = word.lstrip(_OPENING_PUNCTUATION)
+        if position == 0:
+            dotted = token.endswith(".")
+            token = token.removesuffix(".")
+            last_token = token
+        child = node.get(token.casefold()) if token else None
+        if child is None:
+            break
+        node = child
+        terminal = node.get(_TERMINAL)
+        if terminal is not None:
+            book, is_abbreviation = terminal
+            if is_abbreviation and last_token[:1].isupper():
+                best = book
+            elif not is_abbreviation and not dotted:
+                best = book
+        if word[:1] in _OPENING_PUNCTUATION:
+            break
+    return best
+
+
+def parse_bible_references(text: str) -> list[BibleReference]:
+    seen: set[BibleReference] = set()
+    refs: list[BibleReference] = []
+    for match in CHAPTER_VERSE_RE.finditer(text):
+        book = _book_before(text, match.start())
+        if book is None:
+            continue
+        chapter = int(match.group(1))
+        verse = int(match.group(2)) if match.group(2) else None
+        end_chapter = int(match.group(3)) if match.group(3) else None
+        end_value = int(match.group(4)) if match.group(4) else None
+        if verse is None and end_chapter is not None:
+            ref = BibleReference(book, chapter, None, end_chapter, end_value)
+        elif verse is None:
+            chapter_end = end_value if end_value is not None else chapter
+            ref = BibleReference(book, chapter, None, chapter_end, None)
+        else:
+            ref = BibleReference(
+                book,
+                chapter,
+                verse,
+                end_chapter if end_chapter is not None else chapter,
+                end_value if end_value is not None else verse,
+            )
+        if ref not in seen:
+            seen.add(ref)
+            refs.append(ref)
+    return refs
+
+
+def extract_bible_references(text: str) -> list[str]:
+    return [str(ref) for ref in parse_bible_references(text)]
+
+
+def reference_ordinal_range(label: str) -> tuple[int, int] | None:
+    """Return the absolute verse interval of the first reference in `label`, if it has one."""
+    for ref in parse_bible_references(label):
+        start, end = ref.start_ordinal, ref.end_ordinal
+        if start is not None and end is not None:
+            return (start, end)
+    return None
+
+
+def bible_reference_rows(
+    file_key: str, references: Iterable[tuple[BibleReference, str]]
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "file_key": file_key,
+            "reference": str(ref),
+            "book": ref.book,
+            "book_ordinal": ref.book_ordinal,
+            "chapter": ref.chapter,
+            "verse_start": ref.verse_start,
+            "chapter_end": ref.chapter_end,
+            "verse_end": ref.verse_end,
+            "start_ordinal": ref.start_ordinal,
+            "end_ordinal": ref.end_ordinal,
+            "reference_role": role,
+        }
+        for ref, role in references
+    ]
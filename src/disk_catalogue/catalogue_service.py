@@ -0,0 +1,276 @@
+"""Single-writer DuckDB catalogue service over a Unix socket.
+
+One process owns the read-write connection to `catalogue.duckdb`. Clients send JSON-lines
+requests; write batches are queued to one writer thread and each batch runs in its own
+transaction, while read queries run concurrently on per-request cursors of the same database.
+Scripts that would otherwise fight over the DuckDB file lock can share the catalogue this way.
+
+Requests (one JSON object per line):
+
+- `{"op": "ping"}`
+- `{"op": "query", "sql": "...", "params": [...]}` returns `columns` and `rows`
+- `{"op": "execute", "statements": [{"sql": "...", "params": [...]}, ...]}`
+
+Every response carries `ok`; failures carry `error` instead of a result. The service owns
+transaction boundaries, so statements that begin, end, or checkpoint a transaction are rejected.
+`query` takes a single SELECT (including SHOW, DESCRIBE, and table-valued PRAGMAs); anything
+else would write, or change the session, outside the writer's queue and is rejected too.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import queue
+import re
+import socket
+import socketserver
+import threading
+from collections.abc import Sequence
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+Statement = tuple[str, Sequence[Any]]
+
+# Long enough for a checkpoint's write batch queued behind others, short enough that a client
+# of a hung service fails instead of blocking forever.
+DEFAULT_CLIENT_TIMEOUT = 600.0
+
+_LEADING_COMMENTS = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+_TRANSACTION_CONTROL = re.compile(
+    r"(?:BEGIN|START|COMMIT|END|ROLLBACK|ABORT|CHECKPOINT|FORCE\s+CHECKPOINT)\b", re.IGNORECASE
+)
+
+
+class CatalogueServiceError(RuntimeError):
+    """A request failed inside the catalogue service."""
+
+
+def is_transaction_control(sql: str) -> bool:
+    """True for statements that would begin, end, or checkpoint the writer's transaction."""
+    return _TRANSACTION_CONTROL.match(_LEADING_COMMENTS.sub("", sql, count=1)) is not None
+
+
+def is_read_only_query(sql: str) -> bool:
+    """True when `sql` is exactly one statement and DuckDB parses it as a SELECT."""
+    statements = duckdb.extract_statements(sql)
+    return len(statements) == 1 and statements[0].type == duckdb.StatementType.SELECT
+
+
+class CatalogueService:
+    def __init__(self, db_path: Path, socket_path: Path) -> None:
+        self.db_path = db_path
+        self.socket_path = socket_path
+        self.con = duckdb.connect(str(db_path))
+        self._writes: queue.Queue[tuple[list[Statement], Future[int]] | None] = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="catalogue-writer")
+        self._server: _UnixServer | None = None
+        self._stopped = threading.Event()
+
+    def _write_loop(self) -> None:
+        cursor = self.con.cursor()
+        while True:
+            item = self._writes.get()
+            if item is None:
+                break
+            statements, result = item
+            try:
+                cursor.execute("BEGIN TRANSACTION")
+                for sql, params in statements:
+                    cursor.execute(sql, list(params))
+                cursor.execute("COMMIT")
+            except Exception as exc:
+                # The transaction may already be gone (or the connection invalidated); the
+                # writer must survive so the failure reaches this client and later batches run.
+                with contextlib.suppress(Exception):
+                    cursor.execute("ROLLBACK")
+                result.set_exception(exc)
+            else:
+                result.set_result(len(statements))
+        cursor.close()
+
+    def submit(self, statements: list[Statement]) -> Future[int]:
+        for sql, _params in statements:
+            if is_transaction_control(sql):
+                raise CatalogueServiceError(
+                    f"transaction control is managed by the service: {sql.strip()[:40]!r}"
+                )
+        result: Future[int] = Future()
+        self._writes.put((statements, result))
+        return result
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> dict[str, Any]:
+        if not is_read_only_query(sql):
+            raise CatalogueServiceError(
+                f"query takes one read-only SELECT; send writes with execute: {sql.strip()[:40]!r}"
+            )
+        cursor = self.con.cursor()
+        try:
+            cursor.execute(sql, list(params))
+            columns = [column[0] for column in cursor.description or []]
+            rows = [list(row) for row in cursor.fetchall()] if columns else []
+        finally:
+            cursor.close()
+        return {"columns": columns, "rows": rows}
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        op = request.get("op")
+        try:
+            if op == "ping":
+                return {"ok": True}
+            if op == "query":
+                return {"ok": True, **self.query(request["sql"], request.get("params", []))}
+            if op == "execute":
+                statements = [
+                    (item["sql"], item.get("params", [])) for item in request["statements"]
+                ]
+                return {"ok": True, "statements": self.submit(statements).result()}
+            return {"ok": False, "error": f"unknown op: {op!r}"}
+        except Exception as exc:
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+
+    def start(self) -> None:
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self._server = _UnixServer(str(self.socket_path), _RequestHandler)
+        self._server.service = self
+        self._writer.start()
+        threading.Thread(
+            target=self._server.serve_forever, name="catalogue-server", daemon=True
+        ).start()
+
+    def serve_forever(self) -> None:
+        """Serve until `stop()` is called or the calling thread is interrupted."""
+        self.start()
+        try:
+            self._stopped.wait()
+        finally:
+            self.stop()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        if self._writer.is_alive():
+            self._writes.put(None)
+            self._writer.join()
+        self.con.close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    service: CatalogueService
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: _UnixServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+            except json.JSONDecodeError as exc:
+                response: dict[str, Any] = {"ok": False, "error": f"invalid request: {exc}"}
+            else:
+                response = self.server.service.handle(request)
+            payload = json.dumps(response, default=str) + "\n"
+            self.wfile.write(payload.encode("utf-8"))
+            self.wfile.flush()
+
+
+class CatalogueClient:
+    """Blocking client for `CatalogueService`; one socket per client.
+
+    Requests that get no response within `timeout` seconds raise `CatalogueServiceError`; the
+    connection is then out of step with the service and should be closed.
+    """
+
+    def __init__(self, socket_path: Path, timeout: float | None = DEFAULT_CLIENT_TIMEOUT) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(str(socket_path))
+        self._file = self._socket.makefile("rwb")
+
+    def request(self, payload: dict[str, Any]) -> dict[str, Any]:
+        try:
+            # default=str sends datetimes as text, which DuckDB casts on insert.
+            self._file.write(json.dumps(payload, default=str).encode("utf-8") + b"\n")
+            self._file.flush()
+            line = self._file.readline()
+        except OSError as exc:
+            raise CatalogueServiceError(f"catalogue service connection failed: {exc}") from exc
+        if not line:
+            raise CatalogueServiceError("catalogue service closed the connection")
+        response: dict[str, Any] = json.loads(line)
+        if not response.get("ok"):
+            raise CatalogueServiceError(str(response.get("error")))
+        return response
+
+    def ping(self) -> bool:
+        return bool(self.request({"op": "ping"})["ok"])
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> list[tuple[Any, ...]]:
+        response = self.request({"op": "query", "sql": sql, "params": list(params)})
+        return [tuple(row) for row in response["rows"]]
+
+    def query_dicts(self, sql: str, params: Sequence[Any] = ()) -> list[dict[str, Any]]:
+        response = self.request({"op": "query", "sql": sql, "params": list(params)})
+        columns = response["columns"]
+        return [dict(zip(columns, row, strict=True)) for row in response["rows"]]
+
+    def relation_exists(self, name: str) -> bool:
+        """Same check as `reports.relation_exists`, answered by the service."""
+        return bool(
+            self.query(
+                "SELECT 1 FROM information_schema.tables "
+                "WHERE table_schema = 'main' AND table_name = ?",
+                [name],
+            )
+        )
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        self.execute_batch([(sql, params)])
+
+    def execute_batch(self, statements: Sequence[Statement]) -> int:
+        payload = [{"sql": sql, "params": list(params)} for sql, params in statements]
+        return int(self.request({"op": "execute", "statements": payload})["statements"])
+
+    def close(self) -> None:
+        # Closing flushes any request left unsent when the service went away.
+        with contextlib.suppress(OSError):
+            self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> CatalogueClient:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+
+def write_catalogue(
+    db_path: Path, statements: Sequence[Statement], service_socket: Path | None = None
+) -> None:
+    """Run write statements in one transaction, through the catalogue service when given.
+
+    Without a service the database is opened read-write for the transaction only, so the file
+    lock is held no longer than the write itself.
+    """
+    if service_socket is not None:
+        with CatalogueClient(service_socket) as client:
+            client.execute_batch(statements)
+        return
+    con = duckdb.connect(str(db_path))
+    try:
+        con.execute("BEGIN TRANSACTION")
+        for sql, params in statements:
+            con.execute(sql, list(params))
+        con.execute("COMMIT")
+    finally:
+        con.close()
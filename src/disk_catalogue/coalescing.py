@@ -0,0 +1,106 @@
+"""Background worker that runs at most one job at a time and coalesces the backlog.
+
+Checkpoint exports are slow (CSV rewrites, DuckDB table replacement) and only the newest state
+matters, so the transcription loop hands them to a `CoalescingWorker` instead of waiting.
+While a job runs, further submissions are merged into a single pending job with the caller's
+`merge` function (e.g. the newer state snapshot plus the union of changed file_keys), so the
+worker never falls more than one job behind and never runs a stale snapshot after a newer one.
+
+A failed job is reported through `on_error` and merged into the next submission, so its work
+is retried rather than lost. `close` finishes any pending job before the thread exits.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class CoalescingWorker(Generic[T]):
+    def __init__(
+        self,
+        run: Callable[[T], None],
+        merge: Callable[[T, T], T],
+        *,
+        name: str = "coalescing-worker",
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        self._run = run
+        self._merge = merge
+        self._on_error = on_error
+        self._condition = threading.Condition()
+        # At most one job each; lists rather than Optional so None can be a job.
+        self._pending: list[T] = []
+        self._failed: list[T] = []
+        self._busy = False
+        self._closed = False
+        self.completed = 0
+        self.coalesced = 0
+        self.errors: list[Exception] = []
+        self._thread = threading.Thread(target=self._loop, name=name, daemon=True)
+        self._thread.start()
+
+    def __enter__(self) -> CoalescingWorker[T]:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    @property
+    def busy(self) -> bool:
+        with self._condition:
+            return self._busy or bool(self._pending)
+
+    def submit(self, job: T) -> None:
+        """Queue `job`, merging it into the pending job if one is already waiting."""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("worker is closed")
+            if self._failed:
+                job = self._merge(self._failed.pop(), job)
+            if self._pending:
+                job = self._merge(self._pending.pop(), job)
+                self.coalesced += 1
+            self._pending.append(job)
+            self._condition.notify_all()
+
+    def wait_idle(self) -> None:
+        """Block until nothing is running or pending."""
+        with self._condition:
+            while self._busy or self._pending:
+                self._condition.wait()
+
+    def close(self) -> None:
+        """Run any pending job, then stop the thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending and not self._closed:
+                    self._condition.wait()
+                if not self._pending:
+                    return
+                job = self._pending.pop()
+                self._busy = True
+            try:
+                self._run(job)
+            except Exception as exc:
+                with self._condition:
+                    self.errors.append(exc)
+                    if self._failed:
+                        job = self._merge(self._failed.pop(), job)
+                    self._failed.append(job)
+                if self._on_error is not None:
+                    self._on_error(exc)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self.completed += 1
+                    self._condition.notify_all()
@@ -0,0 +1,134 @@
+"""One DuckDB file holding every completed semantic entry, replacing per-file sidecar globbing.
+
+Exports, `--verify`, and `--evaluate` used to glob `transcripts/**/*.semantic.json` and parse
+thousands of small files on the recovery SSD each time. An `EntryStore` keeps the same rows
+(the `audio_semantic_catalogue` columns) in a single table, so loading the catalogue is one
+sequential read. Each entry is stored together with the record's state in one transaction, so
+an entry and its "completed" status cannot disagree after a crash; `record_states` returns those
+states for the transcription script to recover from when its JSON state file is behind.
+
+Sidecars become an optional mirror; `import_sidecars` loads existing ones into a new store.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+from disk_catalogue.audio_semantic import (
+    SemanticEntry,
+    semantic_entry_from_mapping,
+    semantic_entry_row,
+)
+from disk_catalogue.semantic_tables import (
+    SEMANTIC_CATALOGUE,
+    TableSchema,
+    replace_file_rows,
+)
+
+ENTRY_STORE = TableSchema(
+    "semantic_entries", (*SEMANTIC_CATALOGUE.columns, ("record_state", "VARCHAR"))
+)
+
+StoredEntry = tuple[SemanticEntry, Mapping[str, Any] | None]
+
+
+class EntryStore:
+    """Semantic entries by file_key in the DuckDB file at `path`.
+
+    DuckDB allows one read-write process per file, so the store belongs to one transcription
+    run. The connection is shared across threads behind a lock, so a background checkpoint
+    export can read while the main loop writes.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = str(path)
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = duckdb.connect(self.path)
+        self._con.execute(ENTRY_STORE.create_sql(replace=False))
+
+    def __enter__(self) -> EntryStore:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._con.execute(f"SELECT COUNT(*) FROM {ENTRY_STORE.name}").fetchone()
+        return int(row[0]) if row else 0
+
+    def put(self, entry: SemanticEntry, record_state: Mapping[str, Any] | None = None) -> None:
+        self.put_many([(entry, record_state)])
+
+    def put_many(self, items: Iterable[StoredEntry]) -> int:
+        """Insert or replace entries, with their record states, in one transaction."""
+        rows = [
+            {
+                **semantic_entry_row(entry),
+                "record_state": json.dumps(state, sort_keys=True) if state is not None else None,
+            }
+            for entry, state in items
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self._con.execute("BEGIN TRANSACTION")
+            try:
+                replace_file_rows(
+                    self._con, ENTRY_STORE, rows, {str(row["file_key"]) for row in rows}
+                )
+            except BaseException:
+                self._con.execute("ROLLBACK")
+                raise
+            self._con.execute("COMMIT")
+        return len(rows)
+
+    def _select(self, columns: str, file_keys: Iterable[str] | None) -> list[tuple[Any, ...]]:
+        sql = f"SELECT {columns} FROM {ENTRY_STORE.name}"
+        params: list[Any] = []
+        if file_keys is not None:
+            sql += " WHERE file_key IN (SELECT UNNEST($1))"
+            params = [sorted(file_keys)]
+        with self._lock:
+            return self._con.execute(f"{sql} ORDER BY file_key", params).fetchall()
+
+    def load(self, file_keys: Iterable[str] | None = None) -> dict[str, SemanticEntry]:
+        """Entries by file_key, all of them or those in `file_keys`, in one query."""
+        names = SEMANTIC_CATALOGUE.column_names
+        targets = ", ".join(f'"{name}"' for name in names)
+        entries: dict[str, SemanticEntry] = {}
+        for values in self._select(targets, file_keys):
+            entry = semantic_entry_from_mapping(dict(zip(names, values, strict=True)))
+            entries[entry.file_key] = entry
+        return entries
+
+    def file_keys(self) -> set[str]:
+        return {str(row[0]) for row in self._select("file_key", None)}
+
+    def record_states(self) -> dict[str, dict[str, Any]]:
+        """The record state stored with each entry, by file_key."""
+        return {
+            file_key: json.loads(state)
+            for file_key, state in self._select("file_key, record_state", None)
+            if state is not None
+        }
+
+    def import_sidecars(self, paths: Iterable[Path]) -> int:
+        """Load `.semantic.json` sidecars (without record states); returns how many."""
+        entries = [
+            semantic_entry_from_mapping(json.loads(path.read_text(encoding="utf-8")))
+            for path in paths
+        ]
+        return self.put_many((entry, None) for entry in entries)
@@ -0,0 +1,133 @@
+"""Parallel stat and hash passes over many files, for checking plans against slow drives.
+
+Validating a rename plan used to stat each path several times and hash one file after another.
+On a USB drive every stat is a round trip, so `stat_paths` stats each distinct path once on a
+thread pool and keeps many requests in flight.
+
+`hash_files` also hashes on a pool, but limits how many files are read at once from each device
+(`st_dev`). Parallel reads from one spinning disk or USB bridge seek against each other rather
+than add bandwidth, while reads from different devices overlap freely. With a `MemoCache`, a
+file whose path, size, and modification time have not changed since it was last hashed is not
+read again.
+"""
+
+from __future__ import annotations
+
+import errno
+import os
+import threading
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain, zip_longest
+from pathlib import Path
+
+from disk_catalogue.audio_semantic import file_sha256
+from disk_catalogue.memo_cache import FILE_HASHES, MemoCache, stat_key
+from disk_catalogue.progress import ProgressReporter, ProgressTracker
+
+DEFAULT_WORKERS = 16
+DEFAULT_HASHES_PER_DEVICE = 1
+# New hashes are written to the cache in batches, so an interrupted run keeps most of its work.
+CACHE_BATCH = 64
+# Errors that mean "not there", as for Path.exists(). Anything else (EACCES, EIO) is raised.
+_MISSING_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
+
+
+def _stat_or_none(path: Path) -> os.stat_result | None:
+    try:
+        return path.stat()
+    except OSError as exc:
+        if exc.errno in _MISSING_ERRNOS:
+            return None
+        raise
+
+
+def stat_paths(
+    paths: Iterable[Path], workers: int = DEFAULT_WORKERS
+) -> dict[Path, os.stat_result | None]:
+    """Stat each distinct path once; None for paths that do not exist.
+
+    Other stat errors, such as permission denied or an I/O error, propagate.
+    """
+    unique = list(dict.fromkeys(paths))
+    if workers <= 1 or len(unique) <= 1:
+        return {path: _stat_or_none(path) for path in unique}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="stat") as pool:
+        return dict(zip(unique, pool.map(_stat_or_none, unique), strict=True))
+
+
+def _interleave_devices(
+    files: Iterable[tuple[Path, os.stat_result]],
+) -> list[tuple[Path, os.stat_result]]:
+    """Order files round-robin across devices, so each device's queue starts at once."""
+    by_device: dict[int, list[tuple[Path, os.stat_result]]] = defaultdict(list)
+    for item in files:
+        by_device[item[1].st_dev].append(item)
+    rounds = zip_longest(*by_device.values())
+    return [item for item in chain.from_iterable(rounds) if item is not None]
+
+
+def hash_files(
+    files: Mapping[Path, os.stat_result],
+    workers: int = DEFAULT_WORKERS,
+    per_device: int = DEFAULT_HASHES_PER_DEVICE,
+    cache: MemoCache | None = None,
+    progress: ProgressReporter | None = None,
+    hasher: Callable[[Path], str] = file_sha256,
+) -> dict[Path, str]:
+    """SHA-256 of each file, given the stat taken for it, reading at most `per_device` at once.
+
+    Cached hashes are counted as skipped work in the progress report.
+    """
+    if workers <= 0 or per_device <= 0:
+        raise ValueError("workers and per_device must be positive")
+    tracker = ProgressTracker(
+        "hash", total_files=len(files), total_bytes=sum(stat.st_size for stat in files.values())
+    )
+    keys = {path: stat_key(path, stat) for path, stat in files.items()}
+    cached = cache.lookup_many(FILE_HASHES, keys.values()) if cache is not None else {}
+    hashes: dict[Path, str] = {}
+    pending: list[tuple[Path, os.stat_result]] = []
+    for path, stat in files.items():
+        if keys[path] in cached:
+            hashes[path] = str(cached[keys[path]])
+            tracker.skip(bytes_=stat.st_size)
+        else:
+            pending.append((path, stat))
+
+    ordered = _interleave_devices(pending)
+    devices = {stat.st_dev for _, stat in ordered}
+    limits = {device: threading.Semaphore(per_device) for device in devices}
+    lock = threading.Lock()
+    unsaved: list[tuple[str, str]] = []
+
+    def save() -> None:
+        if cache is not None and unsaved:
+            cache.put_many(FILE_HASHES, unsaved)
+        unsaved.clear()
+
+    def run(item: tuple[Path, os.stat_result]) -> str:
+        path, stat = item
+        with limits[stat.st_dev]:
+            digest = hasher(path)
+        with lock:
+            tracker.advance(bytes_=stat.st_size, path=str(path))
+            unsaved.append((keys[path], digest))
+            if len(unsaved) >= CACHE_BATCH:
+                save()
+        if progress is not None:
+            progress.report(tracker)
+        return digest
+
+    try:
+        if ordered:
+            pool_size = min(workers, per_device * len(devices))
+            with ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="hash") as pool:
+                for (path, _), digest in zip(ordered, pool.map(run, ordered), strict=True):
+                    hashes[path] = digest
+    finally:
+        save()
+    if progress is not None and files:
+        progress.report(tracker, state="done", force=True)
+    return hashes
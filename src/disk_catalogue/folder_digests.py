@@ -0,0 +1,392 @@
+"""Merkle directory digests and MinHash sketches for finding copied folder trees across drives.
+
+`directory_digests` makes one pass over (drive, path, size) rows sorted by drive and path, as
+`SELECT ... FROM files ORDER BY Drive, RelativePath` returns them. Each directory is finalised
+as soon as the sorted paths leave it:
+
+- its digest hashes the sorted entries below it, a (name, size) entry per file and a
+  (name, digest) entry per subdirectory, so two trees with identical contents have equal
+  digests wherever they are mounted and whatever the top folder is called;
+- its sketch is a bottom-k MinHash of the (name, size) tokens of every file in the subtree,
+  merged from its children's sketches rather than recomputed, so estimates for partially
+  overlapping trees cost O(k) per directory.
+
+`find_folder_matches` pairs directories on different drives that share sketch values, reports
+the estimated Jaccard similarity and how much of each folder is contained in the other, and
+keeps one statement per copied tree.
+"""
+
+from __future__ import annotations
+
+import heapq
+import unicodedata
+from collections import Counter, defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from itertools import combinations
+from typing import Any
+
+import duckdb
+
+DEFAULT_SKETCH_SIZE = 128
+
+FILES_SQL = """
+SELECT Drive, RelativePath, CAST("FileSize#" AS BIGINT)
+FROM files
+WHERE Drive <> '' AND RelativePath IS NOT NULL AND "FileSize#" IS NOT NULL
+ORDER BY Drive, RelativePath
+"""
+
+
+@dataclass(frozen=True)
+class DirectoryDigest:
+    drive: str
+    path: str
+    digest: str
+    files: int
+    bytes: int
+    sketch: tuple[int, ...]
+
+    @property
+    def label(self) -> str:
+        return f"{self.drive}:/{self.path}"
+
+
+@dataclass(frozen=True)
+class FolderMatch:
+    a: DirectoryDigest
+    b: DirectoryDigest
+    jaccard: float
+    a_in_b: float
+    b_in_a: float
+
+    @property
+    def exact(self) -> bool:
+        return self.a.digest == self.b.digest
+
+    @property
+    def overlap(self) -> float:
+        return max(self.a_in_b, self.b_in_a)
+
+    @property
+    def copy_and_source(self) -> tuple[DirectoryDigest, DirectoryDigest]:
+        """The folder more fully contained in the other first."""
+        return (self.a, self.b) if self.a_in_b >= self.b_in_a else (self.b, self.a)
+
+    def describe(self) -> str:
+        copy, source = self.copy_and_source
+        if self.exact:
+            return f"{copy.label} is an exact copy of {source.label}"
+        return f"{copy.label} is a {self.overlap:.0%} copy of {source.label}"
+
+    def row(self) -> tuple[Any, ...]:
+        return (
+            self.a.drive,
+            self.a.path,
+            self.b.drive,
+            self.b.path,
+            self.a.files,
+            self.b.files,
+            round(self.jaccard, 3),
+            round(self.a_in_b, 3),
+            round(self.b_in_a, 3),
+            self.exact,
+        )
+
+
+MATCH_COLUMNS = [
+    "a_drive",
+    "a_path",
+    "b_drive",
+    "b_path",
+    "a_files",
+    "b_files",
+    "jaccard",
+    "a_in_b",
+    "b_in_a",
+    "exact",
+]
+
+
+def normalise_name(name: str) -> str:
+    return unicodedata.normalize("NFC", name).lower()
+
+
+def _hash64(*parts: str) -> int:
+    data = "\0".join(parts).encode("utf-8", "surrogatepass")
+    return int.from_bytes(blake2b(data, digest_size=8).digest(), "big")
+
+
+def _entry(kind: str, name: str, value: str) -> bytes:
+    return blake2b(f"{kind}\0{name}\0{value}".encode("utf-8", "surrogatepass")).digest()
+
+
+@dataclass
+class _OpenDirectory:
+    parts: tuple[str, ...]
+    entries: list[bytes] = field(default_factory=list)
+    values: set[int] = field(default_factory=set)
+    files: int = 0
+    bytes: int = 0
+
+
+def _trim(directory: _OpenDirectory, sketch_size: int) -> None:
+    # Keep only the values that can still reach this directory's sketch.
+    if len(directory.values) > 4 * sketch_size:
+        directory.values = set(heapq.nsmallest(sketch_size, directory.values))
+
+
+def directory_digests(
+    rows: Iterable[tuple[str, str, int]],
+    sketch_size: int = DEFAULT_SKETCH_SIZE,
+    min_files: int = 1,
+) -> Iterator[DirectoryDigest]:
+    """Digest and sketch every directory in one pass over rows sorted by (drive, path).
+
+    Directories are yielded bottom-up as they are closed; those with fewer than `min_files`
+    files in their subtree still feed their parents but are not yielded.
+    """
+    stack: list[_OpenDirectory] = []
+    drive = ""
+    previous: tuple[str, str] | None = None
+
+    def close() -> DirectoryDigest | None:
+        current = stack.pop()
+        digest = blake2b(b"".join(sorted(current.entries)), digest_size=16).hexdigest()
+        sketch = tuple(heapq.nsmallest(sketch_size, current.values))
+        if stack:
+            parent = stack[-1]
+            parent.entries.append(_entry("d", normalise_name(current.parts[-1]), digest))
+            parent.values.update(sketch)
+            _trim(parent, sketch_size)
+            parent.files += current.files
+            parent.bytes += current.bytes
+        if current.files < min_files:
+            return None
+        return DirectoryDigest(
+            drive, "/".join(current.parts), digest, current.files, current.bytes, sketch
+        )
+
+    for row_drive, path, size in rows:
+        key = (row_drive, path)
+        if previous is not None and key < previous:
+            raise ValueError(f"rows must be sorted by drive and path: {key} after {previous}")
+        previous = key
+        *parts, name = path.split("/")
+        if row_drive != drive:
+            while stack:
+                closed = close()
+                if closed is not None:
+                    yield closed
+            drive = row_drive
+            stack.append(_OpenDirectory(()))
+        common = 0
+        for current, part in zip(stack[1:], parts, strict=False):
+            if current.parts[-1] != part:
+                break
+            common += 1
+        while len(stack) > common + 1:
+            closed = close()
+            if closed is not None:
+                yield closed
+        for depth in range(common, len(parts)):
+            stack.append(_OpenDirectory(tuple(parts[: depth + 1])))
+        current = stack[-1]
+        key_name = normalise_name(name)
+        current.entries.append(_entry("f", key_name, str(size)))
+        current.values.add(_hash64(key_name, str(size)))
+        current.files += 1
+        current.bytes += size
+        _trim(current, sketch_size)
+    while stack:
+        closed = close()
+        if closed is not None:
+            yield closed
+
+
+@dataclass(frozen=True)
+class SketchComparison:
+    a_sample: int
+    b_sample: int
+    shared: int
+    exact: bool
+
+    @property
+    def jaccard(self) -> float:
+        union = self.a_sample + self.b_sample - self.shared
+        return self.shared / union if union else 0.0
+
+    @property
+    def a_in_b(self) -> float:
+        return self.shared / self.a_sample if self.a_sample else 0.0
+
+    @property
+    def b_in_a(self) -> float:
+        return self.shared / self.b_sample if self.b_sample else 0.0
+
+
+def compare_sketches(
+    a: tuple[int, ...], b: tuple[int, ...], sketch_size: int = DEFAULT_SKETCH_SIZE
+) -> SketchComparison:
+    """Compare two bottom-k sketches on the hash range both cover completely.
+
+    Below the smaller of the two full sketches' largest values, each sketch holds every token
+    of its set, so membership there is exact and the overlap of that uniform sample estimates
+    Jaccard and containment; the sample sizes say how far to trust it. With two partial
+    sketches (sets smaller than `sketch_size`) the comparison is exact.
+    """
+    limit = min((sketch[-1] for sketch in (a, b) if len(sketch) >= sketch_size), default=None)
+    a_values = {value for value in a if limit is None or value <= limit}
+    b_values = {value for value in b if limit is None or value <= limit}
+    return SketchComparison(
+        len(a_values), len(b_values), len(a_values & b_values), exact=limit is None
+    )
+
+
+Key = tuple[str, str]
+
+
+def _key(directory: DirectoryDigest) -> Key:
+    return directory.drive, directory.path
+
+
+def _parent(key: Key) -> Key | None:
+    drive, path = key
+    if not path:
+        return None
+    return drive, path.rpartition("/")[0]
+
+
+def _nested(a: Key, b: Key) -> bool:
+    """True when one folder is the other or sits inside it on the same drive."""
+    if a[0] != b[0]:
+        return False
+    shorter, longer = sorted((a[1], b[1]), key=len)
+    return not shorter or longer == shorter or longer.startswith(shorter + "/")
+
+
+def _depth(pair: tuple[Key, Key]) -> int:
+    return sum(path.count("/") + 1 for _drive, path in pair if path)
+
+
+def find_folder_matches(
+    directories: Iterable[DirectoryDigest],
+    threshold: float = 0.9,
+    sketch_size: int = DEFAULT_SKETCH_SIZE,
+    min_samples: int = 16,
+    max_bucket: int = 200,
+    same_drive: bool = False,
+    tolerance: float = 0.1,
+) -> list[FolderMatch]:
+    """Folder pairs where at least `threshold` of one folder's files are in the other.
+
+    Containment is estimated from at least `min_samples` sampled files of the copied folder
+    unless both folders are small enough to compare exactly, which limits matches to folders
+    within about `sketch_size / min_samples` times each other's size. Values held by more than
+    `max_bucket` directories (ubiquitous files) are ignored for pairing.
+
+    A copied tree matches at every level, so pairs are walked from the top down and one
+    statement is kept per tree. A pair is dropped when a neighbouring pair one level down
+    says more: it narrows the source to a subfolder that still contains the copy, is more
+    than `tolerance` more similar, or is an exact copy where this pair is not. A pair is
+    covered, and dropped, when a parent-level pair (either folder or both replaced by its
+    parent) is kept or covered by a statement whose copy folder contains this pair's copy
+    folder, or that is at most `tolerance` less similar.
+    """
+    dirs = list(directories)
+    by_value: dict[int, list[int]] = defaultdict(list)
+    for index, directory in enumerate(dirs):
+        for value in directory.sketch:
+            by_value[value].append(index)
+    shared: Counter[tuple[int, int]] = Counter()
+    for members in by_value.values():
+        if len(members) > max_bucket:
+            continue
+        for i, j in combinations(members, 2):
+            if same_drive or dirs[i].drive != dirs[j].drive:
+                shared[(i, j)] += 1
+
+    matches: dict[tuple[Key, Key], FolderMatch] = {}
+    min_shared = threshold * min_samples
+    for (i, j), count in shared.items():
+        small = len(dirs[i].sketch) < sketch_size and len(dirs[j].sketch) < sketch_size
+        if count < min_shared and not small:
+            continue
+        a, b = sorted((dirs[i], dirs[j]), key=_key)
+        if _nested(_key(a), _key(b)):
+            continue
+        result = compare_sketches(a.sketch, b.sketch, sketch_size)
+        if max(result.a_in_b, result.b_in_a) < threshold:
+            continue
+        copy_sample = result.a_sample if result.a_in_b >= result.b_in_a else result.b_sample
+        if copy_sample < min_samples and not result.exact:
+            continue
+        matches[(_key(a), _key(b))] = FolderMatch(
+            a, b, result.jaccard, result.a_in_b, result.b_in_a
+        )
+
+    parents: dict[tuple[Key, Key], list[tuple[Key, Key]]] = defaultdict(list)
+    children: dict[tuple[Key, Key], list[tuple[Key, Key]]] = defaultdict(list)
+    for pair in matches:
+        left, right = pair
+        parent_left, parent_right = _parent(left), _parent(right)
+        for up_left, up_right in (
+            (parent_left, right),
+            (left, parent_right),
+            (parent_left, parent_right),
+        ):
+            if up_left is None or up_right is None:
+                continue
+            up = (up_left, up_right) if up_left <= up_right else (up_right, up_left)
+            if up in matches:
+                parents[pair].append(up)
+                children[up].append(pair)
+
+    def containment(match: FolderMatch, key: Key) -> float:
+        return match.a_in_b if key == _key(match.a) else match.b_in_a
+
+    def copy_side(match: FolderMatch) -> Key:
+        return _key(match.a if match.a_in_b >= match.b_in_a else match.b)
+
+    def better_child(match: FolderMatch, child: FolderMatch) -> bool:
+        copy = copy_side(match)
+        if copy in (_key(child.a), _key(child.b)):
+            return containment(child, copy) >= threshold
+        return child.jaccard > match.jaccard + tolerance or (
+            child.exact and not match.exact and child.jaccard >= match.jaccard
+        )
+
+    # The kept statement (its similarity and copy folder) each covered pair falls under.
+    anchors: dict[tuple[Key, Key], tuple[float, Key]] = {}
+    kept: list[FolderMatch] = []
+    for pair in sorted(matches, key=_depth):
+        match = matches[pair]
+        copy = copy_side(match)
+        anchor = next(
+            (
+                anchors[up]
+                for up in parents[pair]
+                if up in anchors
+                and (match.jaccard <= anchors[up][0] + tolerance or _nested(copy, anchors[up][1]))
+            ),
+            None,
+        )
+        if anchor is not None:
+            anchors[pair] = anchor
+        elif not any(better_child(match, matches[down]) for down in children[pair]):
+            anchors[pair] = (match.jaccard, copy)
+            kept.append(match)
+    return sorted(
+        kept,
+        key=lambda match: (-match.overlap, -(match.a.files + match.b.files), match.a.label),
+    )
+
+
+def catalogue_rows(
+    con: duckdb.DuckDBPyConnection, batch_size: int = 10_000
+) -> Iterator[tuple[str, str, int]]:
+    """Stream (drive, path, size) rows from the `files` view in the order digests need."""
+    cursor = con.execute(FILES_SQL)
+    while batch := cursor.fetchmany(batch_size):
+        yield from batch
@@ -2,16 +2,39 @@ from __future__ import annotations
 
 import csv
 import json
-import re
-import unicodedata
 from collections import Counter
 from collections.abc import Callable, Iterable, Mapping, Sequence
-from dataclasses import asdict, dataclass
-from hashlib import sha256
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, replace
+from functools import cache
+from itertools import chain
 from pathlib import Path
 from typing import Any
 
-from disk_catalogue.audio_semantic import is_generic_title, normalise_space
+from disk_catalogue.audio_semantic import file_sha256
+from disk_catalogue.file_checks import (
+    DEFAULT_HASHES_PER_DEVICE,
+    DEFAULT_WORKERS,
+    hash_files,
+    stat_paths,
+)
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.move_engine import (
+    DEFAULT_CHUNK_BYTES,
+    MoveError,
+    MoveJournal,
+    move_file,
+    resume_move,
+)
+from disk_catalogue.progress import ProgressReporter
+from disk_catalogue.rename_planner import (
+    RENAME_RULES_VERSION,
+    AlbumSpec,
+    RenameEntry,
+    RenameRules,
+    parse_size,
+    rename_rules_from_mapping,
+)
 
 DEFAULT_TARGET_ROOT = Path(
     "/Volumes/ExtSSD-Data/Avery Willis Storying Audio/Following Jesus - Renamed"
@@ -23,65 +46,59 @@ DEFAULT_ALBUM_CATALOGUE_PATH = DEFAULT_RENAME_DIR / "following_jesus_album_catal
 DEFAULT_MARKDOWN_CATALOGUE_PATH = DEFAULT_RENAME_DIR / "following_jesus_catalogue.md"
 DEFAULT_VALIDATION_REPORT_PATH = DEFAULT_RENAME_DIR / "following_jesus_rename_validation.json"
 
-PLAN_FIELDNAMES = [
-    "file_key",
-    "module_code",
-    "module_title",
-    "source_album_folder",
-    "source_file_name",
-    "disc_index",
-    "track_index",
-    "selected_title",
-    "embedded_title",
-    "semantic_title",
-    "track_type",
-    "bible_reference",
-    "duration_seconds",
-    "size_bytes",
-    "source_sha256",
-    "source_path",
-    "target_relative_path",
-    "target_path",
-]
-
-
-@dataclass(frozen=True)
-class AlbumSpec:
-    module_code: str
-    module_title: str
-    module_sort: int
-
-    @property
-    def folder_name(self) -> str:
-        return f"{self.module_code} {self.module_title}"
-
-
-@dataclass(frozen=True)
-class RenameEntry:
-    file_key: str
-    module_code: str
-    module_title: str
-    module_sort: int
-    source_album_folder: str
-    source_file_name: str
-    disc_index: int
-    track_index: int
-    selected_title: str
-    embedded_title: str
-    semantic_title: str
-    track_type: str
-    bible_reference: str
-    duration_seconds: float | None
-    size_bytes: int | None
-    source_sha256: str
-    source_path: str
-    target_relative_path: str
-    target_path: str
-
-    def plan_row(self) -> dict[str, Any]:
-        row = asdict(self)
-        row.pop("module_sort")
-        return row
+FOLLOWING_JESUS_RENAME_RULES: dict[str, Any] = {
+    "version": RENAME_RULES_VERSION,
+    "albums": [
+        {
+            "match": ["making disciples", "primary oral"],
+            "code": "FJ-M01",
+            "title": "Primary Oral Learners",
+            "sort": 1,
+        },
+        {
+            "match": ["choosing to follow"],
+            "code": "FJ-M02",
+            "title": "Choosing to Follow",
+            "sort": 2,
+        },
+        {
+            "match": ["living in the family"],
+            "code": "FJ-M03",
+            "title": "Living in the Family",
+            "sort": 3,
+        },
+        {
+            "match": ["becoming like jesus"],
+            "code": "FJ-M04",
+            "title": "Becoming Like Jesus",
+            "sort": 4,
+        },
+        {
+            "match": ["serving like jesus"],
+            "code": "FJ-M05",
+            "title": "Serving Like Jesus",
+            "sort": 5,
+        },
+        {
+            "match": ["multiplying spiritual"],
+            "code": "FJ-M06",
+            "title": "Multiplying Disciples",
+            "sort": 6,
+        },
+        {"match": ["mission with god"], "code": "FJ-M07", "title": "Mission With God", "sort": 7},
+    ],
+    "fallback_album": {"code": "FJ-M00", "sort": 0, "title_max_chars": 48},
+    "title_fields": ["embedded_title", "semantic_title"],
+    "title_max_chars": 72,
+    "folder": "{module_folder}/Disc {disc_index:02d}",
+    "file_name": "{module_code}-D{disc_index:02d}-T{track_index:02d} - {title}",
+    "default_extension": ".m4a",
+}
+
+
+@cache
+def following_jesus_rename_rules() -> RenameRules:
+    return rename_rules_from_mapping(FOLLOWING_JESUS_RENAME_RULES)
 
 
 @dataclass(frozen=True)
@@ -120,78 +137,12 @@ class ValidationReport:
         }
 
 
-def parse_int(value: Any, default: int = 0) -> int:
-    if value in (None, "", "nan"):
-        return default
-    return int(float(str(value)))
-
-
-def parse_float(value: Any) -> float | None:
-    if value in (None, "", "nan"):
-        return None
-    return float(str(value))
-
-
-def parse_size(value: Any) -> int | None:
-    if value in (None, "", "nan"):
-        return None
-    return int(float(str(value)))
-
-
 def album_spec_for_folder(album_folder: str) -> AlbumSpec:
-    folder = album_folder.casefold()
-    if "making disciples" in folder or "primary oral" in folder:
-        return AlbumSpec("FJ-M01", "Primary Oral Learners", 1)
-    if "choosing to follow" in folder:
-        return AlbumSpec("FJ-M02", "Choosing to Follow", 2)
-    if "living in the family" in folder:
-        return AlbumSpec("FJ-M03", "Living in the Family", 3)
-    if "becoming like jesus" in folder:
-        return AlbumSpec("FJ-M04", "Becoming Like Jesus", 4)
-    if "serving like jesus" in folder:
-        return AlbumSpec("FJ-M05", "Serving Like Jesus", 5)
-    if "multiplying spiritual" in folder:
-        return AlbumSpec("FJ-M06", "Multiplying Disciples", 6)
-    if "mission with god" in folder:
-        return AlbumSpec("FJ-M07", "Mission With God", 7)
-    return AlbumSpec("FJ-M00", sanitise_title(album_folder, max_chars=48), 0)
-
-
-def ascii_text(value: str) -> str:
-    normalised = unicodedata.normalize("NFKD", value)
-    return normalised.encode("ascii", "ignore").decode("ascii")
-
-
-def sanitise_title(value: str, max_chars: int = 72) -> str:
-    text = ascii_text(value).replace("&", " and ")
-    text = re.sub(r"[/\\:*?\"<>|]+", " ", text)
-    text = re.sub(r"[\[\](){}]+", " ", text)
-    text = normalise_space(text).strip(" ._-")
-    if not text:
-        return "Untitled"
-    if len(text) <= max_chars:
-        return text
-    shortened = text[:max_chars].rsplit(" ", 1)[0].strip(" ._-")
-    return shortened or text[:max_chars].strip(" ._-")
+    return following_jesus_rename_rules().album_for(album_folder)
 
 
 def choose_track_title(row: Mapping[str, Any]) -> str:
-    embedded = normalise_space(str(row.get("embedded_title") or ""))
-    semantic = normalise_space(str(row.get("semantic_title") or ""))
-    source_file_name = Path(str(row.get("source_file_name") or "")).stem
-    if embedded and not is_generic_title(embedded):
-        return embedded
-    if semantic and not is_generic_title(semantic):
-        return semantic
-    return source_file_name or embedded or "Untitled"
-
-
-def file_sha256(path: Path) -> str:
-    digest = sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    return following_jesus_rename_rules().select_title(row)
 
 
 def build_rename_entry(
@@ -199,66 +150,26 @@ def build_rename_entry(
     target_root: Path,
     include_hash: bool = False,
 ) -> RenameEntry:
-    album = album_spec_for_folder(str(row["source_album_folder"]))
-    disc_index = parse_int(row.get("disc_index"))
-    track_index = parse_int(row.get("track_index"))
-    selected_title = sanitise_title(choose_track_title(row))
     source_path = Path(str(row["source_path"]))
-    file_ext = source_path.suffix.lower() or ".m4a"
-    file_name = f"{album.module_code}-D{disc_index:02d}-T{track_index:02d} - {selected_title}"
-    target_relative = Path(album.folder_name) / f"Disc {disc_index:02d}" / f"{file_name}{file_ext}"
-    target_path = target_root / target_relative
     source_sha = file_sha256(source_path) if include_hash and source_path.exists() else ""
-
-    return RenameEntry(
-        file_key=str(row["file_key"]),
-        module_code=album.module_code,
-        module_title=album.module_title,
-        module_sort=album.module_sort,
-        source_album_folder=str(row["source_album_folder"]),
-        source_file_name=str(row["source_file_name"]),
-        disc_index=disc_index,
-        track_index=track_index,
-        selected_title=selected_title,
-        embedded_title=str(row.get("embedded_title") or ""),
-        semantic_title=str(row.get("semantic_title") or ""),
-        track_type=str(row.get("track_type") or ""),
-        bible_reference=str(row.get("bible_reference") or ""),
-        duration_seconds=parse_float(row.get("duration_seconds")),
-        size_bytes=parse_size(row.get("size_bytes")),
-        source_sha256=source_sha,
-        source_path=str(source_path),
-        target_relative_path=str(target_relative),
-        target_path=str(target_path),
-    )
-
-
-def ensure_unique_targets(entries: Sequence[RenameEntry]) -> None:
-    counts = Counter(entry.target_path for entry in entries)
-    duplicates = sorted(path for path, count in counts.items() if count > 1)
-    if duplicates:
-        raise ValueError(f"duplicate target paths in rename plan: {duplicates[:5]}")
-
-
-def write_plan(path: Path, entries: Sequence[RenameEntry]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=PLAN_FIELDNAMES)
-        writer.writeheader()
-        for entry in entries:
-            writer.writerow(entry.plan_row())
-
-
-def read_plan(path: Path) -> list[dict[str, str]]:
-    with path.open(newline="", encoding="utf-8") as handle:
-        return [dict(row) for row in csv.DictReader(handle)]
+    return following_jesus_rename_rules().entry_for(row, target_root, source_sha)
 
 
 def validate_plan_rows(
     rows: Sequence[Mapping[str, str]],
     mode: str = "auto",
     verify_hash: bool = False,
+    workers: int = DEFAULT_WORKERS,
+    hashes_per_device: int = DEFAULT_HASHES_PER_DEVICE,
+    hash_cache: MemoCache | None = None,
+    progress: ProgressReporter | None = None,
 ) -> ValidationReport:
+    """Check each row's source and target before or after applying the plan.
+
+    Every path is statted once on a pool of `workers` threads. With `verify_hash`, files are
+    hashed in parallel, at most `hashes_per_device` at a time per drive, reusing hashes in
+    `hash_cache` for files whose size and modification time are unchanged.
+    """
     issues: list[ValidationIssue] = []
     source_present = 0
     target_present = 0
@@ -277,13 +188,29 @@ def validate_plan_rows(
                 )
             )
 
-    for row in rows:
+    paths = [(Path(row["source_path"]), Path(row["target_path"])) for row in rows]
+    stats = stat_paths(chain.from_iterable(paths), workers=workers)
+    to_hash = {}
+    if verify_hash:
+        for row, (source, target) in zip(rows, paths, strict=True):
+            path_to_check = target if stats[target] is not None else source
+            stat = stats[path_to_check]
+            if row.get("source_sha256") and stat is not None:
+                to_hash[path_to_check] = stat
+    hashes = hash_files(
+        to_hash,
+        workers=workers,
+        per_device=hashes_per_device,
+        cache=hash_cache,
+        progress=progress,
+        hasher=file_sha256,
+    )
+
+    for row, (source, target) in zip(rows, paths, strict=True):
         file_key = row.get("file_key", "")
-        source = Path(row["source_path"])
-        target = Path(row["target_path"])
         size = parse_size(row.get("size_bytes"))
-        has_source = source.exists()
-        has_target = target.exists()
+        has_source = stats[source] is not None
+        has_target = stats[target] is not None
         source_present += int(has_source)
         target_present += int(has_target)
 
@@ -298,7 +225,8 @@ def validate_plan_rows(
             issues.append(ValidationIssue("error", file_key, "both source and target exist"))
 
         path_to_check = target if has_target else source
-        if path_to_check.exists() and size is not None and path_to_check.stat().st_size != size:
+        stat = stats[path_to_check]
+        if stat is not None and size is not None and stat.st_size != size:
             issues.append(
                 ValidationIssue(
                     "error",
@@ -306,10 +234,8 @@ def validate_plan_rows(
                     f"size mismatch for {path_to_check}: expected {size}",
                 )
             )
-        if verify_hash and row.get("source_sha256") and path_to_check.exists():
-            actual_hash = file_sha256(path_to_check)
-            if actual_hash != row["source_sha256"]:
-                issues.append(ValidationIssue("error", file_key, "sha256 mismatch"))
+        if path_to_check in hashes and hashes[path_to_check] != row["source_sha256"]:
+            issues.append(ValidationIssue("error", file_key, "sha256 mismatch"))
 
     if mode == "before" and target_present:
         issues.append(ValidationIssue("error", "", "target files already exist"))
@@ -328,23 +254,65 @@ def validate_plan_rows(
     )
 
 
+def resume_journalled_moves(
+    rows: Sequence[Mapping[str, str]],
+    journal: MoveJournal,
+) -> int:
+    """Finish or clean up moves an interrupted run left part-way; returns how many finished."""
+    last_steps = MoveJournal.last_steps(journal.path)
+    resumed = 0
+    for row in rows:
+        last = last_steps.get(row.get("file_key", ""))
+        if last is not None:
+            source = Path(row["source_path"])
+            resumed += resume_move(source, Path(row["target_path"]), last, journal)
+    return resumed
+
+
 def apply_rename_plan(
     rows: Sequence[Mapping[str, str]],
     apply: bool = False,
+    journal_path: Path | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
 ) -> ValidationReport:
-    report = validate_plan_rows(rows, mode="auto")
-    if not report.ok:
-        return report
-    if not apply:
-        return report
-    for row in rows:
-        source = Path(row["source_path"])
-        target = Path(row["target_path"])
-        if not source.exists() or target.exists():
-            continue
-        target.parent.mkdir(parents=True, exist_ok=True)
-        source.rename(target)
-    return validate_plan_rows(rows, mode="after")
+    """Validate the plan and, with `apply`, move every file that still needs it.
+
+    Moves across filesystems are copied, verified against `source_sha256` when the plan has
+    it, and only then unlinked. With `journal_path`, each step is journalled and a rerun first
+    finishes whatever the previous run left part-way. The first failed move stops the run and
+    is reported as an error.
+    """
+    with ExitStack() as stack:
+        journal = None
+        if apply and journal_path is not None:
+            journal = stack.enter_context(MoveJournal(journal_path))
+            resume_journalled_moves(rows, journal)
+        report = validate_plan_rows(rows, mode="auto")
+        if not report.ok:
+            return report
+        if not apply:
+            return report
+        failures: list[ValidationIssue] = []
+        for row in rows:
+            source = Path(row["source_path"])
+            target = Path(row["target_path"])
+            if not source.exists() or target.exists():
+                continue
+            file_key = row.get("file_key", "")
+            try:
+                move_file(
+                    source,
+                    target,
+                    file_key=file_key,
+                    expected_sha256=row.get("source_sha256") or None,
+                    journal=journal,
+                    chunk_bytes=chunk_bytes,
+                )
+            except (MoveError, OSError) as exc:
+                failures.append(ValidationIssue("error", file_key, f"move failed: {exc}"))
+                break
+    report = validate_plan_rows(rows, mode="after")
+    return replace(report, issues=[*failures, *report.issues])
 
 
 def write_json_report(path: Path, report: ValidationReport) -> None:
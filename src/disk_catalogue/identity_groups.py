@@ -0,0 +1,138 @@
+"""Maintained duplicate index: files grouped by (size, normalised name) with member lists.
+
+`file_identity_groups` has one row per (size, name_key), where `name_key` is the NFC-normalised,
+lower-cased file name, so macOS (NFD) and Windows copies of a name land in the same group.
+Each row lists its members as (drive, path) structs plus the distinct drives they sit on.
+`load_csvs` merges every new files CSV into the table as it is ingested, touching only the
+groups that CSV contributes to, so duplicate and cross-drive queries read pre-grouped rows
+instead of self-joining `files` and re-deriving its columns on both sides.
+"""
+
+from __future__ import annotations
+
+import duckdb
+
+from disk_catalogue.reports import relation_exists
+
+IDENTITY_TABLE = "file_identity_groups"
+IDENTITY_DDL = f"""
+CREATE TABLE IF NOT EXISTS {IDENTITY_TABLE} (
+  size BIGINT,
+  name_key TEXT,
+  n_files BIGINT,
+  n_drives BIGINT,
+  drives TEXT[],
+  members STRUCT(drive TEXT, path TEXT)[]
+);
+"""
+
+# Same drive/path derivation as the `files` view in load_csvs.ensure_derived_views.
+MEMBER_SQL = r"""
+SELECT
+  CAST("FileSize#" AS BIGINT) AS size,
+  lower(nfc_normalize("FileName")) AS name_key,
+  struct_pack(
+    drive := regexp_extract("SourceFile", '/host/Volumes/([^/]+)/', 1),
+    path := regexp_replace("SourceFile", '^/host/Volumes/[^/]+/', '')
+  ) AS member
+FROM {relation}
+WHERE "FileSize#" IS NOT NULL AND "FileName" IS NOT NULL
+"""
+
+GROUPED_SQL = f"""
+SELECT size, name_key, list_sort(list_distinct(list(member))) AS members
+FROM ({MEMBER_SQL})
+GROUP BY size, name_key
+"""
+
+FINAL_COLUMNS = """
+size,
+name_key,
+len(members) AS n_files,
+len(list_distinct([m.drive FOR m IN members])) AS n_drives,
+list_sort(list_distinct([m.drive FOR m IN members])) AS drives,
+members
+"""
+
+
+def rebuild_identity_sql(files_table: str) -> str:
+    return (
+        f"CREATE OR REPLACE TABLE {IDENTITY_TABLE} AS "
+        f"SELECT {FINAL_COLUMNS} FROM ({GROUPED_SQL.format(relation=files_table)})"
+    )
+
+
+def rebuild_identity_groups(con: duckdb.DuckDBPyConnection, files_table: str) -> int:
+    """Recreate the table from every row of `files_table`; returns the group count."""
+    con.execute(rebuild_identity_sql(files_table))
+    row = con.execute(f"SELECT COUNT(*) FROM {IDENTITY_TABLE}").fetchone()
+    return row[0] if row else 0
+
+
+def ensure_identity_sql(files_table: str, files_table_exists: bool) -> str:
+    """Statement creating the missing table, backfilled from `files_table` when that exists."""
+    return rebuild_identity_sql(files_table) if files_table_exists else IDENTITY_DDL
+
+
+def ensure_identity_groups(con: duckdb.DuckDBPyConnection, files_table: str) -> bool:
+    """Create the table if missing, backfilling it from `files_table` when that exists.
+
+    Returns True when the table was created, so catalogues ingested before the index existed
+    pick it up on their next load.
+    """
+    if relation_exists(con, IDENTITY_TABLE):
+        return False
+    con.execute(ensure_identity_sql(files_table, relation_exists(con, files_table)))
+    return True
+
+
+def _merge_sql(relation: str) -> list[str]:
+    return [
+        IDENTITY_DDL,
+        "CREATE OR REPLACE TEMP TABLE _identity_delta AS " + GROUPED_SQL.format(relation=relation),
+        f"""
+        CREATE OR REPLACE TEMP TABLE _identity_merged AS
+        SELECT {FINAL_COLUMNS}
+        FROM (
+          SELECT d.size,
+                 d.name_key,
+                 list_sort(list_distinct(list_concat(coalesce(g.members, []), d.members)))
+                   AS members
+          FROM _identity_delta d
+          LEFT JOIN {IDENTITY_TABLE} g USING (size, name_key)
+        )
+        """,
+        f"""
+        DELETE FROM {IDENTITY_TABLE} g
+        USING _identity_delta d
+        WHERE g.size = d.size AND g.name_key = d.name_key
+        """,
+        f"INSERT INTO {IDENTITY_TABLE} SELECT * FROM _identity_merged",
+    ]
+
+
+_DROP_TEMP_SQL = [
+    "DROP TABLE IF EXISTS _identity_delta",
+    "DROP TABLE IF EXISTS _identity_merged",
+]
+
+
+def update_identity_sql(relation: str) -> list[str]:
+    """`update_identity_groups` as statements, for a batch run through the catalogue service."""
+    return [*_merge_sql(relation), *_DROP_TEMP_SQL]
+
+
+def update_identity_groups(con: duckdb.DuckDBPyConnection, relation: str) -> int:
+    """Merge the files rows in `relation` (e.g. an ingest staging view) into the groups.
+
+    Only groups the new rows belong to are rewritten; members already present (a rescanned
+    drive) are not counted twice. Returns the number of groups touched.
+    """
+    try:
+        for sql in _merge_sql(relation):
+            con.execute(sql)
+        row = con.execute("SELECT COUNT(*) FROM _identity_delta").fetchone()
+        return row[0] if row else 0
+    finally:
+        for sql in _DROP_TEMP_SQL:
+            con.execute(sql)
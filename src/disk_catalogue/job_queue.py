@@ -0,0 +1,312 @@
+"""Durable SQLite job queue with leases, for several transcription workers on one recovery set.
+
+The semantic catalogue's JSON state file only works for one process: two machines sharing the
+recovery SSD would both transcribe the same files and overwrite each other's state. A
+`JobQueue` keeps one row per file_key in a SQLite file that every worker opens:
+
+- `claim` atomically leases the highest-priority pending jobs to a worker for `lease_seconds`;
+- `heartbeat` (or `keep_alive` around the work) extends a lease while the worker is alive;
+- a lease that expires is put back to pending, or marked failed after `max_attempts` claims, so
+  a crashed or unplugged worker's files are picked up by the others;
+- `complete` and `fail` commit a result once: repeating them is harmless, and a worker whose
+  lease was taken over cannot overwrite the new holder.
+
+The file uses SQLite's default rollback journal rather than WAL, because WAL needs shared memory
+and does not work when workers on different hosts open the file over a network share. Lease
+times are wall-clock, so hosts need roughly synchronised clocks; leases are minutes long.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from disk_catalogue.audio_semantic import utc_now_iso
+
+DEFAULT_LEASE_SECONDS = 900.0
+DEFAULT_MAX_ATTEMPTS = 3
+PENDING = "pending"
+LEASED = "leased"
+COMPLETED = "completed"
+FAILED = "failed"
+
+QUEUE_DDL = """
+CREATE TABLE IF NOT EXISTS jobs (
+  file_key TEXT NOT NULL PRIMARY KEY,
+  priority REAL NOT NULL,
+  status TEXT NOT NULL,
+  worker TEXT,
+  lease_token TEXT,
+  lease_expires REAL,
+  attempts INTEGER NOT NULL DEFAULT 0,
+  result TEXT,
+  error TEXT,
+  updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, priority DESC);
+CREATE TABLE IF NOT EXISTS queue_meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class Lease:
+    file_key: str
+    token: str
+    worker: str
+    attempt: int
+
+
+class JobQueue:
+    """Leased work queue in the SQLite file at `path`; safe to share across processes.
+
+    Each instance holds one connection shared across its threads behind a lock, so a worker's
+    heartbeat thread can use the same queue object as its main loop.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if lease_seconds <= 0 or max_attempts <= 0:
+            raise ValueError("lease_seconds and max_attempts must be positive")
+        self.path = str(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._clock = clock
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode, so `_transaction` controls BEGIN IMMEDIATE itself.
+        self._con = sqlite3.connect(
+            self.path, timeout=60, isolation_level=None, check_same_thread=False
+        )
+        with self._transaction() as con:
+            for statement in QUEUE_DDL.split(";"):
+                if statement.strip():
+                    con.execute(statement)
+
+    def __enter__(self) -> JobQueue:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front, so claims never interleave."""
+        with self._lock:
+            self._con.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._con
+            except BaseException:
+                self._con.execute("ROLLBACK")
+                raise
+            self._con.execute("COMMIT")
+
+    def enqueue(self, jobs: Iterable[tuple[str, float]]) -> int:
+        """Add (file_key, priority) jobs not already queued; returns how many were new.
+
+        Higher priority is claimed first. New jobs reopen a queue whose final export was done.
+        """
+        rows = [(file_key, priority, PENDING, utc_now_iso()) for file_key, priority in jobs]
+        with self._transaction() as con:
+            before = con.total_changes
+            con.executemany(
+                "INSERT INTO jobs (file_key, priority, status, updated_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (file_key) DO NOTHING",
+                rows,
+            )
+            added = con.total_changes - before
+            if added:
+                con.execute("DELETE FROM queue_meta WHERE key = 'finalised_by'")
+        return added
+
+    def retry_failed(self) -> int:
+        """Return failed jobs to pending with a fresh attempt budget."""
+        with self._transaction() as con:
+            cursor = con.execute(
+                "UPDATE jobs SET status = ?, attempts = 0, error = NULL, updated_at = ? "
+                "WHERE status = ?",
+                (PENDING, utc_now_iso(), FAILED),
+            )
+            return cursor.rowcount
+
+    def _expire_leases(self, con: sqlite3.Connection) -> None:
+        now, stamp = self._clock(), utc_now_iso()
+        con.execute(
+            "UPDATE jobs SET status = ?, error = ?, worker = NULL, lease_token = NULL, "
+            "lease_expires = NULL, updated_at = ? "
+            "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, "lease expired on every attempt", stamp, LEASED, now, self.max_attempts),
+        )
+        con.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_token = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE status = ? AND lease_expires < ?",
+            (PENDING, stamp, LEASED, now),
+        )
+
+    def claim(self, worker: str, limit: int = 1) -> list[Lease]:
+        """Lease up to `limit` pending jobs to `worker`, re-queueing expired leases first."""
+        leases: list[Lease] = []
+        with self._transaction() as con:
+            self._expire_leases(con)
+            rows = con.execute(
+                "SELECT file_key, attempts FROM jobs WHERE status = ? "
+                "ORDER BY priority DESC, rowid LIMIT ?",
+                (PENDING, limit),
+            ).fetchall()
+            expires = self._clock() + self.lease_seconds
+            for file_key, attempts in rows:
+                lease = Lease(file_key, uuid.uuid4().hex, worker, attempts + 1)
+                con.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, lease_token = ?, lease_expires = ?, "
+                    "attempts = ?, updated_at = ? WHERE file_key = ?",
+                    (LEASED, worker, lease.token, expires, lease.attempt, utc_now_iso(), file_key),
+                )
+                leases.append(lease)
+        return leases
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """Extend `lease`; False once it has expired and been re-queued or taken over."""
+        with self._transaction() as con:
+            cursor = con.execute(
+                "UPDATE jobs SET lease_expires = ? "
+                "WHERE file_key = ? AND lease_token = ? AND status = ?",
+                (self._clock() + self.lease_seconds, lease.file_key, lease.token, LEASED),
+            )
+            return cursor.rowcount == 1
+
+    @contextmanager
+    def keep_alive(self, lease: Lease, interval: float | None = None) -> Iterator[threading.Event]:
+        """Heartbeat `lease` from a background thread while the block runs.
+
+        Yields an event that is set if the lease is lost, so long work can stop early.
+        """
+        lost = threading.Event()
+        stop = threading.Event()
+        period = interval if interval is not None else self.lease_seconds / 3
+
+        def beat() -> None:
+            while not stop.wait(period):
+                if not self.heartbeat(lease):
+                    lost.set()
+                    return
+
+        thread = threading.Thread(target=beat, name=f"lease-{lease.file_key}", daemon=True)
+        thread.start()
+        try:
+            yield lost
+        finally:
+            stop.set()
+            thread.join()
+
+    def _finish(self, lease: Lease, status: str, result: Any, error: str | None) -> bool:
+        payload = json.dumps(result, sort_keys=True) if result is not None else None
+        with self._transaction() as con:
+            # Our lease, or an expired one nobody has claimed since: the work is still wanted.
+            cursor = con.execute(
+                "UPDATE jobs SET status = :status, result = :result, error = :error, "
+                "worker = :worker, lease_token = :token, lease_expires = NULL, updated_at = :now "
+                "WHERE file_key = :file_key "
+                "AND ((status = :leased AND lease_token = :token) OR status = :pending)",
+                {
+                    "status": status,
+                    "result": payload,
+                    "error": error,
+                    "worker": lease.worker,
+                    "token": lease.token,
+                    "now": utc_now_iso(),
+                    "file_key": lease.file_key,
+                    "leased": LEASED,
+                    "pending": PENDING,
+                },
+            )
+            if cursor.rowcount:
+                return True
+            row = con.execute(
+                "SELECT status, lease_token FROM jobs WHERE file_key = ?", (lease.file_key,)
+            ).fetchone()
+        # Repeating a commit that already landed is a success, not a conflict.
+        return row is not None and tuple(row) == (status, lease.token)
+
+    def complete(self, lease: Lease, result: Any = None) -> bool:
+        """Record `lease`'s job as done with a JSON `result`; False if another worker owns it."""
+        return self._finish(lease, COMPLETED, result, None)
+
+    def fail(self, lease: Lease, error: str, result: Any = None) -> bool:
+        """Record `lease`'s job as failed; `retry_failed` puts it back in the queue."""
+        return self._finish(lease, FAILED, result, error)
+
+    def results(self) -> dict[str, Any]:
+        """Committed results by file_key, for completed and failed jobs that stored one."""
+        with self._lock:
+            rows = self._con.execute(
+                "SELECT file_key, result FROM jobs WHERE result IS NOT NULL AND status IN (?, ?)",
+                (COMPLETED, FAILED),
+            ).fetchall()
+        return {file_key: json.loads(result) for file_key, result in rows}
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            rows = self._con.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return dict(rows)
+
+    def outstanding(self) -> tuple[float, int]:
+        """Total priority of pending and leased jobs, and how many workers hold leases."""
+        with self._lock:
+            row = self._con.execute(
+                "SELECT COALESCE(SUM(priority), 0), "
+                "COUNT(DISTINCT worker) FILTER (WHERE status = ?) "
+                "FROM jobs WHERE status IN (?, ?)",
+                (LEASED, PENDING, LEASED),
+            ).fetchone()
+        return float(row[0]), int(row[1])
+
+    def claim_final_export(self, worker: str) -> bool:
+        """True for exactly one worker once every job is done: the one that runs the export."""
+        with self._transaction() as con:
+            self._expire_leases(con)
+            open_jobs = con.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status IN (?, ?)", (PENDING, LEASED)
+            ).fetchone()[0]
+            if open_jobs:
+                return False
+            cursor = con.execute(
+                "INSERT OR IGNORE INTO queue_meta VALUES ('finalised_by', ?)", (worker,)
+            )
+            return cursor.rowcount == 1
+
+    def claimed(self, worker: str, poll_seconds: float | None = None) -> Iterator[Lease]:
+        """Lease jobs one at a time until none are pending or leased by anyone.
+
+        While other workers still hold leases this waits and polls, so a job whose worker died
+        is picked up when its lease expires instead of being left behind.
+        """
+        poll = poll_seconds if poll_seconds is not None else min(self.lease_seconds / 4, 30.0)
+        while True:
+            leases = self.claim(worker)
+            if leases:
+                yield leases[0]
+                continue
+            counts = self.counts()
+            if not counts.get(PENDING) and not counts.get(LEASED):
+                return
+            time.sleep(poll)
@@ -0,0 +1,188 @@
+"""Content-addressed memo cache for transcripts and embeddings.
+
+Results are keyed by what they were computed from rather than where the input lives: a
+transcript by the audio file's SHA-256 plus the transcriber's model id, an embedding by the
+text's SHA-256 plus the embedder's model id. Exact duplicate tracks, files that moved to a new
+path or drive, and re-catalogued file keys therefore cost one hash instead of another model run.
+
+File hashes themselves (`FILE_HASHES`) are keyed the other way round, by path, size, and
+modification time, so a file that has not changed since it was hashed is not read again.
+
+Entries live in a small SQLite file shared by `semantic_audio.catalogue_audio` and the Following
+Jesus transcription script. Every hit refreshes an entry's recency; once the stored values
+exceed `max_bytes`, the least recently used entries are evicted.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from collections.abc import Callable, Iterable
+from hashlib import sha256
+from pathlib import Path
+from typing import Any, TypeVar, cast
+
+from disk_catalogue.audio_semantic import file_sha256, utc_now_iso
+
+T = TypeVar("T")
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+TRANSCRIPTS = "transcript"
+EMBEDDINGS = "embedding"
+FILE_HASHES = "file_sha256"
+# Keys per SELECT in `lookup_many`, well under SQLite's bound-parameter limit.
+LOOKUP_BATCH = 500
+
+CACHE_DDL = """
+CREATE TABLE IF NOT EXISTS memo_entries (
+  kind TEXT NOT NULL,
+  key TEXT NOT NULL,
+  value TEXT NOT NULL,
+  size INTEGER NOT NULL,
+  last_used INTEGER NOT NULL,
+  created_at TEXT NOT NULL,
+  PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS memo_entries_last_used ON memo_entries (last_used);
+"""
+
+# Keep the most recently used entries whose running total fits in the budget.
+EVICT_SQL = """
+DELETE FROM memo_entries WHERE rowid IN (
+  SELECT rowid FROM (
+    SELECT rowid, SUM(size) OVER (ORDER BY last_used DESC, rowid DESC) AS running
+    FROM memo_entries
+  )
+  WHERE running > ?
+)
+"""
+
+
+def _content_key(digest: str, model_id: str) -> str:
+    return f"{model_id}:{digest}"
+
+
+def audio_key(path: Path, model_id: str) -> str:
+    """Key for a result computed by `model_id` from the audio bytes at `path`."""
+    return _content_key(file_sha256(path), model_id)
+
+
+def text_key(text: str, model_id: str) -> str:
+    """Key for a result computed by `model_id` from `text`."""
+    return _content_key(sha256(text.encode("utf-8")).hexdigest(), model_id)
+
+
+def stat_key(path: Path, stat: os.stat_result) -> str:
+    """Key for a file's SHA-256, valid while its size and modification time are unchanged."""
+    return f"{stat.st_size}:{stat.st_mtime_ns}:{path}"
+
+
+class MemoCache:
+    """Size-bounded LRU store of JSON values keyed by (kind, content key).
+
+    `path` may be ":memory:" for a per-process cache. The connection is shared across
+    threads behind a lock, so worker pools can use one cache.
+    """
+
+    def __init__(self, path: str | Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(self.path, check_same_thread=False)
+        self._con.executescript(CACHE_DDL)
+        row = self._con.execute("SELECT COALESCE(MAX(last_used), 0) FROM memo_entries").fetchone()
+        self._tick = int(row[0])
+
+    def __enter__(self) -> MemoCache:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._con.close()
+
+    def _next_tick(self) -> int:
+        self._tick += 1
+        return self._tick
+
+    def lookup(self, kind: str, key: str) -> tuple[bool, Any]:
+        """Return (found, value), refreshing the entry's recency on a hit."""
+        with self._lock:
+            row = self._con.execute(
+                "SELECT value FROM memo_entries WHERE kind = ? AND key = ?", (kind, key)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return False, None
+            self._con.execute(
+                "UPDATE memo_entries SET last_used = ? WHERE kind = ? AND key = ?",
+                (self._next_tick(), kind, key),
+            )
+            self._con.commit()
+            self.hits += 1
+            return True, json.loads(row[0])
+
+    def lookup_many(self, kind: str, keys: Iterable[str]) -> dict[str, Any]:
+        """Values for whichever `keys` are cached, looked up and refreshed in one transaction."""
+        wanted = list(dict.fromkeys(keys))
+        found: dict[str, Any] = {}
+        with self._lock:
+            for start in range(0, len(wanted), LOOKUP_BATCH):
+                batch = wanted[start : start + LOOKUP_BATCH]
+                marks = ", ".join("?" * len(batch))
+                rows = self._con.execute(
+                    f"SELECT key, value FROM memo_entries WHERE kind = ? AND key IN ({marks})",
+                    (kind, *batch),
+                ).fetchall()
+                found.update((key, json.loads(value)) for key, value in rows)
+            self._con.executemany(
+                "UPDATE memo_entries SET last_used = ? WHERE kind = ? AND key = ?",
+                [(self._next_tick(), kind, key) for key in found],
+            )
+            self._con.commit()
+            self.hits += len(found)
+            self.misses += len(wanted) - len(found)
+        return found
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        self.put_many(kind, [(key, value)])
+
+    def put_many(self, kind: str, items: Iterable[tuple[str, Any]]) -> None:
+        """Store (key, value) pairs in one transaction, evicting once afterwards."""
+        rows = []
+        for key, value in items:
+            payload = json.dumps(value, sort_keys=True)
+            size = len(payload.encode("utf-8"))
+            rows.append((kind, key, payload, size))
+        with self._lock:
+            self._con.executemany(
+                "INSERT OR REPLACE INTO memo_entries VALUES (?, ?, ?, ?, ?, ?)",
+                [(*row, self._next_tick(), utc_now_iso()) for row in rows],
+            )
+            self._con.execute(EVICT_SQL, (self.max_bytes,))
+            self._con.commit()
+
+    def get_or_compute(self, kind: str, key: str, compute: Callable[[], T]) -> T:
+        found, value = self.lookup(kind, key)
+        if found:
+            return cast(T, value)
+        result = compute()
+        self.put(kind, key, result)
+        return result
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            row = self._con.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM memo_entries"
+            ).fetchone()
+        return {"entries": row[0], "bytes": row[1], "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,250 @@
+"""Verified file moves that work across filesystems, with a journal to resume interrupted runs.
+
+`Path.rename` fails with EXDEV when the target is on another filesystem, such as the renamed
+catalogue on a different SSD from the recovery set. `move_file` renames when it can and
+otherwise copies:
+
+- the copy goes to a hidden `.partial` file beside the target, in large chunks, with
+  `os.copy_file_range` where the kernel supports it and buffered reads and writes otherwise;
+- SHA-256 is computed in the same pass (after `copy_file_range`, from the chunk the kernel has
+  just read into the page cache), so each source file is read from disk once;
+- the copy is fsynced and checked against the plan's size and `source_sha256`, then replaced
+  into the target, and only then is the source unlinked.
+
+Each step is appended to a `MoveJournal` and fsynced before the next begins, so `resume_move`
+can finish a move that had been verified, or clean up a partial copy, after a crash.
+"""
+
+from __future__ import annotations
+
+import errno
+import json
+import os
+import shutil
+from collections.abc import Mapping
+from dataclasses import dataclass
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+from disk_catalogue.audio_semantic import utc_now_iso
+
+DEFAULT_CHUNK_BYTES = 64 * 1024 * 1024
+STARTED = "started"
+VERIFIED = "verified"
+DONE = "done"
+FAILED = "failed"
+
+# copy_file_range errors that mean "not between these files", not "the copy went wrong".
+_NO_KERNEL_COPY = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP}
+
+
+class MoveError(RuntimeError):
+    """A copy did not match its source, so the source was left in place."""
+
+
+@dataclass(frozen=True)
+class MoveResult:
+    method: str
+    size_bytes: int
+    sha256: str | None
+
+
+class MoveJournal:
+    """Append-only JSON Lines log of move steps at `path`; every line is fsynced."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = path.open("a", encoding="utf-8")
+
+    def __enter__(self) -> MoveJournal:
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._handle.close()
+
+    def record(self, file_key: str, step: str, **fields: Any) -> None:
+        line = {"file_key": file_key, "step": step, "at": utc_now_iso(), **fields}
+        self._handle.write(json.dumps(line, sort_keys=True) + "\n")
+        self._handle.flush()
+        os.fsync(self._handle.fileno())
+
+    @staticmethod
+    def last_steps(path: Path) -> dict[str, dict[str, Any]]:
+        """The latest journal line for each file_key; a line torn by a crash is skipped."""
+        steps: dict[str, dict[str, Any]] = {}
+        if not path.exists():
+            return steps
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            steps[str(entry["file_key"])] = entry
+        return steps
+
+
+def partial_path(target: Path) -> Path:
+    return target.with_name(f".{target.name}.partial")
+
+
+def fsync_directory(path: Path) -> None:
+    """Make renames and unlinks in `path` durable; a no-op where directories cannot be opened."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _write_all(fd: int, data: bytes, offset: int) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.pwrite(fd, view, offset)
+        view = view[written:]
+        offset += written
+
+
+def copy_with_sha256(
+    source: Path, destination: Path, chunk_bytes: int = DEFAULT_CHUNK_BYTES
+) -> tuple[int, str]:
+    """Copy `source` to `destination` in one pass, returning (bytes copied, SHA-256).
+
+    The copy is fsynced before returning.
+    """
+    digest = sha256()
+    offset = 0
+    kernel_copy = hasattr(os, "copy_file_range")
+    src = os.open(source, os.O_RDONLY)
+    try:
+        dst = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            size = os.fstat(src).st_size
+            while offset < size:
+                length = min(chunk_bytes, size - offset)
+                if kernel_copy:
+                    try:
+                        copied = os.copy_file_range(src, dst, length, offset, offset)
+                    except OSError as exc:
+                        if exc.errno not in _NO_KERNEL_COPY:
+                            raise
+                        copied = 0
+                    if copied:
+                        digest.update(os.pread(src, copied, offset))
+                        offset += copied
+                        continue
+                    kernel_copy = False
+                data = os.pread(src, length, offset)
+                if not data:
+                    break
+                digest.update(data)
+                _write_all(dst, data, offset)
+                offset += len(data)
+            os.fsync(dst)
+        finally:
+            os.close(dst)
+    finally:
+        os.close(src)
+    return offset, digest.hexdigest()
+
+
+def _record(journal: MoveJournal | None, file_key: str, step: str, **fields: Any) -> None:
+    if journal is not None:
+        journal.record(file_key, step, **fields)
+
+
+def move_file(
+    source: Path,
+    target: Path,
+    file_key: str = "",
+    expected_sha256: str | None = None,
+    journal: MoveJournal | None = None,
+    chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+) -> MoveResult:
+    """Move `source` to `target`, copying and verifying when they are on different filesystems.
+
+    Raises `MoveError`, leaving the source untouched, if the copy's size or SHA-256 does not
+    match; `expected_sha256` is the plan's hash, when it has one.
+    """
+    if target.exists():
+        raise FileExistsError(f"target already exists: {target}")
+    size = source.stat().st_size
+    target.parent.mkdir(parents=True, exist_ok=True)
+    paths = {"source": str(source), "target": str(target)}
+    _record(journal, file_key, STARTED, **paths)
+    try:
+        os.rename(source, target)
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            _record(journal, file_key, FAILED, error=str(exc), **paths)
+            raise
+    else:
+        fsync_directory(target.parent)
+        _record(journal, file_key, DONE, method="rename", **paths)
+        return MoveResult("rename", size, None)
+
+    partial = partial_path(target)
+    copied, digest = copy_with_sha256(source, partial, chunk_bytes)
+    problem = None
+    if copied != size:
+        problem = f"copied {copied} of {size} bytes"
+    elif expected_sha256 and digest != expected_sha256:
+        problem = f"sha256 {digest} does not match the plan's {expected_sha256}"
+    if problem:
+        partial.unlink()
+        _record(journal, file_key, FAILED, error=problem, **paths)
+        raise MoveError(f"{source}: {problem}")
+    shutil.copystat(source, partial)
+    _record(journal, file_key, VERIFIED, size_bytes=copied, sha256=digest, **paths)
+    os.replace(partial, target)
+    fsync_directory(target.parent)
+    source.unlink()
+    fsync_directory(source.parent)
+    _record(journal, file_key, DONE, method="copy", sha256=digest, **paths)
+    return MoveResult("copy", copied, digest)
+
+
+def resume_move(
+    source: Path,
+    target: Path,
+    last: Mapping[str, Any],
+    journal: MoveJournal | None = None,
+) -> bool:
+    """Finish or clean up the move whose latest journal line is `last`; True if it is now done.
+
+    A verified copy is put in place and its source unlinked. A move that stopped before
+    verification loses its partial copy and is left for `move_file` to start again.
+    """
+    if last.get("target") != str(target) or last.get("step") in (DONE, FAILED):
+        return False
+    file_key = str(last["file_key"])
+    paths = {"source": str(source), "target": str(target)}
+    partial = partial_path(target)
+    if last["step"] == VERIFIED:
+        if not target.exists() and partial.exists():
+            os.replace(partial, target)
+            fsync_directory(target.parent)
+        if not target.exists() or target.stat().st_size != last["size_bytes"]:
+            return False
+        if source.exists():
+            source.unlink()
+            fsync_directory(source.parent)
+        _record(
+            journal, file_key, DONE, method="copy", sha256=last["sha256"], resumed=True, **paths
+        )
+        return True
+    if partial.exists():
+        partial.unlink()
+    if target.exists() and not source.exists():
+        _record(journal, file_key, DONE, method="rename", resumed=True, **paths)
+        return True
+    return False
@@ -0,0 +1,299 @@
+"""Live progress, throughput and ETA for long-running scans and transcription runs.
+
+A `ProgressTracker` counts files and bytes against optional totals (from a files CSV, a path
+list, or a fast pre-walk) and derives files/sec, bytes/sec and an ETA. A `ProgressReporter`
+prints a one-line summary to the terminal and rewrites a JSON status file at most once per
+interval, so a slow drive (rates falling, progress still moving) can be told apart from a hung
+one (`seconds_since_progress` growing).
+
+`run_with_progress` runs a child process, parses ExifTool `-progress` lines from its stderr as
+they arrive, and keeps reporting on a heartbeat even when the child prints nothing.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, TextIO
+
+from .scan_telemetry import FILE_SIZE_COLUMNS
+
+# ExifTool -progress prints "======== /path/to/file [12/345]" for each file; the scan scripts send
+# these lines to stderr (scripts/split_exiftool_progress.awk).
+EXIFTOOL_PROGRESS_RE = re.compile(r"^=+ (?P<path>.+?) \[(?P<done>\d+)/(?P<total>\d+)\]\s*$")
+
+# AppleDouble and system files the scans skip; the pre-walk skips them too.
+SKIPPED_NAMES = frozenset({".DS_Store", "Thumbs.db", "desktop.ini"})
+
+
+def utc_now_iso() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+@dataclass
+class ProgressTracker:
+    label: str
+    total_files: int | None = None
+    total_bytes: int | None = None
+    files_done: int = 0
+    bytes_done: int = 0
+    files_skipped: int = 0
+    errors: int = 0
+    clock: Callable[[], float] = time.monotonic
+    started_at: str = field(default_factory=utc_now_iso)
+    last_file: str | None = None
+
+    def __post_init__(self) -> None:
+        self._started = self.clock()
+        self._last_progress = self._started
+
+    def advance(self, files: int = 1, bytes_: int = 0, path: str | None = None) -> None:
+        self.files_done += files
+        self.bytes_done += bytes_
+        self.last_file = path or self.last_file
+        self._last_progress = self.clock()
+
+    def skip(self, files: int = 1, bytes_: int = 0) -> None:
+        """Count already-done work towards the totals without crediting it to the rate."""
+        self.files_skipped += files
+        if self.total_bytes is not None:
+            self.total_bytes = max(0, self.total_bytes - bytes_)
+
+    def elapsed(self) -> float:
+        return self.clock() - self._started
+
+    def files_per_sec(self) -> float | None:
+        elapsed = self.elapsed()
+        return self.files_done / elapsed if elapsed > 0 else None
+
+    def bytes_per_sec(self) -> float | None:
+        elapsed = self.elapsed()
+        return self.bytes_done / elapsed if elapsed > 0 else None
+
+    def eta_seconds(self) -> float | None:
+        """Seconds left, by bytes when both byte totals and a byte rate exist, else by files."""
+        bytes_rate = self.bytes_per_sec()
+        if self.total_bytes is not None and bytes_rate:
+            return max(0.0, self.total_bytes - self.bytes_done) / bytes_rate
+        files_rate = self.files_per_sec()
+        if self.total_files is not None and files_rate:
+            remaining = self.total_files - self.files_skipped - self.files_done
+            return max(0, remaining) / files_rate
+        return None
+
+    def snapshot(self) -> dict[str, Any]:
+        def rounded(value: float | None, digits: int = 2) -> float | None:
+            return None if value is None else round(value, digits)
+
+        return {
+            "label": self.label,
+            "started_at": self.started_at,
+            "updated_at": utc_now_iso(),
+            "elapsed_seconds": round(self.elapsed(), 1),
+            "seconds_since_progress": round(self.clock() - self._last_progress, 1),
+            "files_done": self.files_done,
+            "files_skipped": self.files_skipped,
+            "total_files": self.total_files,
+            "bytes_done": self.bytes_done,
+            "total_bytes": self.total_bytes,
+            "errors": self.errors,
+            "files_per_sec": rounded(self.files_per_sec()),
+            "bytes_per_sec": rounded(self.bytes_per_sec(), 0),
+            "eta_seconds": rounded(self.eta_seconds(), 0),
+            "last_file": self.last_file,
+        }
+
+    def format_line(self) -> str:
+        done = self.files_done + self.files_skipped
+        count = f"{done}/{self.total_files}" if self.total_files is not None else str(done)
+        parts = [f"[{self.label}] {count} files"]
+        files_rate = self.files_per_sec()
+        if files_rate is not None:
+            parts.append(f"{files_rate:.1f} files/s")
+        bytes_rate = self.bytes_per_sec()
+        if bytes_rate:
+            parts.append(f"{bytes_rate / 1e6:.1f} MB/s")
+        eta = self.eta_seconds()
+        parts.append(f"ETA {format_duration(eta)}" if eta is not None else "ETA ?")
+        stalled = self.clock() - self._last_progress
+        if stalled >= 60:
+            parts.append(f"no progress for {format_duration(stalled)}")
+        return ", ".join(parts)
+
+
+def format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "?"
+    total = round(seconds)
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def write_json_atomic(path: Path, payload: dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A unique temporary name, so processes writing the same file cannot interleave.
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2, sort_keys=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class ProgressReporter:
+    """Throttled terminal line plus JSON status file for one tracker at a time."""
+
+    def __init__(
+        self,
+        status_path: Path | None,
+        interval: float = 5.0,
+        stream: TextIO | None = None,
+        context: dict[str, Any] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.status_path = status_path
+        self.interval = interval
+        self.stream = stream if stream is not None else sys.stderr
+        self.context = dict(context or {})
+        self.clock = clock
+        self._last_report: float | None = None
+        self._lock = threading.Lock()
+
+    def report(self, tracker: ProgressTracker, state: str = "running", force: bool = False) -> bool:
+        with self._lock:
+            now = self.clock()
+            if not force and self._last_report is not None:
+                if now - self._last_report < self.interval:
+                    return False
+            self._last_report = now
+            if self.status_path is not None:
+                write_json_atomic(
+                    self.status_path, {**self.context, "state": state, **tracker.snapshot()}
+                )
+            print(tracker.format_line(), file=self.stream, flush=True)
+            return True
+
+
+def parse_exiftool_progress(line: str) -> tuple[str, int, int] | None:
+    """The file path, files done and total from an ExifTool -progress line."""
+    match = EXIFTOOL_PROGRESS_RE.match(line.rstrip("\r\n"))
+    if match is None:
+        return None
+    return match["path"], int(match["done"]), int(match["total"])
+
+
+def file_size(path: str) -> int:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return 0
+
+
+def consume_progress_lines(
+    lines: Iterator[str] | TextIO,
+    tracker: ProgressTracker,
+    passthrough: TextIO | None = None,
+    size_of: Callable[[str], int] = file_size,
+) -> None:
+    """Apply ExifTool progress lines to `tracker`; forward every other line to `passthrough`."""
+    for line in lines:
+        parsed = parse_exiftool_progress(line)
+        if parsed is None:
+            if passthrough is not None:
+                passthrough.write(line)
+                passthrough.flush()
+            continue
+        path, done, total = parsed
+        tracker.total_files = total
+        tracker.advance(files=done - tracker.files_done, bytes_=size_of(path), path=path)
+
+
+def run_with_progress(
+    cmd: list[str],
+    tracker: ProgressTracker,
+    reporter: ProgressReporter,
+    size_of: Callable[[str], int] = file_size,
+) -> None:
+    """Run `cmd` like `subprocess.run(cmd, check=True)`, reporting progress as it goes.
+
+    The child's stderr is read on a separate thread so the reporter keeps its heartbeat while
+    the child is silent; stdout is inherited unchanged.
+    """
+    proc = subprocess.Popen(
+        cmd, stderr=subprocess.PIPE, text=True, encoding="utf-8", errors="replace"
+    )
+    assert proc.stderr is not None
+    reader = threading.Thread(
+        target=consume_progress_lines,
+        args=(proc.stderr, tracker, sys.stderr, size_of),
+        name="progress-reader",
+        daemon=True,
+    )
+    reader.start()
+    reporter.report(tracker, force=True)
+    while True:
+        try:
+            returncode = proc.wait(timeout=reporter.interval)
+            break
+        except subprocess.TimeoutExpired:
+            reporter.report(tracker)
+    reader.join()
+    proc.stderr.close()
+    if returncode != 0:
+        tracker.errors += 1
+        reporter.report(tracker, state="failed", force=True)
+        raise subprocess.CalledProcessError(returncode, cmd)
+    reporter.report(tracker, state="ok", force=True)
+
+
+def count_tree(root: Path) -> tuple[int, int]:
+    """Files and bytes under `root` by a scandir walk, skipping the files the scans skip."""
+    files = 0
+    total = 0
+    stack = [str(root)]
+    while stack:
+        try:
+            entries = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if entry.name.startswith("._") or entry.name in SKIPPED_NAMES:
+                            continue
+                        files += 1
+                        total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    continue
+    return files, total
+
+
+def listed_totals(list_path: Path, files_csv: Path) -> tuple[int, int]:
+    """Files in a path list and their summed sizes as recorded in the files CSV."""
+    with list_path.open(encoding="utf-8") as handle:
+        wanted = {line.rstrip("\n") for line in handle if line.strip()}
+    total = 0
+    with files_csv.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        fields = reader.fieldnames or []
+        size_column = next((name for name in FILE_SIZE_COLUMNS if name in fields), None)
+        if size_column is not None:
+            for row in reader:
+                if (row.get("SourceFile") or "").strip() in wanted:
+                    try:
+                        total += int(row.get(size_column) or 0)
+                    except ValueError:
+                        continue
+    return len(wanted), total
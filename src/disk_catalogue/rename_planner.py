@@ -0,0 +1,417 @@
+"""Rule-driven rename plans for any audio library, streamed from DuckDB to a plan CSV.
+
+A rename rule set is a versioned JSON mapping:
+
+- `albums`: `{"match": [...], "code", "title", "sort"}` entries; the first whose phrase occurs in
+  the casefolded source album folder names the album. Folders that match nothing fall back to
+  `fallback_album` (`code`, `sort`, and `title_max_chars` for the sanitised folder name).
+- `title_fields`: row columns tried in order for a track title that is not generic ("Track 03");
+  otherwise the source file name's stem is used.
+- `folder` and `file_name`: `str.format` templates over `module_code`, `module_title`,
+  `module_folder`, `disc_index`, `track_index`, and `title`. `folder` may contain `/` for
+  nested directories.
+
+`plan_from_duckdb` maps each distinct album folder once and lets DuckDB order the rows by the
+mapped album, so rows stream out in `fetchmany` batches instead of being sorted in Python.
+`plan_entries` reuses album and title results across rows and hashes each batch in parallel,
+and `write_plan` streams entries to the CSV, catching duplicate targets with a set.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+import re
+import unicodedata
+import uuid
+from collections import Counter
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+import duckdb
+
+from disk_catalogue.audio_semantic import is_generic_title, normalise_space
+from disk_catalogue.file_checks import hash_files, stat_paths
+from disk_catalogue.memo_cache import MemoCache
+
+RENAME_RULES_VERSION = 1
+DEFAULT_BATCH_SIZE = 10_000
+
+PLAN_FIELDNAMES = [
+    "file_key",
+    "module_code",
+    "module_title",
+    "source_album_folder",
+    "source_file_name",
+    "disc_index",
+    "track_index",
+    "selected_title",
+    "embedded_title",
+    "semantic_title",
+    "track_type",
+    "bible_reference",
+    "duration_seconds",
+    "size_bytes",
+    "source_sha256",
+    "source_path",
+    "target_relative_path",
+    "target_path",
+]
+
+TEMPLATE_FIELDS = (
+    "module_code",
+    "module_title",
+    "module_folder",
+    "disc_index",
+    "track_index",
+    "title",
+)
+
+
+@dataclass(frozen=True)
+class AlbumSpec:
+    module_code: str
+    module_title: str
+    module_sort: int
+
+    @property
+    def folder_name(self) -> str:
+        return f"{self.module_code} {self.module_title}"
+
+
+@dataclass(frozen=True)
+class RenameEntry:
+    file_key: str
+    module_code: str
+    module_title: str
+    module_sort: int
+    source_album_folder: str
+    source_file_name: str
+    disc_index: int
+    track_index: int
+    selected_title: str
+    embedded_title: str
+    semantic_title: str
+    track_type: str
+    bible_reference: str
+    duration_seconds: float | None
+    size_bytes: int | None
+    source_sha256: str
+    source_path: str
+    target_relative_path: str
+    target_path: str
+
+    def plan_row(self) -> dict[str, Any]:
+        # Every field is a scalar, so a shallow lookup avoids `asdict`'s per-field deep copies.
+        return {name: getattr(self, name) for name in PLAN_FIELDNAMES}
+
+
+def parse_int(value: Any, default: int = 0) -> int:
+    if value in (None, "", "nan"):
+        return default
+    return int(float(str(value)))
+
+
+def parse_float(value: Any) -> float | None:
+    if value in (None, "", "nan"):
+        return None
+    return float(str(value))
+
+
+def parse_size(value: Any) -> int | None:
+    if value in (None, "", "nan"):
+        return None
+    return int(float(str(value)))
+
+
+def ascii_text(value: str) -> str:
+    normalised = unicodedata.normalize("NFKD", value)
+    return normalised.encode("ascii", "ignore").decode("ascii")
+
+
+def sanitise_title(value: str, max_chars: int = 72) -> str:
+    text = ascii_text(value).replace("&", " and ")
+    text = re.sub(r"[/\\:*?\"<>|]+", " ", text)
+    text = re.sub(r"[\[\](){}]+", " ", text)
+    text = normalise_space(text).strip(" ._-")
+    if not text:
+        return "Untitled"
+    if len(text) <= max_chars:
+        return text
+    shortened = text[:max_chars].rsplit(" ", 1)[0].strip(" ._-")
+    return shortened or text[:max_chars].strip(" ._-")
+
+
+@dataclass(frozen=True)
+class AlbumRule:
+    album: AlbumSpec
+    match: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class RenameRules:
+    version: int
+    albums: tuple[AlbumRule, ...]
+    fallback_code: str
+    fallback_sort: int
+    fallback_title_max_chars: int
+    title_fields: tuple[str, ...]
+    title_max_chars: int
+    folder: str
+    file_name: str
+    default_extension: str
+    _folders: dict[str, str] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def album_for(self, album_folder: str) -> AlbumSpec:
+        folder = album_folder.casefold()
+        for rule in self.albums:
+            if any(phrase in folder for phrase in rule.match):
+                return rule.album
+        title = sanitise_title(album_folder, max_chars=self.fallback_title_max_chars)
+        return AlbumSpec(self.fallback_code, title, self.fallback_sort)
+
+    def select_title(self, row: Mapping[str, Any]) -> str:
+        """The first non-generic title field, else the source file name's stem."""
+        values = [normalise_space(str(row.get(field) or "")) for field in self.title_fields]
+        for value in values:
+            if value and not is_generic_title(value):
+                return value
+        stem = Path(str(row.get("source_file_name") or "")).stem
+        return stem or (values[0] if values else "") or "Untitled"
+
+    def relative_target(
+        self, album: AlbumSpec, disc_index: int, track_index: int, title: str, extension: str
+    ) -> str:
+        fields = {
+            "module_code": album.module_code,
+            "module_title": album.module_title,
+            "module_folder": album.folder_name,
+            "disc_index": disc_index,
+            "track_index": track_index,
+            "title": title,
+        }
+        folder = self.folder.format_map(fields)
+        file_name = f"{self.file_name.format_map(fields)}{extension}"
+        # Few distinct folders, so normalise each once and join strings for the rest.
+        normalised = self._folders.get(folder)
+        if normalised is None:
+            normalised = self._folders[folder] = str(Path(folder))
+        if "/" in file_name or normalised == ".":
+            return str(Path(folder, file_name))
+        return f"{normalised}/{file_name}"
+
+    def entry_for(
+        self,
+        row: Mapping[str, Any],
+        target_root: Path,
+        source_sha256: str = "",
+        album: AlbumSpec | None = None,
+        title: str | None = None,
+    ) -> RenameEntry:
+        """The plan entry for one source row; `album` and `title` may be passed in precomputed."""
+        album_folder = str(row["source_album_folder"])
+        album = album if album is not None else self.album_for(album_folder)
+        if title is None:
+            title = sanitise_title(self.select_title(row), max_chars=self.title_max_chars)
+        disc_index = parse_int(row.get("disc_index"))
+        track_index = parse_int(row.get("track_index"))
+        source_path = Path(str(row["source_path"]))
+        extension = source_path.suffix.lower() or self.default_extension
+        target_relative = self.relative_target(album, disc_index, track_index, title, extension)
+        return RenameEntry(
+            file_key=str(row["file_key"]),
+            module_code=album.module_code,
+            module_title=album.module_title,
+            module_sort=album.module_sort,
+            source_album_folder=album_folder,
+            source_file_name=str(row["source_file_name"]),
+            disc_index=disc_index,
+            track_index=track_index,
+            selected_title=title,
+            embedded_title=str(row.get("embedded_title") or ""),
+            semantic_title=str(row.get("semantic_title") or ""),
+            track_type=str(row.get("track_type") or ""),
+            bible_reference=str(row.get("bible_reference") or ""),
+            duration_seconds=parse_float(row.get("duration_seconds")),
+            size_bytes=parse_size(row.get("size_bytes")),
+            source_sha256=source_sha256,
+            source_path=str(source_path),
+            target_relative_path=target_relative,
+            target_path=str(target_root / target_relative),
+        )
+
+
+def _check_template(name: str, template: str) -> str:
+    sample = {field: 1 if field.endswith("_index") else "x" for field in TEMPLATE_FIELDS}
+    try:
+        rendered = template.format_map(sample)
+    except (KeyError, IndexError, ValueError) as exc:
+        raise ValueError(f"invalid rename {name} template {template!r}: {exc}") from exc
+    parts = PurePosixPath(rendered).parts
+    if rendered.startswith("/") or ".." in parts:
+        raise ValueError(f"rename {name} template must stay under the target root: {template!r}")
+    return template
+
+
+def rename_rules_from_mapping(raw: Mapping[str, Any]) -> RenameRules:
+    version = raw.get("version")
+    if version != RENAME_RULES_VERSION:
+        raise ValueError(f"unsupported rename rule set version: {version!r}")
+    albums = tuple(
+        AlbumRule(
+            AlbumSpec(str(item["code"]), str(item["title"]), int(item["sort"])),
+            tuple(str(phrase).casefold() for phrase in item["match"]),
+        )
+        for item in raw["albums"]
+    )
+    fallback = raw["fallback_album"]
+    return RenameRules(
+        version=int(version),
+        albums=albums,
+        fallback_code=str(fallback["code"]),
+        fallback_sort=int(fallback["sort"]),
+        fallback_title_max_chars=int(fallback.get("title_max_chars", 48)),
+        title_fields=tuple(str(field) for field in raw["title_fields"]),
+        title_max_chars=int(raw.get("title_max_chars", 72)),
+        folder=_check_template("folder", str(raw["folder"])),
+        file_name=_check_template("file_name", str(raw["file_name"])),
+        default_extension=str(raw.get("default_extension", "")),
+    )
+
+
+def load_rename_rules(path: Path) -> RenameRules:
+    return rename_rules_from_mapping(json.loads(path.read_text(encoding="utf-8")))
+
+
+def plan_entries(
+    rows: Iterable[Mapping[str, Any]],
+    target_root: Path,
+    rules: RenameRules,
+    include_hash: bool = False,
+    hash_cache: MemoCache | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[RenameEntry]:
+    """Plan entries for `rows` in order, reusing album and title results across rows.
+
+    With `include_hash`, each batch's existing source files are hashed in parallel.
+    """
+    albums: dict[str, AlbumSpec] = {}
+    titles: dict[tuple[str, ...], str] = {}
+    title_columns = (*rules.title_fields, "source_file_name")
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        hashes: dict[Path, str] = {}
+        if include_hash:
+            stats = stat_paths(Path(str(row["source_path"])) for row in batch)
+            present = {path: stat for path, stat in stats.items() if stat is not None}
+            hashes = hash_files(present, cache=hash_cache)
+        for row in batch:
+            album_folder = str(row["source_album_folder"])
+            album = albums.get(album_folder)
+            if album is None:
+                album = albums[album_folder] = rules.album_for(album_folder)
+            title_key = tuple(str(row.get(column) or "") for column in title_columns)
+            title = titles.get(title_key)
+            if title is None:
+                title = sanitise_title(rules.select_title(row), max_chars=rules.title_max_chars)
+                titles[title_key] = title
+            source_sha = hashes.get(Path(str(row["source_path"])), "") if hashes else ""
+            yield rules.entry_for(row, target_root, source_sha, album=album, title=title)
+
+
+def plan_from_duckdb(
+    con: duckdb.DuckDBPyConnection,
+    source_sql: str,
+    target_root: Path,
+    rules: RenameRules,
+    include_hash: bool = False,
+    hash_cache: MemoCache | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[RenameEntry]:
+    """Plan entries for the rows of `source_sql`, in album, disc, track, and file_key order.
+
+    The query must return `file_key`, `source_path`, `source_album_folder`, and
+    `source_file_name`, plus any title fields the rules use; `disc_index`, `track_index`,
+    `duration_seconds`, `size_bytes`, `track_type`, and `bible_reference` are optional.
+    """
+    con.execute(f"CREATE OR REPLACE TEMP VIEW rename_source AS {source_sql}")
+    columns = {
+        str(item[0]) for item in con.execute("SELECT * FROM rename_source LIMIT 0").description
+    }
+    folders = con.execute("SELECT DISTINCT source_album_folder FROM rename_source").fetchall()
+    con.execute(
+        "CREATE OR REPLACE TEMP TABLE rename_album_sort "
+        "(source_album_folder VARCHAR, module_sort INTEGER)"
+    )
+    if folders:
+        con.executemany(
+            "INSERT INTO rename_album_sort VALUES (?, ?)",
+            [(folder, rules.album_for(str(folder)).module_sort) for (folder,) in folders],
+        )
+
+    # Absent index columns count as 0 for every row, so they drop out of the ordering.
+    order = ["a.module_sort"] + [
+        f"COALESCE(CAST(trunc(TRY_CAST(s.{column} AS DOUBLE)) AS BIGINT), 0)"
+        for column in ("disc_index", "track_index")
+        if column in columns
+    ]
+    cursor = con.execute(
+        f"""
+        SELECT s.* FROM rename_source s
+        JOIN rename_album_sort a
+          ON a.source_album_folder IS NOT DISTINCT FROM CAST(s.source_album_folder AS VARCHAR)
+        ORDER BY {", ".join(order)}, CAST(s.file_key AS VARCHAR)
+        """
+    )
+    names = [str(item[0]) for item in cursor.description]
+
+    def rows() -> Iterator[dict[str, Any]]:
+        while batch := cursor.fetchmany(batch_size):
+            for values in batch:
+                yield dict(zip(names, values, strict=True))
+
+    yield from plan_entries(rows(), target_root, rules, include_hash, hash_cache, batch_size)
+
+
+def ensure_unique_targets(entries: Sequence[RenameEntry]) -> None:
+    counts = Counter(entry.target_path for entry in entries)
+    duplicates = sorted(path for path, count in counts.items() if count > 1)
+    if duplicates:
+        raise ValueError(f"duplicate target paths in rename plan: {duplicates[:5]}")
+
+
+def write_plan(path: Path, entries: Iterable[RenameEntry]) -> int:
+    """Stream `entries` to the plan CSV at `path`; returns how many rows were written.
+
+    Raises ValueError on duplicate target paths, leaving any previous plan in place.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    seen: set[str] = set()
+    duplicates: set[str] = set()
+    count = 0
+    try:
+        with tmp.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=PLAN_FIELDNAMES)
+            writer.writeheader()
+            for entry in entries:
+                if entry.target_path in seen:
+                    duplicates.add(entry.target_path)
+                seen.add(entry.target_path)
+                writer.writerow(entry.plan_row())
+                count += 1
+        if duplicates:
+            raise ValueError(f"duplicate target paths in rename plan: {sorted(duplicates)[:5]}")
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return count
+
+
+def read_plan(path: Path) -> list[dict[str, str]]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        return [dict(row) for row in csv.DictReader(handle)]
@@ -0,0 +1,281 @@
+"""Named catalogue reports with results cached in DuckDB summary tables.
+
+Each `Report` names a recurring query from `sample_queries.sql` and the tables whose change
+should invalidate it. A report's result is stored in a `report_<name>` table alongside a row in
+`report_cache` recording the watermark it was computed at: the latest `ingested_at` and row
+count of `ingested_files` (or of `drive_scans` for scan-history reports) plus a hash of the SQL.
+`run_report` serves the stored rows while the watermark and SQL are unchanged and recomputes
+them otherwise, so repeated reports over an unchanged catalogue cost one small lookup.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+from hashlib import sha256
+from typing import Any
+
+import duckdb
+
+CACHE_TABLE = "report_cache"
+CACHE_DDL = f"""
+CREATE TABLE IF NOT EXISTS {CACHE_TABLE} (
+  report_name TEXT PRIMARY KEY,
+  watermark TEXT,
+  sql_hash TEXT,
+  refreshed_at TIMESTAMP,
+  row_count BIGINT
+);
+"""
+
+# Tables whose (latest timestamp, row count) marks a change in a report's inputs.
+WATERMARK_SQL = {
+    "ingested_files": "SELECT CAST(MAX(ingested_at) AS VARCHAR), COUNT(*) FROM ingested_files",
+    "drive_scans": "SELECT CAST(MAX(started_at) AS VARCHAR), COUNT(*) FROM drive_scans",
+}
+
+
+class ReportError(RuntimeError):
+    """A report is unknown or its source tables are missing."""
+
+
+@dataclass(frozen=True)
+class Report:
+    name: str
+    title: str
+    sql: str
+    sources: tuple[str, ...]
+    watermark_tables: tuple[str, ...] = ("ingested_files",)
+
+    @property
+    def result_table(self) -> str:
+        return f"report_{self.name}"
+
+    @property
+    def sql_hash(self) -> str:
+        return sha256(self.sql.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ReportResult:
+    name: str
+    columns: list[str]
+    rows: list[tuple[Any, ...]]
+    cached: bool
+    watermark: str
+    refreshed_at: datetime
+
+
+REPORTS: dict[str, Report] = {
+    report.name: report
+    for report in (
+        Report(
+            "drives_seen",
+            "Drives seen",
+            """
+            SELECT Drive AS drive,
+                   COUNT(*) AS n_files,
+                   SUM(CAST("FileSize#" AS BIGINT)) / 1e12 AS tb_total
+            FROM files
+            GROUP BY 1
+            ORDER BY tb_total DESC
+            """,
+            ("files",),
+        ),
+        Report(
+            "top_cameras_lenses",
+            "Top cameras and lenses",
+            """
+            SELECT Model, LensModel, COUNT(*) AS n
+            FROM photos
+            GROUP BY 1, 2
+            ORDER BY n DESC
+            LIMIT 25
+            """,
+            ("photos",),
+        ),
+        Report(
+            "duplicate_sizes",
+            "Duplicate candidates by size",
+            """
+            SELECT size AS bytes,
+                   SUM(n_files) AS n,
+                   len(list_distinct(flatten(list(drives)))) AS drives
+            FROM file_identity_groups
+            GROUP BY 1
+            HAVING SUM(n_files) > 1
+            ORDER BY n DESC, bytes DESC
+            LIMIT 50
+            """,
+            ("file_identity_groups",),
+        ),
+        Report(
+            "duplicate_names",
+            "Duplicate candidates by name + size",
+            """
+            SELECT name_key AS name, size AS bytes, n_files AS n, drives
+            FROM file_identity_groups
+            WHERE n_files > 1
+            ORDER BY n DESC, bytes DESC, name
+            LIMIT 50
+            """,
+            ("file_identity_groups",),
+        ),
+        Report(
+            "cross_drive_pairs",
+            "Cross-drive pairs (same name + size)",
+            """
+            WITH m AS (
+              SELECT size, name_key, member.drive AS drive, member.path AS path
+              FROM (
+                SELECT size, name_key, UNNEST(members) AS member
+                FROM file_identity_groups
+                WHERE n_drives > 1
+              )
+            )
+            SELECT a.drive AS a_drive, b.drive AS b_drive,
+                   a.path AS a_path, b.path AS b_path,
+                   a.size AS bytes
+            FROM m a
+            JOIN m b
+              ON a.size = b.size
+             AND a.name_key = b.name_key
+             AND a.drive < b.drive
+            ORDER BY bytes DESC, a_path, b_path
+            LIMIT 50
+            """,
+            ("file_identity_groups",),
+        ),
+        Report(
+            "reclaimable_space",
+            "Reclaimable space by name + size group",
+            """
+            SELECT name_key AS name,
+                   size AS bytes,
+                   n_files,
+                   drives,
+                   size * (n_files - 1) AS reclaimable_bytes
+            FROM file_identity_groups
+            WHERE n_files > 1
+            ORDER BY reclaimable_bytes DESC, name
+            LIMIT 50
+            """,
+            ("file_identity_groups",),
+        ),
+        Report(
+            "scan_deltas",
+            "Row deltas vs previous scan per drive",
+            """
+            SELECT drive_label,
+                   started_at,
+                   status,
+                   files_rows,
+                   files_rows - LAG(files_rows)
+                     OVER (PARTITION BY drive_label ORDER BY started_at) AS files_delta,
+                   photos_rows,
+                   photos_rows - LAG(photos_rows)
+                     OVER (PARTITION BY drive_label ORDER BY started_at) AS photos_delta,
+                   videos_rows,
+                   videos_rows - LAG(videos_rows)
+                     OVER (PARTITION BY drive_label ORDER BY started_at) AS videos_delta
+            FROM drive_scans
+            ORDER BY drive_label, started_at DESC
+            LIMIT 200
+            """,
+            ("drive_scans",),
+            ("drive_scans",),
+        ),
+    )
+}
+
+
+def relation_exists(con: duckdb.DuckDBPyConnection, name: str) -> bool:
+    row = con.execute(
+        "SELECT 1 FROM information_schema.tables WHERE table_schema = 'main' AND table_name = ?",
+        [name],
+    ).fetchone()
+    return row is not None
+
+
+def get_report(name: str) -> Report:
+    try:
+        return REPORTS[name]
+    except KeyError:
+        raise ReportError(f"unknown report: {name!r}") from None
+
+
+def available_reports(con: duckdb.DuckDBPyConnection) -> list[Report]:
+    """Reports whose source tables or views exist in this catalogue."""
+    return [
+        report
+        for report in REPORTS.values()
+        if all(relation_exists(con, source) for source in report.sources)
+    ]
+
+
+def report_watermark(con: duckdb.DuckDBPyConnection, report: Report) -> str:
+    marks: list[Any] = []
+    for table in report.watermark_tables:
+        if relation_exists(con, table):
+            row = con.execute(WATERMARK_SQL[table]).fetchone()
+            marks.append([table, *(row or ())])
+        else:
+            marks.append([table, None, 0])
+    return json.dumps(marks, default=str)
+
+
+def _fetch_table(con: duckdb.DuckDBPyConnection, table: str) -> tuple[list[str], list[Any]]:
+    # DuckDB preserves insertion order, so the stored rows keep the report's ORDER BY.
+    cursor = con.execute(f"SELECT * FROM {table}")
+    return [column[0] for column in cursor.description or []], cursor.fetchall()
+
+
+def run_report(con: duckdb.DuckDBPyConnection, name: str, *, refresh: bool = False) -> ReportResult:
+    """Serve `name` from its summary table, recomputing it when its inputs have changed."""
+    report = get_report(name)
+    missing = [source for source in report.sources if not relation_exists(con, source)]
+    if missing:
+        raise ReportError(f"report {name!r} needs missing tables: {', '.join(missing)}")
+    con.execute(CACHE_DDL)
+    watermark = report_watermark(con, report)
+    cached = con.execute(
+        f"SELECT watermark, sql_hash, refreshed_at FROM {CACHE_TABLE} WHERE report_name = ?",
+        [report.name],
+    ).fetchone()
+    if (
+        not refresh
+        and cached is not None
+        and cached[0] == watermark
+        and cached[1] == report.sql_hash
+        and relation_exists(con, report.result_table)
+    ):
+        columns, rows = _fetch_table(con, report.result_table)
+        return ReportResult(report.name, columns, rows, True, watermark, cached[2])
+
+    refreshed_at = datetime.now()
+    con.execute("BEGIN TRANSACTION")
+    try:
+        con.execute(f"CREATE OR REPLACE TABLE {report.result_table} AS {report.sql}")
+        count_row = con.execute(f"SELECT COUNT(*) FROM {report.result_table}").fetchone()
+        row_count = count_row[0] if count_row else 0
+        con.execute(f"DELETE FROM {CACHE_TABLE} WHERE report_name = ?", [report.name])
+        con.execute(
+            f"INSERT INTO {CACHE_TABLE} VALUES (?, ?, ?, ?, ?)",
+            [report.name, watermark, report.sql_hash, refreshed_at, row_count],
+        )
+        con.execute("COMMIT")
+    except Exception:
+        con.execute("ROLLBACK")
+        raise
+    columns, rows = _fetch_table(con, report.result_table)
+    return ReportResult(report.name, columns, rows, False, watermark, refreshed_at)
+
+
+def refresh_reports(
+    con: duckdb.DuckDBPyConnection, names: Iterable[str] | None = None, *, force: bool = False
+) -> list[ReportResult]:
+    """Bring the named (default: all available) reports up to date, e.g. after an ingest."""
+    reports = [get_report(name) for name in names] if names else available_reports(con)
+    return [run_report(con, report.name, refresh=force) for report in reports]
@@ -0,0 +1,152 @@
+"""Per-phase timing and throughput for drive scans.
+
+Each scan phase (the ExifTool files walk, list derivation, photo and video extraction, ingest)
+records wall time, CPU time for this process and its finished child processes, input block
+operations, the files and bytes it covered, and its error count. Rows go to `drive_scan_phases`,
+keyed by drive label and the scan's `started_at` so they join back to `drive_scans`.
+"""
+
+from __future__ import annotations
+
+import csv
+import resource
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+DRIVE_SCAN_PHASES_DDL = """
+CREATE TABLE IF NOT EXISTS drive_scan_phases (
+  drive_label TEXT,
+  scan_started_at TIMESTAMP,
+  phase_index INTEGER,
+  phase TEXT,
+  status TEXT,
+  started_at TIMESTAMP,
+  ended_at TIMESTAMP,
+  wall_seconds DOUBLE,
+  cpu_seconds DOUBLE,
+  input_blocks BIGINT,
+  files BIGINT,
+  bytes BIGINT,
+  errors BIGINT
+);
+"""
+
+PHASE_COLUMNS = (
+    "drive_label",
+    "scan_started_at",
+    "phase_index",
+    "phase",
+    "status",
+    "started_at",
+    "ended_at",
+    "wall_seconds",
+    "cpu_seconds",
+    "input_blocks",
+    "files",
+    "bytes",
+    "errors",
+)
+
+# ExifTool writes the numeric `-FileSize#` tag under either header depending on version.
+FILE_SIZE_COLUMNS = ("FileSize#", "FileSize")
+
+
+@dataclass
+class PhaseTiming:
+    phase: str
+    status: str = "running"
+    started_at: datetime | None = None
+    ended_at: datetime | None = None
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    input_blocks: int = 0
+    files: int = 0
+    bytes: int = 0
+    errors: int = 0
+
+
+def resource_totals() -> tuple[float, int]:
+    """CPU seconds and input block operations for this process plus its reaped children."""
+    cpu = 0.0
+    blocks = 0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        cpu += usage.ru_utime + usage.ru_stime
+        blocks += usage.ru_inblock
+    return cpu, blocks
+
+
+@contextmanager
+def measure_phase(phases: list[PhaseTiming], name: str) -> Iterator[PhaseTiming]:
+    """Time a phase and append it to `phases`; the caller fills in files, bytes and errors.
+
+    A phase that raises is recorded as failed with at least one error, and the exception
+    propagates.
+    """
+    timing = PhaseTiming(phase=name, started_at=datetime.now())
+    phases.append(timing)
+    cpu_before, blocks_before = resource_totals()
+    started = time.perf_counter()
+    try:
+        yield timing
+    except BaseException:
+        timing.status = "failed"
+        timing.errors = max(timing.errors, 1)
+        raise
+    else:
+        timing.status = "ok"
+    finally:
+        cpu_after, blocks_after = resource_totals()
+        timing.wall_seconds = round(time.perf_counter() - started, 6)
+        timing.cpu_seconds = round(cpu_after - cpu_before, 6)
+        timing.input_blocks = blocks_after - blocks_before
+        timing.ended_at = datetime.now()
+
+
+def csv_file_stats(path: Path | None) -> tuple[int, int]:
+    """Rows and the summed file-size column of an ExifTool CSV; (0, 0) when it is missing."""
+    if path is None or not path.exists():
+        return 0, 0
+    rows = 0
+    total = 0
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        fields = reader.fieldnames or []
+        size_column = next((name for name in FILE_SIZE_COLUMNS if name in fields), None)
+        for row in reader:
+            rows += 1
+            if size_column is None:
+                continue
+            try:
+                total += int(row.get(size_column) or 0)
+            except ValueError:
+                continue
+    return rows, total
+
+
+def phase_rows(
+    drive_label: str, scan_started_at: datetime, phases: list[PhaseTiming]
+) -> list[list[Any]]:
+    return [
+        [
+            drive_label,
+            scan_started_at,
+            index,
+            timing.phase,
+            timing.status,
+            timing.started_at,
+            timing.ended_at,
+            timing.wall_seconds,
+            timing.cpu_seconds,
+            timing.input_blocks,
+            timing.files,
+            timing.bytes,
+            timing.errors,
+        ]
+        for index, timing in enumerate(phases)
+    ]
@@ -4,9 +4,12 @@ import json
 import os
 from collections.abc import Callable, Sequence
 from dataclasses import asdict, dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any, cast
 
+from disk_catalogue.memo_cache import EMBEDDINGS, TRANSCRIPTS, MemoCache, audio_key, text_key
+
 AudioTranscriber = Callable[[Path], str]
 TextEmbedder = Callable[[str], list[float]]
 
@@ -132,13 +135,24 @@ def catalogue_audio(
     transcriber: AudioTranscriber,
     embedder: TextEmbedder,
     audio_extensions: Sequence[str] = tuple(DEFAULT_AUDIO_EXTENSIONS),
+    cache: MemoCache | None = None,
+    transcriber_id: str | None = None,
+    embedder_id: str | None = None,
 ) -> list[SemanticAudioRecord]:
     """Catalogue audio files under root with resumable JSON state.
 
     The expensive work is injected through `transcriber` and `embedder`, keeping
     this core deterministic and easy to test. Completed records are reused only
     while file size and mtime are unchanged. Failed records are retried.
+
+    With a `cache`, transcripts are looked up by audio content hash and
+    `transcriber_id`, and embeddings by text hash and `embedder_id`, so duplicate
+    or moved files reuse earlier results for the cost of hashing them. Both ids
+    are then required: they name the model, so a different model never gets
+    another model's results.
     """
+    if cache is not None and (not transcriber_id or not embedder_id):
+        raise ValueError("transcriber_id and embedder_id are required when a cache is given")
 
     root_path = Path(root)
     state_file = Path(state_path)
@@ -154,8 +168,17 @@ def catalogue_audio(
             continue
 
         try:
-            transcript = transcriber(path)
-            embedding = embedder(transcript)
+            if cache is None:
+                transcript = transcriber(path)
+                embedding = embedder(transcript)
+            else:
+                assert transcriber_id and embedder_id
+                transcript = cache.get_or_compute(
+                    TRANSCRIPTS, audio_key(path, transcriber_id), partial(transcriber, path)
+                )
+                embedding = cache.get_or_compute(
+                    EMBEDDINGS, text_key(transcript, embedder_id), partial(embedder, transcript)
+                )
             records_state[relative_path] = completed_state_record(transcript, embedding, current)
             write_state(state_file, state)
         except Exception as exc:
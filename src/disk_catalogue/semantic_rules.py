@@ -0,0 +1,324 @@
+"""Data-driven phrase rules for the heuristic semantic audio analysis.
+
+A rule set is a versioned JSON-compatible mapping. Conditions are written as:
+
+- `"phrase"` — the lowercased transcript contains the phrase
+- `{"all": [...]}` / `{"any": [...]}` — boolean combinations of conditions
+- `{"title": "phrase"}` / `{"album": "phrase"}` — the lowercased track title or album folder
+  contains the phrase
+
+Every distinct transcript phrase is searched once per transcript, so each rule evaluation is a
+set lookup instead of another scan over the full text.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+RULE_SET_VERSION = 1
+
+DEFAULT_RULES: dict[str, Any] = {
+    "version": RULE_SET_VERSION,
+    "story_references": [
+        {
+            "value": "Genesis 3",
+            "when": {
+                "all": [
+                    "serpent",
+                    {"any": ["forbidden fruit", {"all": ["garden", "fruit"]}]},
+                ]
+            },
+        },
+        {"value": "John 21:1-22", "when": {"all": ["feed my sheep", "peter"]}},
+        {
+            "value": "Exodus 40",
+            "when": {"all": ["tabernacle", {"any": ["moses", "glory of the lord filled"]}]},
+        },
+        {
+            "value": "John 11:1-12:26",
+            "when": {
+                "all": [
+                    "lazarus",
+                    {"any": ["grain of wheat", "kernel of wheat", "single seed"]},
+                ]
+            },
+        },
+        {"value": "Mark 5 / Luke 8", "when": {"any": ["gerasene", "gadarene"]}},
+        {"value": "Genesis 28", "when": {"all": ["jacob", "bethel"]}},
+    ],
+    "semantic_titles": [
+        {
+            "value": "Adam and Eve: disobedience, shame, judgment, and exile",
+            "when": {
+                "all": [
+                    "serpent",
+                    {"any": ["forbidden fruit", {"all": ["garden", "fruit"]}]},
+                ]
+            },
+        },
+        {
+            "value": "Jesus restores Peter: feed my sheep and follow me",
+            "when": {"all": ["feed my sheep", "peter"]},
+        },
+        {
+            "value": "How to ask story dialogue questions",
+            "when": "ask the right kinds of questions",
+        },
+        {
+            "value": "Moses sets up the tabernacle and God's glory fills it",
+            "when": {"all": ["tabernacle", {"any": ["moses", "glory of the lord filled"]}]},
+        },
+        {
+            "value": "Lazarus, Mary's anointing, triumphal entry, and the grain of wheat",
+            "when": {
+                "all": [
+                    "lazarus",
+                    {"any": ["grain of wheat", "kernel of wheat", "single seed"]},
+                ]
+            },
+        },
+        {
+            "value": "Mission with God: God's big story and spiritual markers",
+            "when": {"any": ["our mission with god", "spiritual markers"]},
+        },
+        {
+            "value": "Wake Up to Orality and Literacy: why literate methods fail oral learners",
+            "when": {"any": [{"title": "wake up to orality"}, "orality and literacy"]},
+        },
+    ],
+    "classifications": [
+        {
+            "track_type": "roundtable_training",
+            "storying_role": "Foundational training and rationale for orality-based discipleship.",
+            "module_role": "foundational_training",
+            "when": {"any": [{"title": "wake up to orality"}, "roundtable"]},
+        },
+        {
+            "track_type": "module_overview",
+            "storying_role": "Module orientation; explains audience, structure, and intended use.",
+            "module_role": "module_orientation",
+            "when": {
+                "any": [
+                    "this is module",
+                    "welcome to module",
+                    {"all": ["mission with god", "spiritual markers"]},
+                    {"all": [{"title": "module "}, {"title": "welcome"}]},
+                ]
+            },
+        },
+        {
+            "track_type": "training_guidance",
+            "storying_role": (
+                "Facilitator training; explains story dialogue and discussion practice."
+            ),
+            "module_role": "facilitator_training",
+            "when": {
+                "any": [
+                    "ask the right kinds of questions",
+                    {"all": ["questions", "story", "worldview"]},
+                ]
+            },
+        },
+        {
+            "track_type": "bible_story",
+            "storying_role": "Bible story narration with explicit memory verse.",
+            "module_role": "memory_verse_story",
+            "when": "memory verse",
+        },
+        {
+            "track_type": "bible_story",
+            "storying_role": "Bible story narration.",
+            "module_role": "story_narration",
+            "when": {"any": ["jesus", "god", "moses", "peter", "serpent", "lazarus"]},
+        },
+        {
+            "track_type": "training_guidance",
+            "storying_role": "Training or storying resource segment.",
+            "module_role": "training_segment",
+            "when": {"album": "following jesus"},
+        },
+    ],
+    "fallback_classification": {
+        "track_type": "unknown",
+        "storying_role": "Unclassified audio segment.",
+        "module_role": None,
+    },
+    "keywords": [
+        "orality",
+        "literacy",
+        "primary oral learners",
+        "worldview",
+        "discipleship",
+        "storying",
+        "evangelism",
+        "memory verse",
+        "mission",
+        "tabernacle",
+        "lazarus",
+        "peter",
+        "moses",
+        "genesis",
+        "john",
+        "exodus",
+    ],
+    "memory_verse_when": "memory verse",
+    "worldview_when": "worldview",
+    "speakers": ["Avery Willis", "Jim Slack", "Grant Lovejoy", "Marcus Vegh"],
+}
+
+
+@dataclass(frozen=True)
+class ValueRule:
+    value: str
+    when: Any
+
+
+@dataclass(frozen=True)
+class ClassificationRule:
+    track_type: str
+    storying_role: str
+    module_role: str | None
+    when: Any
+
+    def result(self) -> tuple[str, str, str | None]:
+        return (self.track_type, self.storying_role, self.module_role)
+
+
+@dataclass(frozen=True)
+class RuleSet:
+    version: int
+    story_references: tuple[ValueRule, ...]
+    semantic_titles: tuple[ValueRule, ...]
+    classifications: tuple[ClassificationRule, ...]
+    fallback_classification: ClassificationRule
+    keywords: tuple[str, ...]
+    memory_verse_when: Any
+    worldview_when: Any
+    speakers: tuple[str, ...]
+    phrases: frozenset[str]
+    speaker_re: re.Pattern[str]
+
+
+@dataclass(frozen=True)
+class TranscriptView:
+    """A transcript prepared once for every rule: lowercased, normalised, and phrase-matched."""
+
+    text: str
+    lower: str
+    normalised: str
+    phrases: frozenset[str]
+
+
+def _iter_condition_phrases(condition: Any) -> Iterator[str]:
+    if isinstance(condition, str):
+        yield condition
+        return
+    if not isinstance(condition, Mapping) or len(condition) != 1:
+        raise ValueError(f"invalid rule condition: {condition!r}")
+    ((operator, operand),) = condition.items()
+    if operator in ("all", "any"):
+        for item in operand:
+            yield from _iter_condition_phrases(item)
+    elif operator not in ("title", "album"):
+        raise ValueError(f"unknown rule condition operator: {operator!r}")
+
+
+def _classification(raw: Mapping[str, Any]) -> ClassificationRule:
+    module_role = raw.get("module_role")
+    return ClassificationRule(
+        track_type=str(raw["track_type"]),
+        storying_role=str(raw["storying_role"]),
+        module_role=str(module_role) if module_role is not None else None,
+        when=raw.get("when"),
+    )
+
+
+def rule_set_from_mapping(raw: Mapping[str, Any]) -> RuleSet:
+    version = raw.get("version")
+    if version != RULE_SET_VERSION:
+        raise ValueError(f"unsupported semantic rule set version: {version!r}")
+    story_references = tuple(
+        ValueRule(str(item["value"]), item["when"]) for item in raw["story_references"]
+    )
+    semantic_titles = tuple(
+        ValueRule(str(item["value"]), item["when"]) for item in raw["semantic_titles"]
+    )
+    classifications = tuple(_classification(item) for item in raw["classifications"])
+    keywords = tuple(str(keyword) for keyword in raw["keywords"])
+    speakers = tuple(str(name) for name in raw["speakers"])
+    conditions: list[Any] = [
+        *(rule.when for rule in story_references),
+        *(rule.when for rule in semantic_titles),
+        *(rule.when for rule in classifications),
+        raw["memory_verse_when"],
+        raw["worldview_when"],
+    ]
+    phrases = {phrase for condition in conditions for phrase in _iter_condition_phrases(condition)}
+    phrases.update(keywords)
+    speaker_pattern = "|".join(re.escape(name) for name in speakers) or r"(?!)"
+    return RuleSet(
+        version=int(version),
+        story_references=story_references,
+        semantic_titles=semantic_titles,
+        classifications=classifications,
+        fallback_classification=_classification(raw["fallback_classification"]),
+        keywords=keywords,
+        memory_verse_when=raw["memory_verse_when"],
+        worldview_when=raw["worldview_when"],
+        speakers=speakers,
+        phrases=frozenset(phrase.lower() for phrase in phrases),
+        speaker_re=re.compile(rf"\b({speaker_pattern})\b", re.IGNORECASE),
+    )
+
+
+def load_rule_set(path: Path) -> RuleSet:
+    return rule_set_from_mapping(json.loads(path.read_text(encoding="utf-8")))
+
+
+@cache
+def default_rule_set() -> RuleSet:
+    return rule_set_from_mapping(DEFAULT_RULES)
+
+
+def match_phrases(lower_text: str, phrases: Iterable[str]) -> frozenset[str]:
+    return frozenset(phrase for phrase in phrases if phrase in lower_text)
+
+
+def prepare_transcript(text: str, rules: RuleSet, normalised: str) -> TranscriptView:
+    lower = text.lower()
+    return TranscriptView(
+        text=text,
+        lower=lower,
+        normalised=normalised,
+        phrases=match_phrases(lower, rules.phrases),
+    )
+
+
+def condition_matches(
+    condition: Any, view: TranscriptView, title: str = "", album: str = ""
+) -> bool:
+    if isinstance(condition, str):
+        return condition.lower() in view.phrases
+    ((operator, operand),) = condition.items()
+    if operator == "all":
+        return all(condition_matches(item, view, title, album) for item in operand)
+    if operator == "any":
+        return any(condition_matches(item, view, title, album) for item in operand)
+    if operator == "title":
+        return str(operand).lower() in title.lower()
+    return str(operand).lower() in album.lower()
+
+
+def first_matching_value(
+    rules: Sequence[ValueRule], view: TranscriptView, title: str = "", album: str = ""
+) -> str | None:
+    return next(
+        (rule.value for rule in rules if condition_matches(rule.when, view, title, album)),
+        None,
+    )
@@ -0,0 +1,381 @@
+"""Typed DuckDB table writes for the semantic audio catalogue.
+
+Every exported table has an explicit schema, so column types no longer depend on which values a
+particular run happens to contain (an all-NULL column stays VARCHAR rather than becoming INTEGER).
+Rows are bulk-inserted column-wise: each column is passed as one list parameter and expanded with
+`UNNEST`, which avoids building a DataFrame per table. Writes are built as `(sql, params)`
+statements so they can run on a local connection or be sent to `catalogue_service`.
+
+Tables fed from open-ended rows, such as the per-file run state, are widened with
+`with_row_columns`, so keys a schema does not list yet still reach DuckDB. `patch_csv` is the
+CSV counterpart of `replace_file_rows` for the file_key-sorted CSV exports.
+"""
+
+from __future__ import annotations
+
+import csv
+import heapq
+import json
+import os
+import uuid
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import duckdb
+
+
+@dataclass(frozen=True)
+class TableSchema:
+    name: str
+    columns: tuple[tuple[str, str], ...]
+    indexes: tuple[tuple[str, tuple[str, ...]], ...] = ()
+
+    @property
+    def column_names(self) -> list[str]:
+        return [name for name, _type in self.columns]
+
+    def create_sql(self, replace: bool = True) -> str:
+        columns = ", ".join(f'"{name}" {column_type}' for name, column_type in self.columns)
+        create = "CREATE OR REPLACE TABLE" if replace else "CREATE TABLE IF NOT EXISTS"
+        return f"{create} {self.name} ({columns})"
+
+    def index_sql(self) -> list[str]:
+        return [
+            f"CREATE INDEX {index_name} ON {self.name}({', '.join(columns)})"
+            for index_name, columns in self.indexes
+        ]
+
+
+def text_schema(name: str, column_names: Iterable[str]) -> TableSchema:
+    """Schema for rows copied verbatim from a CSV, where every value is text."""
+    return TableSchema(name, tuple((column, "VARCHAR") for column in column_names))
+
+
+def value_type(values: Iterable[Any]) -> str:
+    """DuckDB type for a column of Python values; VARCHAR unless every value agrees."""
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        return "BOOLEAN"
+    if any(isinstance(value, bool) for value in present):
+        return "VARCHAR"
+    if present and all(isinstance(value, int) for value in present):
+        return "BIGINT"
+    if present and all(isinstance(value, int | float) for value in present):
+        return "DOUBLE"
+    return "VARCHAR"
+
+
+def with_row_columns(schema: TableSchema, rows: Sequence[Mapping[str, Any]]) -> TableSchema:
+    """`schema` plus a column, typed from its values, for every row key the schema lacks."""
+    known = set(schema.column_names)
+    extra = [
+        name for name in dict.fromkeys(key for row in rows for key in row) if name not in known
+    ]
+    if not extra:
+        return schema
+    columns = tuple((name, value_type(row.get(name) for row in rows)) for name in extra)
+    return TableSchema(schema.name, schema.columns + columns, schema.indexes)
+
+
+SEMANTIC_CATALOGUE = TableSchema(
+    "audio_semantic_catalogue",
+    (
+        ("recovery_set", "VARCHAR"),
+        ("file_key", "VARCHAR"),
+        ("album_folder", "VARCHAR"),
+        ("file_name", "VARCHAR"),
+        ("embedded_title", "VARCHAR"),
+        ("semantic_title", "VARCHAR"),
+        ("track_type", "VARCHAR"),
+        ("bible_reference", "VARCHAR"),
+        ("bible_book", "VARCHAR"),
+        ("speaker_names", "VARCHAR"),
+        ("speaker_confidence", "VARCHAR"),
+        ("storying_role", "VARCHAR"),
+        ("module_role", "VARCHAR"),
+        ("process_step", "VARCHAR"),
+        ("memory_verse", "VARCHAR"),
+        ("worldview_issue", "VARCHAR"),
+        ("summary_short", "VARCHAR"),
+        ("summary_long", "VARCHAR"),
+        ("keywords", "VARCHAR"),
+        ("transcript_path", "VARCHAR"),
+        ("srt_path", "VARCHAR"),
+        ("transcript_chars", "BIGINT"),
+        ("metadata_confidence", "VARCHAR"),
+        ("evidence_json", "VARCHAR"),
+        ("created_at", "VARCHAR"),
+        ("analysis_backend", "VARCHAR"),
+    ),
+)
+
+CATALOGUE_STATUS = TableSchema(
+    "audio_semantic_catalogue_status",
+    (
+        ("file_key", "VARCHAR"),
+        ("status", "VARCHAR"),
+        ("source_size", "BIGINT"),
+        ("source_mtime_ns", "BIGINT"),
+        ("album_folder", "VARCHAR"),
+        ("file_name", "VARCHAR"),
+        ("title", "VARCHAR"),
+        ("started_at", "VARCHAR"),
+        ("completed_at", "VARCHAR"),
+        ("failed_at", "VARCHAR"),
+        ("updated_at", "VARCHAR"),
+        ("elapsed_seconds", "DOUBLE"),
+        ("error", "VARCHAR"),
+        ("transcript_path", "VARCHAR"),
+        ("srt_path", "VARCHAR"),
+        ("semantic_path", "VARCHAR"),
+        ("semantic_title", "VARCHAR"),
+        ("track_type", "VARCHAR"),
+        ("bible_reference", "VARCHAR"),
+        ("metadata_confidence", "VARCHAR"),
+        ("model_id", "VARCHAR"),
+        ("threads", "BIGINT"),
+        ("memo_cache_hit", "BOOLEAN"),
+        ("entry_stored", "BOOLEAN"),
+        ("vad_duration_seconds", "DOUBLE"),
+        ("vad_speech_seconds", "DOUBLE"),
+        ("vad_skipped_fraction", "DOUBLE"),
+    ),
+)
+
+CATALOGUE_DUPLICATES = TableSchema(
+    "audio_semantic_catalogue_duplicates",
+    (
+        ("duplicate_kind", "VARCHAR"),
+        ("duplicate_key", "VARCHAR"),
+        ("group_count", "BIGINT"),
+        ("file_count", "BIGINT"),
+        ("file_keys", "VARCHAR"),
+        ("album_folders", "VARCHAR"),
+        ("file_names", "VARCHAR"),
+        ("destination_paths", "VARCHAR"),
+        ("evidence_json", "VARCHAR"),
+    ),
+)
+
+CATALOGUE_VERIFICATION = TableSchema(
+    "audio_semantic_catalogue_verification",
+    (
+        ("total_files", "BIGINT"),
+        ("catalogued_files", "BIGINT"),
+        ("transcript_files", "BIGINT"),
+        ("missing_catalogue", "VARCHAR[]"),
+        ("missing_transcripts", "VARCHAR[]"),
+        ("empty_transcripts", "VARCHAR[]"),
+        ("verified_at", "VARCHAR"),
+        ("short_transcripts", "VARCHAR[]"),
+        ("duplicate_audit_complete", "BOOLEAN"),
+        ("duplicate_source_files_checked", "BIGINT"),
+        ("exact_duplicate_groups", "BIGINT"),
+        ("exact_duplicate_files", "BIGINT"),
+        ("folder_duplicate_groups", "BIGINT"),
+        ("folder_duplicate_folders", "BIGINT"),
+    ),
+)
+
+CATALOGUE_EVAL = TableSchema(
+    "audio_semantic_catalogue_eval",
+    (
+        ("eval_set", "VARCHAR"),
+        ("analysis_backend", "VARCHAR"),
+        ("question_id", "VARCHAR"),
+        ("score", "DOUBLE"),
+        ("max_score", "DOUBLE"),
+        ("passed", "BOOLEAN"),
+        ("details_json", "VARCHAR"),
+    ),
+)
+
+CATALOGUE_FIELD_ACCURACY = TableSchema(
+    "audio_semantic_catalogue_field_accuracy",
+    (
+        ("eval_set", "VARCHAR"),
+        ("analysis_backend", "VARCHAR"),
+        ("field_name", "VARCHAR"),
+        ("questions", "BIGINT"),
+        ("matched", "BIGINT"),
+        ("accuracy", "DOUBLE"),
+        ("weighted_score", "DOUBLE"),
+        ("max_weighted_score", "DOUBLE"),
+    ),
+)
+
+TRANSCRIPT_SEGMENTS = TableSchema(
+    "audio_transcript_segments",
+    (
+        ("file_key", "VARCHAR"),
+        ("segment_index", "BIGINT"),
+        ("start_seconds", "DOUBLE"),
+        ("end_seconds", "DOUBLE"),
+        ("text", "VARCHAR"),
+    ),
+    indexes=(("idx_audio_transcript_segments_time", ("file_key", "start_seconds", "end_seconds")),),
+)
+
+BIBLE_REFERENCES = TableSchema(
+    "audio_bible_references",
+    (
+        ("file_key", "VARCHAR"),
+        ("reference", "VARCHAR"),
+        ("book", "VARCHAR"),
+        ("book_ordinal", "BIGINT"),
+        ("chapter", "BIGINT"),
+        ("verse_start", "BIGINT"),
+        ("chapter_end", "BIGINT"),
+        ("verse_end", "BIGINT"),
+        ("start_ordinal", "BIGINT"),
+        ("end_ordinal", "BIGINT"),
+        ("reference_role", "VARCHAR"),
+    ),
+    indexes=(("idx_audio_bible_references_range", ("start_ordinal", "end_ordinal")),),
+)
+
+
+Statement = tuple[str, list[Any]]
+
+
+def insert_statements(schema: TableSchema, rows: Sequence[Mapping[str, Any]]) -> list[Statement]:
+    """Statements appending rows to an existing table. Keys outside the schema are ignored."""
+    if not rows:
+        return []
+    names = schema.column_names
+    columns = [
+        _column_values(rows, name, column_type == "VARCHAR") for name, column_type in schema.columns
+    ]
+    targets = ", ".join(f'"{name}"' for name in names)
+    values = ", ".join(f"UNNEST(${position})" for position in range(1, len(names) + 1))
+    return [(f"INSERT INTO {schema.name} ({targets}) SELECT {values}", columns)]
+
+
+def _column_values(rows: Sequence[Mapping[str, Any]], name: str, text: bool) -> list[Any]:
+    values = [row.get(name) for row in rows]
+    if text and any(value is not None and not isinstance(value, str) for value in values):
+        # Text columns widened from open-ended rows may hold numbers, lists, or flags.
+        return [
+            value if value is None or isinstance(value, str) else json.dumps(value, default=str)
+            for value in values
+        ]
+    return values
+
+
+def add_columns_statements(schema: TableSchema) -> list[Statement]:
+    """Statements adding any of `schema`'s columns missing from the existing table."""
+    return [
+        (f'ALTER TABLE {schema.name} ADD COLUMN IF NOT EXISTS "{name}" {column_type}', [])
+        for name, column_type in schema.columns
+    ]
+
+
+def write_table_statements(
+    schema: TableSchema, rows: Sequence[Mapping[str, Any]]
+) -> list[Statement]:
+    """Statements replacing a table with `rows`, recreating its schema and indexes."""
+    return [
+        (schema.create_sql(), []),
+        *insert_statements(schema, rows),
+        *((statement, []) for statement in schema.index_sql()),
+    ]
+
+
+def replace_file_rows_statements(
+    schema: TableSchema, rows: Sequence[Mapping[str, Any]], file_keys: Iterable[str]
+) -> list[Statement]:
+    """Statements deleting every row for `file_keys`, then inserting their replacement rows."""
+    return [
+        (f"DELETE FROM {schema.name} WHERE file_key IN (SELECT UNNEST($1))", [sorted(file_keys)]),
+        *insert_statements(schema, rows),
+    ]
+
+
+def execute_statements(con: duckdb.DuckDBPyConnection, statements: Iterable[Statement]) -> None:
+    for sql, params in statements:
+        con.execute(sql, params)
+
+
+def insert_rows(
+    con: duckdb.DuckDBPyConnection, schema: TableSchema, rows: Sequence[Mapping[str, Any]]
+) -> None:
+    execute_statements(con, insert_statements(schema, rows))
+
+
+def write_table(
+    con: duckdb.DuckDBPyConnection, schema: TableSchema, rows: Sequence[Mapping[str, Any]]
+) -> None:
+    execute_statements(con, write_table_statements(schema, rows))
+
+
+def replace_file_rows(
+    con: duckdb.DuckDBPyConnection,
+    schema: TableSchema,
+    rows: Sequence[Mapping[str, Any]],
+    file_keys: Iterable[str],
+) -> None:
+    execute_statements(con, replace_file_rows_statements(schema, rows, file_keys))
+
+
+def _file_key(row: Mapping[str, Any]) -> str:
+    return str(row["file_key"])
+
+
+def write_csv(
+    path: Path, rows: Iterable[Mapping[str, Any]], fieldnames: Sequence[str] | None = None
+) -> None:
+    """Write rows with a header of `fieldnames`, or of every row key in first-seen order."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fieldnames is None:
+        rows = list(rows)
+        if not rows:
+            path.write_text("", encoding="utf-8")
+            return
+        fieldnames = list(dict.fromkeys(name for row in rows for name in row))
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def patch_csv(path: Path, rows: Sequence[Mapping[str, Any]], file_keys: Iterable[str]) -> None:
+    """Replace the rows for `file_keys` in a file_key-sorted CSV written by `write_csv`.
+
+    The file is scanned once for its last file_key and any of `file_keys`, without holding its
+    rows. New rows that all sort after the last one, need no new columns, and replace nothing are
+    appended. Otherwise the kept and new rows are merged in file_key order into a temporary file
+    that replaces the CSV.
+    """
+    keys = set(file_keys)
+    new_rows = sorted(rows, key=_file_key)
+    if not path.exists() or path.stat().st_size == 0:
+        write_csv(path, new_rows)
+        return
+    with path.open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader)
+        key_index = header.index("file_key")
+        last_key = ""
+        overlaps = False
+        for values in reader:
+            last_key = values[key_index]
+            if last_key in keys:
+                overlaps = True
+                break
+    new_fields = [
+        name for name in dict.fromkeys(key for row in new_rows for key in row) if name not in header
+    ]
+    if not overlaps and not new_fields and (not new_rows or _file_key(new_rows[0]) > last_key):
+        with path.open("a", newline="", encoding="utf-8") as handle:
+            csv.DictWriter(handle, fieldnames=header).writerows(new_rows)
+        return
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with path.open(newline="", encoding="utf-8") as handle:
+            kept = (row for row in csv.DictReader(handle) if row["file_key"] not in keys)
+            write_csv(tmp, heapq.merge(kept, new_rows, key=_file_key), [*header, *new_fields])
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
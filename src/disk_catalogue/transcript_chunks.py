@@ -0,0 +1,163 @@
+"""Split long tracks into overlapping chunks and stitch their transcripts back together.
+
+Roundtable and overview tracks run for most of an hour, and one whisper job per file leaves a
+single long track setting the tail of a run. `plan_chunks` cuts a track into fixed-length
+windows that overlap by a few seconds, so no word is lost at a cut. `split_wav` writes each
+window as its own WAV, and `stitch_segments` shifts each chunk's SRT cues onto the track's
+timeline and resolves every overlap once:
+
+- cues are split at the middle of the overlap, the earlier chunk keeping cues centred before it;
+- words repeated across the seam (a phrase both chunks heard) are dropped from the later cue;
+- cue times are clamped so they never run backwards.
+"""
+
+from __future__ import annotations
+
+import wave
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from disk_catalogue.audio_semantic import TranscriptSegment, format_srt_timestamp, normalise_space
+
+DEFAULT_CHUNK_SECONDS = 600.0
+DEFAULT_OVERLAP_SECONDS = 8.0
+# Seam repeats shorter than this many words are left alone; they are likely real repetition.
+MIN_REPEATED_WORDS = 2
+
+
+@dataclass(frozen=True)
+class ChunkOptions:
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS
+    # Chunks transcribed at once; each job gets an equal share of the whisper threads.
+    workers: int = 4
+
+
+@dataclass(frozen=True)
+class Chunk:
+    index: int
+    start_seconds: float
+    end_seconds: float
+
+
+def plan_chunks(
+    duration_seconds: float,
+    chunk_seconds: float = DEFAULT_CHUNK_SECONDS,
+    overlap_seconds: float = DEFAULT_OVERLAP_SECONDS,
+) -> list[Chunk]:
+    """Overlapping windows covering the track; one chunk when it is not worth splitting.
+
+    A final window shorter than a quarter of `chunk_seconds` is folded into the one before.
+    """
+    if overlap_seconds < 0 or chunk_seconds <= 2 * overlap_seconds:
+        raise ValueError("chunk_seconds must exceed twice overlap_seconds")
+    if duration_seconds <= chunk_seconds * 1.25:
+        return [Chunk(0, 0.0, duration_seconds)]
+    step = chunk_seconds - overlap_seconds
+    starts = [0.0]
+    while starts[-1] + chunk_seconds < duration_seconds:
+        starts.append(starts[-1] + step)
+    if len(starts) > 1 and duration_seconds - starts[-1] < chunk_seconds / 4:
+        starts.pop()
+    return [
+        Chunk(
+            index,
+            start,
+            duration_seconds if index == len(starts) - 1 else start + chunk_seconds,
+        )
+        for index, start in enumerate(starts)
+    ]
+
+
+def parallel_chunks(duration_seconds: float, options: ChunkOptions) -> int:
+    """How many chunks of the track are transcribed at once; 1 when it is not split."""
+    chunks = plan_chunks(duration_seconds, options.chunk_seconds, options.overlap_seconds)
+    return max(1, min(options.workers, len(chunks)))
+
+
+def wav_duration(path: Path) -> float:
+    with wave.open(str(path), "rb") as handle:
+        return handle.getnframes() / handle.getframerate()
+
+
+def split_wav(source: Path, chunks: Sequence[Chunk], directory: Path) -> list[Path]:
+    """Write each chunk of `source` to `directory` as chunk_<index>.wav, same format."""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths: list[Path] = []
+    with wave.open(str(source), "rb") as reader:
+        rate = reader.getframerate()
+        for chunk in chunks:
+            first = round(chunk.start_seconds * rate)
+            last = min(round(chunk.end_seconds * rate), reader.getnframes())
+            reader.setpos(first)
+            path = directory / f"chunk_{chunk.index:03d}.wav"
+            with wave.open(str(path), "wb") as writer:
+                writer.setparams(reader.getparams())
+                writer.writeframes(reader.readframes(last - first))
+            paths.append(path)
+    return paths
+
+
+def _midpoint(segment: TranscriptSegment) -> float:
+    return (segment.start_seconds + segment.end_seconds) / 2
+
+
+def _repeated_words(previous: list[str], following: list[str]) -> int:
+    """Length of the longest tail of `previous` that `following` starts with."""
+    compare = [word.strip(".,!?;:\"'").lower() for word in previous]
+    lead = [word.strip(".,!?;:\"'").lower() for word in following]
+    for size in range(min(len(compare), len(lead)), MIN_REPEATED_WORDS - 1, -1):
+        if compare[-size:] == lead[:size]:
+            return size
+    return 0
+
+
+def stitch_segments(
+    chunks: Sequence[tuple[Chunk, Sequence[TranscriptSegment]]],
+) -> list[TranscriptSegment]:
+    """Merge per-chunk cues (times relative to each chunk) into one track-level cue list."""
+    stitched: list[TranscriptSegment] = []
+    ordered = sorted(chunks, key=lambda item: item[0].start_seconds)
+    for position, (chunk, segments) in enumerate(ordered):
+        low = 0.0
+        if position:
+            previous = ordered[position - 1][0]
+            low = (chunk.start_seconds + previous.end_seconds) / 2
+        high = float("inf")
+        if position + 1 < len(ordered):
+            following = ordered[position + 1][0]
+            high = (following.start_seconds + chunk.end_seconds) / 2
+        first_in_chunk = True
+        for segment in segments:
+            shifted = TranscriptSegment(
+                segment.start_seconds + chunk.start_seconds,
+                segment.end_seconds + chunk.start_seconds,
+                segment.text,
+            )
+            if not low <= _midpoint(shifted) < high:
+                continue
+            words = shifted.text.split()
+            if first_in_chunk and stitched:
+                words = words[_repeated_words(stitched[-1].text.split(), words) :]
+            first_in_chunk = False
+            if not words:
+                continue
+            start = max(shifted.start_seconds, stitched[-1].end_seconds if stitched else 0.0)
+            stitched.append(
+                TranscriptSegment(start, max(start, shifted.end_seconds), " ".join(words))
+            )
+    return stitched
+
+
+def format_srt(segments: Sequence[TranscriptSegment]) -> str:
+    return "".join(
+        f"{number}\n{format_srt_timestamp(segment.start_seconds)} --> "
+        f"{format_srt_timestamp(segment.end_seconds)}\n{segment.text}\n\n"
+        for number, segment in enumerate(segments, start=1)
+    )
+
+
+def format_transcript(segments: Sequence[TranscriptSegment]) -> str:
+    """One line per cue, as whisper's own .txt output is laid out."""
+    return "".join(f"{normalise_space(segment.text)}\n" for segment in segments)
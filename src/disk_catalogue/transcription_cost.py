@@ -0,0 +1,167 @@
+"""Transcription cost model fitted from past runs, for ordering work and estimating ETAs.
+
+Every completed record in the semantic catalogue state carries `elapsed_seconds`, and
+`audio_metadata.csv` carries each track's `duration_seconds`. `fit_cost_model` fits
+`elapsed = overhead + rtf * duration` per (model id, threads, chunking), where `rtf` is the
+real-time factor and `overhead` covers ffmpeg and model start-up. It falls back to a fit over every
+run, then to a conservative default, when a configuration has no history.
+
+A long track split into chunks runs as several whisper jobs at once, so each sample records how
+many chunks ran in parallel and the fit uses its duration divided by that count: the share of
+the track one job worked through, which is what wall-clock time follows.
+
+`longest_first` orders pending work by predicted cost, so the long tracks start early and the
+end of a batch is not one straggler.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from statistics import median
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Used before any history exists: whisper base.en on a laptop CPU runs at about a quarter of
+# real time, plus a few seconds of ffmpeg and model load.
+DEFAULT_RTF = 0.25
+DEFAULT_OVERHEAD_SECONDS = 3.0
+
+CostKey = tuple[str | None, int | None, str | None]
+
+
+@dataclass(frozen=True)
+class CostSample:
+    model_id: str | None
+    threads: int | None
+    duration_seconds: float
+    elapsed_seconds: float
+    chunking: str | None = None
+    parallelism: int = 1
+
+    @property
+    def wall_duration_seconds(self) -> float:
+        return self.duration_seconds / max(1, self.parallelism)
+
+
+@dataclass(frozen=True)
+class CostFit:
+    rtf: float
+    overhead_seconds: float
+    samples: int
+
+    def predict(self, duration_seconds: float) -> float:
+        return self.overhead_seconds + self.rtf * duration_seconds
+
+
+DEFAULT_FIT = CostFit(DEFAULT_RTF, DEFAULT_OVERHEAD_SECONDS, 0)
+
+
+def fit_line(samples: Sequence[CostSample]) -> CostFit:
+    """Least-squares overhead and RTF, both kept non-negative.
+
+    With fewer than three samples, or durations too alike to separate the two terms, the
+    overhead is dropped and the RTF is the ratio of total elapsed to total duration.
+    """
+    total_duration = sum(sample.wall_duration_seconds for sample in samples)
+    total_elapsed = sum(sample.elapsed_seconds for sample in samples)
+    if not samples or total_duration <= 0:
+        return DEFAULT_FIT
+    ratio = CostFit(total_elapsed / total_duration, 0.0, len(samples))
+    if len(samples) < 3:
+        return ratio
+    mean_duration = total_duration / len(samples)
+    mean_elapsed = total_elapsed / len(samples)
+    spread = sum((sample.wall_duration_seconds - mean_duration) ** 2 for sample in samples)
+    if spread <= 1e-9 * mean_duration**2:
+        return ratio
+    covariance = sum(
+        (sample.wall_duration_seconds - mean_duration) * (sample.elapsed_seconds - mean_elapsed)
+        for sample in samples
+    )
+    rtf = covariance / spread
+    overhead = mean_elapsed - rtf * mean_duration
+    if rtf <= 0 or overhead < 0:
+        return ratio
+    return CostFit(rtf, overhead, len(samples))
+
+
+@dataclass(frozen=True)
+class CostModel:
+    fits: Mapping[CostKey, CostFit] = field(default_factory=dict)
+    overall: CostFit = DEFAULT_FIT
+
+    def fit_for(
+        self, model_id: str | None, threads: int | None, chunking: str | None = None
+    ) -> CostFit:
+        return self.fits.get((model_id, threads, chunking), self.overall)
+
+    def predict(
+        self,
+        duration_seconds: float,
+        model_id: str | None,
+        threads: int | None,
+        chunking: str | None = None,
+        parallelism: int = 1,
+    ) -> float:
+        fit = self.fit_for(model_id, threads, chunking)
+        return fit.predict(duration_seconds / max(1, parallelism))
+
+
+def fit_cost_model(samples: Iterable[CostSample]) -> CostModel:
+    grouped: dict[CostKey, list[CostSample]] = defaultdict(list)
+    everything: list[CostSample] = []
+    for sample in samples:
+        if sample.duration_seconds <= 0 or sample.elapsed_seconds <= 0:
+            continue
+        grouped[(sample.model_id, sample.threads, sample.chunking)].append(sample)
+        everything.append(sample)
+    return CostModel(
+        fits={key: fit_line(group) for key, group in grouped.items()},
+        overall=fit_line(everything),
+    )
+
+
+def cost_samples(
+    state_records: Mapping[str, Mapping[str, Any]],
+    durations: Mapping[str, float | None],
+) -> list[CostSample]:
+    """Samples from completed state records whose track duration is known.
+
+    Records served from the memo cache (`memo_cache_hit`) are left out: their elapsed time
+    says nothing about the model. Records from before chunking was tracked count as unchunked.
+    """
+    samples: list[CostSample] = []
+    for file_key, record in state_records.items():
+        duration = durations.get(file_key)
+        elapsed = record.get("elapsed_seconds")
+        if record.get("status") != "completed" or record.get("memo_cache_hit"):
+            continue
+        if duration is None or elapsed is None:
+            continue
+        threads = record.get("threads")
+        samples.append(
+            CostSample(
+                record.get("model_id"),
+                int(threads) if threads is not None else None,
+                float(duration),
+                float(elapsed),
+                record.get("chunking"),
+                int(record.get("parallel_chunks") or 1),
+            )
+        )
+    return samples
+
+
+def fill_missing_durations(durations: Sequence[float | None]) -> list[float]:
+    """Unknown durations take the median known one, so they are neither first nor free."""
+    known = [duration for duration in durations if duration is not None]
+    fallback = median(known) if known else 0.0
+    return [fallback if duration is None else duration for duration in durations]
+
+
+def longest_first(items: Sequence[T], cost: Callable[[T], float]) -> list[T]:
+    """Items by descending cost; ties keep their original order."""
+    return sorted(items, key=lambda item: -cost(item))
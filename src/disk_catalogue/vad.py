@@ -0,0 +1,195 @@
+"""Energy-based voice activity detection to trim silence before transcription.
+
+The CD rips in the recovery set carry long silences, music beds and lead-ins that whisper
+still has to decode. `trim_to_speech` reads the 16 kHz mono PCM that `convert_to_wav` writes,
+marks frames whose energy stands clear of the track's own noise floor, closes short pauses,
+pads each speech region, and writes only those regions, back to back, to a new WAV. The
+returned `SpeechTimeline` maps times in the trimmed audio back to the original track, so
+`remap_srt` can put whisper's cues on the original timeline.
+
+Requires NumPy (`pip install disk-catalogue[vad]`).
+"""
+
+from __future__ import annotations
+
+import re
+import wave
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+
+from disk_catalogue.audio_semantic import format_srt_timestamp, parse_srt_timestamp
+
+Samples = npt.NDArray[np.float32]
+
+SRT_TIMING_RE = re.compile(
+    r"^(?P<start>\d+:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(?P<end>\d+:\d{2}:\d{2}[,.]\d{3})(?P<rest>.*)$"
+)
+
+
+@dataclass(frozen=True)
+class VadOptions:
+    frame_ms: int = 30
+    # Speech frames sit this far above the track's noise floor (10th-percentile frame energy).
+    margin_db: float = 12.0
+    # Frames quieter than this are never speech, however quiet the floor is.
+    min_db: float = -55.0
+    min_speech_ms: int = 250
+    # Pauses shorter than this stay inside a region, so sentences are not split.
+    min_silence_ms: int = 600
+    pad_ms: int = 200
+
+
+@dataclass(frozen=True)
+class SpeechRegion:
+    start_seconds: float
+    end_seconds: float
+
+    @property
+    def seconds(self) -> float:
+        return self.end_seconds - self.start_seconds
+
+
+@dataclass(frozen=True)
+class SpeechTimeline:
+    regions: tuple[SpeechRegion, ...]
+    duration_seconds: float
+
+    @property
+    def speech_seconds(self) -> float:
+        return sum(region.seconds for region in self.regions)
+
+    @property
+    def skipped_fraction(self) -> float:
+        if self.duration_seconds <= 0:
+            return 0.0
+        return max(0.0, 1.0 - self.speech_seconds / self.duration_seconds)
+
+    def to_original(self, seconds: float, *, end: bool = False) -> float:
+        """Map a time in the trimmed audio to the original track.
+
+        A time on the join between two regions maps to the start of the later region, or
+        to the end of the earlier one when `end` is set, so cues never swallow the gap.
+        """
+        if not self.regions:
+            return seconds
+        offsets = list(accumulate((region.seconds for region in self.regions), initial=0.0))
+        find = bisect_left if end else bisect_right
+        index = min(max(find(offsets, seconds) - 1, 0), len(self.regions) - 1)
+        region = self.regions[index]
+        return min(region.start_seconds + seconds - offsets[index], region.end_seconds)
+
+
+def frame_energies_db(samples: Samples, frame_length: int) -> npt.NDArray[np.float64]:
+    frames = len(samples) // frame_length
+    if not frames:
+        return np.zeros(0)
+    framed = samples[: frames * frame_length].reshape(frames, frame_length)
+    power: npt.NDArray[np.float64] = np.square(framed, dtype=np.float64).mean(axis=1)
+    return np.asarray(10.0 * np.log10(power + 1e-10), dtype=np.float64)
+
+
+def _runs(mask: npt.NDArray[np.bool_]) -> list[tuple[int, int]]:
+    """Half-open [start, end) index ranges where `mask` is true."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    return [(int(start), int(stop)) for start, stop in zip(starts, ends, strict=True)]
+
+
+def detect_speech(
+    samples: Samples, sample_rate: int, options: VadOptions | None = None
+) -> list[SpeechRegion]:
+    """Speech regions in `samples` (floats in [-1, 1]), in seconds on the original timeline."""
+    options = options or VadOptions()
+    frame_length = max(1, sample_rate * options.frame_ms // 1000)
+    energies = frame_energies_db(samples, frame_length)
+    if not len(energies):
+        return []
+    floor, loud = np.percentile(energies, [10, 90])
+    if loud - floor < options.margin_db:
+        # No quiet stretches to measure against: keep everything audible.
+        threshold = options.min_db
+    else:
+        threshold = max(float(floor) + options.margin_db, options.min_db)
+    runs = _runs(energies > threshold)
+
+    def frames(ms: int) -> int:
+        return -(-ms // options.frame_ms)
+
+    merged: list[tuple[int, int]] = []
+    for start, stop in runs:
+        if merged and start - merged[-1][1] < frames(options.min_silence_ms):
+            merged[-1] = (merged[-1][0], stop)
+        else:
+            merged.append((start, stop))
+
+    frame_seconds = frame_length / sample_rate
+    pad = options.pad_ms / 1000
+    duration = len(samples) / sample_rate
+    regions: list[SpeechRegion] = []
+    for start, stop in merged:
+        if stop - start < frames(options.min_speech_ms):
+            continue
+        begin = max(0.0, start * frame_seconds - pad)
+        finish = min(duration, stop * frame_seconds + pad)
+        if regions and begin <= regions[-1].end_seconds:
+            regions[-1] = SpeechRegion(regions[-1].start_seconds, finish)
+        else:
+            regions.append(SpeechRegion(begin, finish))
+    return regions
+
+
+def read_pcm16(path: Path) -> tuple[Samples, int]:
+    """Read a 16-bit mono WAV as floats in [-1, 1] plus its sample rate."""
+    with wave.open(str(path), "rb") as handle:
+        if handle.getsampwidth() != 2 or handle.getnchannels() != 1:
+            raise ValueError(f"expected 16-bit mono PCM: {path}")
+        rate = handle.getframerate()
+        data = handle.readframes(handle.getnframes())
+    samples = np.frombuffer(data, dtype="<i2").astype(np.float32) / 32768.0
+    return samples, rate
+
+
+def write_pcm16(path: Path, samples: Samples, sample_rate: int) -> None:
+    pcm = np.clip(np.round(samples * 32768.0), -32768, 32767).astype("<i2")
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(sample_rate)
+        handle.writeframes(pcm.tobytes())
+
+
+def trim_to_speech(
+    source_wav: Path, trimmed_wav: Path, options: VadOptions | None = None
+) -> SpeechTimeline:
+    """Write only the speech regions of `source_wav` to `trimmed_wav`, back to back."""
+    samples, rate = read_pcm16(source_wav)
+    regions = detect_speech(samples, rate, options)
+    pieces = [
+        samples[round(region.start_seconds * rate) : round(region.end_seconds * rate)]
+        for region in regions
+    ]
+    write_pcm16(trimmed_wav, np.concatenate(pieces) if pieces else samples[:0], rate)
+    return SpeechTimeline(tuple(regions), len(samples) / rate)
+
+
+def remap_srt(text: str, timeline: SpeechTimeline) -> str:
+    """Rewrite every cue timing in SRT `text` from the trimmed to the original timeline."""
+    lines = []
+    for line in text.splitlines(keepends=True):
+        match = SRT_TIMING_RE.match(line.rstrip("\r\n"))
+        if match is None:
+            lines.append(line)
+            continue
+        start = timeline.to_original(parse_srt_timestamp(match["start"]))
+        end = timeline.to_original(parse_srt_timestamp(match["end"]), end=True)
+        newline = line[len(line.rstrip("\r\n")) :]
+        lines.append(
+            f"{format_srt_timestamp(start)} --> {format_srt_timestamp(end)}{match['rest']}{newline}"
+        )
+    return "".join(lines)
@@ -3,29 +3,47 @@ from __future__ import annotations
 import json
 from dataclasses import replace
 from pathlib import Path
+from typing import Any
+
+import pytest
 
 from disk_catalogue.audio_semantic import (
     AudioCatalogueRecord,
+    GoldLookupIndex,
     GoldQuestion,
+    TranscriptSegment,
+    bible_book_from_reference,
     build_semantic_entry,
     duplicate_group_row,
+    entry_bible_reference_rows,
+    entry_covers_reference,
+    entry_matches_lookup,
+    evaluate_gold_question_sets,
     extract_bible_references,
     extract_keywords,
     extract_speaker_names,
+    field_accuracy_rows,
     find_duplicate_groups,
     first_sentence,
+    gold_question_set_names,
+    gold_score_rows,
     infer_known_story_reference,
     is_generic_title,
+    load_gold_question_sets,
     load_gold_questions,
     normalise_space,
     parse_srt_end_seconds,
     parse_srt_text,
+    read_srt_segments,
     score_gold_question,
     score_gold_questions,
+    segment_at,
+    segments_end_seconds,
     semantic_entry_from_mapping,
     semantic_entry_row,
     slugify,
     transcript_output_stem,
+    transcript_segment_rows,
     value_matches,
     verify_catalogue_outputs,
 )
@@ -96,6 +114,44 @@ def test_parse_srt_text_extracts_only_caption_lines(tmp_path: Path) -> None:
     assert parse_srt_end_seconds(tmp_path / "missing.srt") is None
 
 
+def test_read_srt_segments_yields_timed_cues_and_time_lookup(tmp_path: Path) -> None:
+    srt = tmp_path / "sample.srt"
+    srt.write_text(
+        "1\n00:12:00,000 --> 00:12:29,500\nFirst cue\nwraps here.\n\n"
+        "2\n00:12:29,500 --> 00:12:41,250\nSecond cue.\n\n"
+        "3\nnot a timing line\nIgnored.\n\n"
+        "4\n00:12:50,000 --> 00:13:05,000\nLast cue without trailing blank.",
+        encoding="utf-8",
+    )
+
+    segments = read_srt_segments(srt)
+
+    assert [segment.text for segment in segments] == [
+        "First cue wraps here.",
+        "Second cue.",
+        "Last cue without trailing blank.",
+    ]
+    assert segments[0].start_seconds == 720.0
+    assert segments_end_seconds(segments) == 785.0
+    assert segments_end_seconds([]) is None
+    found = segment_at(segments, 750.0)
+    assert found is not None
+    assert found.text == "Second cue."
+    assert segment_at(segments, 765.0) is None
+    assert segment_at(segments, 10.0) is None
+    assert read_srt_segments(tmp_path / "missing.srt") == []
+
+    rows = transcript_segment_rows("k1", segments)
+    assert [row["segment_index"] for row in rows] == [0, 1, 2]
+    assert rows[1] == {
+        "file_key": "k1",
+        "segment_index": 1,
+        "start_seconds": 749.5,
+        "end_seconds": 761.25,
+        "text": "Second cue.",
+    }
+
+
 def test_reference_and_speaker_extraction() -> None:
     text = (
         "Avery Willis, Jim Slack and Grant Lovejoy discuss John 12:24, Genesis 3, and Mark 5:1-20."
@@ -107,6 +163,29 @@ def test_reference_and_speaker_extraction() -> None:
     assert value_matches("Genesis 3", "genesis 3")
 
 
+def test_entry_bible_references_index_primary_and_detected_ranges() -> None:
+    entry = build_semantic_entry(
+        make_record(),
+        "Lazarus is raised and the grain of wheat falls. Read Jn 12:24 and John 11:1-12:26.",
+        Path("lazarus.txt"),
+        None,
+    )
+
+    rows = entry_bible_reference_rows(entry)
+
+    assert [(row["reference"], row["reference_role"]) for row in rows] == [
+        ("John 11:1-12:26", "primary"),
+        ("John 12:24", "detected"),
+    ]
+    assert bible_book_from_reference("Mark 5 / Luke 8") == "Mark"
+    assert bible_book_from_reference("no passage") is None
+    assert entry_covers_reference(entry, "John 12:1")
+    assert not entry_covers_reference(entry, "John 13:1")
+    assert not entry_covers_reference(entry, "unknown")
+    assert entry_matches_lookup(entry, {"covers_reference": "John 11"})
+    assert not entry_matches_lookup(entry, {"covers_reference": "Genesis 3", "file_key": "k1"})
+
+
 def test_known_story_inference_patterns() -> None:
     assert infer_known_story_reference("The serpent offered forbidden fruit.") == "Genesis 3"
     assert infer_known_story_reference("Peter, do you love me? Feed my sheep.") == "John 21:1-22"
@@ -283,6 +362,15 @@ def test_verify_catalogue_outputs_flags_short_transcripts(tmp_path: Path) -> Non
     assert not result.complete
     assert result.short_transcripts == ["short"]
 
+    from_segments = verify_catalogue_outputs(
+        [record_full, record_short],
+        {},
+        {"full": full_txt, "short": short_txt},
+        duration_tolerance_seconds=5.0,
+        srt_end_seconds={"full": 245.0, "short": None},
+    )
+    assert from_segments.short_transcripts == ["short"]
+
 
 def test_duplicate_audit_finds_exact_and_folder_sequence_matches(tmp_path: Path) -> None:
     exact_one = tmp_path / "exact-one.m4a"
@@ -404,6 +492,93 @@ def test_gold_question_loading_and_scoring(tmp_path: Path) -> None:
     assert missing.score == 0.0
 
 
+def test_gold_lookup_index_matches_linear_scan_in_entry_order() -> None:
+    story = "The serpent and forbidden fruit story."
+    entries = [
+        build_semantic_entry(make_record(file_key=key, title=title), story, Path("t.txt"), None)
+        for key, title in (("k1", "Track 01"), ("k2", "Track 02"), ("k3", "Track 01"))
+    ]
+    index = GoldLookupIndex(entries)
+    lookups: list[dict[str, str]] = [
+        {"file_key": "k2"},
+        {"embedded_title": "Track 01"},
+        {"embedded_title": "Track 01", "track_type": "bible_story"},
+        {"covers_reference": "Genesis 3:6"},
+        {"embedded_title": "Track 01", "covers_reference": "John 1"},
+        {"file_key": "missing"},
+    ]
+
+    for lookup in lookups:
+        expected = [entry for entry in entries if entry_matches_lookup(entry, lookup)]
+        assert index.matching(lookup) == expected
+    matches = index.matching({"embedded_title": "Track 01"})
+    assert [entry.file_key for entry in matches] == ["k1", "k3"]
+
+
+def test_evaluate_gold_question_sets_reports_backends_and_field_accuracy() -> None:
+    entry = build_semantic_entry(
+        make_record(), "The serpent and forbidden fruit story.", Path("g.txt"), None
+    )
+    other = replace(entry, analysis_backend="rules_v2", track_type="unknown")
+    genesis = GoldQuestion(
+        question_id="genesis",
+        prompt="Which passage is this?",
+        lookup={"file_key": "k1"},
+        expected={"bible_reference": "Genesis 3", "track_type": "bible_story"},
+        rubric={"bible_reference": 0.5, "track_type": 0.5},
+    )
+    missing = replace(genesis, question_id="missing", lookup={"file_key": "none"})
+
+    evaluations = evaluate_gold_question_sets(
+        {"core": [genesis], "extra": [missing]}, [other, entry]
+    )
+
+    assert [(e.eval_set, e.analysis_backend) for e in evaluations] == [
+        ("core", "heuristic_v1"),
+        ("extra", "heuristic_v1"),
+        ("core", "rules_v2"),
+        ("extra", "rules_v2"),
+    ]
+    assert evaluations[0].scores[0].passed
+    assert evaluations[1].scores[0].details["fields"]["track_type"]["actual"] is None
+    rows = gold_score_rows(evaluations[2])
+    assert rows[0]["analysis_backend"] == "rules_v2"
+    assert rows[0]["score"] == 0.5
+    accuracy = {
+        (row["eval_set"], row["analysis_backend"], row["field_name"]): row
+        for row in field_accuracy_rows(evaluations)
+    }
+    assert accuracy["core", "heuristic_v1", "track_type"]["accuracy"] == 1.0
+    assert accuracy["core", "rules_v2", "track_type"]["matched"] == 0
+    assert accuracy["core", "rules_v2", "bible_reference"]["weighted_score"] == 0.5
+    assert accuracy["extra", "rules_v2", "track_type"]["questions"] == 1
+    assert [e.analysis_backend for e in evaluate_gold_question_sets({"core": [genesis]}, [])] == [
+        "heuristic_v1"
+    ]
+
+
+def test_gold_question_sets_are_named_by_stem_and_reject_clashes(tmp_path: Path) -> None:
+    question = {
+        "question_id": "q1",
+        "prompt": "Which passage is this?",
+        "lookup": {"file_key": "k1"},
+        "expected": {"track_type": "bible_story"},
+        "rubric": {"track_type": 1.0},
+    }
+    core = tmp_path / "core.json"
+    core.write_text(json.dumps({"questions": [question]}), encoding="utf-8")
+    missing = tmp_path / "extra.json"
+
+    sets = load_gold_question_sets([core, missing, core])
+    assert list(sets) == ["core"] and sets["core"][0].question_id == "q1"
+    # Two sets named "core" would overwrite each other's scores.
+    other = tmp_path / "team" / "core.json"
+    with pytest.raises(ValueError, match="share the name 'core'"):
+        gold_question_set_names([core, other])
+    with pytest.raises(ValueError, match="share the name"):
+        load_gold_question_sets([core, other])
+
+
 def test_extract_keywords_deduplicates_and_includes_reference() -> None:
     keywords = extract_keywords(
         "Storying and discipleship with storying in John.", "bible_story", "John 1"
@@ -412,3 +587,26 @@ def test_extract_keywords_deduplicates_and_includes_reference() -> None:
     assert keywords[0] == "bible_story"
     assert keywords.count("storying") == 1
     assert keywords[-1] == "John 1"
+
+
+class CountingSegments(list[TranscriptSegment]):
+    reads = 0
+
+    def __getitem__(self, index: Any) -> Any:
+        self.reads += 1
+        return super().__getitem__(index)
+
+    def __iter__(self) -> Any:
+        self.reads += len(self)
+        return super().__iter__()
+
+
+def test_segment_at_reads_only_the_cues_it_bisects() -> None:
+    segments = CountingSegments(
+        TranscriptSegment(float(second), second + 0.5, f"cue {second}") for second in range(20_000)
+    )
+
+    found = segment_at(segments, 12_345.25)
+
+    assert found is not None and found.text == "cue 12345"
+    assert segments.reads < 40
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from disk_catalogue.bible_references import (
+    BIBLE_BOOKS,
+    BibleReference,
+    bible_reference_rows,
+    extract_bible_references,
+    parse_bible_references,
+    reference_ordinal_range,
+)
+
+
+def test_parse_bible_references_normalises_books_and_ranges() -> None:
+    refs = parse_bible_references(
+        "Read first Corinthians 13:4-7, then Gen. 3 and 1 Cor 2:1 (John 3:16). "
+        "Later: Song of Solomon 2, psalm 23, John 11:1-12:26 and Mark 5-6."
+    )
+
+    assert refs == [
+        BibleReference("1 Corinthians", 13, 4, 13, 7),
+        BibleReference("Genesis", 3, None, 3, None),
+        BibleReference("1 Corinthians", 2, 1, 2, 1),
+        BibleReference("John", 3, 16, 3, 16),
+        BibleReference("Song of Songs", 2, None, 2, None),
+        BibleReference("Psalms", 23, None, 23, None),
+        BibleReference("John", 11, 1, 12, 26),
+        BibleReference("Mark", 5, None, 6, None),
+    ]
+    assert [str(ref) for ref in refs[-2:]] == ["John 11:1-12:26", "Mark 5-6"]
+    assert refs[0].book_ordinal == BIBLE_BOOKS.index("1 Corinthians") + 1
+    assert str(BibleReference("Mark", 5, None, 6, 3)) == "Mark 5-6:3"
+
+
+def test_extract_bible_references_deduplicates_and_ignores_lowercase_abbreviations() -> None:
+    text = (
+        "John 3:16 and john 3:16 again. There is 5 of us, I am 3 years in, "
+        "ex 4 is not Exodus 4. Corinthians 13 stays unnumbered."
+    )
+
+    assert extract_bible_references(text) == ["John 3:16", "Exodus 4", "Corinthians 13"]
+    assert parse_bible_references("Corinthians 13")[0].book_ordinal is None
+    assert extract_bible_references("John. 3 people came, Mark 5:1-20") == ["Mark 5:1-20"]
+    assert extract_bible_references("( 3 and John3 and 12") == []
+
+
+def test_reference_ordinals_support_range_overlap_rows() -> None:
+    john = BibleReference("John", 11, 1, 12, 26)
+    mark = BibleReference("Mark", 5, None, 6, None)
+
+    assert (john.start_ordinal, john.end_ordinal) == (43_011_001, 43_012_026)
+    assert (mark.start_ordinal, mark.end_ordinal) == (41_005_000, 41_006_999)
+    assert reference_ordinal_range("Jn 12:24") == (43_012_024, 43_012_024)
+    assert reference_ordinal_range("Corinthians 13 and Gen 3") == (1_003_000, 1_003_999)
+    assert reference_ordinal_range("no reference") is None
+    rows = bible_reference_rows(
+        "k1", [(john, "primary"), (BibleReference("Peter", 2, None, 2, None), "detected")]
+    )
+    assert rows[0]["reference"] == "John 11:1-12:26"
+    assert rows[0]["start_ordinal"] == 43_011_001
+    assert rows[0]["reference_role"] == "primary"
+    assert rows[1]["book_ordinal"] is None
+    assert rows[1]["start_ordinal"] is None
@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import csv
+import importlib.util
+import sys
+from dataclasses import replace
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import duckdb
+import pytest
+
+from disk_catalogue.audio_semantic import AudioCatalogueRecord, build_semantic_entry
+from disk_catalogue.entry_store import EntryStore
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.transcription_cost import DEFAULT_FIT, CostFit, CostModel
+
+SCRIPT = Path(__file__).resolve().parents[1] / "scripts" / "catalogue_following_jesus_semantic.py"
+
+
+def load_script() -> ModuleType:
+    spec = importlib.util.spec_from_file_location("catalogue_following_jesus_semantic", SCRIPT)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_records(tmp_path: Path, count: int) -> list[AudioCatalogueRecord]:
+    return [
+        AudioCatalogueRecord(
+            recovery_set="fj",
+            file_key=f"k{index}",
+            album_folder="Following Jesus 1--Making Disciples",
+            file_name=f"{index:02d} Track {index:02d}.m4a",
+            title=f"Track {index:02d}",
+            destination_path=str(tmp_path / "source" / f"{index:02d}.m4a"),
+            disc_index=1,
+            track_index=index,
+            duration_seconds=4.0,
+        )
+        for index in range(1, count + 1)
+    ]
+
+
+def write_metadata(path: Path, records: list[AudioCatalogueRecord]) -> None:
+    with path.open("w", newline="", encoding="utf-8") as handle:
+        writer = csv.DictWriter(handle, fieldnames=["file_key", "title"])
+        writer.writeheader()
+        writer.writerows({"file_key": r.file_key, "title": r.title} for r in records)
+
+
+def transcribe(
+    script: ModuleType,
+    store: EntryStore,
+    state: dict[str, Any],
+    record: AudioCatalogueRecord,
+    output_dir: Path,
+    text: str,
+    **extra_state: Any,
+) -> None:
+    txt_path, srt_path, _semantic_path = script.transcript_paths(record, output_dir)
+    txt_path.parent.mkdir(parents=True, exist_ok=True)
+    txt_path.write_text(text, encoding="utf-8")
+    srt_path.write_text(
+        f"1\n00:00:00,000 --> 00:00:02,000\n{text}\n\n2\n00:00:02,000 --> 00:00:04,000\nAmen.\n",
+        encoding="utf-8",
+    )
+    entry = build_semantic_entry(record, text, txt_path, srt_path)
+    record_state = {
+        "status": "completed",
+        "transcript_path": str(txt_path),
+        "entry_stored": True,
+        **extra_state,
+    }
+    state["records"][record.file_key] = record_state
+    store.put(entry, record_state)
+
+
+def read_csv_keys(path: Path) -> list[str]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        return [row["file_key"] for row in csv.DictReader(handle)]
+
+
+def test_checkpoint_export_upserts_changed_file_keys(tmp_path: Path) -> None:
+    script = load_script()
+    records = make_records(tmp_path, 3)
+    output_dir = tmp_path / "semantic"
+    metadata_csv = tmp_path / "audio_metadata.csv"
+    write_metadata(metadata_csv, records)
+    db_path = tmp_path / "catalogue.duckdb"
+    state: dict[str, Any] = {"records": {}}
+    with EntryStore(tmp_path / "entries.duckdb") as store:
+        for record in records[:2]:
+            transcribe(script, store, state, record, output_dir, "Jesus called the disciples.")
+        script.export_outputs(
+            db_path, output_dir, records, state, [], metadata_csv, store, run_duplicate_audit=False
+        )
+
+        # k1 is re-run with a Bible reference; k3 completes with a state key new to the table.
+        transcribe(script, store, state, records[0], output_dir, "Read John 3:16 together.")
+        transcribe(script, store, state, records[2], output_dir, "Pray together.", chunk_jobs=2)
+        script.export_changed_outputs(db_path, output_dir, records, state, {"k1", "k3"}, store)
+
+    assert read_csv_keys(output_dir / "semantic_catalogue.csv") == ["k1", "k2", "k3"]
+    assert read_csv_keys(output_dir / "semantic_catalogue_status.csv") == ["k1", "k2", "k3"]
+    with duckdb.connect(str(db_path), read_only=True) as con:
+        assert con.execute(
+            "SELECT file_key, chunk_jobs FROM audio_semantic_catalogue_status ORDER BY 1"
+        ).fetchall() == [("k1", None), ("k2", None), ("k3", 2)]
+        assert con.execute(
+            "SELECT file_key, count(*) FROM audio_transcript_segments GROUP BY 1 ORDER BY 1"
+        ).fetchall() == [("k1", 2), ("k2", 2), ("k3", 2)]
+        assert con.execute(
+            "SELECT file_key, reference FROM audio_bible_references ORDER BY 1"
+        ).fetchall() == [("k1", "John 3:16")]
+        assert con.execute(
+            "SELECT count(*) FROM audio_semantic_catalogue WHERE file_key = 'k1'"
+        ).fetchall() == [(1,)]
+
+
+def fake_transcriber(
+    script: ModuleType, calls: list[str], vad: dict[str, Any] | None = None
+) -> Any:
+    def transcribe(
+        record: AudioCatalogueRecord, output_dir: Path, _model: Path, _threads: int
+    ) -> tuple[str, Path, Path | None]:
+        calls.append(record.file_key)
+        txt_path, srt_path, _semantic_path = script.transcript_paths(record, output_dir)
+        txt_path.parent.mkdir(parents=True, exist_ok=True)
+        txt_path.write_text("Jesus called the disciples.", encoding="utf-8")
+        srt_path.write_text("1\n00:00:00,000 --> 00:00:02,000\nJesus.\n\n", encoding="utf-8")
+        if vad is not None:
+            script.write_json_atomic(txt_path.with_suffix(".vad.json"), vad)
+        return "Jesus called the disciples.", txt_path, srt_path
+
+    return transcribe
+
+
+def test_cached_transcriber_reports_only_real_cache_hits(tmp_path: Path) -> None:
+    script = load_script()
+    first, duplicate = make_records(tmp_path, 2)
+    for record in (first, duplicate):
+        Path(record.destination_path).parent.mkdir(exist_ok=True)
+        Path(record.destination_path).write_bytes(b"same audio")
+    calls: list[str] = []
+    with MemoCache(tmp_path / "memo.sqlite") as cache:
+        cached = script.CachedTranscriber(
+            fake_transcriber(script, calls), cache, "whisper-cli:base"
+        )
+        cached(first, tmp_path / "out", Path("model.bin"), 4)
+        assert not cached.served_from_cache
+        text, txt_path, srt_path = cached(duplicate, tmp_path / "out", Path("model.bin"), 4)
+        assert cached.served_from_cache and calls == ["k1"]
+        assert txt_path.read_text(encoding="utf-8") == text and srt_path is not None
+
+        # --force recomputes without consulting the cache, so the timing is a real one.
+        forced = script.CachedTranscriber(
+            fake_transcriber(script, calls), cache, "whisper-cli:base", refresh=True
+        )
+        hits = cache.hits
+        forced(duplicate, tmp_path / "forced", Path("model.bin"), 4)
+        assert not forced.served_from_cache
+        assert calls == ["k1", "k2"] and cache.hits == hits
+
+
+def test_cached_transcriber_restores_the_vad_sidecar(tmp_path: Path) -> None:
+    script = load_script()
+    first, duplicate, other = make_records(tmp_path, 3)
+    for record in (first, duplicate, other):
+        Path(record.destination_path).parent.mkdir(exist_ok=True)
+        Path(record.destination_path).write_bytes(b"same audio")
+    vad = {"duration_seconds": 4.0, "speech_seconds": 3.0, "skipped_fraction": 0.25}
+    calls: list[str] = []
+    out = tmp_path / "out"
+    with MemoCache(tmp_path / "memo.sqlite") as cache:
+        cached = script.CachedTranscriber(
+            fake_transcriber(script, calls, vad), cache, "whisper-cli:base:vad:6.0:300"
+        )
+        cached(first, out, Path("model.bin"), 4)
+        _text, txt_path, _srt = cached(duplicate, out, Path("model.bin"), 4)
+        assert cached.served_from_cache and calls == ["k1"]
+        assert script.vad_state(txt_path) == script.vad_state(
+            script.transcript_paths(first, out)[0]
+        )
+        assert script.vad_state(txt_path)["vad_speech_seconds"] == 3.0
+
+        # A hit without VAD removes the sidecar an earlier --vad run left at that path.
+        plain = script.CachedTranscriber(fake_transcriber(script, calls), cache, "whisper-cli:base")
+        plain(first, tmp_path / "plain", Path("model.bin"), 4)
+        _text, stale_txt, _srt = plain(duplicate, out, Path("model.bin"), 4)
+        assert plain.served_from_cache and stale_txt == txt_path
+        assert script.vad_state(stale_txt) == {}
+
+
+def test_predicted_costs_use_the_chunked_fit_and_parallelism(tmp_path: Path) -> None:
+    script = load_script()
+    chunking = script.ChunkOptions(600.0, 8.0, 4)
+    short, long, done = (
+        replace(record, duration_seconds=duration)
+        for record, duration in zip(make_records(tmp_path, 3), (300.0, 3600.0, 60.0), strict=True)
+    )
+    state = {"records": {done.file_key: {"status": "completed"}}}
+    model = CostModel(fits={("m", 8, script.chunking_id(chunking)): CostFit(0.3, 6.0, 4)})
+    costs = script.predicted_costs([short, long, done], state, model, "m", 8, chunking)
+    assert costs == {short.file_key: pytest.approx(96.0), long.file_key: pytest.approx(276.0)}
+    # Unchunked runs use the plain (model, threads) fit, here the default.
+    plain = script.predicted_costs([long], state, model, "m", 8)
+    assert plain == {long.file_key: pytest.approx(DEFAULT_FIT.predict(3600.0))}
+
+
+def test_main_rejects_gold_question_sets_with_one_name(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    script = load_script()
+    gold = ["--gold-questions", str(tmp_path / "a" / "gold.json")]
+    gold += ["--gold-questions", str(tmp_path / "b" / "gold.json")]
+    monkeypatch.setattr(sys, "argv", ["catalogue_following_jesus_semantic.py", *gold])
+    with pytest.raises(SystemExit) as exc:
+        script.main()
+    assert exc.value.code == 2
+    assert "share the name 'gold'" in capsys.readouterr().err
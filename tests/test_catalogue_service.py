@@ -0,0 +1,302 @@
+from __future__ import annotations
+
+import importlib.util
+import socket
+import sys
+import tempfile
+import threading
+from collections.abc import Iterator
+from concurrent.futures import Future
+from datetime import datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import duckdb
+import pytest
+
+from disk_catalogue.catalogue_service import (
+    CatalogueClient,
+    CatalogueService,
+    CatalogueServiceError,
+    write_catalogue,
+)
+from disk_catalogue.rename_planner import write_plan
+from disk_catalogue.semantic_tables import TRANSCRIPT_SEGMENTS, write_table_statements
+
+
+@pytest.fixture
+def service(tmp_path: Path) -> Iterator[CatalogueService]:
+    # Unix socket paths are length-limited, so keep the socket out of the deep pytest tmp path.
+    with tempfile.TemporaryDirectory(prefix="cat-") as socket_dir:
+        service = CatalogueService(tmp_path / "catalogue.duckdb", Path(socket_dir) / "s.sock")
+        service.start()
+        try:
+            yield service
+        finally:
+            service.stop()
+
+
+def test_client_batches_writes_and_reads_them_back(service: CatalogueService) -> None:
+    rows = [
+        {"file_key": "k1", "segment_index": 0, "start_seconds": 0.0, "end_seconds": 2.5},
+        {"file_key": "k1", "segment_index": 1, "start_seconds": 2.5, "end_seconds": 4.0},
+    ]
+    with CatalogueClient(service.socket_path) as client:
+        assert client.ping()
+        assert client.execute_batch(write_table_statements(TRANSCRIPT_SEGMENTS, rows)) == 3
+        client.execute(
+            "UPDATE audio_transcript_segments SET text = ? WHERE segment_index = ?", ["hi", 1]
+        )
+
+        assert client.query(
+            "SELECT segment_index, text FROM audio_transcript_segments ORDER BY 1"
+        ) == [(0, None), (1, "hi")]
+
+
+def test_failed_batch_rolls_back_and_reports_error(service: CatalogueService) -> None:
+    with CatalogueClient(service.socket_path) as client:
+        client.execute("CREATE TABLE t (value INTEGER)")
+        with pytest.raises(CatalogueServiceError, match="CatalogException"):
+            client.execute_batch(
+                [("INSERT INTO t VALUES (?)", [1]), ("INSERT INTO missing VALUES (1)", [])]
+            )
+        with pytest.raises(CatalogueServiceError, match="unknown op"):
+            client.request({"op": "drop"})
+
+        assert client.query("SELECT count(*) FROM t") == [(0,)]
+
+
+def test_query_refuses_anything_but_one_select(service: CatalogueService) -> None:
+    with CatalogueClient(service.socket_path) as client:
+        client.execute("CREATE TABLE t (value INTEGER)")
+        client.execute("INSERT INTO t VALUES (1)")
+        for sql in (
+            "INSERT INTO t VALUES (2)",
+            "DROP TABLE t",
+            "CREATE TABLE u (value INTEGER)",
+            "BEGIN TRANSACTION",
+            "CHECKPOINT",
+            "SELECT 1; DELETE FROM t",
+        ):
+            with pytest.raises(CatalogueServiceError, match="read-only SELECT"):
+                client.query(sql)
+        assert service.handle({"op": "query", "sql": "INSERT INTO t VALUES (3)"})["ok"] is False
+
+        assert client.query("SELECT value FROM t") == [(1,)]
+        assert client.query("SELECT count(*) FROM information_schema.tables") == [(1,)]
+        assert [row[1] for row in client.query("PRAGMA table_info('t')")] == ["value"]
+
+
+def test_concurrent_clients_share_one_writer(service: CatalogueService) -> None:
+    with CatalogueClient(service.socket_path) as client:
+        client.execute("CREATE TABLE hits (worker INTEGER, n INTEGER)")
+
+    def work(worker: int) -> None:
+        with CatalogueClient(service.socket_path) as client:
+            for n in range(5):
+                client.execute("INSERT INTO hits VALUES (?, ?)", [worker, n])
+                client.query("SELECT count(*) FROM hits")
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert service.query("SELECT count(*) FROM hits")["rows"] == [[20]]
+
+
+def test_service_rejects_malformed_lines(service: CatalogueService) -> None:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as raw:
+        raw.connect(str(service.socket_path))
+        raw.sendall(b"not json\n")
+        response = raw.makefile("rb").readline()
+
+    assert b'"ok": false' in response
+    assert b"invalid request" in response
+
+
+def test_client_reports_closed_connection() -> None:
+    with tempfile.TemporaryDirectory(prefix="cat-") as socket_dir:
+        socket_path = Path(socket_dir) / "s.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(socket_path))
+            server.listen(1)
+            client = CatalogueClient(socket_path)
+            server.accept()[0].close()
+            with pytest.raises(CatalogueServiceError, match=r"closed|failed"):
+                client.ping()
+            client.close()
+
+
+def test_writer_survives_failed_rollback_and_rejects_transaction_control(
+    service: CatalogueService,
+) -> None:
+    with CatalogueClient(service.socket_path) as client:
+        client.execute("CREATE TABLE t (value INTEGER)")
+        for sql in ["COMMIT", "  -- end it\n rollback", "/* x */ BEGIN TRANSACTION", "CHECKPOINT"]:
+            with pytest.raises(CatalogueServiceError, match="transaction control"):
+                client.execute_batch([("INSERT INTO t VALUES (1)", []), (sql, [])])
+
+        # Bypass the check: the inner COMMIT ends the transaction, so both the service's COMMIT
+        # and its ROLLBACK fail. The error must still reach the caller.
+        result: Future[int] = Future()
+        service._writes.put(([("INSERT INTO t VALUES (2)", []), ("COMMIT", [])], result))
+        with pytest.raises(duckdb.Error):
+            result.result(timeout=5)
+
+        client.execute("INSERT INTO t VALUES (3)")
+        assert client.query("SELECT value FROM t ORDER BY 1") == [(2,), (3,)]
+
+
+def load_script(name: str) -> ModuleType:
+    path = Path(__file__).resolve().parents[1] / "scripts" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(name, path)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def write_scan_csvs(directory: Path) -> None:
+    directory.mkdir()
+    (directory / "files_Ext-10_1.csv").write_text(
+        "SourceFile,FileName,Directory,FileSize#\n"
+        '"/host/Volumes/Ext-10/a, b.jpg","a, b.jpg",/host/Volumes/Ext-10,10\n'
+        "/host/Volumes/Ext-10/c.mov,c.mov,/host/Volumes/Ext-10,20\n",
+        encoding="utf-8",
+    )
+    # A later scan with an extra column: the target table gains it.
+    (directory / "files_Ext-20_2.csv").write_text(
+        "SourceFile,FileName,Directory,FileSize#,MIMEType\n"
+        '"/host/Volumes/Ext-20/a, b.jpg","a, b.jpg",/host/Volumes/Ext-20,10,image/jpeg\n',
+        encoding="utf-8",
+    )
+    (directory / "photos_Ext-10_1.csv").write_text(
+        "SourceFile,FileName,Directory,FileSize#,Model\n"
+        "/host/Volumes/Ext-10/x.jpg,x.jpg,/host/Volumes/Ext-10,5,X100\n",
+        encoding="utf-8",
+    )
+    (directory / "videos_Ext-10_1.csv").write_text(
+        "SourceFile,FileName,Directory,FileSize#,Duration\n"
+        "/host/Volumes/Ext-10/c.mov,c.mov,/host/Volumes/Ext-10,20,1.5\n",
+        encoding="utf-8",
+    )
+
+
+def catalogue_rows(con: duckdb.DuckDBPyConnection) -> dict[str, list[tuple[Any, ...]]]:
+    return {
+        table: con.execute(f"SELECT * EXCLUDE ({exclude}) FROM {table} ORDER BY ALL").fetchall()
+        for table, exclude in (
+            ("files", "FileKey"),
+            ("photos", "FileKey"),
+            ("file_identity_groups", "n_files"),
+            ("ingested_files", "ingested_at"),
+        )
+    }
+
+
+def test_load_csvs_through_the_service_matches_a_local_ingest(
+    service: CatalogueService, tmp_path: Path
+) -> None:
+    load_csvs = load_script("load_csvs")
+    scans = tmp_path / "scans"
+    write_scan_csvs(scans)
+
+    assert load_csvs.ingest_via_service(service.socket_path, scans) == 4
+    assert load_csvs.ingest_via_service(service.socket_path, scans) == 0
+    local = duckdb.connect()
+    load_csvs.ensure_schema(local)
+    load_csvs.ensure_identity_groups(local, load_csvs.FILE_TABLE)
+    for path, table in load_csvs.pending_targets(scans, set()):
+        load_csvs.ingest_file(local, path, table)
+    load_csvs.ensure_derived_views(local)
+
+    service.stop()
+    with duckdb.connect(str(service.db_path), read_only=True) as con:
+        served = catalogue_rows(con)
+    assert served == catalogue_rows(local)
+    assert [row[1:3] for row in served["files"]] == [
+        ("a, b.jpg", "/host/Volumes/Ext-10"),
+        ("c.mov", "/host/Volumes/Ext-10"),
+        ("a, b.jpg", "/host/Volumes/Ext-20"),
+    ]
+    assert served["file_identity_groups"][0][3:5] == (
+        ["Ext-10", "Ext-20"],
+        [
+            {"drive": "Ext-10", "path": "a, b.jpg"},
+            {"drive": "Ext-20", "path": "a, b.jpg"},
+        ],
+    )
+
+
+def test_scan_records_and_rename_plan_go_through_the_service(
+    service: CatalogueService, tmp_path: Path
+) -> None:
+    scan = load_script("scan_and_ingest")
+    planner = load_script("plan_following_jesus_rename")
+    manifest = tmp_path / "drive_manifest.csv"
+    manifest.write_text(
+        "drive_label,platform_mount,volume_uuid,serial_number,notes\n"
+        "Ext-10,mac:/Volumes/Ext-10,UUID-1,SN1,backup\n",
+        encoding="utf-8",
+    )
+    started = datetime(2026, 1, 2, 3, 4, 5)
+    write_catalogue(
+        service.db_path,
+        [
+            *scan.drive_snapshot_statements(manifest, "Ext-10", None),
+            *scan.drive_scan_statements("Ext-10", started, started, "skipped", None, None, None),
+            *scan.scan_phase_statements("Ext-10", started, []),
+        ],
+        service.socket_path,
+    )
+    assert scan.indexed_tables(str(service.db_path), "Ext-10", service.socket_path) == {
+        "files_raw": False,
+        "photos_raw": False,
+        "videos_raw": False,
+    }
+
+    with CatalogueClient(service.socket_path) as client:
+        assert client.query("SELECT mac_mount, volume_uuid FROM drives") == [
+            ("mac:/Volumes/Ext-10", "UUID-1")
+        ]
+        assert client.query("SELECT started_at, status FROM drive_scans") == [
+            ("2026-01-02 03:04:05", "skipped")
+        ]
+        client.execute_batch(
+            [
+                (
+                    "CREATE TABLE audio_semantic_source_metadata AS SELECT * FROM (VALUES "
+                    "('k1', '/src/01.m4a', 'Following Jesus 1--Making Disciples', '01.m4a', "
+                    "'Track 01', '1', '1', '60.0', '100')) t(file_key, destination_path, "
+                    "album_folder, file_name, title, disc_index, track_index, duration_seconds, "
+                    "size_bytes_actual)",
+                    [],
+                ),
+                (
+                    "CREATE TABLE audio_semantic_catalogue AS SELECT 'k1' AS file_key, "
+                    "'Jesus calls the disciples' AS semantic_title, 'bible_story' AS track_type, "
+                    "'Mark 1:16-20' AS bible_reference",
+                    [],
+                ),
+            ]
+        )
+    rules = planner.following_jesus_rename_rules()
+    served = planner.build_entries(
+        service.db_path, tmp_path / "renamed", rules, False, service_socket=service.socket_path
+    )
+    plan = tmp_path / "plan.csv"
+    write_plan(plan, served)
+    planner.write_rename_table(service.db_path, plan, service.socket_path)
+
+    service.stop()
+    assert served == planner.build_entries(service.db_path, tmp_path / "renamed", rules, False)
+    assert served[0].target_relative_path.endswith("FJ-M01-D01-T01 - Jesus calls the disciples.m4a")
+    with duckdb.connect(str(service.db_path), read_only=True) as con:
+        assert con.execute("SELECT file_key FROM audio_semantic_rename_plan").fetchall() == [
+            ("k1",)
+        ]
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from disk_catalogue.coalescing import CoalescingWorker
+
+
+def union(older: set[int], newer: set[int]) -> set[int]:
+    return older | newer
+
+
+def test_submissions_during_a_run_coalesce_into_one_pending_job() -> None:
+    started = threading.Event()
+    release = threading.Event()
+    runs: list[set[int]] = []
+
+    def run(job: set[int]) -> None:
+        runs.append(job)
+        started.set()
+        release.wait(5)
+
+    worker = CoalescingWorker(run, union)
+    worker.submit({1})
+    assert started.wait(5)
+    for key in (2, 3, 4):
+        worker.submit({key})
+    assert worker.busy
+    release.set()
+    worker.close()
+    assert runs == [{1}, {2, 3, 4}]
+    assert (worker.completed, worker.coalesced) == (2, 2)
+    assert not worker.busy
+    with pytest.raises(RuntimeError, match="closed"):
+        worker.submit({5})
+
+
+def test_failed_jobs_are_reported_and_merged_into_the_next_submission() -> None:
+    runs: list[set[int]] = []
+    errors: list[Exception] = []
+
+    def run(job: set[int]) -> None:
+        runs.append(job)
+        if len(runs) == 1:
+            raise OSError("disk full")
+
+    with CoalescingWorker(run, union, on_error=errors.append) as worker:
+        worker.submit({1})
+        worker.wait_idle()
+        assert [str(error) for error in errors] == ["disk full"]
+        worker.submit({2})
+        worker.wait_idle()
+    assert runs == [{1}, {1, 2}]
+    assert worker.errors == errors
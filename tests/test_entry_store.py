@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from disk_catalogue.audio_semantic import (
+    AudioCatalogueRecord,
+    SemanticEntry,
+    build_semantic_entry,
+    semantic_entry_row,
+)
+from disk_catalogue.entry_store import EntryStore
+
+
+def make_entry(tmp_path: Path, file_key: str, text: str) -> SemanticEntry:
+    record = AudioCatalogueRecord(
+        recovery_set="set",
+        file_key=file_key,
+        album_folder="Stories",
+        file_name=f"{file_key}.m4a",
+        title="The Prodigal Son",
+        destination_path=str(tmp_path / f"{file_key}.m4a"),
+        disc_index=1,
+        track_index=int(file_key[-1]),
+        duration_seconds=60.0,
+    )
+    transcript = tmp_path / f"{file_key}.txt"
+    transcript.write_text(text, encoding="utf-8")
+    return build_semantic_entry(record, text, transcript, None, speaker_names=["Sarah"])
+
+
+def test_entries_round_trip_and_replace_by_file_key(tmp_path: Path) -> None:
+    first = make_entry(tmp_path, "k1", "Read with me from Luke 15:11-32. A father had two sons.")
+    second = make_entry(tmp_path, "k2", "Today's story comes from John 3:16.")
+    path = tmp_path / "store" / "semantic_entries.duckdb"
+    with EntryStore(path) as store:
+        assert store.put_many([]) == 0
+        store.put(first, {"status": "completed", "completed_at": "2026-01-01T00:00:00+00:00"})
+        store.put(second)
+        assert len(store) == 2 and store.file_keys() == {"k1", "k2"}
+        assert store.load() == {"k1": first, "k2": second}
+        assert store.load({"k2", "missing"}) == {"k2": second}
+
+    revised = make_entry(tmp_path, "k1", "Jesus feeds the five thousand in Matthew 14:13-21.")
+    with EntryStore(path) as store:
+        store.put(revised, {"status": "completed"})
+        assert len(store) == 2
+        assert store.load(["k1"])["k1"].bible_reference == revised.bible_reference
+        assert store.load()["k1"].speaker_names == ["Sarah"]
+        assert store.record_states() == {"k1": {"status": "completed"}}
+
+
+def test_import_sidecars_fills_a_new_store(tmp_path: Path) -> None:
+    entry = make_entry(tmp_path, "k3", "My name is Sarah and I will tell the story.")
+    sidecar = tmp_path / "transcripts" / "k3.semantic.json"
+    sidecar.parent.mkdir()
+    sidecar.write_text(json.dumps(semantic_entry_row(entry), indent=2), encoding="utf-8")
+    with EntryStore(":memory:") as store:
+        assert store.import_sidecars([sidecar]) == 1
+        assert store.load() == {"k3": entry}
+        assert store.record_states() == {}
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import errno
+import io
+import os
+import threading
+import time
+from collections import Counter
+from hashlib import sha256
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.file_checks import hash_files, stat_paths
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.progress import ProgressReporter
+
+
+def fake_stat(device: int, size: int = 10, mtime_ns: int = 1) -> os.stat_result:
+    return os.stat_result((0o100644, 1, device, 1, 0, 0, size, 0, 0, 0, 0, 0, 0, 0, 0, mtime_ns))
+
+
+def test_stat_paths_stats_each_path_once(tmp_path: Path) -> None:
+    present = tmp_path / "a.m4a"
+    present.write_bytes(b"audio")
+    missing = tmp_path / "missing.m4a"
+    for workers in (1, 4):
+        stats = stat_paths([present, missing, present], workers=workers)
+        assert list(stats) == [present, missing]
+        assert stats[present] is not None and stats[present].st_size == 5
+        assert stats[missing] is None
+    # A path under a file is missing (ENOTDIR), as Path.exists() would say.
+    assert stat_paths([present / "child.m4a"]) == {present / "child.m4a": None}
+
+
+def test_stat_paths_raises_errors_other_than_missing(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    locked = tmp_path / "locked.m4a"
+    real_stat = Path.stat
+
+    def stat(path: Path, **kwargs: bool) -> os.stat_result:
+        if path == locked:
+            raise PermissionError(errno.EACCES, "Permission denied", str(path))
+        return real_stat(path, **kwargs)
+
+    monkeypatch.setattr(Path, "stat", stat)
+    for workers in (1, 4):
+        with pytest.raises(PermissionError):
+            stat_paths([tmp_path / "missing.m4a", locked], workers=workers)
+
+
+def test_hash_files_caps_reads_per_device() -> None:
+    files = {Path(f"/drive-{n % 2}/{n}.m4a"): fake_stat(device=n % 2) for n in range(8)}
+    active: Counter[str] = Counter()
+    peak: Counter[str] = Counter()
+    lock = threading.Lock()
+
+    def hasher(path: Path) -> str:
+        device = path.parent.name
+        with lock:
+            active[device] += 1
+            peak[device] = max(peak[device], active[device])
+        time.sleep(0.01)
+        with lock:
+            active[device] -= 1
+        return sha256(str(path).encode()).hexdigest()
+
+    hashes = hash_files(files, workers=8, per_device=1, hasher=hasher)
+    assert hashes == {path: sha256(str(path).encode()).hexdigest() for path in files}
+    assert peak == {"drive-0": 1, "drive-1": 1}
+    with pytest.raises(ValueError, match="positive"):
+        hash_files(files, per_device=0)
+
+
+def test_hash_files_reuses_cached_hashes_until_the_file_changes(tmp_path: Path) -> None:
+    path = tmp_path / "a.m4a"
+    path.write_bytes(b"audio")
+    calls: list[Path] = []
+
+    def hasher(target: Path) -> str:
+        calls.append(target)
+        return sha256(target.read_bytes()).hexdigest()
+
+    stream = io.StringIO()
+    progress = ProgressReporter(tmp_path / "status.json", interval=0, stream=stream)
+    with MemoCache(tmp_path / "hashes.sqlite") as cache:
+        for _ in range(2):
+            hashes = hash_files({path: path.stat()}, cache=cache, progress=progress, hasher=hasher)
+        assert hashes == {path: sha256(b"audio").hexdigest()} and calls == [path]
+        path.write_bytes(b"changed audio")
+        hashes = hash_files({path: path.stat()}, cache=cache, hasher=hasher)
+    assert hashes == {path: sha256(b"changed audio").hexdigest()} and len(calls) == 2
+    assert "[hash] 1/1 files" in stream.getvalue()
+    assert (tmp_path / "status.json").exists()
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import random
+
+import duckdb
+import pytest
+
+from disk_catalogue.folder_digests import (
+    DirectoryDigest,
+    catalogue_rows,
+    compare_sketches,
+    directory_digests,
+    find_folder_matches,
+)
+
+
+def tree(count: int, seed: int = 0) -> list[tuple[str, int]]:
+    rng = random.Random(seed)
+    return [
+        (f"{rng.choice(['raw', 'edits', 'raw/day1'])}/IMG_{index:05d}.JPG", rng.randrange(1, 10**7))
+        for index in range(count)
+    ]
+
+
+def rows_for(drives: dict[str, list[tuple[str, int]]]) -> list[tuple[str, str, int]]:
+    return sorted((drive, path, size) for drive, files in drives.items() for path, size in files)
+
+
+def digests(rows: list[tuple[str, str, int]], **kwargs: int) -> dict[str, DirectoryDigest]:
+    return {digest.label: digest for digest in directory_digests(rows, **kwargs)}
+
+
+def test_directory_digests_are_bottom_up_and_location_independent() -> None:
+    rows = rows_for(
+        {
+            "Ext-10": [("Photos/2019/a.jpg", 10), ("Photos/2019/sub/b.jpg", 20), ("x.txt", 1)],
+            "ExtSSD-Data": [("Backup/2019 copy/A.JPG", 10), ("Backup/2019 copy/sub/b.jpg", 20)],
+        }
+    )
+    ordered = [digest.label for digest in directory_digests(rows)]
+    assert ordered.index("Ext-10:/Photos/2019/sub") < ordered.index("Ext-10:/Photos/2019")
+    assert ordered.index("Ext-10:/Photos") < ordered.index("Ext-10:/")
+
+    by_label = digests(rows)
+    original = by_label["Ext-10:/Photos/2019"]
+    copy = by_label["ExtSSD-Data:/Backup/2019 copy"]
+    assert original.digest == copy.digest
+    assert (original.files, original.bytes) == (2, 30)
+    assert (by_label["Ext-10:/"].files, by_label["Ext-10:/"].bytes) == (3, 31)
+    assert by_label["Ext-10:/Photos"].digest != original.digest
+
+    changed = digests([("D", "Photos/2019/a.jpg", 11), ("D", "Photos/2019/sub/b.jpg", 20)])
+    assert changed["D:/Photos/2019"].digest != original.digest
+
+    assert "Ext-10:/Photos/2019/sub" not in digests(rows, min_files=2)
+
+
+def test_directory_digests_reject_unsorted_rows() -> None:
+    with pytest.raises(ValueError, match="sorted"):
+        list(directory_digests([("A", "b/x", 1), ("A", "a/y", 1)]))
+
+
+def test_sketches_estimate_containment() -> None:
+    files = tree(3000)
+    source = digests(rows_for({"A": files}))["A:/"]
+    subset = digests(rows_for({"B": files[:1000]}))["B:/"]
+
+    result = compare_sketches(subset.sketch, source.sketch)
+    assert not result.exact
+    assert result.a_in_b == 1.0
+    assert result.b_in_a == pytest.approx(1 / 3, abs=0.12)
+
+    small = digests(rows_for({"A": files[:20], "B": files[10:30]}), sketch_size=128)
+    exact = compare_sketches(small["A:/"].sketch, small["B:/"].sketch)
+    assert exact.exact
+    assert (exact.shared, exact.jaccard, exact.a_in_b) == (10, 10 / 30, 0.5)
+
+
+def test_find_folder_matches_reports_each_copy_once_at_its_top() -> None:
+    photos = tree(400, seed=1)
+    edited = [*photos[:388], ("edits/new_1.jpg", 5), ("edits/new_2.jpg", 6)]
+    music = tree(150, seed=2)
+    rows = rows_for(
+        {
+            "Ext-10": [(f"Photos/2019/{path}", size) for path, size in photos]
+            + [(f"Music/{path}", size) for path, size in music]
+            + [(f"Other/{path}", size) for path, size in tree(300, seed=3)],
+            "ExtSSD-Data": [(f"Backup/2019/{path}", size) for path, size in edited]
+            + [(f"Old/Music/{path}", size) for path, size in music],
+            "Spare": [(f"Unrelated/{path}", size) for path, size in tree(200, seed=4)],
+        }
+    )
+
+    matches = find_folder_matches(directory_digests(rows, min_files=5), threshold=0.9)
+
+    assert [match.describe() for match in matches] == [
+        "ExtSSD-Data:/Backup is a 100% copy of Ext-10:/Photos/2019",
+        "Ext-10:/Music is an exact copy of ExtSSD-Data:/Old/Music",
+    ]
+    photo_match = matches[0]
+    assert not photo_match.exact
+    assert photo_match.jaccard == pytest.approx(388 / 402, abs=0.05)
+    assert photo_match.a_in_b == pytest.approx(388 / 400, abs=0.05)
+    assert not find_folder_matches(directory_digests(rows, min_files=5), threshold=1.01)
+
+
+def test_same_drive_copies_are_opt_in() -> None:
+    files = tree(100)
+    rows = rows_for(
+        {"A": [(f"one/{p}", s) for p, s in files] + [(f"two/{p}", s) for p, s in files]}
+    )
+    assert not find_folder_matches(directory_digests(rows))
+    (match,) = find_folder_matches(directory_digests(rows), same_drive=True)
+    assert (match.a.label, match.b.label, match.exact) == ("A:/one", "A:/two", True)
+    assert match.row()[-1] is True
+
+
+def test_catalogue_rows_stream_sorted_files() -> None:
+    con = duckdb.connect(":memory:")
+    con.execute(
+        "CREATE VIEW files AS SELECT * FROM (VALUES "
+        "('B', 'z.txt', 1), ('A', 'b/c.txt', 2), ('A', 'a.txt', 3), ('', 'nodrive.txt', 4)) "
+        't(Drive, RelativePath, "FileSize#")'
+    )
+    assert list(catalogue_rows(con, batch_size=2)) == [
+        ("A", "a.txt", 3),
+        ("A", "b/c.txt", 2),
+        ("B", "z.txt", 1),
+    ]
@@ -1,25 +1,33 @@
 from __future__ import annotations
 
+import errno
 import json
+import os
 from pathlib import Path
 
+import pytest
+
 from disk_catalogue.following_jesus_rename import (
     album_catalogue_rows,
     album_spec_for_folder,
     apply_rename_plan,
     build_rename_entry,
     choose_track_title,
+    track_catalogue_rows,
+    validate_plan_rows,
+    write_dict_csv,
+    write_json_report,
+    write_markdown_catalogue,
+)
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.move_engine import MoveJournal, partial_path
+from disk_catalogue.rename_planner import (
     ensure_unique_targets,
     parse_float,
     parse_int,
     parse_size,
     read_plan,
     sanitise_title,
-    track_catalogue_rows,
-    validate_plan_rows,
-    write_dict_csv,
-    write_json_report,
-    write_markdown_catalogue,
     write_plan,
 )
 
@@ -235,3 +243,73 @@ def test_apply_rename_plan_returns_errors_without_moving(tmp_path: Path) -> None
 
     assert not report.ok
     assert source.exists()
+
+
+def test_apply_copies_across_filesystems_and_resumes_from_the_journal(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def rename(_source: object, _target: object) -> None:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "rename", rename)
+    sources = []
+    for index in (1, 2):
+        source = tmp_path / f"source-{index}.m4a"
+        source.write_bytes(b"audio" * index)
+        sources.append(source)
+    rows = []
+    for index, source in enumerate(sources, start=1):
+        row = make_row(source, title=f"Track {index:02d}")
+        row.update(file_key=f"k{index}", track_index=index)
+        entry = build_rename_entry(row, tmp_path / "renamed", include_hash=True)
+        rows.append({key: str(value) for key, value in entry.plan_row().items()})
+    rows[1]["source_sha256"] = "0" * 64
+    journal = tmp_path / "journal.jsonl"
+
+    failed = apply_rename_plan(rows, apply=True, journal_path=journal)
+    assert not failed.ok
+    assert "move failed" in failed.issues[0].message
+    assert not sources[0].exists() and sources[1].exists()
+
+    # A crash after verifying the second copy, before it was put in place.
+    target = Path(rows[1]["target_path"])
+    partial_path(target).write_bytes(sources[1].read_bytes())
+    with MoveJournal(journal) as log:
+        log.record("k2", "verified", target=str(target), size_bytes=10, sha256="x")
+    resumed = apply_rename_plan(rows, apply=True, journal_path=journal)
+    assert resumed.ok and resumed.already_renamed == 2
+    assert target.read_bytes() == b"audio" * 2 and not sources[1].exists()
+
+
+def test_parallel_cached_validation_matches_the_sequential_report(tmp_path: Path) -> None:
+    rows = []
+    for index in range(1, 13):
+        source = tmp_path / "source" / f"{index:02d}.m4a"
+        source.parent.mkdir(exist_ok=True)
+        source.write_bytes(b"audio" * index)
+        row = make_row(source, title=f"Track {index:02d}")
+        row.update(file_key=f"k{index}", track_index=index)
+        entry = build_rename_entry(row, tmp_path / "renamed", include_hash=True)
+        rows.append({key: str(value) for key, value in entry.plan_row().items()})
+    for row in rows[:6]:
+        Path(row["target_path"]).parent.mkdir(parents=True, exist_ok=True)
+        Path(row["source_path"]).rename(row["target_path"])
+    rows[1]["source_sha256"] = "0" * 64
+    rows[2]["size_bytes"] = "1"
+    Path(rows[7]["source_path"]).unlink()
+    Path(rows[8]["target_path"]).write_bytes(b"stray")
+
+    expected = validate_plan_rows(rows, verify_hash=True, workers=1).to_jsonable()
+    assert [issue["file_key"] for issue in expected["issues"]] == [
+        "k2",
+        "k3",
+        "k8",
+        "k9",
+        "k9",
+        "k9",
+    ]
+    with MemoCache(tmp_path / "hashes.sqlite") as cache:
+        for _ in range(2):
+            report = validate_plan_rows(rows, verify_hash=True, workers=8, hash_cache=cache)
+            assert report.to_jsonable() == expected
+        assert cache.hits == 11
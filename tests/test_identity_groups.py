@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import random
+import unicodedata
+
+import duckdb
+
+from disk_catalogue.identity_groups import (
+    IDENTITY_TABLE,
+    ensure_identity_groups,
+    rebuild_identity_groups,
+    update_identity_groups,
+)
+
+FILES_DDL = 'CREATE TABLE {name} (SourceFile TEXT, FileName TEXT, "FileSize#" BIGINT)'
+
+
+def insert(con: duckdb.DuckDBPyConnection, table: str, rows: list[tuple[str, str, int]]) -> None:
+    con.executemany(
+        f"INSERT INTO {table} VALUES (?, ?, ?)",
+        [
+            (f"/host/Volumes/{drive}/{path}", path.rsplit("/", 1)[-1], size)
+            for drive, path, size in rows
+        ],
+    )
+
+
+def ingest(con: duckdb.DuckDBPyConnection, rows: list[tuple[str, str, int]]) -> int:
+    con.execute(FILES_DDL.format(name="staging"))
+    try:
+        insert(con, "staging", rows)
+        con.execute("INSERT INTO files_raw SELECT * FROM staging")
+        return update_identity_groups(con, "staging")
+    finally:
+        con.execute("DROP TABLE staging")
+
+
+def groups(con: duckdb.DuckDBPyConnection) -> dict[tuple[int, str], tuple[int, int, list[str]]]:
+    rows = con.execute(
+        f"SELECT size, name_key, n_files, n_drives, drives, members FROM {IDENTITY_TABLE}"
+    ).fetchall()
+    return {
+        (size, name): (n_files, n_drives, drives)
+        for size, name, n_files, n_drives, drives, _ in rows
+    }
+
+
+def test_update_merges_new_rows_into_existing_groups() -> None:
+    con = duckdb.connect(":memory:")
+    con.execute(FILES_DDL.format(name="files_raw"))
+    assert ensure_identity_groups(con, "files_raw")
+    assert not ensure_identity_groups(con, "files_raw")
+
+    touched = ingest(con, [("A", "x/IMG_1.JPG", 100), ("A", "y/img_1.jpg", 100), ("A", "z.mov", 7)])
+    assert touched == 2
+    assert groups(con) == {(100, "img_1.jpg"): (2, 1, ["A"]), (7, "z.mov"): (1, 1, ["A"])}
+
+    # A second drive joins the existing group; a rescan of drive A adds nothing twice.
+    assert ingest(con, [("B", "backup/IMG_1.jpg", 100)]) == 1
+    ingest(con, [("A", "x/IMG_1.JPG", 100)])
+    assert groups(con)[(100, "img_1.jpg")] == (3, 2, ["A", "B"])
+    members = con.execute(
+        f"SELECT members FROM {IDENTITY_TABLE} WHERE name_key = 'img_1.jpg'"
+    ).fetchone()
+    assert members is not None
+    assert [(m["drive"], m["path"]) for m in members[0]] == [
+        ("A", "x/IMG_1.JPG"),
+        ("A", "y/img_1.jpg"),
+        ("B", "backup/IMG_1.jpg"),
+    ]
+
+
+def test_names_are_unicode_normalised() -> None:
+    con = duckdb.connect(":memory:")
+    con.execute(FILES_DDL.format(name="files_raw"))
+    decomposed = unicodedata.normalize("NFD", "Café.JPG")
+    ingest(con, [("Mac", decomposed, 10), ("Win", "café.jpg", 10)])
+    assert groups(con) == {(10, "café.jpg"): (2, 2, ["Mac", "Win"])}
+
+
+def test_backfill_and_incremental_match_the_self_join() -> None:
+    rng = random.Random(3)
+    rows = [
+        (rng.choice("ABC"), f"d{rng.randrange(5)}/f{rng.randrange(40)}.JPG", rng.randrange(4))
+        for _ in range(400)
+    ]
+    con = duckdb.connect(":memory:")
+    con.execute(FILES_DDL.format(name="files_raw"))
+    insert(con, "files_raw", rows[:200])
+    assert ensure_identity_groups(con, "files_raw")
+    for start in range(200, 400, 50):
+        ingest(con, rows[start : start + 50])
+    incremental = groups(con)
+
+    assert rebuild_identity_groups(con, "files_raw") == len(incremental)
+    assert groups(con) == incremental
+
+    pair_sql = r"""
+        WITH f AS (
+          SELECT DISTINCT
+                 regexp_extract(SourceFile, '/host/Volumes/([^/]+)/', 1) AS drive,
+                 regexp_replace(SourceFile, '^/host/Volumes/[^/]+/', '') AS path,
+                 lower(FileName) AS name,
+                 "FileSize#" AS size
+          FROM files_raw
+        )
+        SELECT COUNT(*) FROM f a JOIN f b
+          ON a.size = b.size AND a.name = b.name AND a.drive < b.drive
+        """
+    grouped_sql = f"""
+        WITH m AS (
+          SELECT size, name_key, UNNEST(members) AS member
+          FROM {IDENTITY_TABLE} WHERE n_drives > 1
+        )
+        SELECT COUNT(*) FROM m a JOIN m b
+          ON a.size = b.size AND a.name_key = b.name_key AND a.member.drive < b.member.drive
+        """
+    assert con.execute(pair_sql).fetchone() == con.execute(grouped_sql).fetchone()
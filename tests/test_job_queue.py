@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import multiprocessing
+import sqlite3
+import time
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.job_queue import JobQueue
+
+
+class FakeClock:
+    def __init__(self, step: float = 0.0) -> None:
+        self.now = 1_000.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def test_claims_are_exclusive_prioritised_and_expire(tmp_path: Path) -> None:
+    clock = FakeClock()
+    path = tmp_path / "queue" / "jobs.sqlite"
+    first = JobQueue(path, lease_seconds=60, max_attempts=2, clock=clock)
+    second = JobQueue(path, lease_seconds=60, max_attempts=2, clock=clock)
+    assert first.enqueue([("short", 10.0), ("long", 500.0), ("mid", 90.0)]) == 3
+    assert first.enqueue([("long", 1.0)]) == 0
+
+    [long] = first.claim("a")
+    assert (long.file_key, long.attempt) == ("long", 1)
+    assert [lease.file_key for lease in second.claim("b", limit=5)] == ["mid", "short"]
+    assert second.claim("b") == []
+    assert first.outstanding() == (600.0, 2)
+
+    # "a" keeps its lease alive; "b" goes quiet and its leases are re-queued.
+    clock.now += 45
+    assert first.heartbeat(long)
+    clock.now += 30
+    [again, _] = first.claim("a", limit=2)
+    assert (again.file_key, again.attempt) == ("mid", 2)
+    clock.now += 61
+    # "long" expired once and is claimed again; "mid" and "short" used up both attempts.
+    [retried] = first.claim("a")
+    assert (retried.file_key, retried.attempt) == ("long", 2)
+    assert not first.heartbeat(long)
+    assert first.counts() == {"failed": 2, "leased": 1}
+    assert first.retry_failed() == 2
+    first.close()
+    second.close()
+
+
+def test_results_commit_once_and_one_worker_exports(tmp_path: Path) -> None:
+    clock = FakeClock()
+    with JobQueue(tmp_path / "jobs.sqlite", lease_seconds=60, clock=clock) as queue:
+        queue.enqueue([("a", 1.0), ("b", 2.0)])
+        [stale] = queue.claim("old")
+        clock.now += 61
+        [current] = queue.claim("new")
+        assert current.file_key == stale.file_key == "b"
+        assert not queue.complete(stale, {"status": "completed", "by": "old"})
+        assert queue.complete(current, {"status": "completed", "by": "new"})
+        assert queue.complete(current, {"status": "completed", "by": "new"})
+        assert not queue.fail(stale, "too late")
+
+        # An expired lease nobody has re-claimed may still deliver its result.
+        [late] = queue.claim("slow")
+        clock.now += 61
+        assert not queue.claim_final_export("new")
+        assert queue.fail(late, "decode error", {"status": "failed"})
+        assert queue.results() == {
+            "a": {"status": "failed"},
+            "b": {"status": "completed", "by": "new"},
+        }
+        assert queue.claim_final_export("new")
+        assert not queue.claim_final_export("slow")
+        queue.enqueue([("c", 0.0)])
+        [last] = queue.claim("slow")
+        queue.complete(last)
+        assert queue.claim_final_export("slow")
+
+
+def test_claimed_waits_for_dead_workers_leases_and_keep_alive_notices_loss(
+    tmp_path: Path,
+) -> None:
+    # Every clock read moves ten seconds on, so a lease nobody renews soon expires.
+    clock = FakeClock(step=10.0)
+    with JobQueue(tmp_path / "jobs.sqlite", lease_seconds=60, clock=clock) as queue:
+        queue.enqueue([("a", 2.0), ("b", 1.0)])
+        [abandoned] = queue.claim("dead")
+        done = []
+        for lease in queue.claimed("live", poll_seconds=0):
+            done.append(lease.file_key)
+            queue.complete(lease)
+        assert done == ["b", "a"]
+        with pytest.raises(sqlite3.IntegrityError):
+            queue.enqueue([(None, 0.0)])  # type: ignore[list-item]
+        queue.enqueue([("c", 0.0)])
+        [taken] = queue.claim("slow")
+        with queue.keep_alive(taken, interval=0.001) as lost:
+            queue.complete(taken)
+            assert lost.wait(5)
+        assert not queue.complete(abandoned)
+
+
+def run_worker(path: str, name: str) -> None:
+    with JobQueue(path, lease_seconds=30) as queue:
+        for lease in queue.claimed(name, poll_seconds=0.01):
+            with queue.keep_alive(lease, interval=0.005):
+                time.sleep(0.002)
+            queue.complete(lease, {"worker": name})
+
+
+def test_worker_processes_share_the_queue_without_duplicates(tmp_path: Path) -> None:
+    path = str(tmp_path / "jobs.sqlite")
+    keys = [f"track-{index:03d}" for index in range(60)]
+    with JobQueue(path) as queue:
+        queue.enqueue((key, float(index)) for index, key in enumerate(keys))
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=run_worker, args=(path, f"worker-{n}")) for n in range(3)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(60)
+        assert worker.exitcode == 0
+
+    with JobQueue(path) as queue:
+        results = queue.results()
+        assert queue.counts() == {"completed": len(keys)}
+    assert sorted(results) == keys
+    assert len({result["worker"] for result in results.values()}) > 1
+
+
+def test_rejects_non_positive_settings(tmp_path: Path) -> None:
+    with pytest.raises(ValueError, match="positive"):
+        JobQueue(tmp_path / "jobs.sqlite", lease_seconds=0)
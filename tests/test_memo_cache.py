@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.memo_cache import (
+    EMBEDDINGS,
+    FILE_HASHES,
+    TRANSCRIPTS,
+    MemoCache,
+    audio_key,
+    text_key,
+)
+from disk_catalogue.semantic_audio import catalogue_audio
+
+
+def test_keys_follow_content_and_model_not_location(tmp_path: Path) -> None:
+    first = tmp_path / "Ext-10" / "a.m4a"
+    moved = tmp_path / "ExtSSD-Data" / "renamed.m4a"
+    for path in (first, moved):
+        path.parent.mkdir()
+        path.write_bytes(b"same audio")
+
+    assert audio_key(first, "base.en") == audio_key(moved, "base.en")
+    assert audio_key(first, "base.en") != audio_key(first, "large-v3")
+    assert text_key("hello", "e5") == text_key("hello", "e5") != text_key("hello!", "e5")
+
+
+def test_cache_persists_and_evicts_least_recently_used(tmp_path: Path) -> None:
+    path = tmp_path / "cache" / "memo.sqlite"
+    with MemoCache(path) as cache:
+        calls: list[str] = []
+        for _ in range(2):
+            value = cache.get_or_compute(TRANSCRIPTS, "k1", lambda: calls.append("k1") or "text")
+        assert (value, calls) == ("text", ["k1"])
+        assert cache.lookup(EMBEDDINGS, "k1") == (False, None)
+        assert cache.stats() == {"entries": 1, "bytes": len('"text"'), "hits": 1, "misses": 2}
+
+    # Each list is 15 bytes of JSON, so the budget holds two of them.
+    with MemoCache(path, max_bytes=30) as cache:
+        assert cache.lookup(TRANSCRIPTS, "k1") == (True, "text")
+        cache.put(EMBEDDINGS, "a", [1.0, 2.0, 3.0])
+        cache.put(EMBEDDINGS, "b", [4.0, 5.0, 6.0])
+        assert cache.lookup(EMBEDDINGS, "a")[0]
+        cache.put(EMBEDDINGS, "c", [7.0, 8.0, 9.0])
+        assert [cache.lookup(EMBEDDINGS, key)[0] for key in "abc"] == [True, False, True]
+        assert not cache.lookup(TRANSCRIPTS, "k1")[0]
+
+    with pytest.raises(ValueError, match="max_bytes"):
+        MemoCache(":memory:", max_bytes=0)
+
+
+def test_batch_lookups_and_puts_share_one_transaction(tmp_path: Path) -> None:
+    with MemoCache(tmp_path / "memo.sqlite") as cache:
+        cache.put_many(FILE_HASHES, [(f"k{n}", f"digest-{n}") for n in range(600)])
+        found = cache.lookup_many(FILE_HASHES, ["k5", "k599", "missing", "k5"])
+        assert found == {"k5": "digest-5", "k599": "digest-599"}
+        assert len(cache.lookup_many(FILE_HASHES, (f"k{n}" for n in range(600)))) == 600
+        assert (cache.hits, cache.misses) == (602, 1)
+
+
+def test_catalogue_audio_reuses_results_for_duplicate_and_moved_files(tmp_path: Path) -> None:
+    root = tmp_path / "media"
+    (root / "disc1").mkdir(parents=True)
+    (root / "disc1" / "track.m4a").write_bytes(b"sermon audio")
+    (root / "copy.m4a").write_bytes(b"sermon audio")
+    (root / "other.m4a").write_bytes(b"other audio")
+    transcribed: list[str] = []
+    embedded: list[str] = []
+
+    def transcribe(path: Path) -> str:
+        transcribed.append(path.name)
+        return "shared words" if path.name != "other.m4a" else f"words {len(transcribed)}"
+
+    def embed(text: str) -> list[float]:
+        embedded.append(text)
+        return [float(len(text))]
+
+    cache = MemoCache(tmp_path / "memo.sqlite")
+    ids = {"transcriber_id": "base.en", "embedder_id": "minilm"}
+    records = catalogue_audio(
+        root, tmp_path / "state.json", transcriber=transcribe, embedder=embed, cache=cache, **ids
+    )
+    assert transcribed == ["copy.m4a", "other.m4a"]
+    assert embedded == ["shared words", "words 2"]
+    assert [record.transcript for record in records] == ["shared words", "shared words", "words 2"]
+
+    # A fresh state file (the tracks moved) only costs hashing.
+    (root / "disc1" / "track.m4a").rename(root / "moved.m4a")
+    moved = catalogue_audio(
+        root,
+        tmp_path / "new-state.json",
+        transcriber=transcribe,
+        embedder=embed,
+        cache=cache,
+        **ids,
+    )
+    assert len(transcribed) == 2 and len(embedded) == 2
+    assert [record.relative_path for record in moved] == ["copy.m4a", "moved.m4a", "other.m4a"]
+
+    catalogue_audio(
+        root,
+        tmp_path / "third-state.json",
+        transcriber=transcribe,
+        embedder=embed,
+        cache=cache,
+        transcriber_id="large-v3",
+        embedder_id="minilm",
+    )
+    assert transcribed[2:] == ["copy.m4a", "other.m4a"]
+    assert len(embedded) == 3
+
+
+def test_catalogue_audio_keeps_each_transcribers_results_apart(tmp_path: Path) -> None:
+    root = tmp_path / "media"
+    root.mkdir()
+    (root / "track.m4a").write_bytes(b"sermon audio")
+
+    def embed(text: str) -> list[float]:
+        return [float(len(text))]
+
+    cache = MemoCache(tmp_path / "memo.sqlite")
+    with pytest.raises(ValueError, match="required when a cache is given"):
+        catalogue_audio(
+            root, tmp_path / "s0.json", transcriber=lambda _p: "x", embedder=embed, cache=cache
+        )
+    transcripts = [
+        catalogue_audio(
+            root,
+            tmp_path / f"{model}.json",
+            transcriber=lambda _path, model=model: f"words from {model}",
+            embedder=embed,
+            cache=cache,
+            transcriber_id=model,
+            embedder_id="minilm",
+        )[0].transcript
+        for model in ("base.en", "large-v3")
+    ]
+    assert transcripts == ["words from base.en", "words from large-v3"]
+    assert cache.misses == 4 and cache.hits == 0
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import errno
+import json
+import os
+from hashlib import sha256
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.move_engine import (
+    MoveError,
+    MoveJournal,
+    copy_with_sha256,
+    move_file,
+    partial_path,
+    resume_move,
+)
+
+AUDIO = bytes(range(256)) * 40
+
+
+def cross_device(monkeypatch: pytest.MonkeyPatch) -> None:
+    def rename(_source: object, _target: object) -> None:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "rename", rename)
+
+
+def steps(journal: Path) -> list[str]:
+    return [entry["step"] for entry in MoveJournal.last_steps(journal).values()]
+
+
+def test_same_filesystem_moves_rename(tmp_path: Path) -> None:
+    source = tmp_path / "source.m4a"
+    source.write_bytes(AUDIO)
+    target = tmp_path / "renamed" / "01 Track.m4a"
+    with MoveJournal(tmp_path / "journal.jsonl") as journal:
+        result = move_file(source, target, file_key="k1", journal=journal)
+    assert (result.method, result.size_bytes, result.sha256) == ("rename", len(AUDIO), None)
+    assert target.read_bytes() == AUDIO and not source.exists()
+    assert steps(tmp_path / "journal.jsonl") == ["done"]
+    with pytest.raises(FileExistsError):
+        move_file(target, target)
+
+
+def test_cross_device_moves_copy_verify_then_unlink(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cross_device(monkeypatch)
+    source = tmp_path / "source.m4a"
+    source.write_bytes(AUDIO)
+    os.utime(source, (1_600_000_000, 1_600_000_000))
+    target = tmp_path / "renamed" / "01 Track.m4a"
+    expected = sha256(AUDIO).hexdigest()
+    journal_path = tmp_path / "journal.jsonl"
+    with MoveJournal(journal_path) as journal:
+        result = move_file(source, target, "k1", expected, journal, chunk_bytes=1000)
+    assert (result.method, result.size_bytes, result.sha256) == ("copy", len(AUDIO), expected)
+    assert target.read_bytes() == AUDIO and not source.exists()
+    assert target.stat().st_mtime == 1_600_000_000
+    assert not partial_path(target).exists()
+    lines = journal_path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["step"] for line in lines] == ["started", "verified", "done"]
+
+
+def test_copy_falls_back_to_buffered_io(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def unsupported(*_args: object) -> int:
+        raise OSError(errno.EXDEV, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    source = tmp_path / "source.m4a"
+    source.write_bytes(AUDIO)
+    copied, digest = copy_with_sha256(source, tmp_path / "copy.m4a", chunk_bytes=999)
+    assert (copied, digest) == (len(AUDIO), sha256(AUDIO).hexdigest())
+    assert (tmp_path / "copy.m4a").read_bytes() == AUDIO
+
+    def broken(*_args: object) -> int:
+        raise OSError(errno.EIO, "I/O error")
+
+    monkeypatch.setattr(os, "copy_file_range", broken, raising=False)
+    if hasattr(os, "copy_file_range"):
+        with pytest.raises(OSError, match="I/O error"):
+            copy_with_sha256(source, tmp_path / "copy.m4a")
+
+
+def test_hash_mismatch_keeps_the_source(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    cross_device(monkeypatch)
+    source = tmp_path / "source.m4a"
+    source.write_bytes(AUDIO)
+    target = tmp_path / "renamed" / "01 Track.m4a"
+    journal_path = tmp_path / "journal.jsonl"
+    with MoveJournal(journal_path) as journal, pytest.raises(MoveError, match="does not match"):
+        move_file(source, target, "k1", "0" * 64, journal)
+    assert source.read_bytes() == AUDIO
+    assert not target.exists() and not partial_path(target).exists()
+    assert steps(journal_path) == ["failed"]
+
+
+def test_other_rename_errors_are_journalled(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def rename(_source: object, _target: object) -> None:
+        raise PermissionError(errno.EACCES, "Permission denied")
+
+    monkeypatch.setattr(os, "rename", rename)
+    source = tmp_path / "source.m4a"
+    source.write_bytes(AUDIO)
+    journal_path = tmp_path / "journal.jsonl"
+    with MoveJournal(journal_path) as journal, pytest.raises(PermissionError):
+        move_file(source, tmp_path / "renamed.m4a", "k1", journal=journal)
+    assert source.exists() and steps(journal_path) == ["failed"]
+
+
+def test_resume_finishes_verified_moves_and_discards_partial_copies(tmp_path: Path) -> None:
+    source = tmp_path / "source.m4a"
+    source.write_bytes(AUDIO)
+    target = tmp_path / "renamed" / "01 Track.m4a"
+    target.parent.mkdir()
+    partial_path(target).write_bytes(AUDIO[:100])
+    started = {"file_key": "k1", "step": "started", "target": str(target)}
+    assert not resume_move(source, target, started)
+    assert not partial_path(target).exists() and source.exists()
+
+    partial_path(target).write_bytes(AUDIO)
+    verified = {**started, "step": "verified", "size_bytes": len(AUDIO), "sha256": "abc"}
+    journal_path = tmp_path / "journal.jsonl"
+    with MoveJournal(journal_path) as journal:
+        assert not resume_move(source, tmp_path / "elsewhere.m4a", verified, journal)
+        assert resume_move(source, target, verified, journal)
+        assert resume_move(source, target, started, journal)
+        assert not resume_move(source, target, {**verified, "step": "done"}, journal)
+        assert not resume_move(source, target, {**verified, "size_bytes": 1}, journal)
+    assert target.read_bytes() == AUDIO and not source.exists()
+    assert MoveJournal.last_steps(journal_path)["k1"]["resumed"] is True
+
+
+def test_journal_skips_a_torn_last_line(tmp_path: Path) -> None:
+    journal_path = tmp_path / "journal.jsonl"
+    assert MoveJournal.last_steps(journal_path) == {}
+    with MoveJournal(journal_path) as journal:
+        journal.record("k1", "started", target="t")
+    with journal_path.open("a", encoding="utf-8") as handle:
+        handle.write('{"file_key": "k1", "st')
+    assert steps(journal_path) == ["started"]
@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.progress import (
+    ProgressReporter,
+    ProgressTracker,
+    consume_progress_lines,
+    count_tree,
+    file_size,
+    format_duration,
+    listed_totals,
+    parse_exiftool_progress,
+    run_with_progress,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_tracker_rates_and_eta_prefer_bytes() -> None:
+    clock = FakeClock()
+    tracker = ProgressTracker("files", total_files=10, total_bytes=1000, clock=clock)
+    assert tracker.eta_seconds() is None
+
+    clock.now += 10
+    tracker.advance(files=2, bytes_=100, path="/a")
+
+    assert tracker.files_per_sec() == pytest.approx(0.2)
+    assert tracker.bytes_per_sec() == pytest.approx(10.0)
+    assert tracker.eta_seconds() == pytest.approx(90.0)
+    tracker.total_bytes = None
+    assert tracker.eta_seconds() == pytest.approx(40.0)
+
+
+def test_skipped_files_shorten_the_eta_without_raising_the_rate() -> None:
+    clock = FakeClock()
+    tracker = ProgressTracker("transcribe", total_files=10, clock=clock)
+    tracker.skip(files=6)
+    clock.now += 20
+    tracker.advance()
+
+    snapshot = tracker.snapshot()
+    assert snapshot["files_per_sec"] == 0.05
+    assert snapshot["eta_seconds"] == 60
+    assert tracker.format_line().startswith("[transcribe] 7/10 files, 0.1 files/s")
+
+
+def test_format_line_flags_stalled_progress() -> None:
+    clock = FakeClock()
+    tracker = ProgressTracker("files", clock=clock)
+    clock.now += 3725
+    line = tracker.format_line()
+
+    assert "ETA ?" in line
+    assert "no progress for 1:02:05" in line
+    assert format_duration(None) == "?"
+    assert format_duration(65) == "1:05"
+
+
+def test_reporter_throttles_and_writes_status_file(tmp_path: Path) -> None:
+    clock = FakeClock()
+    stream = io.StringIO()
+    status = tmp_path / "scan_status.json"
+    reporter = ProgressReporter(
+        status, interval=5, stream=stream, context={"drive_label": "Ext-10"}, clock=clock
+    )
+    tracker = ProgressTracker("files", total_files=4, clock=clock)
+
+    assert reporter.report(tracker)
+    clock.now += 1
+    tracker.advance(bytes_=2_000_000)
+    assert not reporter.report(tracker)
+    assert reporter.report(tracker, state="ok", force=True)
+
+    payload = json.loads(status.read_text(encoding="utf-8"))
+    assert payload["drive_label"] == "Ext-10"
+    assert payload["state"] == "ok"
+    assert payload["files_done"] == 1
+    assert len(stream.getvalue().splitlines()) == 2
+    assert "2.0 MB/s" in stream.getvalue()
+
+
+def test_parse_and_consume_exiftool_progress_lines() -> None:
+    assert parse_exiftool_progress("======== /v/a b.jpg [3/40]\n") == ("/v/a b.jpg", 3, 40)
+    assert parse_exiftool_progress("Warning: bad file\n") is None
+
+    tracker = ProgressTracker("photos")
+    passthrough = io.StringIO()
+    lines = ["======== /v/a.jpg [1/2]\n", "Warning: odd\n", "======== /v/b.jpg [2/2]\n"]
+    consume_progress_lines(iter(lines), tracker, passthrough, size_of=lambda _path: 10)
+
+    assert (tracker.files_done, tracker.total_files, tracker.bytes_done) == (2, 2, 20)
+    assert tracker.last_file == "/v/b.jpg"
+    assert passthrough.getvalue() == "Warning: odd\n"
+
+
+def child(script: str) -> list[str]:
+    return [sys.executable, "-c", script]
+
+
+def test_run_with_progress_tracks_child_stderr(tmp_path: Path) -> None:
+    media = tmp_path / "a.jpg"
+    media.write_bytes(b"x" * 7)
+    script = (
+        "import sys, time\n"
+        f"sys.stderr.write('======== {media} [1/1]\\n')\n"
+        "sys.stderr.flush()\n"
+        "time.sleep(0.2)\n"
+    )
+    tracker = ProgressTracker("files")
+    status = tmp_path / "status.json"
+    reporter = ProgressReporter(status, interval=0.05, stream=io.StringIO())
+
+    run_with_progress(child(script), tracker, reporter)
+
+    assert (tracker.files_done, tracker.bytes_done) == (1, 7)
+    assert json.loads(status.read_text(encoding="utf-8"))["state"] == "ok"
+
+
+def test_run_with_progress_raises_like_check_true(tmp_path: Path) -> None:
+    tracker = ProgressTracker("ingest")
+    reporter = ProgressReporter(tmp_path / "status.json", stream=io.StringIO())
+
+    with pytest.raises(subprocess.CalledProcessError):
+        run_with_progress(child("raise SystemExit(2)"), tracker, reporter)
+
+    assert tracker.errors == 1
+    assert json.loads((tmp_path / "status.json").read_text(encoding="utf-8"))["state"] == "failed"
+
+
+def test_scan_script_moves_progress_lines_out_of_the_csv(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    drive = tmp_path / "drive"
+    drive.mkdir()
+    (drive / "a.jpg").write_bytes(b"x" * 5)
+    (drive / "b.jpg").write_bytes(b"x" * 9)
+    csv_text = f"SourceFile,FileName\n{drive}/a.jpg,a.jpg\n{drive}/b.jpg,b.jpg\n"
+    # Stand-in for ExifTool printing its -progress (-v0) lines and summary on stdout.
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    fake = bin_dir / "exiftool"
+    fake.write_text(
+        "#!/bin/sh\n"
+        f'echo "$*" > {tmp_path}/args\n'
+        f"echo '======== {drive}/a.jpg [1/2]'\n"
+        f"echo '======== {drive}/b.jpg [2/2]'\n"
+        f"printf '%s' '{csv_text}'\n"
+        "echo '    1 directories scanned'\n"
+        "echo '    2 image files read'\n",
+        encoding="utf-8",
+    )
+    fake.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    tracker = ProgressTracker("files")
+    reporter = ProgressReporter(tmp_path / "status.json", stream=io.StringIO())
+    script = Path(__file__).resolve().parents[1] / "scripts" / "container_scan_files.sh"
+
+    run_with_progress([str(script), str(drive), "d1", str(tmp_path / "out")], tracker, reporter)
+
+    assert (tracker.files_done, tracker.total_files, tracker.bytes_done) == (2, 2, 14)
+    [csv_path] = (tmp_path / "out").glob("files_d1_*.csv")
+    assert csv_path.read_text(encoding="utf-8") == csv_text
+    args = (tmp_path / "args").read_text(encoding="utf-8").split()
+    assert "-progress" in args and "-q" not in args
+
+
+def test_count_tree_skips_appledouble_and_system_files(tmp_path: Path) -> None:
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "a.mov").write_bytes(b"12345")
+    (tmp_path / "b.jpg").write_bytes(b"12")
+    (tmp_path / "._b.jpg").write_bytes(b"junk")
+    (tmp_path / ".DS_Store").write_bytes(b"junk")
+
+    assert count_tree(tmp_path) == (2, 7)
+    assert count_tree(tmp_path / "missing") == (0, 0)
+    assert file_size(str(tmp_path / "missing")) == 0
+
+
+def test_listed_totals_sums_listed_sizes(tmp_path: Path) -> None:
+    files_csv = tmp_path / "files.csv"
+    files_csv.write_text(
+        "SourceFile,FileSize#\n/v/a.jpg,10\n/v/b.mov,20\n/v/c.jpg,bad\n", encoding="utf-8"
+    )
+    photo_list = tmp_path / "photos_list.txt"
+    photo_list.write_text("/v/a.jpg\n/v/c.jpg\n", encoding="utf-8")
+
+    assert listed_totals(photo_list, files_csv) == (2, 10)
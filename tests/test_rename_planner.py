@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+from hashlib import sha256
+from pathlib import Path
+from typing import Any
+
+import duckdb
+import pytest
+
+from disk_catalogue.following_jesus_rename import (
+    FOLLOWING_JESUS_RENAME_RULES,
+    build_rename_entry,
+    following_jesus_rename_rules,
+)
+from disk_catalogue.memo_cache import MemoCache
+from disk_catalogue.rename_planner import (
+    load_rename_rules,
+    plan_entries,
+    plan_from_duckdb,
+    read_plan,
+    rename_rules_from_mapping,
+    write_plan,
+)
+
+FOLDERS = [
+    "Following Jesus 2--Living in the Family",
+    "Following Jesus 1--Making Disciples",
+    "Unknown Album: Extras",
+]
+
+
+def source_rows(tmp_path: Path) -> list[dict[str, Any]]:
+    rows = []
+    for index in range(30):
+        source = tmp_path / "source" / f"{index:02d} Track {index % 5:02d}.M4A"
+        source.parent.mkdir(exist_ok=True)
+        source.write_bytes(b"audio" * (index + 1))
+        rows.append(
+            {
+                "file_key": f"k{index:02d}",
+                "source_path": str(source),
+                "source_album_folder": FOLDERS[index % 3],
+                "source_file_name": source.name,
+                "embedded_title": f"Track {index % 5:02d}" if index % 2 else f"Story {index}",
+                "semantic_title": "Jesus calls the first disciples" if index % 4 else "",
+                "track_type": "bible_story",
+                "bible_reference": "",
+                "disc_index": index % 2 + 1,
+                "track_index": 30 - index,
+                "duration_seconds": 60.5,
+                "size_bytes": source.stat().st_size,
+            }
+        )
+    return rows
+
+
+def test_duckdb_plan_matches_per_row_entries_in_sorted_order(tmp_path: Path) -> None:
+    rows = source_rows(tmp_path)
+    expected = sorted(
+        (build_rename_entry(row, tmp_path / "renamed", include_hash=True) for row in rows),
+        key=lambda item: (item.module_sort, item.disc_index, item.track_index, item.file_key),
+    )
+    library = tmp_path / "library.json"
+    library.write_text(json.dumps(rows), encoding="utf-8")
+    db = tmp_path / "library.duckdb"
+    with duckdb.connect(str(db)) as con:
+        con.execute("CREATE TABLE library AS SELECT * FROM read_json_auto(?)", [str(library)])
+    with (
+        duckdb.connect(str(db), read_only=True) as con,
+        MemoCache(tmp_path / "hashes.sqlite") as cache,
+    ):
+        planned = list(
+            plan_from_duckdb(
+                con,
+                "SELECT * FROM library",
+                tmp_path / "renamed",
+                following_jesus_rename_rules(),
+                include_hash=True,
+                hash_cache=cache,
+                batch_size=7,
+            )
+        )
+    assert planned == expected
+    assert {entry.module_code for entry in planned} == {"FJ-M00", "FJ-M01", "FJ-M03"}
+
+
+def test_custom_rules_from_json_drive_folders_and_titles(tmp_path: Path) -> None:
+    raw = {
+        "version": 1,
+        "albums": [{"match": ["sermons"], "code": "SER", "title": "Sermons", "sort": 1}],
+        "fallback_album": {"code": "MISC", "sort": 9},
+        "title_fields": ["embedded_title"],
+        "folder": "{module_code}/{module_title}",
+        "file_name": "{track_index:03d} {title}",
+    }
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(raw), encoding="utf-8")
+    rules = load_rename_rules(path)
+    rows = [
+        {
+            "file_key": "a",
+            "source_path": "/drive/Sunday Sermons/01.mp3",
+            "source_album_folder": "Sunday Sermons",
+            "source_file_name": "01.mp3",
+            "embedded_title": "Grace & Truth",
+            "track_index": "4.0",
+        },
+        {
+            "file_key": "b",
+            "source_path": "/drive/Other/x",
+            "source_album_folder": "Other",
+            "source_file_name": "",
+            "embedded_title": "",
+        },
+    ]
+    first, second = plan_entries(rows, Path("/library"), rules)
+    assert first.target_path == "/library/SER/Sermons/004 Grace and Truth.mp3"
+    assert second.target_relative_path == "MISC/Other/000 Untitled"
+    with duckdb.connect() as con:
+        con.execute(
+            "CREATE TABLE library (file_key VARCHAR, source_path VARCHAR, "
+            "source_album_folder VARCHAR, source_file_name VARCHAR, embedded_title VARCHAR)"
+        )
+        con.execute(
+            "INSERT INTO library VALUES ('b', '/drive/Other/x', 'Other', '', ''), "
+            "('a', '/drive/Sunday Sermons/02.mp3', 'Sunday Sermons', '02.mp3', 'Hope')"
+        )
+        planned = list(plan_from_duckdb(con, "SELECT * FROM library", Path("/library"), rules))
+    assert [entry.target_relative_path for entry in planned] == [
+        "SER/Sermons/000 Hope.mp3",
+        "MISC/Other/000 Untitled",
+    ]
+
+    for bad, message in [
+        ({**raw, "version": 2}, "version"),
+        ({**raw, "folder": "{artist}"}, "invalid rename folder"),
+        ({**raw, "file_name": "../{title}"}, "under the target root"),
+        ({**raw, "folder": "/{module_code}"}, "under the target root"),
+    ]:
+        with pytest.raises(ValueError, match=message):
+            rename_rules_from_mapping(bad)
+
+
+def test_write_plan_streams_and_keeps_the_old_plan_on_collisions(tmp_path: Path) -> None:
+    rules = rename_rules_from_mapping(FOLLOWING_JESUS_RENAME_RULES)
+    rows = source_rows(tmp_path)[:4]
+    plan = tmp_path / "plan" / "rename_plan.csv"
+    assert write_plan(plan, plan_entries(rows, tmp_path / "renamed", rules)) == 4
+    assert [row["file_key"] for row in read_plan(plan)] == ["k00", "k01", "k02", "k03"]
+
+    clash = [rows[0], {**rows[0], "file_key": "copy"}]
+    with pytest.raises(ValueError, match="duplicate target paths"):
+        write_plan(plan, plan_entries(clash, tmp_path / "renamed", rules))
+    assert len(read_plan(plan)) == 4
+    assert sorted(path.name for path in plan.parent.iterdir()) == ["rename_plan.csv"]
+
+    hashed = list(plan_entries(rows[:1], tmp_path / "renamed", rules, include_hash=True))
+    assert hashed[0].source_sha256 == sha256(b"audio").hexdigest()
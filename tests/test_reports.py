@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+import duckdb
+import pytest
+
+from disk_catalogue.identity_groups import update_identity_groups
+from disk_catalogue.reports import (
+    CACHE_TABLE,
+    REPORTS,
+    Report,
+    ReportError,
+    available_reports,
+    refresh_reports,
+    run_report,
+)
+
+
+def make_catalogue() -> duckdb.DuckDBPyConnection:
+    con = duckdb.connect(":memory:")
+    con.execute("CREATE TABLE ingested_files (file_path TEXT, ingested_at TIMESTAMP)")
+    con.execute('CREATE TABLE files_raw (SourceFile TEXT, FileName TEXT, "FileSize#" BIGINT)')
+    con.execute(r"""
+        CREATE VIEW files AS
+        SELECT *,
+               regexp_extract(SourceFile, '/host/Volumes/([^/]+)/', 1) AS Drive,
+               regexp_replace(SourceFile, '^/host/Volumes/[^/]+/', '') AS RelativePath
+        FROM files_raw
+        """)
+    add_files(
+        con,
+        "files_A.csv",
+        [("A", "x/IMG_1.jpg", 100), ("A", "y/clip.mov", 500)],
+    )
+    add_files(con, "files_B.csv", [("B", "backup/img_1.JPG", 100)])
+    return con
+
+
+def add_files(
+    con: duckdb.DuckDBPyConnection, csv_name: str, rows: list[tuple[str, str, int]]
+) -> None:
+    """Ingest rows the way load_csvs does: files_raw, the identity groups, then the log."""
+    con.execute(
+        'CREATE OR REPLACE TEMP TABLE staging (SourceFile TEXT, FileName TEXT, "FileSize#" BIGINT)'
+    )
+    con.executemany(
+        "INSERT INTO staging VALUES (?, ?, ?)",
+        [
+            (f"/host/Volumes/{drive}/{path}", path.rsplit("/", 1)[-1], size)
+            for drive, path, size in rows
+        ],
+    )
+    con.execute("INSERT INTO files_raw SELECT * FROM staging")
+    update_identity_groups(con, "staging")
+    con.execute("INSERT INTO ingested_files VALUES (?, current_timestamp)", [csv_name])
+
+
+def test_run_report_caches_until_new_data_is_ingested() -> None:
+    con = make_catalogue()
+
+    first = run_report(con, "drives_seen")
+    assert not first.cached
+    assert first.columns == ["drive", "n_files", "tb_total"]
+    assert [row[:2] for row in first.rows] == [("A", 2), ("B", 1)]
+
+    # Unlogged writes are invisible to the watermark, proving the second call used the cache.
+    con.execute("INSERT INTO files_raw VALUES ('/host/Volumes/C/z.txt', 'z.txt', 1)")
+    second = run_report(con, "drives_seen")
+    assert second.cached
+    assert second.rows == first.rows
+    assert second.refreshed_at == first.refreshed_at
+
+    add_files(con, "files_C.csv", [("C", "w.txt", 2)])
+    third = run_report(con, "drives_seen")
+    assert not third.cached
+    assert [row[:2] for row in third.rows] == [("A", 2), ("B", 1), ("C", 2)]
+    assert third.watermark != first.watermark
+
+    cached = con.execute(
+        f"SELECT report_name, row_count FROM {CACHE_TABLE} ORDER BY report_name"
+    ).fetchall()
+    assert cached == [("drives_seen", 3)]
+
+
+def test_run_report_recomputes_on_force_or_changed_sql(monkeypatch: pytest.MonkeyPatch) -> None:
+    con = make_catalogue()
+    run_report(con, "cross_drive_pairs")
+
+    forced = run_report(con, "cross_drive_pairs", refresh=True)
+    assert not forced.cached
+    assert forced.rows == [("A", "B", "x/IMG_1.jpg", "backup/img_1.JPG", 100)]
+
+    changed = Report("cross_drive_pairs", "pairs", "SELECT COUNT(*) AS n FROM files", ("files",))
+    monkeypatch.setitem(REPORTS, "cross_drive_pairs", changed)
+    result = run_report(con, "cross_drive_pairs")
+    assert not result.cached
+    assert result.rows == [(3,)]
+
+
+def test_refresh_reports_runs_only_reports_with_sources() -> None:
+    con = make_catalogue()
+    assert [report.name for report in available_reports(con)] == [
+        "drives_seen",
+        "duplicate_sizes",
+        "duplicate_names",
+        "cross_drive_pairs",
+        "reclaimable_space",
+    ]
+
+    results = refresh_reports(con)
+    assert [result.cached for result in results] == [False] * 5
+    assert all(result.cached for result in refresh_reports(con))
+    duplicates = {result.name: result.rows for result in results}["duplicate_names"]
+    assert duplicates == [("img_1.jpg", 100, 2, ["A", "B"])]
+    reclaimable = {result.name: result.rows for result in results}["reclaimable_space"]
+    assert reclaimable == [("img_1.jpg", 100, 2, ["A", "B"], 100)]
+
+    with pytest.raises(ReportError, match="missing tables: photos"):
+        run_report(con, "top_cameras_lenses")
+    with pytest.raises(ReportError, match="unknown report"):
+        run_report(con, "nope")
+
+
+def test_scan_deltas_watch_drive_scans_not_ingests() -> None:
+    con = make_catalogue()
+    con.execute(
+        "CREATE TABLE drive_scans (drive_label TEXT, started_at TIMESTAMP, status TEXT, "
+        "files_rows BIGINT, photos_rows BIGINT, videos_rows BIGINT)"
+    )
+    con.execute("INSERT INTO drive_scans VALUES ('A', ?, 'ok', 10, 2, 1)", [datetime(2026, 1, 1)])
+
+    assert not run_report(con, "scan_deltas").cached
+    add_files(con, "files_D.csv", [("D", "d.txt", 3)])
+    assert run_report(con, "scan_deltas").cached
+
+    con.execute("INSERT INTO drive_scans VALUES ('A', ?, 'ok', 15, 2, 1)", [datetime(2026, 2, 1)])
+    result = run_report(con, "scan_deltas")
+    assert not result.cached
+    assert [row[4] for row in result.rows] == [5, None]
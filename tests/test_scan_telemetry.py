@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.scan_telemetry import (
+    PHASE_COLUMNS,
+    PhaseTiming,
+    csv_file_stats,
+    measure_phase,
+    phase_rows,
+)
+
+
+def test_measure_phase_records_wall_and_child_cpu_time() -> None:
+    phases: list[PhaseTiming] = []
+    with measure_phase(phases, "files_exiftool") as phase:
+        subprocess.run(
+            [sys.executable, "-c", "sum(i * i for i in range(300000))"],
+            check=True,
+        )
+        phase.files, phase.bytes = 3, 1024
+
+    (timing,) = phases
+    assert timing.status == "ok"
+    assert timing.wall_seconds > 0
+    assert timing.cpu_seconds > 0
+    assert timing.started_at is not None and timing.ended_at is not None
+    assert timing.started_at <= timing.ended_at
+    assert (timing.files, timing.bytes, timing.errors) == (3, 1024, 0)
+
+
+def test_measure_phase_marks_failures_and_reraises() -> None:
+    phases: list[PhaseTiming] = []
+    with pytest.raises(subprocess.CalledProcessError):
+        with measure_phase(phases, "ingest"):
+            subprocess.run([sys.executable, "-c", "raise SystemExit(3)"], check=True)
+
+    assert phases[0].status == "failed"
+    assert phases[0].errors == 1
+    assert phases[0].ended_at is not None
+
+
+def test_csv_file_stats_sums_exiftool_file_sizes(tmp_path: Path) -> None:
+    numeric = tmp_path / "files_numeric.csv"
+    numeric.write_text("SourceFile,FileSize#\n/a,10\n/b,\n/c,5\n", encoding="utf-8")
+    plain = tmp_path / "files_plain.csv"
+    plain.write_text("SourceFile,FileSize\n/a,7\n/b,n/a\n", encoding="utf-8")
+    no_size = tmp_path / "videos.csv"
+    no_size.write_text("SourceFile\n/a\n", encoding="utf-8")
+
+    assert csv_file_stats(numeric) == (3, 15)
+    assert csv_file_stats(plain) == (2, 7)
+    assert csv_file_stats(no_size) == (1, 0)
+    assert csv_file_stats(tmp_path / "missing.csv") == (0, 0)
+    assert csv_file_stats(None) == (0, 0)
+
+
+def test_phase_rows_follow_column_order() -> None:
+    scan_started = datetime(2026, 1, 2, 3, 4, 5)
+    phases = [PhaseTiming("files_exiftool", status="ok", files=2), PhaseTiming("ingest")]
+
+    rows = phase_rows("Ext-10", scan_started, phases)
+
+    assert [dict(zip(PHASE_COLUMNS, row, strict=True))["phase_index"] for row in rows] == [0, 1]
+    first = dict(zip(PHASE_COLUMNS, rows[0], strict=True))
+    assert first["drive_label"] == "Ext-10"
+    assert first["scan_started_at"] == scan_started
+    assert first["files"] == 2
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.audio_semantic import (
+    AudioCatalogueRecord,
+    analyse_transcript,
+    build_semantic_entry,
+    classify_track,
+)
+from disk_catalogue.semantic_rules import (
+    DEFAULT_RULES,
+    RULE_SET_VERSION,
+    condition_matches,
+    default_rule_set,
+    load_rule_set,
+    rule_set_from_mapping,
+)
+
+
+def make_record(title: str = "Track 01", album_folder: str = "Other Album") -> AudioCatalogueRecord:
+    return AudioCatalogueRecord(
+        recovery_set="set",
+        file_key="k1",
+        album_folder=album_folder,
+        file_name="01 Track 01.m4a",
+        title=title,
+        destination_path="/tmp/audio.m4a",
+    )
+
+
+def test_default_rule_set_collects_every_phrase_once() -> None:
+    rules = default_rule_set()
+
+    assert rules.version == RULE_SET_VERSION
+    assert {"serpent", "forbidden fruit", "memory verse", "john"} <= rules.phrases
+    assert all(phrase == phrase.lower() for phrase in rules.phrases)
+
+    view = analyse_transcript("The  Serpent\nand the FORBIDDEN fruit.")
+    assert view.normalised == "The Serpent and the FORBIDDEN fruit."
+    assert {"serpent", "forbidden fruit", "fruit"} <= view.phrases
+    assert condition_matches({"all": ["serpent", {"any": ["garden", "fruit"]}]}, view)
+    assert condition_matches({"title": "welcome"}, view, title="Avery's Welcome")
+    assert not condition_matches({"album": "following jesus"}, view, album="Other")
+
+
+def test_custom_rule_set_loads_from_versioned_json(tmp_path: Path) -> None:
+    raw = json.loads(json.dumps(DEFAULT_RULES))
+    raw["semantic_titles"].insert(0, {"value": "Custom Ark Story", "when": "ark"})
+    raw["classifications"].insert(
+        0,
+        {
+            "track_type": "flood_story",
+            "storying_role": "Flood narration.",
+            "module_role": None,
+            "when": {"all": ["noah", "ark"]},
+        },
+    )
+    raw["keywords"].append("ark")
+    raw["speakers"] = ["Noah Storyteller"]
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(raw), encoding="utf-8")
+
+    rules = load_rule_set(path)
+    entry = build_semantic_entry(
+        make_record(),
+        "Noah Storyteller tells how Noah built the ark.",
+        Path("noah.txt"),
+        None,
+        rules=rules,
+    )
+
+    assert entry.semantic_title == "Custom Ark Story"
+    assert entry.track_type == "flood_story"
+    assert entry.speaker_names == ["Noah Storyteller"]
+    assert "ark" in entry.keywords
+    assert classify_track(make_record(), "Nothing here.", rules)[0] == "unknown"
+
+
+def test_rule_set_rejects_unknown_versions_and_operators() -> None:
+    with pytest.raises(ValueError, match="version"):
+        rule_set_from_mapping({**DEFAULT_RULES, "version": 99})
+    with pytest.raises(ValueError, match="operator"):
+        rule_set_from_mapping({**DEFAULT_RULES, "memory_verse_when": {"none": ["x"]}})
+    with pytest.raises(ValueError, match="invalid rule condition"):
+        rule_set_from_mapping({**DEFAULT_RULES, "worldview_when": ["worldview"]})
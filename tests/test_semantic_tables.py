@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+import duckdb
+
+from disk_catalogue.semantic_tables import (
+    BIBLE_REFERENCES,
+    CATALOGUE_STATUS,
+    CATALOGUE_VERIFICATION,
+    add_columns_statements,
+    execute_statements,
+    patch_csv,
+    replace_file_rows,
+    replace_file_rows_statements,
+    text_schema,
+    with_row_columns,
+    write_csv,
+    write_table,
+)
+
+
+def column_types(con: duckdb.DuckDBPyConnection, table_name: str) -> dict[str, str]:
+    return {row[0]: row[1] for row in con.execute(f"DESCRIBE {table_name}").fetchall()}
+
+
+def test_write_table_uses_explicit_types_for_empty_and_null_columns() -> None:
+    con = duckdb.connect()
+    write_table(con, BIBLE_REFERENCES, [])
+    write_table(
+        con,
+        CATALOGUE_VERIFICATION,
+        [{"total_files": 2, "missing_catalogue": [], "short_transcripts": ["k2"]}],
+    )
+
+    assert column_types(con, "audio_bible_references")["verse_start"] == "BIGINT"
+    assert con.execute("SELECT count(*) FROM audio_bible_references").fetchone() == (0,)
+    assert column_types(con, "audio_semantic_catalogue_verification")["missing_catalogue"] == (
+        "VARCHAR[]"
+    )
+    assert con.execute(
+        "SELECT total_files, missing_catalogue, short_transcripts, duplicate_audit_complete "
+        "FROM audio_semantic_catalogue_verification"
+    ).fetchall() == [(2, [], ["k2"], None)]
+    indexes = con.execute("SELECT index_name FROM duckdb_indexes()").fetchall()
+    assert indexes == [("idx_audio_bible_references_range",)]
+
+
+def test_replace_file_rows_swaps_rows_and_ignores_unknown_keys() -> None:
+    con = duckdb.connect()
+    write_table(
+        con,
+        CATALOGUE_STATUS,
+        [
+            {"file_key": "k1", "status": "running", "source_size": 10},
+            {"file_key": "k2", "status": "failed", "error": "boom", "extra": "ignored"},
+        ],
+    )
+
+    replace_file_rows(
+        con,
+        CATALOGUE_STATUS,
+        [{"file_key": "k2", "status": "completed", "elapsed_seconds": 1}],
+        {"k2", "k3"},
+    )
+    replace_file_rows(con, CATALOGUE_STATUS, [], {"missing"})
+
+    rows = con.execute(
+        "SELECT file_key, status, source_size, error, elapsed_seconds "
+        "FROM audio_semantic_catalogue_status ORDER BY file_key"
+    ).fetchall()
+    assert rows == [("k1", "running", 10, None, None), ("k2", "completed", None, None, 1.0)]
+    assert "extra" not in column_types(con, "audio_semantic_catalogue_status")
+
+
+def test_status_schema_widens_for_state_keys_it_does_not_list() -> None:
+    con = duckdb.connect()
+    rows = [
+        {"file_key": "k1", "status": "completed", "memo_cache_hit": True, "chunk_jobs": 2},
+        {"file_key": "k2", "status": "failed", "chunk_jobs": 1.5, "notes": ["a", 1]},
+    ]
+    write_table(con, with_row_columns(CATALOGUE_STATUS, rows), rows)
+
+    types = column_types(con, "audio_semantic_catalogue_status")
+    assert (types["memo_cache_hit"], types["chunk_jobs"], types["notes"]) == (
+        "BOOLEAN",
+        "DOUBLE",
+        "VARCHAR",
+    )
+    assert con.execute(
+        "SELECT file_key, chunk_jobs, notes FROM audio_semantic_catalogue_status ORDER BY 1"
+    ).fetchall() == [("k1", 2.0, None), ("k2", 1.5, '["a", 1]')]
+
+    # A checkpoint upsert adds columns for keys that first appear after the last full export.
+    later = [{"file_key": "k1", "status": "completed", "vad_engine": "energy", "threads": 4}]
+    status = with_row_columns(CATALOGUE_STATUS, later)
+    execute_statements(
+        con,
+        [*add_columns_statements(status), *replace_file_rows_statements(status, later, {"k1"})],
+    )
+    assert con.execute(
+        "SELECT file_key, vad_engine, threads, chunk_jobs FROM audio_semantic_catalogue_status "
+        "ORDER BY 1"
+    ).fetchall() == [("k1", "energy", 4, None), ("k2", None, None, 1.5)]
+    assert with_row_columns(CATALOGUE_STATUS, [{"file_key": "k"}]) is CATALOGUE_STATUS
+
+
+def test_text_schema_keeps_csv_values_as_text() -> None:
+    con = duckdb.connect()
+    schema = text_schema("source_rows", ["file_key", "track_index"])
+    write_table(con, schema, [{"file_key": "1", "track_index": "08"}])
+
+    assert schema.column_names == ["file_key", "track_index"]
+    assert con.execute("SELECT track_index FROM source_rows").fetchall() == [("08",)]
+
+
+def read_csv(path: Path) -> list[dict[str, str]]:
+    with path.open(newline="", encoding="utf-8") as handle:
+        return list(csv.DictReader(handle))
+
+
+def test_patch_csv_appends_new_trailing_keys_in_place(tmp_path: Path) -> None:
+    path = tmp_path / "status.csv"
+    patch_csv(path, [{"file_key": "k2", "status": "done"}, {"file_key": "k1"}], {"k1", "k2"})
+    assert read_csv(path) == [
+        {"file_key": "k1", "status": ""},
+        {"file_key": "k2", "status": "done"},
+    ]
+    before = path.read_bytes()
+
+    patch_csv(path, [{"file_key": "k4", "status": "done"}, {"file_key": "k3"}], {"k3", "k4"})
+    patch_csv(path, [], {"k5"})
+
+    assert path.read_bytes().startswith(before)
+    assert [row["file_key"] for row in read_csv(path)] == ["k1", "k2", "k3", "k4"]
+
+
+def test_patch_csv_replaces_reorders_and_widens(tmp_path: Path) -> None:
+    path = tmp_path / "status.csv"
+    write_csv(path, [{"file_key": key, "status": "done"} for key in ("k1", "k3", "k5")])
+
+    # k0 sorts before the existing rows, so it cannot be appended.
+    patch_csv(path, [{"file_key": "k0", "status": "running"}], {"k0"})
+    # k3 is replaced and drops out; k4 brings a column the header lacks.
+    patch_csv(path, [{"file_key": "k4", "status": "failed", "error": "boom"}], {"k3", "k4"})
+
+    assert read_csv(path) == [
+        {"file_key": "k0", "status": "running", "error": ""},
+        {"file_key": "k1", "status": "done", "error": ""},
+        {"file_key": "k4", "status": "failed", "error": "boom"},
+        {"file_key": "k5", "status": "done", "error": ""},
+    ]
+    assert sorted(item.name for item in tmp_path.iterdir()) == ["status.csv"]
+
+    write_csv(tmp_path / "empty.csv", [])
+    assert (tmp_path / "empty.csv").read_text(encoding="utf-8") == ""
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import wave
+from itertools import pairwise
+from pathlib import Path
+
+import pytest
+
+from disk_catalogue.audio_semantic import (
+    AudioCatalogueRecord,
+    TranscriptSegment,
+    build_semantic_entry,
+    read_srt_segments,
+    verify_catalogue_outputs,
+)
+from disk_catalogue.transcript_chunks import (
+    Chunk,
+    ChunkOptions,
+    format_srt,
+    format_transcript,
+    parallel_chunks,
+    plan_chunks,
+    split_wav,
+    stitch_segments,
+    wav_duration,
+)
+
+
+def test_plan_chunks_overlaps_and_folds_short_tails() -> None:
+    assert plan_chunks(700.0) == [Chunk(0, 0.0, 700.0)]
+    chunks = plan_chunks(2400.0, chunk_seconds=600.0, overlap_seconds=10.0)
+    assert [(c.start_seconds, c.end_seconds) for c in chunks] == [
+        (0.0, 600.0),
+        (590.0, 1190.0),
+        (1180.0, 1780.0),
+        (1770.0, 2400.0),
+    ]
+    # A 100 s tail would be its own chunk; it is folded into the one before instead.
+    folded = plan_chunks(1300.0, chunk_seconds=600.0, overlap_seconds=10.0)
+    assert [(c.start_seconds, c.end_seconds) for c in folded] == [(0.0, 600.0), (590.0, 1300.0)]
+    with pytest.raises(ValueError, match="overlap"):
+        plan_chunks(100.0, chunk_seconds=10.0, overlap_seconds=5.0)
+
+
+def test_parallel_chunks_is_capped_by_workers_and_chunk_count() -> None:
+    options = ChunkOptions(chunk_seconds=600.0, overlap_seconds=10.0, workers=4)
+    assert parallel_chunks(700.0, options) == 1
+    assert parallel_chunks(1300.0, options) == 2
+    assert parallel_chunks(3600.0, options) == 4
+
+
+def test_split_wav_writes_each_window(tmp_path: Path) -> None:
+    source = tmp_path / "long.wav"
+    with wave.open(str(source), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(1000)
+        handle.writeframes(bytes(range(256)) * 100)  # 12.8 s of 16-bit mono at 1 kHz
+    chunks = plan_chunks(wav_duration(source), chunk_seconds=5.0, overlap_seconds=1.0)
+    paths = split_wav(source, chunks, tmp_path / "chunks")
+    assert [path.name for path in paths] == ["chunk_000.wav", "chunk_001.wav", "chunk_002.wav"]
+    assert [wav_duration(path) for path in paths] == [5.0, 5.0, pytest.approx(4.8)]
+    with wave.open(str(paths[1]), "rb") as handle:
+        handle.setpos(0)
+        first = handle.readframes(1)
+    assert first == (bytes(range(256)) * 100)[8000:8002]
+
+
+def test_stitch_segments_dedupes_the_overlap_and_keeps_times_monotonic(tmp_path: Path) -> None:
+    first = Chunk(0, 0.0, 60.0)
+    second = Chunk(1, 50.0, 120.0)
+    stitched = stitch_segments(
+        [
+            (
+                second,
+                [
+                    # Heard by both chunks; centred at 53.5 s, before the seam at 55 s.
+                    TranscriptSegment(2.0, 5.0, "the sower went out"),
+                    TranscriptSegment(5.5, 9.0, "went out to sow his seed"),
+                    TranscriptSegment(9.0, 20.0, "and some fell on the path."),
+                    TranscriptSegment(60.0, 69.5, "He who has ears, let him hear."),
+                ],
+            ),
+            (
+                first,
+                [
+                    TranscriptSegment(0.0, 48.0, "Listen! A farmer"),
+                    TranscriptSegment(51.0, 56.5, "the sower went out"),
+                ],
+            ),
+        ]
+    )
+    assert [segment.text for segment in stitched] == [
+        "Listen! A farmer",
+        "the sower went out",
+        "to sow his seed",
+        "and some fell on the path.",
+        "He who has ears, let him hear.",
+    ]
+    starts = [segment.start_seconds for segment in stitched]
+    assert starts == sorted(starts)
+    assert all(later.start_seconds >= earlier.end_seconds for earlier, later in pairwise(stitched))
+    assert stitched[2].start_seconds == 56.5  # clamped to the end of the cue before
+
+    record = AudioCatalogueRecord(
+        recovery_set="set",
+        file_key="long",
+        album_folder="Roundtable",
+        file_name="1-01 Roundtable.m4a",
+        title="Roundtable",
+        destination_path=str(tmp_path / "long.m4a"),
+        disc_index=1,
+        track_index=1,
+        duration_seconds=125.0,
+    )
+    txt, srt = tmp_path / "long.txt", tmp_path / "long.srt"
+    txt.write_text(format_transcript(stitched), encoding="utf-8")
+    srt.write_text(format_srt(stitched), encoding="utf-8")
+    assert read_srt_segments(srt) == [
+        TranscriptSegment(round(s.start_seconds, 3), round(s.end_seconds, 3), s.text)
+        for s in stitched
+    ]
+    assert txt.read_text(encoding="utf-8").splitlines()[2] == "to sow his seed"
+
+    entry = build_semantic_entry(record, txt.read_text(encoding="utf-8"), txt, srt)
+    result = verify_catalogue_outputs([record], {"long": entry}, {"long": txt}, {"long": srt})
+    assert (result.missing_transcripts, result.empty_transcripts) == ([], [])
+    assert result.short_transcripts == []
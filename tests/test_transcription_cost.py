@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import pytest
+
+from disk_catalogue.transcription_cost import (
+    DEFAULT_FIT,
+    CostSample,
+    cost_samples,
+    fill_missing_durations,
+    fit_cost_model,
+    fit_line,
+    longest_first,
+)
+
+
+def samples(model: str, threads: int, rtf: float, overhead: float) -> list[CostSample]:
+    return [
+        CostSample(model, threads, duration, overhead + rtf * duration)
+        for duration in (60.0, 240.0, 900.0, 1800.0)
+    ]
+
+
+def test_fit_recovers_rtf_and_overhead_per_configuration() -> None:
+    model = fit_cost_model(
+        [
+            *samples("base.en", 8, rtf=0.2, overhead=4.0),
+            *samples("large-v3", 8, rtf=1.5, overhead=10.0),
+            CostSample("base.en", 8, 0.0, 3.0),  # unknown length: ignored
+        ]
+    )
+    base = model.fit_for("base.en", 8)
+    assert (base.rtf, base.overhead_seconds, base.samples) == (
+        pytest.approx(0.2),
+        pytest.approx(4.0),
+        4,
+    )
+    assert model.predict(3000.0, "large-v3", 8) == pytest.approx(4510.0)
+    # No history for this thread count: fall back to the fit over every run.
+    assert model.fit_for("base.en", 2) == model.overall
+    assert model.overall.samples == 8
+    assert fit_cost_model([]).fit_for("base.en", 8) == DEFAULT_FIT
+
+
+def test_chunked_runs_are_fitted_apart_on_the_share_each_job_transcribes() -> None:
+    chunking = "chunk:600.0:8.0:4"
+    unchunked = samples("base.en", 8, rtf=0.2, overhead=4.0)
+    # Tracks over 750 s were split and ran four chunks at once; short ones ran as one job.
+    chunked = [
+        CostSample(
+            "base.en", 8, duration, 6.0 + 0.3 * duration / parallelism, chunking, parallelism
+        )
+        for duration, parallelism in ((120.0, 1), (600.0, 1), (1800.0, 3), (3600.0, 4))
+    ]
+    model = fit_cost_model([*unchunked, *chunked])
+    plain = model.fit_for("base.en", 8)
+    split = model.fit_for("base.en", 8, chunking)
+    assert (plain.rtf, plain.overhead_seconds, plain.samples) == (
+        pytest.approx(0.2),
+        pytest.approx(4.0),
+        4,
+    )
+    assert (split.rtf, split.overhead_seconds, split.samples) == (
+        pytest.approx(0.3),
+        pytest.approx(6.0),
+        4,
+    )
+    assert model.predict(3600.0, "base.en", 8) == pytest.approx(724.0)
+    assert model.predict(3600.0, "base.en", 8, chunking, parallelism=4) == pytest.approx(276.0)
+    state = {
+        "a": {"status": "completed", "elapsed_seconds": 276.0, "model_id": "base.en", "threads": 8}
+        | {"chunking": chunking, "parallel_chunks": 4},
+    }
+    assert cost_samples(state, {"a": 3600.0}) == [
+        CostSample("base.en", 8, 3600.0, 276.0, chunking, 4)
+    ]
+
+
+def test_fit_line_falls_back_to_a_ratio_when_the_line_is_unreliable() -> None:
+    two = fit_line([CostSample(None, None, 100.0, 30.0), CostSample(None, None, 300.0, 50.0)])
+    assert (two.rtf, two.overhead_seconds) == (pytest.approx(0.2), 0.0)
+    same_length = fit_line([CostSample(None, None, 100.0, elapsed) for elapsed in (20, 30, 40)])
+    assert (same_length.rtf, same_length.overhead_seconds) == (pytest.approx(0.3), 0.0)
+    # A negative intercept means the line does not describe the data.
+    noisy = fit_line(
+        [
+            CostSample(None, None, duration, elapsed)
+            for duration, elapsed in ((10, 1), (20, 9), (30, 11))
+        ]
+    )
+    assert noisy.overhead_seconds == 0.0
+    assert noisy.rtf == pytest.approx(21 / 60)
+
+
+def test_cost_samples_skip_cache_hits_failures_and_unknown_durations() -> None:
+    state = {
+        "a": {"status": "completed", "elapsed_seconds": 50.0, "model_id": "m", "threads": 8},
+        "b": {"status": "completed", "elapsed_seconds": 0.01, "memo_cache_hit": True},
+        "c": {"status": "failed", "elapsed_seconds": 5.0},
+        "d": {"status": "completed", "elapsed_seconds": 9.0},
+        "e": {"status": "completed"},
+    }
+    durations = {"a": 200.0, "b": 200.0, "c": 10.0, "d": None, "e": 60.0}
+    assert cost_samples(state, durations) == [CostSample("m", 8, 200.0, 50.0)]
+
+
+def test_longest_first_orders_by_cost_with_median_for_unknowns() -> None:
+    durations = fill_missing_durations([120.0, None, 3600.0, 30.0])
+    assert durations == [120.0, 120.0, 3600.0, 30.0]
+    assert fill_missing_durations([None]) == [0.0]
+    assert longest_first(["a", "b", "c", "d"], dict(zip("abcd", durations, strict=True)).get) == [
+        "c",
+        "a",
+        "b",
+        "d",
+    ]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import wave
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from disk_catalogue.vad import (  # noqa: E402
+    SpeechRegion,
+    SpeechTimeline,
+    VadOptions,
+    detect_speech,
+    read_pcm16,
+    remap_srt,
+    trim_to_speech,
+    write_pcm16,
+)
+
+RATE = 16_000
+
+
+def track(*parts: tuple[str, float], seed: int = 0) -> object:
+    """Concatenate ("speech" | "silence", seconds) parts: a loud tone over faint noise."""
+    rng = np.random.default_rng(seed)
+    pieces = []
+    for kind, seconds in parts:
+        count = round(seconds * RATE)
+        noise = rng.normal(0, 0.001, count)
+        if kind == "speech":
+            t = np.arange(count) / RATE
+            noise += 0.3 * np.sin(2 * np.pi * 220 * t)
+        pieces.append(noise)
+    return np.concatenate(pieces).astype(np.float32)
+
+
+def test_detect_speech_finds_regions_and_bridges_short_pauses() -> None:
+    samples = track(
+        ("silence", 1.0),
+        ("speech", 2.0),
+        ("silence", 0.3),
+        ("speech", 1.0),
+        ("silence", 3.0),
+        ("speech", 1.5),
+        ("silence", 0.1),
+        ("speech", 0.1),
+        ("silence", 1.0),
+    )
+    regions = detect_speech(samples, RATE, VadOptions(pad_ms=0, min_silence_ms=500))
+    assert [(round(r.start_seconds, 1), round(r.end_seconds, 1)) for r in regions] == [
+        (1.0, 4.3),
+        (7.3, 9.0),
+    ]
+
+    padded = detect_speech(samples, RATE, VadOptions(pad_ms=200, min_silence_ms=500))
+    assert padded[0].start_seconds == pytest.approx(0.8, abs=0.04)
+    assert detect_speech(samples[:100], RATE) == []
+    # A track with no quiet stretch is kept whole rather than thrown away.
+    (whole,) = detect_speech(track(("speech", 2.0)), RATE, VadOptions(pad_ms=0))
+    assert (whole.start_seconds, round(whole.end_seconds, 1)) == (0.0, 2.0)
+
+
+def test_trim_to_speech_writes_only_speech_and_maps_times_back(tmp_path: Path) -> None:
+    source = tmp_path / "track.wav"
+    write_pcm16(
+        source, track(("silence", 2.0), ("speech", 1.0), ("silence", 4.0), ("speech", 1.0)), RATE
+    )
+
+    timeline = trim_to_speech(source, tmp_path / "speech.wav", VadOptions(pad_ms=0))
+    trimmed, rate = read_pcm16(tmp_path / "speech.wav")
+    assert rate == RATE
+    assert len(trimmed) / RATE == pytest.approx(timeline.speech_seconds, abs=0.01)
+    assert timeline.duration_seconds == pytest.approx(8.0)
+    assert timeline.skipped_fraction == pytest.approx(0.75, abs=0.02)
+    assert timeline.to_original(0.5) == pytest.approx(2.5, abs=0.05)
+    assert timeline.to_original(1.5) == pytest.approx(7.5, abs=0.05)
+
+    with wave.open(str(tmp_path / "stereo.wav"), "wb") as handle:
+        handle.setnchannels(2)
+        handle.setsampwidth(2)
+        handle.setframerate(RATE)
+        handle.writeframes(b"\0" * 8)
+    with pytest.raises(ValueError, match="16-bit mono"):
+        read_pcm16(tmp_path / "stereo.wav")
+
+
+def test_remap_srt_moves_cues_to_the_original_timeline() -> None:
+    timeline = SpeechTimeline((SpeechRegion(10.0, 12.0), SpeechRegion(30.0, 33.0)), 60.0)
+    srt = (
+        "1\n00:00:00,500 --> 00:00:02,000\nTrack one\n\n"
+        "2\r\n00:00:02,000 --> 00:00:04,250 X1:0\r\nParable of the sower\r\n"
+    )
+    assert remap_srt(srt, timeline) == (
+        "1\n00:00:10,500 --> 00:00:12,000\nTrack one\n\n"
+        "2\r\n00:00:30,000 --> 00:00:32,250 X1:0\r\nParable of the sower\r\n"
+    )
+    assert SpeechTimeline((), 0.0).to_original(3.0) == 3.0
+    assert SpeechTimeline((), 0.0).skipped_fraction == 0.0